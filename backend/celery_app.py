@@ -33,6 +33,11 @@ app.conf.update(
         "backend.tasks.document_generation.*": {"queue": "documents"},
         "backend.tasks.audit_runner.*": {"queue": "audits"},
         "backend.tasks.pdf_generation.*": {"queue": "pdfs"},
+        # Audit tasks are registered under short names
+        "run_accuracy_audit": {"queue": "audits"},
+        "run_compliance_check": {"queue": "audits"},
+        "audit_chunk": {"queue": "audits"},
+        "merge_audit_results": {"queue": "audits"},
     },
     # Task time limits
     task_time_limit=600,  # 10 minutes hard limit
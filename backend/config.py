@@ -24,6 +24,20 @@ class Config:
     MINIO_BUCKET: str = os.getenv("MINIO_BUCKET", "cert-documents")
     MINIO_REPORTS_BUCKET: str = os.getenv("MINIO_REPORTS_BUCKET", "cert-reports")
     MINIO_SECURE: bool = os.getenv("MINIO_SECURE", "false").lower() == "true"
+    MINIO_POOL_MAXSIZE: int = int(os.getenv("MINIO_POOL_MAXSIZE", "10"))
+    MINIO_CONNECT_TIMEOUT: float = float(os.getenv("MINIO_CONNECT_TIMEOUT", "5"))
+    MINIO_READ_TIMEOUT: float = float(os.getenv("MINIO_READ_TIMEOUT", "60"))
+    MINIO_RETRIES: int = int(os.getenv("MINIO_RETRIES", "3"))
+    MINIO_PART_SIZE: int = int(os.getenv("MINIO_PART_SIZE", str(16 * 1024 * 1024)))
+
+    # Storage Backend ("minio", or "local" for tests and single-host setups)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "minio")
+    STORAGE_LOCAL_DIR: str = os.getenv("STORAGE_LOCAL_DIR", "/tmp/cert-storage")
+
+    # Task Payload Configuration
+    PAYLOAD_BUCKET: str = os.getenv("PAYLOAD_BUCKET", "cert-payloads")
+    PAYLOAD_STAGING_DIR: Optional[str] = os.getenv("PAYLOAD_STAGING_DIR")
+    PAYLOAD_INLINE_MAX_BYTES: int = int(os.getenv("PAYLOAD_INLINE_MAX_BYTES", "65536"))
 
     # Supabase Configuration
     SUPABASE_URL: Optional[str] = os.getenv("SUPABASE_URL")
@@ -36,6 +50,21 @@ class Config:
     # Worker Configuration
     WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "4"))
 
+    # Audit Configuration
+    AUDIT_PRELOAD_MODELS: bool = os.getenv("AUDIT_PRELOAD_MODELS", "true").lower() == "true"
+    AUDIT_EMBEDDING_MODEL: str = os.getenv("AUDIT_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    AUDIT_CHUNK_SIZE: int = int(os.getenv("AUDIT_CHUNK_SIZE", "500"))
+    AUDIT_FAILURE_SAMPLES: int = int(os.getenv("AUDIT_FAILURE_SAMPLES", "100"))
+    AUDIT_PROGRESS_BATCH: int = int(os.getenv("AUDIT_PROGRESS_BATCH", "50"))
+    AUDIT_PROGRESS_INTERVAL: float = float(os.getenv("AUDIT_PROGRESS_INTERVAL", "2"))
+    AUDIT_PROGRESS_TTL: int = int(os.getenv("AUDIT_PROGRESS_TTL", "86400"))
+
+    # Document Rendering Configuration
+    RENDERER_PRELOAD: bool = os.getenv("RENDERER_PRELOAD", "true").lower() == "true"
+    ARTIFACT_CACHE_ENABLED: bool = os.getenv("ARTIFACT_CACHE_ENABLED", "true").lower() == "true"
+    ARTIFACT_CACHE_TTL: int = int(os.getenv("ARTIFACT_CACHE_TTL", "604800"))
+    ARTIFACT_TEMPLATE_VERSION: Optional[str] = os.getenv("ARTIFACT_TEMPLATE_VERSION")
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
 
@@ -51,14 +80,18 @@ class Config:
         if not cls.REDIS_URL:
             errors.append("REDIS_URL is required")
 
-        if not cls.MINIO_ENDPOINT:
-            errors.append("MINIO_ENDPOINT is required")
+        if cls.STORAGE_BACKEND not in ("minio", "local"):
+            errors.append("STORAGE_BACKEND must be 'minio' or 'local'")
+
+        if cls.STORAGE_BACKEND == "minio":
+            if not cls.MINIO_ENDPOINT:
+                errors.append("MINIO_ENDPOINT is required")
 
-        if not cls.MINIO_ACCESS_KEY:
-            errors.append("MINIO_ACCESS_KEY is required")
+            if not cls.MINIO_ACCESS_KEY:
+                errors.append("MINIO_ACCESS_KEY is required")
 
-        if not cls.MINIO_SECRET_KEY:
-            errors.append("MINIO_SECRET_KEY is required")
+            if not cls.MINIO_SECRET_KEY:
+                errors.append("MINIO_SECRET_KEY is required")
 
         if errors:
             raise ValueError(f"Configuration errors: {', '.join(errors)}")
@@ -71,11 +104,18 @@ Backend Configuration:
 ----------------------
 Redis URL: {cls.REDIS_URL}
 Celery Broker: {cls.CELERY_BROKER_URL}
+Storage Backend: {cls.STORAGE_BACKEND}
 MinIO Endpoint: {cls.MINIO_ENDPOINT}
 MinIO Bucket: {cls.MINIO_BUCKET}
 MinIO Secure: {cls.MINIO_SECURE}
+Payload Storage: {cls.PAYLOAD_STAGING_DIR or cls.PAYLOAD_BUCKET}
 Supabase URL: {cls.SUPABASE_URL or 'Not configured'}
 Worker Concurrency: {cls.WORKER_CONCURRENCY}
+Audit Model Preload: {cls.AUDIT_PRELOAD_MODELS}
+Audit Chunk Size: {cls.AUDIT_CHUNK_SIZE}
+Audit Progress Interval: {cls.AUDIT_PROGRESS_INTERVAL}s
+Renderer Preload: {cls.RENDERER_PRELOAD}
+Artifact Cache: {cls.ARTIFACT_CACHE_ENABLED}
 Log Level: {cls.LOG_LEVEL}
 """
 
@@ -0,0 +1,102 @@
+"""
+Document Renderers
+=================
+
+In-process access to the document and PDF renderers in ``scripts/``.
+
+The renderer scripts double as CLI tools, so they are loaded from
+``Config.SCRIPTS_DIR`` as modules rather than executed as subprocesses.
+Each worker process imports them once; the scripts cache template files
+and paragraph styles in module state, which is reused by every job the
+process handles. The task modules warm their renderer when a worker
+process starts (see ``RENDERER_PRELOAD``).
+"""
+
+import hashlib
+import importlib.util
+import logging
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_RENDERER = "populate_templates"
+PDF_RENDERER = "generate_assessment_pdf"
+
+_renderers: Dict[str, ModuleType] = {}
+_renderers_lock = threading.Lock()
+
+# Content digests of renderer inputs, keyed by path, mtime and size
+_file_digests: Dict[Tuple[Path, int, int], str] = {}
+
+
+def load_renderer(name: str) -> ModuleType:
+    """
+    Import a renderer script once per process.
+
+    Args:
+        name: Script name without extension (e.g. ``populate_templates``)
+
+    Returns:
+        Loaded script module
+
+    Raises:
+        FileNotFoundError: If the script does not exist in ``SCRIPTS_DIR``
+    """
+    module = _renderers.get(name)
+    if module is None:
+        with _renderers_lock:
+            module = _renderers.get(name)
+            if module is None:
+                script_path = Path(Config.SCRIPTS_DIR) / f"{name}.py"
+                if not script_path.exists():
+                    raise FileNotFoundError(f"Renderer script not found: {script_path}")
+
+                spec = importlib.util.spec_from_file_location(f"cert_renderers.{name}", script_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                _renderers[name] = module
+    return module
+
+
+def _renderer_files(name: str) -> List[Path]:
+    """Files whose contents determine a renderer's output."""
+    files = [Path(Config.SCRIPTS_DIR) / f"{name}.py"]
+    if name == DOCUMENT_RENDERER:
+        files.extend(sorted(Path(Config.TEMPLATES_DIR).glob("*.docx")))
+    return files
+
+
+def renderer_version(name: str) -> str:
+    """
+    Version of a renderer for artifact cache keys.
+
+    ``ARTIFACT_TEMPLATE_VERSION`` takes precedence when set; otherwise the
+    version is a digest of the renderer script and, for documents, the
+    template files, so editing either invalidates cached artifacts.
+
+    Args:
+        name: Renderer name
+
+    Returns:
+        Version string
+    """
+    if Config.ARTIFACT_TEMPLATE_VERSION:
+        return Config.ARTIFACT_TEMPLATE_VERSION
+
+    version = hashlib.sha256()
+    for path in _renderer_files(name):
+        if not path.exists():
+            continue
+        stat = path.stat()
+        cache_key = (path, stat.st_mtime_ns, stat.st_size)
+        digest = _file_digests.get(cache_key)
+        if digest is None:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            _file_digests[cache_key] = digest
+        version.update(f"{path.name}:{digest};".encode())
+    return version.hexdigest()[:16]
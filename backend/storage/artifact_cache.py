@@ -0,0 +1,254 @@
+"""
+Generated Artifact Cache
+=======================
+
+Content-addressed cache of generated documents and reports.
+
+An artifact is identified by a SHA-256 of its kind, the canonical JSON of
+its inputs, the renderer version (script and template contents) and the
+generation date, which the renderers print into every document. The
+generating task stores its result under that key in Redis, and the MinIO
+object is named after the digest, so identical submissions map to one
+object.
+
+``submit_artifact_job`` sits in front of the generation tasks:
+- a cache hit whose object still exists is returned immediately
+- an identical submission already in flight is coalesced onto that job
+- otherwise the task is dispatched and owns the in-flight claim until it
+  stores its result or finally fails
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Sequence
+from uuid import uuid4
+
+import redis
+
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cert:artifact:"
+CLAIM_PREFIX = "cert:artifact-claim:"
+
+# Longest attempt of a generation task (time_limit) plus Celery's longest
+# retry backoff (retry_backoff_max); tasks refresh their claim every attempt
+CLAIM_TTL = 600 + 600
+
+# Delete or extend a claim only while the given job still owns it
+RELEASE_CLAIM_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+REFRESH_CLAIM_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def artifact_key(kind: str, inputs: Any, version: str, generated_on: Optional[str] = None) -> str:
+    """
+    Build the cache key for a set of generation inputs.
+
+    Args:
+        kind: Artifact kind (renderer name)
+        inputs: JSON-serializable generation inputs
+        version: Renderer version (see ``backend.renderers.renderer_version``)
+        generated_on: ISO date printed into the artifact (default: today in
+            local time, as the renderers' ``datetime.now()``)
+
+    Returns:
+        Cache key ending in the hex digest
+    """
+    canonical = json.dumps(
+        {
+            "kind": kind,
+            "inputs": inputs,
+            "version": version,
+            "generated_on": generated_on or date.today().isoformat(),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}{kind}:{digest}"
+
+
+def key_digest(key: str) -> str:
+    """Extract the hex digest from a cache key."""
+    return key.rsplit(":", 1)[-1]
+
+
+class ArtifactCache:
+    """
+    Redis-backed index of generated artifacts and in-flight jobs.
+
+    Example:
+        >>> cache = ArtifactCache()
+        >>> key = artifact_key("generate_assessment_pdf", report, version)
+        >>> cache.get(key) is None
+        True
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: Optional[int] = None,
+        claim_ttl: int = CLAIM_TTL,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis URL (default: ``REDIS_URL``)
+            ttl: Seconds a cached result is kept (default: ``ARTIFACT_CACHE_TTL``)
+            claim_ttl: Seconds an in-flight claim survives a lost worker; each
+                attempt of the generating task refreshes it (see ``refresh``)
+        """
+        self.redis = redis.Redis.from_url(redis_url or Config.REDIS_URL)
+        self.ttl = ttl or Config.ARTIFACT_CACHE_TTL
+        self.claim_ttl = claim_ttl
+
+    def get(self, key: str, bucket_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result whose MinIO object still exists.
+
+        Args:
+            key: Cache key
+            bucket_name: Bucket holding the artifact
+
+        Returns:
+            Cached task result, or None on a miss
+        """
+        raw = self.redis.get(key)
+        if raw is None:
+            return None
+
+        result = json.loads(raw)
+
+        from backend.storage.minio_client import get_minio_client
+
+        if not get_minio_client().file_exists(result["object_name"], bucket_name):
+            logger.info(f"Cached artifact {result['object_name']} is gone, regenerating")
+            self.redis.delete(key)
+            return None
+        return result
+
+    def store(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache a task result."""
+        self.redis.set(key, json.dumps(result), ex=self.ttl)
+
+    def claim(self, key: str, job_id: str) -> str:
+        """
+        Claim generation of an artifact for a job.
+
+        Args:
+            key: Cache key
+            job_id: Job that would generate the artifact
+
+        Returns:
+            ``job_id`` if the claim was taken, otherwise the id of the job
+            already generating the artifact
+        """
+        claim_key = f"{CLAIM_PREFIX}{key_digest(key)}"
+        # A second attempt covers the owner finishing between SET and GET
+        for _ in range(2):
+            if self.redis.set(claim_key, job_id, nx=True, ex=self.claim_ttl):
+                return job_id
+            owner = self.redis.get(claim_key)
+            if owner is not None:
+                return owner.decode("utf-8")
+
+        # Contended claim; generate without coalescing rather than fail
+        return job_id
+
+    def refresh(self, key: str, job_id: str) -> bool:
+        """
+        Extend a job's in-flight claim by ``claim_ttl`` seconds.
+
+        Called at the start of every attempt, so a task that is retried
+        keeps its claim for as long as it is still being worked on.
+
+        Returns:
+            False if the job no longer owns the claim
+        """
+        claim_key = f"{CLAIM_PREFIX}{key_digest(key)}"
+        return bool(self.redis.eval(REFRESH_CLAIM_SCRIPT, 1, claim_key, job_id, self.claim_ttl))
+
+    def release(self, key: str, job_id: str) -> None:
+        """Release a job's in-flight claim."""
+        claim_key = f"{CLAIM_PREFIX}{key_digest(key)}"
+        self.redis.eval(RELEASE_CLAIM_SCRIPT, 1, claim_key, job_id)
+
+
+# Global artifact cache instance
+_artifact_cache: Optional[ArtifactCache] = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Get or create global artifact cache instance."""
+    global _artifact_cache
+    if _artifact_cache is None:
+        _artifact_cache = ArtifactCache()
+    return _artifact_cache
+
+
+def submit_artifact_job(
+    task: Any,
+    kind: str,
+    inputs: Sequence[Any],
+    build_args: Callable[[], Sequence[Any]],
+    bucket_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Return a cached artifact or start (or join) the job generating it.
+
+    Args:
+        task: Celery task accepting a ``cache_key`` keyword argument
+        kind: Artifact kind (renderer name)
+        inputs: Generation inputs, hashed for the cache key
+        build_args: Builds the task arguments; only called when dispatching
+        bucket_name: Bucket the task uploads the artifact to
+
+    Returns:
+        API response with ``job_id`` and ``status``; cache hits also carry
+        ``cached`` and ``result``, joined jobs carry ``coalesced``
+    """
+    if not Config.ARTIFACT_CACHE_ENABLED:
+        job = task.delay(*build_args())
+        return {"job_id": job.id, "status": "pending"}
+
+    from backend.renderers import renderer_version
+
+    cache = get_artifact_cache()
+    key = artifact_key(kind, list(inputs), renderer_version(kind))
+
+    cached = cache.get(key, bucket_name)
+    if cached is not None:
+        # Record the hit as a finished task so the status endpoints serve it
+        job_id = str(uuid4())
+        cached = {**cached, "job_id": job_id}
+        task.backend.store_result(job_id, cached, "SUCCESS")
+        logger.info(f"Artifact cache hit for {kind}: {cached['object_name']}")
+        return {"job_id": job_id, "status": "completed", "cached": True, "result": cached}
+
+    job_id = str(uuid4())
+    owner = cache.claim(key, job_id)
+    if owner != job_id:
+        logger.info(f"Coalesced {kind} request onto in-flight job {owner}")
+        return {"job_id": owner, "status": "pending", "coalesced": True}
+
+    try:
+        task.apply_async(args=list(build_args()), kwargs={"cache_key": key}, task_id=job_id)
+    except Exception:
+        cache.release(key, job_id)
+        raise
+    return {"job_id": job_id, "status": "pending"}
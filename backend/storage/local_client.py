@@ -0,0 +1,174 @@
+"""
+Local Storage Client
+===================
+
+Filesystem stand-in for MinIO, used for tests and single-host deployments.
+
+Buckets are directories under ``STORAGE_LOCAL_DIR``; the client exposes the
+same methods as ``MinIOClient``. Select it with ``STORAGE_BACKEND=local``.
+"""
+
+import io
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional
+from uuid import uuid4
+
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _RangeFile(io.RawIOBase):
+    """Raw reader limited to a byte range of an open file."""
+
+    def __init__(self, f, remaining: Optional[int]):
+        self._file = f
+        self._remaining = remaining
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = len(buffer)
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        data = self._file.read(size)
+        buffer[: len(data)] = data
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class LocalObject(io.BufferedReader):
+    """Open local object; mirrors the MinIO response interface."""
+
+    def release_conn(self) -> None:
+        """No pooled connection to release for local files."""
+
+
+class LocalStorageClient:
+    """
+    Filesystem storage client with the ``MinIOClient`` interface.
+
+    Example:
+        >>> client = LocalStorageClient("/tmp/cert-storage")
+        >>> name = client.upload_bytes(b"report", object_name="report.txt")
+        >>> client.download_bytes(name)
+        b'report'
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Initialize local storage client.
+
+        Args:
+            root: Storage root directory (default: ``STORAGE_LOCAL_DIR``)
+        """
+        self.root = Path(root or Config.STORAGE_LOCAL_DIR)
+        logger.info(f"Local storage client initialized: {self.root}")
+
+    def _path(self, bucket_name: Optional[str], object_name: str) -> Path:
+        """Resolve an object path, refusing names that escape the bucket."""
+        bucket = (self.root / (bucket_name or Config.MINIO_BUCKET)).resolve()
+        path = (bucket / object_name).resolve()
+        try:
+            path.relative_to(bucket)
+        except ValueError:
+            raise ValueError(f"Invalid object name: {object_name}") from None
+        return path
+
+    def ensure_bucket(self, bucket_name: str) -> None:
+        """Create the bucket directory if needed."""
+        (self.root / bucket_name).mkdir(parents=True, exist_ok=True)
+
+    def upload_file(
+        self,
+        file_path: str,
+        bucket_name: Optional[str] = None,
+        object_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Copy a file into storage; see ``MinIOClient.upload_file``."""
+        object_name = object_name or f"{uuid4()}{Path(file_path).suffix}"
+        path = self._path(bucket_name, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(file_path, path)
+        return object_name
+
+    def upload_bytes(
+        self,
+        data: bytes,
+        bucket_name: Optional[str] = None,
+        object_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Write bytes into storage; see ``MinIOClient.upload_bytes``."""
+        object_name = object_name or str(uuid4())
+        path = self._path(bucket_name, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return object_name
+
+    def upload_stream(
+        self,
+        chunks: Iterable[bytes],
+        bucket_name: Optional[str] = None,
+        object_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        part_size: Optional[int] = None,
+    ) -> str:
+        """Write chunks into storage; see ``MinIOClient.upload_stream``."""
+        object_name = object_name or str(uuid4())
+        path = self._path(bucket_name, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return object_name
+
+    def open_object(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        offset: int = 0,
+        length: int = 0,
+    ) -> LocalObject:
+        """Open an object or byte range; see ``MinIOClient.open_object``."""
+        f = open(self._path(bucket_name, object_name), "rb")
+        f.seek(offset)
+        return LocalObject(_RangeFile(f, length or None))
+
+    def download_bytes(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        offset: int = 0,
+        length: int = 0,
+    ) -> bytes:
+        """Read an object or byte range; see ``MinIOClient.download_bytes``."""
+        with self.open_object(object_name, bucket_name, offset=offset, length=length) as f:
+            return f.read()
+
+    def get_file_url(
+        self, object_name: str, bucket_name: Optional[str] = None, expires: int = 3600
+    ) -> str:
+        """``file://`` URL of an object (no expiry applies)."""
+        return self._path(bucket_name, object_name).as_uri()
+
+    def get_public_url(self, object_name: str, bucket_name: Optional[str] = None) -> str:
+        """``file://`` URL of an object."""
+        return self._path(bucket_name, object_name).as_uri()
+
+    def delete_file(self, object_name: str, bucket_name: Optional[str] = None) -> None:
+        """Delete an object."""
+        self._path(bucket_name, object_name).unlink(missing_ok=True)
+
+    def file_exists(self, object_name: str, bucket_name: Optional[str] = None) -> bool:
+        """Check if an object exists."""
+        return self._path(bucket_name, object_name).is_file()
@@ -3,20 +3,35 @@ MinIO Storage Client
 ===================
 
 S3-compatible object storage for generated documents and reports.
+
+Bucket existence is checked once per bucket per process, uploads of unknown
+length stream as multipart uploads, and the HTTP connection pool is sized
+and timed out from ``MINIO_*`` settings. ``get_minio_client`` returns a
+``LocalStorageClient`` instead when ``STORAGE_BACKEND=local``.
 """
 
 import logging
+import threading
 from datetime import timedelta
 from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Optional, Set, Union
 from urllib.parse import urljoin
 from uuid import uuid4
 
-from minio import Minio
-from minio.error import S3Error
-
 from backend.config import Config
+from backend.storage.local_client import LocalStorageClient
+from backend.storage.streams import IterableReader
+
+try:
+    import urllib3
+    from minio import Minio
+    from minio.error import S3Error
+
+    MINIO_AVAILABLE = True
+except ImportError:
+    # Only the local storage backend is usable without the MinIO SDK
+    MINIO_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +49,7 @@ class MinIOClient:
         access_key: Optional[str] = None,
         secret_key: Optional[str] = None,
         secure: Optional[bool] = None,
+        http_client: Optional["urllib3.PoolManager"] = None,
     ):
         """
         Initialize MinIO client.
@@ -43,7 +59,14 @@ class MinIOClient:
             access_key: MinIO access key (default: from config)
             secret_key: MinIO secret key (default: from config)
             secure: Use HTTPS (default: from config)
+            http_client: Connection pool (default: built from MINIO_* settings)
         """
+        if not MINIO_AVAILABLE:
+            raise ImportError(
+                "MinIO storage requires the minio package. "
+                "Install with: pip install -r requirements-backend.txt"
+            )
+
         self.endpoint = endpoint or Config.MINIO_ENDPOINT
         self.access_key = access_key or Config.MINIO_ACCESS_KEY
         self.secret_key = secret_key or Config.MINIO_SECRET_KEY
@@ -54,26 +77,58 @@ class MinIOClient:
             access_key=self.access_key,
             secret_key=self.secret_key,
             secure=self.secure,
+            http_client=http_client or self._build_http_client(),
         )
 
+        # Buckets known to exist; checked once per process
+        self._buckets: Set[str] = set()
+        self._buckets_lock = threading.Lock()
+
         logger.info(f"MinIO client initialized: {self.endpoint} (secure={self.secure})")
 
+    @staticmethod
+    def _build_http_client() -> "urllib3.PoolManager":
+        """Build the connection pool from MINIO_* settings."""
+        return urllib3.PoolManager(
+            maxsize=Config.MINIO_POOL_MAXSIZE,
+            timeout=urllib3.Timeout(
+                connect=Config.MINIO_CONNECT_TIMEOUT, read=Config.MINIO_READ_TIMEOUT
+            ),
+            retries=urllib3.Retry(
+                total=Config.MINIO_RETRIES,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+
     def ensure_bucket(self, bucket_name: str) -> None:
         """
         Ensure bucket exists, create if not.
 
+        The result is cached, so only the first upload to a bucket in this
+        process pays the round trip.
+
         Args:
             bucket_name: Bucket name to create/verify
         """
-        try:
-            if not self.client.bucket_exists(bucket_name):
-                self.client.make_bucket(bucket_name)
-                logger.info(f"Created bucket: {bucket_name}")
-            else:
-                logger.debug(f"Bucket exists: {bucket_name}")
-        except S3Error as e:
-            logger.error(f"Failed to ensure bucket {bucket_name}: {e}")
-            raise
+        if bucket_name in self._buckets:
+            return
+
+        with self._buckets_lock:
+            if bucket_name in self._buckets:
+                return
+
+            try:
+                if not self.client.bucket_exists(bucket_name):
+                    self.client.make_bucket(bucket_name)
+                    logger.info(f"Created bucket: {bucket_name}")
+                else:
+                    logger.debug(f"Bucket exists: {bucket_name}")
+            except S3Error as e:
+                logger.error(f"Failed to ensure bucket {bucket_name}: {e}")
+                raise
+
+            self._buckets.add(bucket_name)
 
     def upload_file(
         self,
@@ -147,11 +202,10 @@ class MinIOClient:
             object_name = str(uuid4())
 
         try:
-            data_stream = BytesIO(data)
             self.client.put_object(
                 bucket_name=bucket,
                 object_name=object_name,
-                data=data_stream,
+                data=BytesIO(data),
                 length=len(data),
                 content_type=content_type,
             )
@@ -162,6 +216,111 @@ class MinIOClient:
             logger.error(f"Upload failed: {e}")
             raise
 
+    def upload_stream(
+        self,
+        chunks: Iterable[bytes],
+        bucket_name: Optional[str] = None,
+        object_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        part_size: Optional[int] = None,
+    ) -> str:
+        """
+        Upload data of unknown length from an iterable of chunks.
+
+        The data is sent as a multipart upload, one part at a time, so
+        neither the whole object nor a temporary file is needed.
+
+        Args:
+            chunks: Iterable (e.g. generator) of byte chunks
+            bucket_name: Target bucket (default: cert-documents)
+            object_name: Object name in bucket (default: generated UUID)
+            content_type: MIME type
+            part_size: Multipart part size in bytes (default: MINIO_PART_SIZE)
+
+        Returns:
+            Object name in MinIO
+        """
+        bucket = bucket_name or Config.MINIO_BUCKET
+        self.ensure_bucket(bucket)
+
+        if not object_name:
+            object_name = str(uuid4())
+
+        try:
+            result = self.client.put_object(
+                bucket_name=bucket,
+                object_name=object_name,
+                data=IterableReader(chunks),
+                length=-1,
+                part_size=part_size or Config.MINIO_PART_SIZE,
+                content_type=content_type,
+            )
+            logger.info(f"Streamed upload → {bucket}/{object_name} (etag {result.etag})")
+            return object_name
+
+        except S3Error as e:
+            logger.error(f"Upload failed: {e}")
+            raise
+
+    def open_object(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        offset: int = 0,
+        length: int = 0,
+    ) -> Any:
+        """
+        Open an object, or a byte range of it, for streaming reads.
+
+        The caller must ``close()`` and ``release_conn()`` the returned
+        response once done with it.
+
+        Args:
+            object_name: Object name in bucket
+            bucket_name: Bucket name (default: cert-documents)
+            offset: First byte to read
+            length: Number of bytes to read (0 reads to the end)
+
+        Returns:
+            File-like HTTP response
+        """
+        bucket = bucket_name or Config.MINIO_BUCKET
+
+        try:
+            return self.client.get_object(
+                bucket_name=bucket, object_name=object_name, offset=offset, length=length
+            )
+
+        except S3Error as e:
+            logger.error(f"Download failed: {e}")
+            raise
+
+    def download_bytes(
+        self,
+        object_name: str,
+        bucket_name: Optional[str] = None,
+        offset: int = 0,
+        length: int = 0,
+    ) -> bytes:
+        """
+        Download an object, or a byte range of it, from MinIO.
+
+        Args:
+            object_name: Object name in bucket
+            bucket_name: Bucket name (default: cert-documents)
+            offset: First byte to read
+            length: Number of bytes to read (0 reads to the end)
+
+        Returns:
+            Object bytes
+        """
+        response = self.open_object(object_name, bucket_name, offset=offset, length=length)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
     def get_file_url(
         self, object_name: str, bucket_name: Optional[str] = None, expires: int = 3600
     ) -> str:
@@ -249,13 +408,16 @@ class MinIOClient:
             return False
 
 
-# Global MinIO client instance
-_minio_client: Optional[MinIOClient] = None
+# Global storage client instance
+_minio_client: Optional[Union[MinIOClient, LocalStorageClient]] = None
 
 
-def get_minio_client() -> MinIOClient:
-    """Get or create global MinIO client instance."""
+def get_minio_client() -> Union[MinIOClient, LocalStorageClient]:
+    """Get or create global storage client instance (MinIO unless STORAGE_BACKEND=local)."""
     global _minio_client
     if _minio_client is None:
-        _minio_client = MinIOClient()
+        if Config.STORAGE_BACKEND == "local":
+            _minio_client = LocalStorageClient()
+        else:
+            _minio_client = MinIOClient()
     return _minio_client
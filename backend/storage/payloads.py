@@ -0,0 +1,285 @@
+"""
+Task Payload Storage
+===================
+
+Keeps large task arguments out of the Celery broker.
+
+The API stores large payloads (trace corpora, report JSON) in MinIO, or in
+a shared directory when ``PAYLOAD_STAGING_DIR`` is set, and passes a small
+reference to the task instead. A reference is a dict carrying the storage
+location, the SHA-256 of the uncompressed bytes and the compression used:
+
+    {"payload_ref": True, "bucket": "cert-payloads", "key": "...",
+     "sha256": "...", "size": 1048576, "compression": "gzip"}
+
+Payloads below ``PAYLOAD_INLINE_MAX_BYTES`` stay inline, so tasks accept
+either form and resolve it with ``load_json`` or ``iter_lines``. Workers
+stream referenced payloads and verify the checksum once fully read.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+from uuid import uuid4
+
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Marker key identifying a payload reference among task arguments
+PAYLOAD_REF_KEY = "payload_ref"
+
+
+class PayloadChecksumError(ValueError):
+    """Raised when a stored payload does not match its recorded checksum."""
+
+
+def is_payload_ref(value: Any) -> bool:
+    """Check whether a task argument is a payload reference."""
+    return isinstance(value, dict) and value.get(PAYLOAD_REF_KEY) is True
+
+
+def store_payload(
+    data: bytes,
+    name: Optional[str] = None,
+    content_type: str = "application/octet-stream",
+    compress: bool = False,
+) -> Dict[str, Any]:
+    """
+    Store a payload and return its reference.
+
+    Args:
+        data: Uncompressed payload bytes
+        name: Object name (default: generated UUID)
+        content_type: MIME type of the uncompressed payload
+        compress: Gzip the stored object
+
+    Returns:
+        Payload reference
+    """
+    object_name = f"payloads/{name or uuid4()}"
+    stored = gzip.compress(data, compresslevel=6, mtime=0) if compress else data
+    ref: Dict[str, Any] = {
+        PAYLOAD_REF_KEY: True,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+        "compression": "gzip" if compress else None,
+    }
+
+    if Config.PAYLOAD_STAGING_DIR:
+        path = Path(Config.PAYLOAD_STAGING_DIR) / object_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(stored)
+        ref["path"] = str(path)
+    else:
+        from backend.storage.minio_client import get_minio_client
+
+        get_minio_client().upload_bytes(
+            stored,
+            bucket_name=Config.PAYLOAD_BUCKET,
+            object_name=object_name,
+            content_type="application/gzip" if compress else content_type,
+        )
+        ref["bucket"] = Config.PAYLOAD_BUCKET
+        ref["key"] = object_name
+
+    logger.debug(f"Stored payload {object_name}: {len(data)} bytes ({len(stored)} stored)")
+    return ref
+
+
+def offload_json(value: Any, name: Optional[str] = None) -> Any:
+    """
+    Replace a JSON-serializable task argument by a reference if it is large.
+
+    Args:
+        value: Task argument
+        name: Object name (default: generated UUID)
+
+    Returns:
+        ``value`` unchanged when small, otherwise its payload reference
+    """
+    data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if len(data) <= Config.PAYLOAD_INLINE_MAX_BYTES:
+        return value
+    return store_payload(data, name=name, content_type="application/json")
+
+
+def offload_jsonl(text: str, name: Optional[str] = None) -> Any:
+    """
+    Replace a JSONL task argument by a compressed reference if it is large.
+
+    Args:
+        text: JSONL text
+        name: Object name (default: generated UUID)
+
+    Returns:
+        ``text`` unchanged when small, otherwise its payload reference
+    """
+    data = text.encode("utf-8")
+    if len(data) <= Config.PAYLOAD_INLINE_MAX_BYTES:
+        return text
+    return store_payload(data, name=name, content_type="application/x-ndjson", compress=True)
+
+
+@contextmanager
+def _open_stored(ref: Dict[str, Any], offset: int = 0, length: int = 0) -> Iterator[BinaryIO]:
+    """Open the stored (possibly compressed) object of a reference."""
+    if "path" in ref:
+        with open(ref["path"], "rb") as f:
+            f.seek(offset)
+            yield f
+        return
+
+    from backend.storage.minio_client import get_minio_client
+
+    response = get_minio_client().open_object(
+        ref["key"], bucket_name=ref["bucket"], offset=offset, length=length
+    )
+    try:
+        yield response
+    finally:
+        response.close()
+        response.release_conn()
+
+
+@contextmanager
+def open_payload(ref: Dict[str, Any]) -> Iterator[BinaryIO]:
+    """
+    Open a referenced payload as a stream of its uncompressed bytes.
+
+    Args:
+        ref: Payload reference
+
+    Yields:
+        Binary file-like object
+    """
+    with _open_stored(ref) as stored:
+        if ref.get("compression") == "gzip":
+            with gzip.GzipFile(fileobj=stored, mode="rb") as decompressed:
+                yield decompressed
+        else:
+            yield stored
+
+
+def _verify(ref: Dict[str, Any], digest: Any, size: int) -> None:
+    """Compare the streamed bytes against the reference checksum."""
+    if size != ref["size"] or digest.hexdigest() != ref["sha256"]:
+        raise PayloadChecksumError(
+            f"Payload {ref.get('key') or ref.get('path')} failed checksum verification"
+        )
+
+
+def split_lines(data: Union[str, bytes]) -> List[str]:
+    """
+    Split JSONL on ``\n`` only.
+
+    Unlike ``str.splitlines`` this keeps U+2028, U+2029, ``\x85`` and the
+    other Unicode line breaks inside a line, where JSON serializers (orjson
+    among them) may write them unescaped.
+
+    Args:
+        data: JSONL text or UTF-8 bytes
+
+    Returns:
+        Decoded lines without trailing ``\r\n`` or ``\n``
+    """
+    if isinstance(data, bytes):
+        lines = [line.decode("utf-8") for line in data.split(b"\n")]
+    else:
+        lines = data.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return [line.rstrip("\r") for line in lines]
+
+
+def iter_lines(value: Any) -> Iterator[str]:
+    """
+    Iterate over the lines of an inline or referenced text payload.
+
+    Referenced payloads are streamed line by line; the checksum is verified
+    after the last line.
+
+    Args:
+        value: JSONL text or payload reference
+
+    Yields:
+        Lines without trailing newlines
+    """
+    if not is_payload_ref(value):
+        yield from split_lines(value)
+        return
+
+    digest = hashlib.sha256()
+    size = 0
+    with open_payload(value) as stream:
+        for raw in stream:
+            digest.update(raw)
+            size += len(raw)
+            yield raw.decode("utf-8").rstrip("\r\n")
+    _verify(value, digest, size)
+
+
+def load_json(value: Any) -> Any:
+    """
+    Resolve an inline or referenced JSON task argument.
+
+    Args:
+        value: Task argument as returned by ``offload_json``
+
+    Returns:
+        Decoded JSON value
+    """
+    if not is_payload_ref(value):
+        return value
+
+    with open_payload(value) as stream:
+        data = stream.read()
+    digest = hashlib.sha256(data)
+    _verify(value, digest, len(data))
+    return json.loads(data)
+
+
+def read_range(ref: Dict[str, Any], start: int, end: int) -> bytes:
+    """
+    Read a byte range of an uncompressed referenced payload.
+
+    Ranges cannot be checksummed individually; callers reading a whole
+    payload should use ``iter_lines`` or ``load_json`` instead.
+
+    Args:
+        ref: Payload reference stored without compression
+        start: First byte
+        end: End of the range (exclusive)
+
+    Returns:
+        Range bytes
+    """
+    if ref.get("compression"):
+        raise ValueError("Byte ranges can only be read from uncompressed payloads")
+
+    with _open_stored(ref, offset=start, length=end - start) as stored:
+        return stored.read(end - start)
+
+
+def delete_payload(value: Any) -> None:
+    """
+    Delete a referenced payload once its task has completed.
+
+    Inline values are ignored; failures are logged, not raised.
+    """
+    if not is_payload_ref(value):
+        return
+
+    try:
+        if "path" in value:
+            Path(value["path"]).unlink(missing_ok=True)
+        else:
+            from backend.storage.minio_client import get_minio_client
+
+            get_minio_client().delete_file(value["key"], bucket_name=value["bucket"])
+    except Exception as e:
+        logger.warning(f"Failed to delete payload {value.get('key') or value.get('path')}: {e}")
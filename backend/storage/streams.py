@@ -0,0 +1,90 @@
+"""
+Upload Streams
+=============
+
+File-like adapters used to upload data without intermediate copies or
+temporary files.
+"""
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+
+class IterableReader(io.RawIOBase):
+    """
+    Read-only file view over an iterable of byte chunks.
+
+    Lets generators feed APIs that expect a file object, such as a
+    multipart ``put_object`` of unknown length.
+
+    Example:
+        >>> reader = IterableReader(iter([b"ab", b"cd"]))
+        >>> reader.read()
+        b'abcd'
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        # Fill the whole buffer unless the chunks run out
+        filled = 0
+        while filled < len(buffer):
+            if not self._pending:
+                try:
+                    self._pending = memoryview(next(self._chunks))
+                except StopIteration:
+                    break
+                continue
+
+            size = min(len(buffer) - filled, len(self._pending))
+            buffer[filled : filled + size] = self._pending[:size]
+            self._pending = self._pending[size:]
+            filled += size
+        return filled
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink collecting written chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def iter_zip(paths: Iterable[Path], compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """
+    Build a ZIP archive incrementally.
+
+    The archive is yielded member by member, so its size in memory is
+    bounded by the largest compressed member rather than the whole archive.
+
+    Args:
+        paths: Files to add, stored under their base names
+        compression: ``zipfile`` compression method
+
+    Yields:
+        Consecutive chunks of the archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression) as archive:
+        for path in paths:
+            archive.write(path, Path(path).name)
+            yield from sink.drain()
+    yield from sink.drain()
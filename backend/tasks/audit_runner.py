@@ -3,21 +3,228 @@ Audit Runner Tasks
 =================
 
 Celery tasks for asynchronous accuracy testing and compliance audits.
+
+Small audits run as a single ``run_accuracy_audit`` task. Larger audits are
+staged once to shared storage (see ``backend.storage.payloads``) and split
+into a chord: each ``audit_chunk`` task reads only its byte range of the
+staged JSONL, and ``merge_audit_results`` combines the partial summaries.
+Audit size then scales with the number of workers instead of being bounded
+by a single task's time limit.
+
+Traces are evaluated in batches of ``AUDIT_PROGRESS_BATCH`` so every task
+can publish progress while it runs (see ``backend.tasks.progress``) and stop
+early, returning a partial result with status ``cancelled``, once the audit
+has been cancelled through the API.
 """
 
 import json
 import logging
-import subprocess
-import tempfile
-from pathlib import Path
-from typing import Any, Dict
-
-from celery import Task
+import threading
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from celery import Task, chord, group
+from celery.signals import worker_process_init
 from backend.celery_app import app
 from backend.config import Config
+from backend.storage.payloads import (
+    delete_payload,
+    iter_lines,
+    offload_jsonl,
+    read_range,
+    split_lines,
+    store_payload,
+)
+from backend.tasks.progress import AuditProgress, count_lines, init_progress
 
 logger = logging.getLogger(__name__)
 
+# Number of equal-width confidence bins in the audit score histogram
+SCORE_HISTOGRAM_BINS = 10
+
+# Accuracy evaluators are stateless after construction; one per type per process
+_accuracy_evaluators: Dict[str, Any] = {}
+_evaluators_lock = threading.Lock()
+
+
+@worker_process_init.connect
+def preload_audit_models(**kwargs) -> None:
+    """
+    Load evaluation models once per worker process.
+
+    Runs in each forked pool process before it accepts tasks, so the first
+    audit a process handles does not pay the model load. Failures are logged
+    and the models are loaded lazily on first use instead.
+    """
+    if not Config.AUDIT_PRELOAD_MODELS:
+        return
+
+    try:
+        from cert.evaluation.engines import LazyModelLoader
+
+        timings = LazyModelLoader.preload(embedding_model=Config.AUDIT_EMBEDDING_MODEL)
+        _get_accuracy_evaluator("semantic")
+        logger.info(f"Preloaded audit models: {timings}")
+    except Exception as e:
+        logger.warning(f"Audit model preload failed, models will load on first use: {e}")
+
+
+def _get_accuracy_evaluator(evaluator: str) -> Any:
+    """Get the process-wide accuracy evaluator for an evaluator type."""
+    accuracy_evaluator = _accuracy_evaluators.get(evaluator)
+    if accuracy_evaluator is None:
+        with _evaluators_lock:
+            accuracy_evaluator = _accuracy_evaluators.get(evaluator)
+            if accuracy_evaluator is None:
+                from cert.evaluation import ExactMatchEvaluator, SemanticEvaluator
+
+                if evaluator == "exact":
+                    accuracy_evaluator = ExactMatchEvaluator()
+                else:
+                    accuracy_evaluator = SemanticEvaluator(Config.AUDIT_EMBEDDING_MODEL)
+                _accuracy_evaluators[evaluator] = accuracy_evaluator
+    return accuracy_evaluator
+
+
+def _parse_traces(lines: Iterable[str], first_line: int = 1) -> List[Dict[str, Any]]:
+    """Parse JSONL trace lines, skipping blank and invalid lines."""
+    traces = []
+    for line_num, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            traces.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping invalid JSON on line {line_num}: {e}")
+    return traces
+
+
+def _batched(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield lists of at most ``size`` lines."""
+    iterator = iter(lines)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _evaluate_lines(
+    evaluator_instance: Any, lines: Iterable[str], progress: AuditProgress
+) -> Dict[str, Any]:
+    """
+    Evaluate JSONL lines batch by batch, reporting progress after each batch.
+
+    Stops after the current batch once the audit is cancelled.
+
+    Returns:
+        ``evaluate_traces``-style results over the evaluated lines, plus
+        ``cancelled``
+    """
+    merged: Dict[str, Any] = {"total_traces": 0, "passed": 0, "traces_skipped": 0, "results": []}
+    first_line = 1
+
+    for batch in _batched(lines, Config.AUDIT_PROGRESS_BATCH):
+        results = evaluator_instance.evaluate_traces(_parse_traces(batch, first_line))
+        first_line += len(batch)
+
+        for field in ("total_traces", "passed", "traces_skipped"):
+            merged[field] += results[field]
+        merged["results"].extend(results["results"])
+
+        progress.add(len(batch), results)
+        if progress.cancelled:
+            break
+
+    total = merged["total_traces"]
+    merged["failed"] = total - merged["passed"]
+    merged["pass_rate"] = merged["passed"] / total if total > 0 else 0.0
+    merged["cancelled"] = progress.cancelled
+    return merged
+
+
+def _score_histogram(results: List[Dict[str, Any]]) -> List[int]:
+    """Count evaluation confidences in equal-width bins over [0, 1]."""
+    histogram = [0] * SCORE_HISTOGRAM_BINS
+    for result in results:
+        confidence = result.get("confidence")
+        if isinstance(confidence, (int, float)):
+            index = int(min(max(confidence, 0.0), 1.0) * SCORE_HISTOGRAM_BINS)
+            histogram[min(index, SCORE_HISTOGRAM_BINS - 1)] += 1
+    return histogram
+
+
+def _chunk_offsets(data: bytes, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Split JSONL bytes into ``(start, end)`` ranges of at most ``chunk_size`` lines.
+
+    Ranges always end on a line boundary, so every chunk parses on its own.
+    """
+    ranges = []
+    start = 0
+    total = len(data)
+    while start < total:
+        end = start
+        for _ in range(chunk_size):
+            newline = data.find(b"\n", end)
+            if newline == -1:
+                end = total
+                break
+            end = newline + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def run_audit(
+    job_id: str, traces_data: Any, threshold: float = 0.7, evaluator: str = "semantic"
+) -> Dict[str, Any]:
+    """
+    Evaluate traces in-process and build the audit response.
+
+    Args:
+        job_id: Celery task ID (for logging and the response)
+        traces_data: JSONL-formatted traces, or a payload reference to them
+        threshold: Accuracy threshold (0-1)
+        evaluator: Evaluator type ('semantic' or 'exact')
+
+    Returns:
+        Audit response dictionary (see ``run_accuracy_audit``)
+    """
+    from cert.evaluation import Evaluator
+
+    start = time.perf_counter()
+    accuracy_evaluator = _get_accuracy_evaluator(evaluator)
+    evaluator_instance = Evaluator(threshold=threshold, accuracy_evaluator=accuracy_evaluator)
+
+    # The single audit task's id is the job id
+    progress = AuditProgress(job_id, job_id)
+    results = _evaluate_lines(evaluator_instance, iter_lines(traces_data), progress)
+    progress.publish(final=True)
+
+    response = {
+        "job_id": job_id,
+        "status": "cancelled" if results["cancelled"] else "completed",
+        "total_traces": results["total_traces"],
+        "passed_traces": results["passed"],
+        "failed_traces": results["failed"],
+        "pass_rate": results["pass_rate"],
+        "threshold": threshold,
+        "evaluator_type": accuracy_evaluator.name,
+        "compliant": results["pass_rate"] >= 0.9,
+        "score_histogram": _score_histogram(results["results"]),
+        "results": results["results"],
+    }
+
+    logger.info(
+        f"[Job {job_id}] Audit complete in {(time.perf_counter() - start) * 1000:.1f}ms: "
+        f"{response['passed_traces']}/{response['total_traces']} passed"
+        + (" (cancelled)" if results["cancelled"] else "")
+    )
+    return response
+
 
 class AuditTask(Task):
     """Base task for audit execution with error handling."""
@@ -27,21 +234,29 @@ class AuditTask(Task):
     retry_backoff = True
 
 
-@app.task(bind=True, base=AuditTask, name="run_accuracy_audit", time_limit=300)
+class AccuracyAuditTask(AuditTask):
+    """Single-task audit that owns its traces payload."""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Delete the offloaded traces once retries are exhausted."""
+        delete_payload(args[0] if args else kwargs.get("traces_data"))
+
+
+@app.task(bind=True, base=AccuracyAuditTask, name="run_accuracy_audit", time_limit=300)
 def run_accuracy_audit(
-    self, traces_data: str, threshold: float = 0.7, evaluator: str = "semantic"
+    self, traces_data: Any, threshold: float = 0.7, evaluator: str = "semantic"
 ) -> Dict[str, Any]:
     """
     Run accuracy audit on traces data.
 
-    This task:
-    1. Writes traces to temporary file
-    2. Runs CERT audit CLI command
-    3. Parses results
-    4. Returns formatted audit report
+    Traces are evaluated in the worker process using models preloaded by
+    ``preload_audit_models``; nothing is written to disk and no CLI
+    subprocess is started. Referenced payloads are streamed from storage
+    and deleted once the audit succeeds. A cancelled audit returns the
+    results evaluated so far with status ``cancelled``.
 
     Args:
-        traces_data: JSONL-formatted traces
+        traces_data: JSONL-formatted traces, or a payload reference to them
         threshold: Accuracy threshold (0-1)
         evaluator: Evaluator type ('semantic' or 'exact')
 
@@ -52,99 +267,33 @@ def run_accuracy_audit(
         - failed_traces: Number of failing traces
         - pass_rate: Pass rate (0-1)
         - compliant: Whether system is compliant
+        - score_histogram: Confidence counts in 10 equal-width bins
         - results: List of individual trace results
 
     Raises:
         Exception: If audit execution fails
     """
     job_id = self.request.id
-    logger.info(
-        f"[Job {job_id}] Starting audit: evaluator={evaluator}, threshold={threshold}"
-    )
+    logger.info(f"[Job {job_id}] Starting audit: evaluator={evaluator}, threshold={threshold}")
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
+    try:
+        response = run_audit(job_id, traces_data, threshold, evaluator)
+    except Exception as e:
+        logger.error(f"[Job {job_id}] Audit failed: {e}")
+        raise
 
-        try:
-            # Write traces to file
-            traces_path = temp_path / "traces.jsonl"
-            with open(traces_path, "w") as f:
-                f.write(traces_data)
-
-            logger.info(f"[Job {job_id}] Wrote traces file: {traces_path}")
-
-            # Output path for results
-            results_path = temp_path / "audit_results.json"
-
-            # Run CERT audit command
-            logger.info(f"[Job {job_id}] Running audit...")
-
-            result = subprocess.run(
-                [
-                    "python3",
-                    "-m",
-                    "cert.cli.main",
-                    "audit",
-                    str(traces_path),
-                    "--format",
-                    "json",
-                    "--output",
-                    str(results_path),
-                    "--threshold",
-                    str(threshold),
-                    "--evaluator",
-                    evaluator,
-                ],
-                capture_output=True,
-                text=True,
-                timeout=180,  # 3 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"[Job {job_id}] Audit failed: {result.stderr}")
-                raise Exception(f"Audit execution failed: {result.stderr}")
-
-            logger.info(f"[Job {job_id}] Audit completed successfully")
-
-            # Read results
-            with open(results_path, "r") as f:
-                audit_results = json.load(f)
-
-            # Format response
-            article_15 = audit_results.get("article_15", {})
-
-            response = {
-                "job_id": job_id,
-                "status": "completed",
-                "total_traces": article_15.get("total_traces", 0),
-                "passed_traces": article_15.get("passed_traces", 0),
-                "failed_traces": article_15.get("failed_traces", 0),
-                "pass_rate": article_15.get("accuracy", 0.0),
-                "threshold": threshold,
-                "evaluator_type": article_15.get("evaluator_type", evaluator),
-                "compliant": article_15.get("compliant", False),
-                "results": audit_results.get("traces", []),
-            }
-
-            logger.info(
-                f"[Job {job_id}] Audit complete: {response['passed_traces']}/{response['total_traces']} passed"
-            )
-
-            return response
-
-        except Exception as e:
-            logger.error(f"[Job {job_id}] Audit failed: {e}")
-            raise
+    delete_payload(traces_data)
+    return response
 
 
 @app.task(bind=True, name="run_compliance_check", time_limit=600)
-def run_compliance_check(self, project_id: str, traces_data: str) -> Dict[str, Any]:
+def run_compliance_check(self, project_id: str, traces_data: Any) -> Dict[str, Any]:
     """
     Run full compliance check (Article 15 + Annex IV).
 
     Args:
         project_id: Project UUID
-        traces_data: JSONL-formatted traces
+        traces_data: JSONL-formatted traces, or a payload reference to them
 
     Returns:
         Full compliance report
@@ -155,4 +304,184 @@ def run_compliance_check(self, project_id: str, traces_data: str) -> Dict[str, A
     # TODO: Implement full compliance checking
     # For now, run accuracy audit
 
-    return run_accuracy_audit(self, traces_data, threshold=0.9, evaluator="semantic")
+    return run_audit(job_id, traces_data, threshold=0.9, evaluator="semantic")
+
+
+@app.task(bind=True, base=AuditTask, name="audit_chunk", queue="audits")
+def audit_chunk(
+    self,
+    source: Dict[str, Any],
+    start: int,
+    end: int,
+    threshold: float = 0.7,
+    evaluator: str = "semantic",
+    job_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluate one byte range of a staged audit payload.
+
+    Args:
+        source: Uncompressed payload reference to the staged JSONL
+        start: First byte of the chunk
+        end: End of the chunk (exclusive, on a line boundary)
+        threshold: Accuracy threshold (0-1)
+        evaluator: Evaluator type ('semantic' or 'exact')
+        job_id: Audit job id to publish progress under
+
+    Returns:
+        Partial summary: counts, score histogram, a sample of failing results
+        and whether the audit was cancelled
+    """
+    from cert.evaluation import Evaluator
+
+    accuracy_evaluator = _get_accuracy_evaluator(evaluator)
+    progress = AuditProgress(job_id, self.request.id)
+
+    if progress.check_cancelled():
+        # Queued behind the cancellation; skip reading and evaluating the range
+        lines: List[str] = []
+    else:
+        lines = split_lines(read_range(source, start, end))
+
+    evaluator_instance = Evaluator(threshold=threshold, accuracy_evaluator=accuracy_evaluator)
+    results = _evaluate_lines(evaluator_instance, lines, progress)
+    progress.publish(final=True)
+
+    failing = [r for r in results["results"] if not r["matched"]]
+    return {
+        "total_traces": results["total_traces"],
+        "passed": results["passed"],
+        "failed": results["failed"],
+        "traces_skipped": results["traces_skipped"],
+        "evaluator_type": accuracy_evaluator.name,
+        "score_histogram": _score_histogram(results["results"]),
+        "failing_samples": failing[: Config.AUDIT_FAILURE_SAMPLES],
+        "cancelled": results["cancelled"],
+    }
+
+
+@app.task(bind=True, name="merge_audit_results", queue="audits")
+def merge_audit_results(
+    self,
+    chunk_results: List[Dict[str, Any]],
+    source: Dict[str, Any],
+    threshold: float = 0.7,
+) -> Dict[str, Any]:
+    """
+    Merge ``audit_chunk`` summaries into the audit response.
+
+    The response has the same keys as ``run_accuracy_audit``, except that
+    ``results`` holds at most ``AUDIT_FAILURE_SAMPLES`` failing results
+    instead of every trace result. The status is ``cancelled`` if any chunk
+    stopped early.
+
+    Args:
+        chunk_results: Chunk summaries, in chunk order
+        source: Staged payload reference; deleted after merging
+        threshold: Accuracy threshold (0-1)
+
+    Returns:
+        Merged audit response
+    """
+    job_id = self.request.id
+    total = sum(chunk["total_traces"] for chunk in chunk_results)
+    passed = sum(chunk["passed"] for chunk in chunk_results)
+    histogram = [0] * SCORE_HISTOGRAM_BINS
+    samples: List[Dict[str, Any]] = []
+
+    for chunk in chunk_results:
+        for index, count in enumerate(chunk["score_histogram"]):
+            histogram[index] += count
+        room = Config.AUDIT_FAILURE_SAMPLES - len(samples)
+        if room > 0:
+            samples.extend(chunk["failing_samples"][:room])
+
+    pass_rate = passed / total if total > 0 else 0.0
+    cancelled = any(chunk.get("cancelled") for chunk in chunk_results)
+    delete_payload(source)
+
+    logger.info(f"[Job {job_id}] Merged {len(chunk_results)} audit chunks: {passed}/{total} passed")
+    return {
+        "job_id": job_id,
+        "status": "cancelled" if cancelled else "completed",
+        "total_traces": total,
+        "passed_traces": passed,
+        "failed_traces": total - passed,
+        "pass_rate": pass_rate,
+        "threshold": threshold,
+        "evaluator_type": chunk_results[0]["evaluator_type"] if chunk_results else None,
+        "compliant": pass_rate >= 0.9,
+        "score_histogram": histogram,
+        "chunks": len(chunk_results),
+        "results": samples,
+    }
+
+
+@app.task(name="cleanup_audit_payload", queue="audits")
+def cleanup_audit_payload(*args: Any, source: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Delete the staged payload of a chunked audit that failed.
+
+    Linked as the error callback of ``merge_audit_results``, so it runs when
+    any chunk or the merge itself finally fails. Celery passes the failed
+    request, exception and traceback positionally; they are ignored.
+
+    Args:
+        source: Staged payload reference
+    """
+    delete_payload(source)
+
+
+def start_audit(
+    traces_data: str,
+    threshold: float = 0.7,
+    evaluator: str = "semantic",
+    chunk_size: Optional[int] = None,
+) -> str:
+    """
+    Dispatch an audit and return the job id to poll.
+
+    Payloads of up to ``chunk_size`` lines run as one ``run_accuracy_audit``
+    task, offloaded to storage as compressed JSONL when large. Larger
+    payloads are staged uncompressed, so chunks can read byte ranges, and
+    fanned out as a chord of
+    ``audit_chunk`` tasks; the job id is that of the ``merge_audit_results``
+    callback, so the status endpoints report the merged result. The staged
+    payload is deleted by the merge, or by ``cleanup_audit_payload`` if the
+    chord fails.
+
+    The audit's size is recorded with its progress before dispatch, so
+    clients can compute an ETA from the first published batch.
+
+    Args:
+        traces_data: JSONL-formatted traces
+        threshold: Accuracy threshold (0-1)
+        evaluator: Evaluator type ('semantic' or 'exact')
+        chunk_size: Lines per chunk (default: ``AUDIT_CHUNK_SIZE``)
+
+    Returns:
+        Celery task id of the audit job
+    """
+    chunk_size = chunk_size or Config.AUDIT_CHUNK_SIZE
+    data = traces_data.encode("utf-8")
+    ranges = _chunk_offsets(data, chunk_size)
+
+    job_id = str(uuid4())
+    init_progress(job_id, total=count_lines(data), chunks=max(len(ranges), 1))
+
+    if len(ranges) <= 1:
+        traces_ref = offload_jsonl(traces_data)
+        run_accuracy_audit.apply_async((traces_ref, threshold, evaluator), task_id=job_id)
+        return job_id
+
+    source = store_payload(data, name=f"audits/{job_id}.jsonl", content_type="application/x-ndjson")
+    header = group(
+        audit_chunk.s(source, start, end, threshold, evaluator, job_id=job_id)
+        for start, end in ranges
+    )
+    callback = merge_audit_results.s(source, threshold).set(task_id=job_id)
+    callback.link_error(cleanup_audit_payload.s(source=source))
+    chord(header)(callback)
+
+    logger.info(f"[Job {job_id}] Dispatched audit as {len(ranges)} chunks")
+    return job_id
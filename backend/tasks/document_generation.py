@@ -3,26 +3,51 @@ Document Generation Tasks
 ========================
 
 Celery tasks for asynchronous compliance document generation.
+
+Documents are rendered in the worker process by the ``populate_templates``
+renderer, whose templates are cached per process.
 """
 
-import json
 import logging
-import os
-import subprocess
 import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict
-from uuid import uuid4
-import zipfile
+from typing import Any, Dict, Optional
 
 from celery import Task
+from celery.signals import worker_process_init
 from backend.celery_app import app
 from backend.config import Config
+from backend.renderers import DOCUMENT_RENDERER, load_renderer
+from backend.storage.artifact_cache import get_artifact_cache, key_digest
 from backend.storage.minio_client import get_minio_client
+from backend.storage.payloads import delete_payload, load_json
+from backend.storage.streams import iter_zip
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def preload_document_renderer(**kwargs) -> None:
+    """
+    Import the document renderer and cache its templates once per process.
+
+    Failures are logged and the renderer is loaded on first use instead.
+    """
+    if not Config.RENDERER_PRELOAD:
+        return
+
+    try:
+        start = time.perf_counter()
+        count = load_renderer(DOCUMENT_RENDERER).preload_templates(Config.TEMPLATES_DIR)
+        logger.info(
+            f"Preloaded document renderer with {count} templates in "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+    except Exception as e:
+        logger.warning(f"Document renderer preload failed, loading on first use: {e}")
+
+
 class DocumentGenerationTask(Task):
     """Base task for document generation with error handling."""
 
@@ -30,6 +55,13 @@ class DocumentGenerationTask(Task):
     retry_kwargs = {"max_retries": 3}
     retry_backoff = True
 
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Release the artifact claim and delete offloaded inputs once retries are exhausted."""
+        if kwargs.get("cache_key"):
+            get_artifact_cache().release(kwargs["cache_key"], task_id)
+        for index, name in enumerate(("risk_data", "compliance_data")):
+            delete_payload(args[index] if len(args) > index else kwargs.get(name))
+
 
 @app.task(
     bind=True,
@@ -38,22 +70,22 @@ class DocumentGenerationTask(Task):
     time_limit=600,
 )
 def generate_compliance_documents(
-    self, risk_data: Dict[str, Any], compliance_data: Dict[str, Any]
+    self, risk_data: Any, compliance_data: Any, cache_key: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Generate compliance documents from risk and compliance data.
 
     This task:
     1. Creates temporary directory
-    2. Writes JSON data files
-    3. Runs Python script to populate Word templates
-    4. Creates ZIP archive
-    5. Uploads to MinIO
-    6. Returns download URL
+    2. Populates Word templates in-process
+    3. Streams a ZIP archive of the documents to MinIO
+    4. Returns download URL
 
     Args:
-        risk_data: Risk assessment data
-        compliance_data: Compliance analysis data
+        risk_data: Risk assessment data, or a payload reference to it
+        compliance_data: Compliance analysis data, or a payload reference to it
+        cache_key: Artifact cache key; when set, the archive is named after it
+            and the result is cached for identical requests
 
     Returns:
         Dict with keys:
@@ -68,75 +100,46 @@ def generate_compliance_documents(
     job_id = self.request.id
     logger.info(f"[Job {job_id}] Starting document generation")
 
+    if cache_key:
+        get_artifact_cache().refresh(cache_key, job_id)
+
+    payloads = (risk_data, compliance_data)
+    risk_data = load_json(risk_data)
+    compliance_data = load_json(compliance_data)
+
     # Create temporary directory
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
         logger.info(f"[Job {job_id}] Created temp directory: {temp_path}")
 
         try:
-            # Write JSON data files
-            risk_path = temp_path / "risk.json"
-            compliance_path = temp_path / "compliance.json"
-
-            with open(risk_path, "w") as f:
-                json.dump(risk_data, f, indent=2)
-
-            with open(compliance_path, "w") as f:
-                json.dump(compliance_data, f, indent=2)
-
-            logger.info(f"[Job {job_id}] Wrote JSON data files")
-
             # Output directory for generated documents
             output_dir = temp_path / "documents"
             output_dir.mkdir()
 
-            # Path to Python script
-            script_path = Path(Config.SCRIPTS_DIR) / "populate_templates.py"
-
-            if not script_path.exists():
-                raise FileNotFoundError(f"Template script not found: {script_path}")
-
-            logger.info(f"[Job {job_id}] Running populate_templates.py")
-
-            # Run document generation script
-            result = subprocess.run(
-                [
-                    "python3",
-                    str(script_path),
-                    str(risk_path),
-                    str(compliance_path),
-                    "--output",
-                    str(output_dir),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-            )
-
-            if result.returncode != 0:
-                logger.error(f"[Job {job_id}] Script failed: {result.stderr}")
-                raise Exception(f"Document generation failed: {result.stderr}")
+            logger.info(f"[Job {job_id}] Populating templates")
 
-            logger.info(f"[Job {job_id}] Documents generated successfully")
-
-            # Create ZIP archive
-            zip_path = temp_path / "compliance_package.zip"
+            renderer = load_renderer(DOCUMENT_RENDERER)
+            generated = renderer.generate_documents(
+                risk_data, compliance_data, output_dir, Config.TEMPLATES_DIR
+            )
 
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in output_dir.iterdir():
-                    if file_path.is_file():
-                        zipf.write(file_path, file_path.name)
+            if not generated:
+                raise Exception("Document generation failed: no documents were produced")
 
-            logger.info(f"[Job {job_id}] Created ZIP archive: {zip_path.stat().st_size} bytes")
+            logger.info(f"[Job {job_id}] Generated {len(generated)} documents")
 
-            # Upload to MinIO
+            # Upload to MinIO, streaming the ZIP archive as it is built
             minio_client = get_minio_client()
 
             # Generate unique file name
-            file_name = f"compliance_package_{job_id[:8]}.zip"
+            if cache_key:
+                file_name = f"compliance_package_{key_digest(cache_key)[:16]}.zip"
+            else:
+                file_name = f"compliance_package_{job_id[:8]}.zip"
 
-            object_name = minio_client.upload_file(
-                file_path=str(zip_path),
+            object_name = minio_client.upload_stream(
+                iter_zip(generated),
                 bucket_name=Config.MINIO_BUCKET,
                 object_name=file_name,
                 content_type="application/zip",
@@ -147,7 +150,10 @@ def generate_compliance_documents(
 
             logger.info(f"[Job {job_id}] Upload complete: {download_url}")
 
-            return {
+            for payload in payloads:
+                delete_payload(payload)
+
+            result = {
                 "job_id": job_id,
                 "status": "completed",
                 "file_url": download_url,
@@ -155,6 +161,13 @@ def generate_compliance_documents(
                 "object_name": object_name,
             }
 
+            if cache_key:
+                cache = get_artifact_cache()
+                cache.store(cache_key, result)
+                cache.release(cache_key, job_id)
+
+            return result
+
         except Exception as e:
             logger.error(f"[Job {job_id}] Document generation failed: {e}")
             raise
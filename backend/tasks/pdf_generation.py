@@ -3,21 +3,46 @@ PDF Generation Tasks
 ===================
 
 Celery tasks for PDF report generation.
+
+Reports are rendered in the worker process by the ``generate_assessment_pdf``
+renderer, whose paragraph styles are built once per process.
 """
 
 import logging
-from pathlib import Path
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from celery import Task
+from celery.signals import worker_process_init
 from backend.celery_app import app
 from backend.config import Config
+from backend.renderers import PDF_RENDERER, load_renderer
+from backend.storage.artifact_cache import get_artifact_cache, key_digest
 from backend.storage.minio_client import get_minio_client
+from backend.storage.payloads import delete_payload, load_json
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def preload_pdf_renderer(**kwargs) -> None:
+    """
+    Import the PDF renderer and build its styles once per process.
+
+    Failures are logged and the renderer is loaded on first use instead.
+    """
+    if not Config.RENDERER_PRELOAD:
+        return
+
+    try:
+        start = time.perf_counter()
+        load_renderer(PDF_RENDERER).get_styles()
+        logger.info(f"Preloaded PDF renderer in {(time.perf_counter() - start) * 1000:.1f}ms")
+    except Exception as e:
+        logger.warning(f"PDF renderer preload failed, loading on first use: {e}")
+
+
 class PDFGenerationTask(Task):
     """Base task for PDF generation with error handling."""
 
@@ -25,20 +50,29 @@ class PDFGenerationTask(Task):
     retry_kwargs = {"max_retries": 3}
     retry_backoff = True
 
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        """Release the artifact claim and delete offloaded inputs once retries are exhausted."""
+        if kwargs.get("cache_key"):
+            get_artifact_cache().release(kwargs["cache_key"], task_id)
+        delete_payload(args[0] if args else kwargs.get("report_data"))
+
 
 @app.task(bind=True, base=PDFGenerationTask, name="generate_assessment_pdf", time_limit=180)
-def generate_assessment_pdf(self, report_data: Dict[str, Any]) -> Dict[str, str]:
+def generate_assessment_pdf(
+    self, report_data: Any, cache_key: Optional[str] = None
+) -> Dict[str, str]:
     """
     Generate PDF from assessment report data.
 
     This task:
-    1. Renders HTML template with report data
-    2. Converts HTML to PDF using WeasyPrint
-    3. Uploads PDF to MinIO
-    4. Returns download URL
+    1. Renders the report PDF in memory with reportlab
+    2. Uploads PDF to MinIO
+    3. Returns download URL
 
     Args:
-        report_data: Assessment report data
+        report_data: Assessment report data, or a payload reference to it
+        cache_key: Artifact cache key; when set, the PDF is named after it
+            and the result is cached for identical requests
 
     Returns:
         Dict with:
@@ -53,78 +87,54 @@ def generate_assessment_pdf(self, report_data: Dict[str, Any]) -> Dict[str, str]
     job_id = self.request.id
     logger.info(f"[Job {job_id}] Starting PDF generation")
 
-    try:
-        # Import here to avoid loading heavy dependencies on worker startup
-        import subprocess
-        import tempfile
+    if cache_key:
+        get_artifact_cache().refresh(cache_key, job_id)
 
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+    report_payload = report_data
+    report_data = load_json(report_data)
 
-            # Path to PDF generation script
-            script_path = Path(Config.SCRIPTS_DIR) / "generate_assessment_pdf.py"
+    try:
+        logger.info(f"[Job {job_id}] Rendering PDF")
 
-            if not script_path.exists():
-                raise FileNotFoundError(f"PDF generation script not found: {script_path}")
+        pdf_bytes = load_renderer(PDF_RENDERER).render_assessment_pdf(report_data)
 
-            # Write report data to temp file
-            import json
+        logger.info(f"[Job {job_id}] PDF generated: {len(pdf_bytes)} bytes")
 
-            report_path = temp_path / "report.json"
-            with open(report_path, "w") as f:
-                json.dump(report_data, f, indent=2)
+        # Upload to MinIO
+        minio_client = get_minio_client()
 
-            # Output PDF path
-            pdf_path = temp_path / "assessment_report.pdf"
+        if cache_key:
+            file_name = f"assessment_report_{key_digest(cache_key)[:16]}.pdf"
+        else:
+            file_name = f"assessment_report_{uuid4()}.pdf"
 
-            logger.info(f"[Job {job_id}] Running PDF generation script")
+        object_name = minio_client.upload_bytes(
+            pdf_bytes,
+            bucket_name=Config.MINIO_REPORTS_BUCKET,
+            object_name=file_name,
+            content_type="application/pdf",
+        )
 
-            # Run PDF generation script
-            result = subprocess.run(
-                [
-                    "python3",
-                    str(script_path),
-                    str(report_path),
-                    "--output",
-                    str(pdf_path),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=120,  # 2 minute timeout
-            )
+        download_url = minio_client.get_public_url(object_name, Config.MINIO_REPORTS_BUCKET)
 
-            if result.returncode != 0:
-                logger.error(f"[Job {job_id}] PDF generation failed: {result.stderr}")
-                raise Exception(f"PDF generation failed: {result.stderr}")
+        logger.info(f"[Job {job_id}] PDF uploaded: {download_url}")
 
-            logger.info(f"[Job {job_id}] PDF generated: {pdf_path.stat().st_size} bytes")
+        delete_payload(report_payload)
 
-            # Upload to MinIO
-            minio_client = get_minio_client()
+        result = {
+            "job_id": job_id,
+            "status": "completed",
+            "file_url": download_url,
+            "file_name": file_name,
+            "object_name": object_name,
+        }
 
-            file_name = f"assessment_report_{uuid4()}.pdf"
+        if cache_key:
+            cache = get_artifact_cache()
+            cache.store(cache_key, result)
+            cache.release(cache_key, job_id)
 
-            object_name = minio_client.upload_file(
-                file_path=str(pdf_path),
-                bucket_name=Config.MINIO_REPORTS_BUCKET,
-                object_name=file_name,
-                content_type="application/pdf",
-            )
-
-            download_url = minio_client.get_public_url(
-                object_name, Config.MINIO_REPORTS_BUCKET
-            )
-
-            logger.info(f"[Job {job_id}] PDF uploaded: {download_url}")
-
-            return {
-                "job_id": job_id,
-                "status": "completed",
-                "file_url": download_url,
-                "file_name": file_name,
-                "object_name": object_name,
-            }
+        return result
 
     except Exception as e:
         logger.error(f"[Job {job_id}] PDF generation failed: {e}")
@@ -0,0 +1,182 @@
+"""
+Audit Progress
+=============
+
+Live progress of running audits, published to the Celery result backend.
+
+Every task of an audit (the single ``run_accuracy_audit`` task, or each
+``audit_chunk`` of a chord) writes its counts to one Redis hash keyed by the
+audit job id, at most every ``AUDIT_PROGRESS_INTERVAL`` seconds:
+
+    cert:audit-progress:<job_id>  total, chunks, started_at, cancelled, and for
+                                  each task <field>:<task_id> with field one of
+                                  processed, evaluated, passed, done, failures
+
+Each task owns its fields and overwrites them with its running totals, so
+chunks running in parallel never overwrite each other, and a task retried
+under the same Celery task id replaces the counts of its failed attempt
+instead of adding to them. ``failures`` holds up to ``AUDIT_FAILURE_SAMPLES``
+of the task's failing results as a JSON list. The API sums the fields into
+the job's progress, derives pass rate and ETA from it (see
+``cert.api.task_status``) and sets ``cancelled`` to stop an audit early;
+tasks check the flag each time they publish.
+
+Progress is best effort: Redis errors are logged and never fail the audit.
+"""
+
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from backend.config import Config
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_PREFIX = "cert:audit-progress:"
+
+
+def progress_key(job_id: str) -> str:
+    """Redis key of the progress hash for an audit job."""
+    return f"{PROGRESS_PREFIX}{job_id}"
+
+
+def count_lines(data: bytes) -> int:
+    """Count JSONL lines as ``backend.storage.payloads.split_lines`` yields them."""
+    lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+_redis: Optional[redis.Redis] = None
+
+
+def _get_redis() -> Optional[redis.Redis]:
+    """Get the result backend connection, or None when it is not Redis."""
+    global _redis
+    if _redis is None and Config.CELERY_RESULT_BACKEND.startswith(("redis://", "rediss://")):
+        _redis = redis.Redis.from_url(Config.CELERY_RESULT_BACKEND)
+    return _redis
+
+
+def init_progress(job_id: str, total: int, chunks: int = 1) -> None:
+    """
+    Record the size of an audit before its tasks are dispatched.
+
+    Args:
+        job_id: Audit job id
+        total: Number of JSONL lines in the audit
+        chunks: Number of tasks the audit is split into
+    """
+    client = _get_redis()
+    if client is None:
+        return
+
+    key = progress_key(job_id)
+    try:
+        pipe = client.pipeline()
+        pipe.hset(key, mapping={"total": total, "chunks": chunks})
+        pipe.expire(key, Config.AUDIT_PROGRESS_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"[Job {job_id}] Could not initialise audit progress: {e}")
+
+
+class AuditProgress:
+    """
+    Accumulates one task's progress and publishes it at bounded intervals.
+
+    Example:
+        >>> progress = AuditProgress(job_id, task_id)
+        >>> progress.add(lines=len(batch), results=results)
+        >>> if progress.cancelled:
+        ...     break
+        >>> progress.publish(final=True)
+    """
+
+    def __init__(
+        self,
+        job_id: Optional[str],
+        task_id: Optional[str] = None,
+        interval: Optional[float] = None,
+    ):
+        """
+        Initialize the reporter.
+
+        Args:
+            job_id: Audit job id; no progress is published when None
+            task_id: Celery task id, the same across retries of the task
+                (default: a new id, so counts cannot be replaced by a retry)
+            interval: Minimum seconds between publishes (default: ``AUDIT_PROGRESS_INTERVAL``)
+        """
+        self.job_id = job_id
+        self.task_id = task_id or uuid.uuid4().hex
+        self.redis = _get_redis() if job_id else None
+        self.interval = Config.AUDIT_PROGRESS_INTERVAL if interval is None else interval
+        self.cancelled = False
+        self._counts = {"processed": 0, "evaluated": 0, "passed": 0}
+        self._failures: List[Dict[str, Any]] = []
+        self._last_publish = time.monotonic()
+
+    def add(self, lines: int, results: Dict[str, Any]) -> None:
+        """
+        Count an evaluated batch and publish if the interval has elapsed.
+
+        Args:
+            lines: JSONL lines consumed by the batch, including skipped ones
+            results: ``Evaluator.evaluate_traces`` output for the batch
+        """
+        self._counts["processed"] += lines
+        self._counts["evaluated"] += results["total_traces"]
+        self._counts["passed"] += results["passed"]
+
+        room = Config.AUDIT_FAILURE_SAMPLES - len(self._failures)
+        if room > 0:
+            self._failures.extend([r for r in results["results"] if not r["matched"]][:room])
+
+        if time.monotonic() - self._last_publish >= self.interval:
+            self.publish()
+
+    def check_cancelled(self) -> bool:
+        """Re-read the cancel flag without publishing anything."""
+        if self.redis is not None:
+            try:
+                self.cancelled = self.redis.hget(progress_key(self.job_id), "cancelled") == b"1"
+            except redis.RedisError as e:
+                logger.warning(f"[Job {self.job_id}] Could not read audit progress: {e}")
+        return self.cancelled
+
+    def publish(self, final: bool = False) -> None:
+        """
+        Write this task's counts to the job's progress and read the cancel flag.
+
+        Args:
+            final: Whether this task is done; sets its ``done`` field
+        """
+        self._last_publish = time.monotonic()
+        if self.redis is None:
+            return
+
+        key = progress_key(self.job_id)
+        fields: Dict[str, Any] = {
+            f"{field}:{self.task_id}": count for field, count in self._counts.items()
+        }
+        fields[f"done:{self.task_id}"] = int(final)
+        if self._failures:
+            fields[f"failures:{self.task_id}"] = json.dumps(self._failures, default=str)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hsetnx(key, "started_at", time.time())
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, Config.AUDIT_PROGRESS_TTL)
+            pipe.hget(key, "cancelled")
+            replies = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[Job {self.job_id}] Could not publish audit progress: {e}")
+            return
+
+        self.cancelled = replies[-1] == b"1"
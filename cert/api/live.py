@@ -0,0 +1,353 @@
+"""
+Live Metrics Feed
+=================
+
+Incremental metric deltas pushed to dashboard subscribers.
+
+A single ``LiveMetricsBroadcaster`` tails the trace file. Whenever the file
+grows, only the newly appended traces are parsed, one delta (cost, health,
+quality, recent traces) is computed and serialized once, and the same
+server-sent event is fanned out to every subscriber queue.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format a payload as a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class TraceFileTail:
+    """
+    Incremental reader for an append-only JSONL trace file.
+
+    Tracks the byte offset of the last complete line so that each call to
+    ``read_new`` parses only traces appended since the previous call.
+    """
+
+    def __init__(self, path: str, start_at_end: bool = True):
+        """
+        Initialize the tail.
+
+        Args:
+            path: Path to the JSONL trace file
+            start_at_end: Skip traces already in the file when True
+        """
+        self.path = Path(path)
+        self.offset = 0
+        if start_at_end and self.path.exists():
+            self.offset = self.path.stat().st_size
+
+    def read_new(self) -> List[Dict[str, Any]]:
+        """
+        Read traces appended since the last call.
+
+        A partially written last line is left for the next call. If the file
+        was truncated or rotated, reading restarts from the beginning.
+
+        Returns:
+            List of newly appended traces
+        """
+        if not self.path.exists():
+            self.offset = 0
+            return []
+
+        size = self.path.stat().st_size
+        if size < self.offset:
+            self.offset = 0
+        if size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+
+        end = data.rfind(b"\n")
+        if end == -1:
+            return []
+        self.offset += end + 1
+
+        traces = []
+        for line in data[: end + 1].splitlines():
+            if not line.strip():
+                continue
+            try:
+                traces.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+        return traces
+
+
+def _trace_cost(trace: Dict[str, Any]) -> float:
+    return trace.get("cost", 0) or trace.get("metadata", {}).get("cost", 0) or 0
+
+
+def _trace_latency(trace: Dict[str, Any]) -> Optional[float]:
+    return (
+        trace.get("duration_ms")
+        or trace.get("latency_ms")
+        or trace.get("metadata", {}).get("latency_ms")
+    )
+
+
+def _trace_quality(trace: Dict[str, Any], semantic_threshold: float) -> Optional[Dict[str, Any]]:
+    if "evaluation" in trace:
+        evaluation = trace["evaluation"]
+        return {
+            "score": evaluation.get("confidence", 0) * 100,
+            "passed": evaluation.get("matched", False),
+        }
+    confidence = trace.get("metadata", {}).get("confidence")
+    if confidence:
+        return {"score": confidence * 100, "passed": confidence >= semantic_threshold}
+    return None
+
+
+def compute_delta(
+    traces: List[Dict[str, Any]],
+    recent_limit: int = 20,
+    semantic_threshold: float = 0.7,
+) -> Dict[str, Any]:
+    """
+    Compute the metric delta contributed by a batch of new traces.
+
+    Field extraction follows ``MetricsEngine`` so deltas add up to the
+    values the polling endpoints report.
+
+    Args:
+        traces: Newly appended traces
+        recent_limit: Maximum number of traces echoed in ``recent_traces``
+        semantic_threshold: Confidence threshold for a passing evaluation
+
+    Returns:
+        Dict with ``cost``, ``health``, ``quality`` and ``recent_traces`` sections
+    """
+    by_model: Dict[str, float] = defaultdict(float)
+    by_platform: Dict[str, float] = defaultdict(float)
+    latencies: List[float] = []
+    error_count = 0
+    scores: List[float] = []
+    passed_count = 0
+
+    for trace in traces:
+        cost = _trace_cost(trace)
+        model = trace.get("model") or trace.get("metadata", {}).get("model") or "unknown"
+        platform = trace.get("platform") or trace.get("metadata", {}).get("platform") or "unknown"
+        by_model[model] += cost
+        by_platform[platform] += cost
+
+        if trace.get("error") or trace.get("status") == "error":
+            error_count += 1
+
+        latency = _trace_latency(trace)
+        if latency is not None:
+            latencies.append(latency)
+
+        quality = _trace_quality(trace, semantic_threshold)
+        if quality is not None:
+            scores.append(quality["score"])
+            passed_count += 1 if quality["passed"] else 0
+
+    latencies.sort()
+
+    return {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "trace_count": len(traces),
+        "cost": {
+            "value": sum(by_model.values()),
+            "by_model": dict(by_model),
+            "by_platform": dict(by_platform),
+        },
+        "health": {
+            "requests": len(traces),
+            "error_count": error_count,
+            "error_rate": error_count / len(traces) if traces else 0.0,
+            "max_latency": latencies[-1] if latencies else 0.0,
+            "p95_latency": latencies[int((len(latencies) - 1) * 0.95)] if latencies else 0.0,
+        },
+        "quality": {
+            "evaluated_count": len(scores),
+            "passed_count": passed_count,
+            "mean_score": sum(scores) / len(scores) if scores else None,
+        },
+        "recent_traces": list(reversed(traces[-recent_limit:])),
+    }
+
+
+class LiveMetricsBroadcaster:
+    """
+    Fan-out of incremental metric deltas to SSE subscribers.
+
+    The poller runs only while at least one subscriber is connected. Each
+    subscriber has a bounded queue; when a slow client falls behind, its
+    oldest pending event is dropped so memory stays bounded.
+
+    Example:
+        >>> broadcaster = LiveMetricsBroadcaster("cert_traces.jsonl")
+        >>> queue = broadcaster.subscribe()
+        >>> frame = await queue.get()  # "event: delta\\ndata: {...}\\n\\n"
+        >>> broadcaster.unsubscribe(queue)
+    """
+
+    def __init__(
+        self,
+        trace_path: str,
+        poll_interval: float = 1.0,
+        max_queue_size: int = 100,
+        recent_limit: int = 20,
+        semantic_threshold: float = 0.7,
+        snapshot_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+        run_blocking: Optional[Callable[[Callable[[], Any]], Awaitable[Any]]] = None,
+        snapshot_max_age: Optional[float] = None,
+    ):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            trace_path: Path to the JSONL trace file to watch
+            poll_interval: Seconds between checks for appended traces
+            max_queue_size: Maximum pending events per subscriber
+            recent_limit: Maximum traces included in each delta
+            semantic_threshold: Confidence threshold for a passing evaluation
+            snapshot_fn: Optional blocking function returning the full metrics
+                snapshot sent to new subscribers
+            run_blocking: Coroutine function running ``snapshot_fn`` off the
+                event loop (default: the loop's default executor)
+            snapshot_max_age: Seconds after which the snapshot is recomputed
+                even if the trace file has not advanced, for metrics that
+                are not computed from the file (e.g. a database engine)
+        """
+        self.trace_path = trace_path
+        self.poll_interval = poll_interval
+        self.max_queue_size = max_queue_size
+        self.recent_limit = recent_limit
+        self.semantic_threshold = semantic_threshold
+        self.snapshot_fn = snapshot_fn
+        self.run_blocking = run_blocking
+        self.snapshot_max_age = snapshot_max_age
+
+        self._tail = TraceFileTail(trace_path)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_offset = -1
+        self._snapshot_at = 0.0
+        self.deltas_published = 0
+        self.events_dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a subscriber and start polling if needed.
+
+        Must be called from within the running event loop.
+
+        Returns:
+            Queue receiving pre-formatted SSE frames
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.add(queue)
+
+        if self._task is None or self._task.done():
+            self._tail = TraceFileTail(self.trace_path)
+            self._task = asyncio.get_running_loop().create_task(self._poll_loop())
+
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber and stop polling when none remain."""
+        self._subscribers.discard(queue)
+
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the full metrics snapshot for newly connected subscribers.
+
+        The snapshot is recomputed only after the trace file has advanced
+        (or ``snapshot_max_age`` has passed), so any number of connects
+        between writes share one computation. If recomputing fails, the
+        previous snapshot (or None) is returned.
+        """
+        if self.snapshot_fn is None:
+            return None
+
+        expired = (
+            self.snapshot_max_age is not None
+            and time.monotonic() - self._snapshot_at >= self.snapshot_max_age
+        )
+        if self._snapshot is None or self._snapshot_offset != self._tail.offset or expired:
+            offset = self._tail.offset
+            try:
+                if self.run_blocking is not None:
+                    snapshot = await self.run_blocking(self.snapshot_fn)
+                else:
+                    loop = asyncio.get_running_loop()
+                    snapshot = await loop.run_in_executor(None, self.snapshot_fn)
+            except Exception as e:
+                logger.warning(f"Live metrics snapshot failed: {e}")
+                return self._snapshot
+            self._snapshot = snapshot
+            self._snapshot_offset = offset
+            self._snapshot_at = time.monotonic()
+
+        return self._snapshot
+
+    def invalidate_snapshot(self) -> None:
+        """Force the next subscriber to receive a freshly computed snapshot."""
+        self._snapshot = None
+
+    def publish(self, traces: List[Dict[str, Any]]) -> None:
+        """
+        Compute one delta for ``traces`` and fan it out to all subscribers.
+
+        Args:
+            traces: Newly appended traces
+        """
+        if not traces:
+            return
+
+        delta = compute_delta(traces, self.recent_limit, self.semantic_threshold)
+        frame = format_sse("delta", delta)
+        self.deltas_published += 1
+
+        for queue in list(self._subscribers):
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                    self.events_dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(frame)
+
+    async def _poll_loop(self) -> None:
+        """Watch the trace file and publish a delta whenever it advances."""
+        loop = asyncio.get_running_loop()
+
+        while self._subscribers:
+            try:
+                traces = await loop.run_in_executor(None, self._tail.read_new)
+                self.publish(traces)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live metrics poll failed: {e}")
+
+            await asyncio.sleep(self.poll_interval)
@@ -6,16 +6,26 @@ FastAPI server providing real-time access to CERT framework data
 for self-hosted dashboard integration.
 """
 
+import asyncio
+import functools
 import json
 import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from cert.api.live import LiveMetricsBroadcaster, format_sse
+from cert.api.task_status import READY_STATES, AsyncTaskStatusClient
 from cert.core.tracer import CertTracer
 from cert.integrations.registry import (
     check_connector_health,
@@ -31,9 +41,11 @@ logger = logging.getLogger(__name__)
 
 # Import Celery tasks (lazy import to avoid circular dependencies)
 try:
-    from celery.result import AsyncResult
-
-    from backend.tasks.audit_runner import run_accuracy_audit
+    from backend.config import Config as BackendConfig
+    from backend.renderers import DOCUMENT_RENDERER, PDF_RENDERER
+    from backend.storage.artifact_cache import submit_artifact_job
+    from backend.storage.payloads import offload_json
+    from backend.tasks.audit_runner import start_audit
     from backend.tasks.document_generation import generate_compliance_documents
     from backend.tasks.pdf_generation import generate_assessment_pdf
 
@@ -42,11 +54,30 @@ except ImportError:
     CELERY_AVAILABLE = False
     logger.warning("Celery tasks not available - async endpoints will be disabled")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create the analytics executor for this lifespan, and release it and the
+    result backend connections on shutdown.
+    """
+    get_analytics_executor()
+    yield
+
+    global _task_status_client
+    if _task_status_client is not None:
+        await _task_status_client.close()
+        _task_status_client = None
+    executor, app.state.analytics_executor = app.state.analytics_executor, None
+    executor.shutdown(wait=False)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="CERT API",
     description="Real-time API for CERT Framework monitoring and analytics",
     version="4.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware for dashboard access
@@ -62,6 +93,31 @@ app.add_middleware(
 _tracer: Optional[CertTracer] = None
 _trace_file = Path("cert_traces.jsonl")
 
+# Dedicated, bounded executor for CPU-heavy analytics. Keeping aggregation off
+# Starlette's shared threadpool means slow analytics requests cannot starve
+# /health or the cheap dashboard endpoints.
+ANALYTICS_MAX_WORKERS = int(os.getenv("CERT_API_ANALYTICS_WORKERS", "4"))
+ANALYTICS_MAX_PENDING = int(os.getenv("CERT_API_ANALYTICS_MAX_PENDING", "32"))
+_analytics_pending = 0
+_analytics_lock = threading.Lock()
+
+# NDJSON responses are flushed in chunks of roughly this many bytes
+STREAM_CHUNK_BYTES = 64 * 1024
+
+_task_status_client: Optional[AsyncTaskStatusClient] = None
+
+# Live metrics feed settings
+LIVE_POLL_INTERVAL = float(os.getenv("CERT_API_LIVE_POLL_INTERVAL", "1.0"))
+LIVE_HEARTBEAT_SECONDS = 15.0
+# Seconds a live snapshot is reused when metrics come from the database,
+# where new traces do not advance the trace file
+LIVE_SNAPSHOT_MAX_AGE = float(os.getenv("CERT_API_LIVE_SNAPSHOT_MAX_AGE", "60"))
+
+# Seconds between audit progress reads for /api/v2/audit/stream
+AUDIT_STREAM_INTERVAL = float(os.getenv("CERT_API_AUDIT_STREAM_INTERVAL", "1.0"))
+
+_live_broadcaster: Optional[LiveMetricsBroadcaster] = None
+
 
 def get_tracer() -> CertTracer:
     """Get or create the global tracer instance."""
@@ -71,8 +127,58 @@ def get_tracer() -> CertTracer:
     return _tracer
 
 
+def _new_analytics_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=ANALYTICS_MAX_WORKERS, thread_name_prefix="cert-analytics")
+
+
+def get_analytics_executor() -> ThreadPoolExecutor:
+    """
+    Get the analytics executor of the running app.
+
+    Each lifespan creates its own executor, so the app can be started again
+    after shutdown (uvicorn --reload, test clients). Outside a lifespan one
+    is created on first use.
+    """
+    executor = getattr(app.state, "analytics_executor", None)
+    if executor is None:
+        executor = app.state.analytics_executor = _new_analytics_executor()
+    return executor
+
+
+async def run_analytics(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking analytics function on the dedicated executor.
+
+    Requests beyond ``ANALYTICS_MAX_PENDING`` queued or running jobs are
+    rejected with 503 instead of piling up behind the bounded worker pool.
+    """
+    global _analytics_pending
+
+    with _analytics_lock:
+        if _analytics_pending >= ANALYTICS_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="Analytics workers busy, retry later")
+        _analytics_pending += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_analytics_executor(), functools.partial(func, *args, **kwargs)
+        )
+    finally:
+        with _analytics_lock:
+            _analytics_pending -= 1
+
+
+def get_task_status_client() -> AsyncTaskStatusClient:
+    """Get or create the global non-blocking Celery status client."""
+    global _task_status_client
+    if _task_status_client is None:
+        _task_status_client = AsyncTaskStatusClient(BackendConfig.CELERY_RESULT_BACKEND)
+    return _task_status_client
+
+
 @app.get("/")
-def root():
+async def root():
     """API root endpoint."""
     return {
         "name": "CERT API",
@@ -87,16 +193,19 @@ def root():
                 "/api/metrics/health",
                 "/api/metrics/quality",
                 "/api/metrics/config",
+                "/api/metrics/stream",
             ],
             "connectors": ["/api/connectors/status", "/api/connectors/health"],
-            "costs": ["/api/costs/summary", "/api/costs/trend"],
+            "costs": ["/api/costs/summary", "/api/costs/trend", "/api/costs/budget-burn"],
             "optimization": ["/api/optimization/recommendations"],
-            "traces": ["/api/traces/recent"],
+            "traces": ["/api/traces/recent", "/api/traces/export"],
             "async_v2": [
                 "/api/v2/documents/generate",
                 "/api/v2/documents/status/{job_id}",
                 "/api/v2/audit/run",
                 "/api/v2/audit/status/{job_id}",
+                "/api/v2/audit/stream/{job_id}",
+                "/api/v2/audit/cancel/{job_id}",
                 "/api/v2/pdf/generate",
                 "/api/v2/pdf/status/{job_id}",
             ]
@@ -107,7 +216,7 @@ def root():
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
@@ -117,18 +226,63 @@ _metrics_engine: Optional[MetricsEngine] = None
 _metrics_config: Optional[MetricConfig] = None
 
 
+# Aggregate metrics in Postgres instead of the JSONL file when set
+METRICS_DATABASE_URL = os.getenv("CERT_METRICS_DATABASE_URL")
+
+
 def get_metrics_engine() -> MetricsEngine:
     """Get or create the global metrics engine instance."""
     global _metrics_engine, _metrics_config
     if _metrics_engine is None:
         _metrics_config = _metrics_config or MetricConfig.default()
-        _metrics_engine = MetricsEngine(str(_trace_file), _metrics_config)
+        if METRICS_DATABASE_URL:
+            from cert.metrics.database import DatabaseMetricsEngine
+
+            _metrics_engine = DatabaseMetricsEngine.from_url(METRICS_DATABASE_URL, _metrics_config)
+        else:
+            _metrics_engine = MetricsEngine(str(_trace_file), _metrics_config)
     return _metrics_engine
 
 
+def get_live_broadcaster() -> LiveMetricsBroadcaster:
+    """Get or create the global live metrics broadcaster."""
+    global _live_broadcaster
+    if _live_broadcaster is None:
+        config = _metrics_config or MetricConfig.default()
+        _live_broadcaster = LiveMetricsBroadcaster(
+            str(_trace_file),
+            poll_interval=LIVE_POLL_INTERVAL,
+            semantic_threshold=config.quality.semantic_threshold,
+            snapshot_fn=lambda: _compute_metrics(
+                (_metrics_config or MetricConfig.default()).default_time_window
+            ),
+            run_blocking=run_analytics,
+            snapshot_max_age=LIVE_SNAPSHOT_MAX_AGE if METRICS_DATABASE_URL else None,
+        )
+    return _live_broadcaster
+
+
 # Metrics endpoints - Primary dashboard API
+def _compute_metrics(time_window: str) -> Dict[str, Any]:
+    engine = get_metrics_engine()
+    engine.reload_traces()  # Ensure fresh data
+    return engine.get_metrics(time_window).to_dict()
+
+
+def _compute_metrics_summary(time_window: str) -> Dict[str, Any]:
+    engine = get_metrics_engine()
+    engine.reload_traces()
+    return engine.get_metrics_summary(time_window)
+
+
+def _compute_metric(name: str, time_window: str) -> Dict[str, Any]:
+    engine = get_metrics_engine()
+    engine.reload_traces()
+    return getattr(engine, f"{name}_metric")(time_window).to_dict()
+
+
 @app.get("/api/metrics")
-def get_metrics(time_window: str = "week"):
+async def get_metrics(time_window: str = "week"):
     """
     Get all three primary metrics (Cost, Health, Quality).
 
@@ -141,74 +295,109 @@ def get_metrics(time_window: str = "week"):
         Complete metrics snapshot with cost, health, and quality
     """
     try:
-        engine = get_metrics_engine()
-        engine.reload_traces()  # Ensure fresh data
-        metrics = engine.get_metrics(time_window)
-        return metrics.to_dict()
+        return await run_analytics(_compute_metrics, time_window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/metrics/stream")
+async def stream_metrics(request: Request):
+    """
+    Server-sent events feed of live metric deltas.
+
+    Sends one ``snapshot`` event with the full metrics on connect, then a
+    ``delta`` event (cost, health, quality, recent traces) each time new
+    traces are appended. Deltas are computed once and shared by all
+    subscribers, replacing repeated polling of ``/api/metrics``.
+    """
+    broadcaster = get_live_broadcaster()
+    queue = broadcaster.subscribe()
+
+    async def event_stream():
+        try:
+            snapshot = await broadcaster.get_snapshot()
+            if snapshot is not None:
+                yield format_sse("snapshot", snapshot)
+
+            while not await request.is_disconnected():
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield frame
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/metrics/summary")
-def get_metrics_summary(time_window: str = "week"):
+async def get_metrics_summary(time_window: str = "week"):
     """
     Get simplified metrics summary for quick dashboard display.
 
     Returns display-ready strings with trend indicators.
     """
     try:
-        engine = get_metrics_engine()
-        engine.reload_traces()
-        return engine.get_metrics_summary(time_window)
+        return await run_analytics(_compute_metrics_summary, time_window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get metrics summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/metrics/cost")
-def get_cost_metric(time_window: str = "week"):
+async def get_cost_metric(time_window: str = "week"):
     """
     Get detailed cost metric.
 
     Includes breakdown by model and platform.
     """
     try:
-        engine = get_metrics_engine()
-        engine.reload_traces()
-        return engine.cost_metric(time_window).to_dict()
+        return await run_analytics(_compute_metric, "cost", time_window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get cost metric: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/metrics/health")
-def get_health_metric(time_window: str = "week"):
+async def get_health_metric(time_window: str = "week"):
     """
     Get detailed health metric.
 
     Includes error rate, latency stats, and issues.
     """
     try:
-        engine = get_metrics_engine()
-        engine.reload_traces()
-        return engine.health_metric(time_window).to_dict()
+        return await run_analytics(_compute_metric, "health", time_window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get health metric: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/metrics/quality")
-def get_quality_metric(time_window: str = "week"):
+async def get_quality_metric(time_window: str = "week"):
     """
     Get detailed quality metric.
 
     Includes evaluation method and accuracy breakdown.
     """
     try:
-        engine = get_metrics_engine()
-        engine.reload_traces()
-        return engine.quality_metric(time_window).to_dict()
+        return await run_analytics(_compute_metric, "quality", time_window)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get quality metric: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -258,6 +447,9 @@ def update_metrics_config(update: MetricConfigUpdate):
         # Create new config and reset engine
         _metrics_config = MetricConfig.from_dict(config_dict)
         _metrics_engine = None  # Will be recreated on next request
+        if _live_broadcaster is not None:
+            _live_broadcaster.semantic_threshold = _metrics_config.quality.semantic_threshold
+            _live_broadcaster.invalidate_snapshot()
 
         return {"success": True, "config": _metrics_config.to_dict()}
     except Exception as e:
@@ -310,8 +502,31 @@ def get_connectors_health():
 
 
 # Cost analysis endpoints
+def _compute_cost_summary(days: int) -> Dict[str, Any]:
+    analyzer = CostAnalyzer(str(_trace_file))
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    return {
+        "total_cost": analyzer.total_cost(start_date, end_date),
+        "daily_costs": analyzer.cost_trend("daily", start_date, end_date),
+        "by_model": analyzer.cost_by_model(start_date, end_date),
+        "by_platform": analyzer.cost_by_platform(start_date, end_date),
+    }
+
+
+def _compute_cost_trend(period: str, days: int) -> List[Dict[str, Any]]:
+    analyzer = CostAnalyzer(str(_trace_file))
+
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+
+    return analyzer.cost_trend(period, start_date, end_date)
+
+
 @app.get("/api/costs/summary")
-def get_cost_summary(days: int = 30):
+async def get_cost_summary(days: int = 30):
     """Get cost summary for the specified number of days."""
     try:
         if not _trace_file.exists():
@@ -322,126 +537,259 @@ def get_cost_summary(days: int = 30):
                 "by_platform": {},
             }
 
-        analyzer = CostAnalyzer(str(_trace_file))
-
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-
-        return {
-            "total_cost": analyzer.total_cost(start_date, end_date),
-            "daily_costs": analyzer.cost_trend("daily", start_date, end_date),
-            "by_model": analyzer.cost_by_model(start_date, end_date),
-            "by_platform": analyzer.cost_by_platform(start_date, end_date),
-        }
+        return await run_analytics(_compute_cost_summary, days)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get cost summary: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/costs/trend")
-def get_cost_trend(period: str = "daily", days: int = 30):
+async def get_cost_trend(period: str = "daily", days: int = 30):
     """Get cost trend over time."""
     try:
         if not _trace_file.exists():
             return {"trend": []}
 
-        analyzer = CostAnalyzer(str(_trace_file))
-
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=days)
-
-        trend = analyzer.cost_trend(period, start_date, end_date)
+        trend = await run_analytics(_compute_cost_trend, period, days)
 
         return {"trend": trend, "period": period, "days": days}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get cost trend: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _compute_budget_burn(budget: float, freq: str) -> Dict[str, Any]:
+    analyzer = CostAnalyzer(str(_trace_file))
+    return analyzer.budget_burn(budget, freq=freq)
+
+
+@app.get("/api/costs/budget-burn")
+async def get_budget_burn(budget: float, freq: str = "hour"):
+    """
+    Project spend against a budget for the current month.
+
+    Uses the vectorized cost time-series forecast (requires numpy).
+
+    Args:
+        budget: Monthly budget
+        freq: Forecast bucket width ("hour" or "day")
+    """
+    if freq not in ("hour", "day"):
+        raise HTTPException(status_code=400, detail=f"Unsupported frequency: {freq}")
+
+    try:
+        return await run_analytics(_compute_budget_burn, budget, freq)
+    except HTTPException:
+        raise
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to get budget burn: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Optimization endpoints
 @app.get("/api/optimization/recommendations")
-def get_recommendations():
+async def get_recommendations():
     """Get optimization recommendations."""
     try:
         if not _trace_file.exists():
             return {"recommendations": []}
 
-        optimizer = Optimizer(str(_trace_file))
+        recommendations = await run_analytics(_compute_recommendations)
 
-        recommendations = []
+        return {"recommendations": recommendations, "count": len(recommendations)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get recommendations: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Model downgrade recommendations
-        model_recs = optimizer.recommend_model_changes()
-        for rec in model_recs:
-            recommendations.append(
-                {
-                    "type": "model_downgrade",
-                    "description": f"Downgrade {rec['task_type']} from {rec['current_model']} to {rec['suggested_model']}",
-                    "details": f"Based on {rec['sample_size']} samples with {rec['avg_confidence'] * 100:.1f}% average confidence",
-                    "potential_savings": rec["potential_savings"],
-                    "impact": "high" if rec["potential_savings"] > 50 else "medium",
-                }
-            )
 
-        # Caching recommendations
-        caching_recs = optimizer.find_caching_opportunities()
-        for rec in caching_recs:
-            recommendations.append(
-                {
-                    "type": "caching",
-                    "description": "Cache responses for repeated prompt pattern",
-                    "details": f"Pattern appears {rec['count']} times. Implement caching to save on redundant calls.",
-                    "potential_savings": rec["potential_savings"],
-                    "impact": "high" if rec["count"] > 20 else "medium",
-                }
-            )
+def _compute_recommendations() -> List[Dict[str, Any]]:
+    optimizer = Optimizer(str(_trace_file))
 
-        # Prompt optimization
-        prompt_recs = optimizer.suggest_prompt_optimizations()
-        for rec in prompt_recs:
-            recommendations.append(
-                {
-                    "type": "prompt_optimization",
-                    "description": "Optimize long prompts to reduce token usage",
-                    "details": f"{rec['count']} prompts exceed {rec['threshold']} tokens",
-                    "potential_savings": rec["potential_savings"],
-                    "impact": "medium",
-                }
-            )
+    recommendations = []
+
+    # Model downgrade recommendations
+    model_recs = optimizer.recommend_model_changes()
+    for rec in model_recs:
+        recommendations.append(
+            {
+                "type": "model_downgrade",
+                "description": f"Downgrade {rec['current_model']} to {rec['recommended_models'][0]}",
+                "details": f"Based on {rec['task_count']} samples with {rec['confidence_level']} average confidence",
+                "potential_savings": rec["estimated_savings"],
+                "impact": "high" if rec["estimated_savings"] > 50 else "medium",
+            }
+        )
 
-        # Sort by savings
-        recommendations.sort(key=lambda x: x["potential_savings"], reverse=True)
+    # Caching recommendations
+    caching_recs = optimizer.find_caching_opportunities()
+    for rec in caching_recs:
+        recommendations.append(
+            {
+                "type": "caching",
+                "description": "Cache responses for repeated prompt pattern"
+                if rec["match_type"] == "exact"
+                else "Cache responses for near-identical prompt cluster",
+                "details": f"Pattern appears {rec['repetitions']} times across {rec['distinct_prompts']} distinct prompts. Implement caching to save on redundant calls.",
+                "potential_savings": rec["potential_savings"],
+                "impact": "high" if rec["repetitions"] > 20 else "medium",
+            }
+        )
 
-        return {"recommendations": recommendations, "count": len(recommendations)}
-    except Exception as e:
-        logger.error(f"Failed to get recommendations: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Prompt optimization
+    prompt_recs = optimizer.suggest_prompt_optimizations()
+    for rec in prompt_recs:
+        recommendations.append(
+            {
+                "type": "prompt_optimization",
+                "description": "Optimize long prompts to reduce token usage",
+                "details": f"{rec['count']} prompts exceed {rec['threshold']} tokens",
+                "potential_savings": rec["potential_savings"],
+                "impact": "medium",
+            }
+        )
+
+    # Sort by savings
+    recommendations.sort(key=lambda x: x["potential_savings"], reverse=True)
+
+    return recommendations
 
 
 # Trace endpoints
+def _read_recent_lines(limit: int) -> Tuple[List[str], int]:
+    """
+    Read the last ``limit`` non-empty trace lines, most recent first.
+
+    Only ``limit`` lines are held in memory regardless of file size.
+
+    Returns:
+        Tuple of (raw JSON lines, total number of traces in the file)
+    """
+    recent: deque = deque(maxlen=max(limit, 0))
+    total = 0
+
+    with open(_trace_file) as f:
+        for line in f:
+            if line.strip():
+                total += 1
+                recent.append(line.rstrip("\n"))
+
+    recent.reverse()  # Most recent first
+    return list(recent), total
+
+
+def _iter_ndjson_chunks(lines: Iterator[str]) -> Iterator[bytes]:
+    """Group NDJSON lines into chunks of roughly ``STREAM_CHUNK_BYTES``."""
+    buffer: List[str] = []
+    size = 0
+
+    for line in lines:
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= STREAM_CHUNK_BYTES:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer = []
+            size = 0
+
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+
+def _iter_trace_file(since: Optional[datetime] = None) -> Iterator[str]:
+    """Yield raw trace lines from the trace file, optionally filtered by timestamp."""
+    with open(_trace_file) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            if since is not None:
+                try:
+                    timestamp_str = json.loads(line).get("timestamp", "")
+                    timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+                    if timestamp.replace(tzinfo=None) < since:
+                        continue
+                except (ValueError, AttributeError, TypeError):
+                    continue
+
+            yield line
+
+
 @app.get("/api/traces/recent")
-def get_recent_traces(limit: int = 100):
-    """Get recent traces."""
+async def get_recent_traces(limit: int = 100, format: str = "json"):
+    """
+    Get recent traces, most recent first.
+
+    Args:
+        limit: Maximum number of traces to return
+        format: ``json`` for a single document, ``ndjson`` to stream one trace per line
+    """
     try:
         if not _trace_file.exists():
+            if format == "ndjson":
+                return StreamingResponse(iter(()), media_type="application/x-ndjson")
             return {"traces": [], "count": 0}
 
-        traces = []
-        with open(_trace_file) as f:
-            for line in f:
-                if line.strip():
-                    traces.append(json.loads(line))
+        lines, total = await run_analytics(_read_recent_lines, limit)
 
-        # Return most recent traces
-        recent = traces[-limit:] if len(traces) > limit else traces
-        recent.reverse()  # Most recent first
+        if format == "ndjson":
+            return StreamingResponse(
+                _iter_ndjson_chunks(iter(lines)),
+                media_type="application/x-ndjson",
+                headers={"X-Total-Count": str(total)},
+            )
+
+        recent = [json.loads(line) for line in lines]
 
-        return {"traces": recent, "count": len(recent), "total": len(traces)}
+        return {"traces": recent, "count": len(recent), "total": total}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get recent traces: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/traces/export")
+async def export_traces(since: Optional[str] = None):
+    """
+    Stream all traces as NDJSON.
+
+    The trace file is read incrementally so exports of any size use
+    constant memory.
+
+    Args:
+        since: Optional ISO 8601 timestamp; only traces at or after it are exported
+    """
+    try:
+        if not _trace_file.exists():
+            return StreamingResponse(iter(()), media_type="application/x-ndjson")
+
+        since_dt = None
+        if since:
+            try:
+                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00")).replace(tzinfo=None)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid timestamp: {since}")
+
+        return StreamingResponse(
+            _iter_ndjson_chunks(_iter_trace_file(since_dt)),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=cert_traces.jsonl"},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to export traces: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Assessment endpoints (for lead capture)
 class AssessmentSubmission(BaseModel):
     """Model for assessment submission."""
@@ -504,7 +852,10 @@ def generate_documents_async(request: DocumentGenerationRequest):
     """
     Start async document generation job.
 
-    Returns job_id immediately, allowing client to poll for status.
+    Returns job_id immediately, allowing client to poll for status. Inputs
+    identical to an earlier request return the cached package with
+    ``status: "completed"``; identical requests still in progress share a
+    single job.
 
     Example:
         POST /api/v2/documents/generate
@@ -526,12 +877,24 @@ def generate_documents_async(request: DocumentGenerationRequest):
         )
 
     try:
-        # Start Celery task
-        task = generate_compliance_documents.delay(request.riskData, request.complianceData)
+        # Large inputs travel as storage references, not broker message bodies
+        response = submit_artifact_job(
+            generate_compliance_documents,
+            DOCUMENT_RENDERER,
+            inputs=[request.riskData, request.complianceData],
+            build_args=lambda: [
+                offload_json(request.riskData),
+                offload_json(request.complianceData),
+            ],
+            bucket_name=BackendConfig.MINIO_BUCKET,
+        )
 
-        logger.info(f"Started document generation job: {task.id}")
+        logger.info(f"Document generation job {response['job_id']}: {response['status']}")
 
-        return {"job_id": task.id, "status": "pending", "message": "Document generation started"}
+        message = (
+            "Documents found in cache" if response.get("cached") else "Document generation started"
+        )
+        return {**response, "message": message}
 
     except Exception as e:
         logger.error(f"Failed to start document generation: {e}")
@@ -539,7 +902,7 @@ def generate_documents_async(request: DocumentGenerationRequest):
 
 
 @app.get("/api/v2/documents/status/{job_id}")
-def get_document_status(job_id: str):
+async def get_document_status(job_id: str):
     """
     Check status of document generation job.
 
@@ -573,17 +936,7 @@ def get_document_status(job_id: str):
         )
 
     try:
-        task_result = AsyncResult(job_id)
-
-        response = {"job_id": job_id, "status": task_result.state}
-
-        if task_result.ready():
-            if task_result.successful():
-                response["result"] = task_result.result
-            else:
-                response["error"] = str(task_result.info)
-
-        return response
+        return await get_task_status_client().get_status(job_id)
 
     except Exception as e:
         logger.error(f"Failed to get job status: {e}")
@@ -595,7 +948,9 @@ def run_audit_async(request: AuditRequest):
     """
     Start async accuracy audit job.
 
-    Returns job_id immediately for status polling.
+    Returns job_id immediately for status polling. Large trace payloads are
+    split into chunks evaluated in parallel by the audit workers; their
+    merged result is reported under the same job_id.
 
     Example:
         POST /api/v2/audit/run
@@ -617,12 +972,11 @@ def run_audit_async(request: AuditRequest):
         )
 
     try:
-        # Start Celery task
-        task = run_accuracy_audit.delay(request.traces, request.threshold, request.evaluator)
+        job_id = start_audit(request.traces, request.threshold, request.evaluator)
 
-        logger.info(f"Started audit job: {task.id}")
+        logger.info(f"Started audit job: {job_id}")
 
-        return {"job_id": task.id, "status": "pending", "message": "Audit started"}
+        return {"job_id": job_id, "status": "pending", "message": "Audit started"}
 
     except Exception as e:
         logger.error(f"Failed to start audit: {e}")
@@ -630,11 +984,36 @@ def run_audit_async(request: AuditRequest):
 
 
 @app.get("/api/v2/audit/status/{job_id}")
-def get_audit_status(job_id: str):
+async def get_audit_status(job_id: str):
     """
     Check status of audit job.
 
-    Same response format as document status endpoint.
+    Same response format as document status endpoint. While the audit runs,
+    ``progress`` reports what its tasks have published so far.
+
+    Example:
+        GET /api/v2/audit/status/xyz-456
+
+        Response (in progress):
+        {
+            "job_id": "xyz-456",
+            "status": "STARTED",
+            "progress": {
+                "processed": 1200,
+                "total": 5000,
+                "percent": 24.0,
+                "evaluated_traces": 1190,
+                "passed_traces": 1010,
+                "failed_traces": 180,
+                "pass_rate": 0.849,
+                "elapsed_seconds": 31.5,
+                "eta_seconds": 99.75,
+                "chunks": 10,
+                "chunks_done": 2,
+                "cancelled": false,
+                "failure_samples": [...]
+            }
+        }
     """
     if not CELERY_AVAILABLE:
         raise HTTPException(
@@ -642,22 +1021,99 @@ def get_audit_status(job_id: str):
         )
 
     try:
-        task_result = AsyncResult(job_id)
+        return await get_task_status_client().get_status(job_id, include_progress=True)
+
+    except Exception as e:
+        logger.error(f"Failed to get audit status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/v2/audit/stream/{job_id}")
+async def stream_audit_status(job_id: str, request: Request):
+    """
+    Server-sent events feed of an audit's progress.
+
+    Sends a ``progress`` event (the status payload, as returned by
+    ``/api/v2/audit/status/{job_id}``) whenever published progress changes,
+    and a final ``result`` event once the job is ready, then closes. Replaces
+    polling the status endpoint.
+    """
+    if not CELERY_AVAILABLE:
+        raise HTTPException(
+            status_code=503, detail="Async processing not available. Celery workers not configured."
+        )
 
-        response = {"job_id": job_id, "status": task_result.state}
+    client = get_task_status_client()
+
+    async def event_stream():
+        last_marker = None
+        last_sent = asyncio.get_running_loop().time()
+
+        while not await request.is_disconnected():
+            try:
+                status = await client.get_status(job_id, include_progress=True)
+            except Exception as e:
+                logger.error(f"Failed to get audit status: {e}")
+                yield format_sse("error", {"job_id": job_id, "error": str(e)})
+                return
+
+            now = asyncio.get_running_loop().time()
+            if status["status"] in READY_STATES:
+                yield format_sse("result", status)
+                return
+            # Elapsed time and ETA change on every read; only send new counts
+            progress = status.get("progress") or {}
+            marker = (status["status"], progress.get("processed"), progress.get("cancelled"))
+            if marker != last_marker:
+                yield format_sse("progress", status)
+                last_marker = marker
+                last_sent = now
+            elif now - last_sent >= LIVE_HEARTBEAT_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = now
+
+            await asyncio.sleep(AUDIT_STREAM_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/v2/audit/cancel/{job_id}")
+async def cancel_audit(job_id: str):
+    """
+    Stop a running audit early.
 
-        if task_result.ready():
-            if task_result.successful():
-                response["result"] = task_result.result
-            else:
-                response["error"] = str(task_result.info)
+    Audit tasks stop after their current batch and the job completes with
+    the results evaluated so far and status ``cancelled``, e.g. once the
+    running pass rate has dropped below the compliance threshold.
 
-        return response
+    Example:
+        POST /api/v2/audit/cancel/xyz-456
 
+        Response:
+        {
+            "job_id": "xyz-456",
+            "status": "cancelling"
+        }
+    """
+    if not CELERY_AVAILABLE:
+        raise HTTPException(
+            status_code=503, detail="Async processing not available. Celery workers not configured."
+        )
+
+    try:
+        cancelled = await get_task_status_client().cancel_audit(job_id)
     except Exception as e:
-        logger.error(f"Failed to get audit status: {e}")
+        logger.error(f"Failed to cancel audit: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not cancelled:
+        raise HTTPException(status_code=404, detail=f"No running audit with id {job_id}")
+    return {"job_id": job_id, "status": "cancelling"}
+
 
 @app.post("/api/v2/pdf/generate")
 def generate_pdf_async(request: PDFGenerationRequest):
@@ -682,11 +1138,18 @@ def generate_pdf_async(request: PDFGenerationRequest):
         )
 
     try:
-        task = generate_assessment_pdf.delay(request.reportData)
+        response = submit_artifact_job(
+            generate_assessment_pdf,
+            PDF_RENDERER,
+            inputs=[request.reportData],
+            build_args=lambda: [offload_json(request.reportData)],
+            bucket_name=BackendConfig.MINIO_REPORTS_BUCKET,
+        )
 
-        logger.info(f"Started PDF generation job: {task.id}")
+        logger.info(f"PDF generation job {response['job_id']}: {response['status']}")
 
-        return {"job_id": task.id, "status": "pending", "message": "PDF generation started"}
+        message = "PDF found in cache" if response.get("cached") else "PDF generation started"
+        return {**response, "message": message}
 
     except Exception as e:
         logger.error(f"Failed to start PDF generation: {e}")
@@ -694,7 +1157,7 @@ def generate_pdf_async(request: PDFGenerationRequest):
 
 
 @app.get("/api/v2/pdf/status/{job_id}")
-def get_pdf_status(job_id: str):
+async def get_pdf_status(job_id: str):
     """Check status of PDF generation job."""
     if not CELERY_AVAILABLE:
         raise HTTPException(
@@ -702,17 +1165,7 @@ def get_pdf_status(job_id: str):
         )
 
     try:
-        task_result = AsyncResult(job_id)
-
-        response = {"job_id": job_id, "status": task_result.state}
-
-        if task_result.ready():
-            if task_result.successful():
-                response["result"] = task_result.result
-            else:
-                response["error"] = str(task_result.info)
-
-        return response
+        return await get_task_status_client().get_status(job_id)
 
     except Exception as e:
         logger.error(f"Failed to get PDF status: {e}")
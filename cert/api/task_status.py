@@ -0,0 +1,274 @@
+"""
+Non-blocking Celery Task Status
+===============================
+
+Reads Celery task state for the ``/api/v2/*/status`` endpoints without
+blocking the event loop.
+
+When the Celery result backend is Redis, task metadata is read directly
+from the ``celery-task-meta-<id>`` key with ``redis.asyncio``. Any other
+backend falls back to ``celery.result.AsyncResult`` executed in a worker
+thread.
+
+Running audits also publish progress counters to the result backend (see
+``backend.tasks.progress``); ``get_progress`` turns them into processed
+counts, running pass rate, ETA and failing samples, and ``cancel_audit``
+asks the audit's tasks to stop early. Both need the Redis result backend.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+
+    AIOREDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    AIOREDIS_AVAILABLE = False
+
+# Celery states after which the task will not change anymore
+READY_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+
+# Key prefix used by celery.backends.redis.RedisBackend
+TASK_META_PREFIX = "celery-task-meta-"
+
+# Key layout used by backend.tasks.progress
+AUDIT_PROGRESS_PREFIX = "cert:audit-progress:"
+# Failing results list written by workers before per-task progress fields
+AUDIT_FAILURES_SUFFIX = ":failures"
+
+# Failing results returned with the progress of a running audit
+MAX_FAILURE_SAMPLES = 100
+
+
+def _format_error(result: Any) -> str:
+    """Render a serialized Celery exception like ``str(AsyncResult.info)``."""
+    if isinstance(result, dict) and "exc_type" in result:
+        message = result.get("exc_message")
+        if isinstance(message, (list, tuple)):
+            message = ", ".join(str(m) for m in message)
+        return str(message) if message else str(result["exc_type"])
+    return str(result)
+
+
+def build_status_response(job_id: str, state: str, result: Any) -> Dict[str, Any]:
+    """
+    Build the status payload shared by all async job endpoints.
+
+    Args:
+        job_id: Celery task id
+        state: Celery task state
+        result: Task result, exception info or progress metadata
+
+    Returns:
+        Dict with ``job_id``, ``status`` and ``result`` or ``error`` once ready
+    """
+    response: Dict[str, Any] = {"job_id": job_id, "status": state}
+
+    if state in READY_STATES:
+        if state == "SUCCESS":
+            response["result"] = result
+        else:
+            response["error"] = _format_error(result)
+
+    return response
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def build_progress(
+    fields: Dict[Any, Any], failures: List[Any], now: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Build the progress payload of a running audit from its Redis hash.
+
+    Counts are summed over the per-task ``<name>:<task_id>`` fields, and
+    over a plain ``<name>`` field where one is set.
+
+    Args:
+        fields: Progress hash as returned by ``HGETALL`` (bytes or str)
+        failures: JSON-encoded failing results; each task's JSON list of
+            failing results in the hash is added to them
+        now: Current Unix time (default: ``time.time()``)
+
+    Returns:
+        Dict with processed and total line counts, evaluated/passed/failed
+        trace counts, running ``pass_rate``, ``elapsed_seconds``,
+        ``eta_seconds`` (None until it can be estimated), chunk counts,
+        ``cancelled`` and ``failure_samples``
+    """
+    values = {_decode(k): _decode(v) for k, v in fields.items()}
+
+    def count(name: str) -> int:
+        prefix = name + ":"
+        return sum(
+            int(value or 0)
+            for field, value in values.items()
+            if field == name or field.startswith(prefix)
+        )
+
+    failure_samples = [json.loads(failure) for failure in failures]
+    for field, value in values.items():
+        if field.startswith("failures:"):
+            failure_samples.extend(json.loads(value))
+
+    total = count("total") or None
+    processed = count("processed")
+    evaluated = count("evaluated")
+    passed = count("passed")
+    now = time.time() if now is None else now
+
+    elapsed = None
+    eta = None
+    if values.get("started_at"):
+        elapsed = max(now - float(values["started_at"]), 0.0)
+        if total and processed:
+            eta = elapsed / processed * max(total - processed, 0)
+
+    return {
+        "processed": processed,
+        "total": total,
+        "percent": round(processed / total * 100, 1) if total else None,
+        "evaluated_traces": evaluated,
+        "passed_traces": passed,
+        "failed_traces": evaluated - passed,
+        "pass_rate": passed / evaluated if evaluated else None,
+        "elapsed_seconds": elapsed,
+        "eta_seconds": eta,
+        "chunks": count("chunks") or None,
+        "chunks_done": count("chunks_done") + count("done"),
+        "cancelled": values.get("cancelled") == "1",
+        "failure_samples": failure_samples[:MAX_FAILURE_SAMPLES],
+    }
+
+
+class AsyncTaskStatusClient:
+    """
+    Async client for Celery task state.
+
+    Example:
+        >>> client = AsyncTaskStatusClient("redis://localhost:6379/1")
+        >>> status = await client.get_status("abc-123")
+        >>> status["status"]
+        'SUCCESS'
+    """
+
+    def __init__(self, backend_url: Optional[str] = None):
+        """
+        Initialize the client.
+
+        Args:
+            backend_url: Celery result backend URL. Direct async reads are only
+                used for ``redis://`` and ``rediss://`` URLs.
+        """
+        self.backend_url = backend_url
+        self._redis = None
+
+        if AIOREDIS_AVAILABLE and backend_url and backend_url.startswith(("redis://", "rediss://")):
+            self._redis = aioredis.from_url(backend_url)
+        elif backend_url:
+            logger.debug("Async result reads unavailable; falling back to AsyncResult in threads")
+
+    @property
+    def is_async(self) -> bool:
+        """Whether status reads go straight to Redis without a worker thread."""
+        return self._redis is not None
+
+    async def get_meta(self, job_id: str) -> Dict[str, Any]:
+        """
+        Fetch raw task metadata.
+
+        Returns:
+            Dict with at least ``status`` and ``result`` keys
+        """
+        if self._redis is not None:
+            raw = await self._redis.get(f"{TASK_META_PREFIX}{job_id}")
+            if raw is None:
+                return {"status": "PENDING", "result": None}
+            return json.loads(raw)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._get_meta_sync, job_id)
+
+    @staticmethod
+    def _get_meta_sync(job_id: str) -> Dict[str, Any]:
+        """Blocking fallback through Celery's own result API."""
+        from celery.result import AsyncResult
+
+        task_result = AsyncResult(job_id)
+        state = task_result.state
+        return {"status": state, "result": task_result.info}
+
+    async def get_status(self, job_id: str, include_progress: bool = False) -> Dict[str, Any]:
+        """
+        Get the status payload for a job.
+
+        Args:
+            job_id: Celery task id
+            include_progress: Add audit ``progress`` while the job is not ready
+
+        Returns:
+            Status response as returned by the API status endpoints
+        """
+        meta = await self.get_meta(job_id)
+        response = build_status_response(job_id, meta.get("status", "PENDING"), meta.get("result"))
+
+        if include_progress and response["status"] not in READY_STATES:
+            progress = await self.get_progress(job_id)
+            if progress is not None:
+                response["progress"] = progress
+        return response
+
+    async def get_progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the published progress of an audit job.
+
+        Returns:
+            Progress payload (see ``build_progress``), or None if the audit
+            has published nothing or the result backend is not Redis
+        """
+        if self._redis is None:
+            return None
+
+        key = f"{AUDIT_PROGRESS_PREFIX}{job_id}"
+        pipe = self._redis.pipeline()
+        pipe.hgetall(key)
+        pipe.lrange(key + AUDIT_FAILURES_SUFFIX, 0, -1)
+        fields, failures = await pipe.execute()
+        if not fields:
+            return None
+        return build_progress(fields, failures)
+
+    async def cancel_audit(self, job_id: str) -> bool:
+        """
+        Ask a running audit to stop early.
+
+        Tasks notice the flag the next time they publish progress and return
+        the results evaluated so far with status ``cancelled``.
+
+        Returns:
+            False if the job is unknown or the result backend is not Redis
+        """
+        if self._redis is None:
+            return False
+
+        key = f"{AUDIT_PROGRESS_PREFIX}{job_id}"
+        if not await self._redis.exists(key):
+            return False
+        await self._redis.hset(key, "cancelled", 1)
+        return True
+
+    async def close(self) -> None:
+        """Close the underlying Redis connection pool."""
+        if self._redis is not None:
+            closer = getattr(self._redis, "aclose", None) or self._redis.close
+            await closer()
+            self._redis = None
@@ -178,7 +178,8 @@ def perf_cmd(traces_file, enable, disable, reset, format):
         click.echo("Overall Overhead:")
         click.echo(f"  Average: {summary['overall_average_ms']:.2f}ms")
         click.echo(f"  Median:  {summary['overall_median_ms']:.2f}ms")
-        click.echo(f"  P95:     {summary['overall_p95_ms']:.2f}ms\n")
+        click.echo(f"  P95:     {summary['overall_p95_ms']:.2f}ms")
+        click.echo(f"  P99:     {summary['overall_p99_ms']:.2f}ms\n")
 
         if summary["connectors_exceeding_target"]:
             click.echo("⚠️  Connectors Exceeding 5ms Target:")
@@ -195,6 +196,7 @@ def perf_cmd(traces_file, enable, disable, reset, format):
             click.echo(f"     Average: {metrics['average_overhead_ms']:.2f}ms")
             click.echo(f"     Median:  {metrics['median_overhead_ms']:.2f}ms")
             click.echo(f"     P95:     {metrics['p95_overhead_ms']:.2f}ms")
+            click.echo(f"     P99:     {metrics['p99_overhead_ms']:.2f}ms")
             click.echo(
                 f"     Range:   {metrics['min_overhead_ms']:.2f}-{metrics['max_overhead_ms']:.2f}ms\n"
             )
@@ -0,0 +1,41 @@
+"""
+Fast JSON serialization for traces.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Output is always a ``str`` holding one compact JSON document.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to JSON, stringifying unsupported values.
+
+    Args:
+        obj: Value to serialize
+
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib handles these
+            pass
+    return json.dumps(obj, default=str)
+
+
+def content_hash(text: str) -> str:
+    """Content address (SHA-256 hex digest) of a text payload."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
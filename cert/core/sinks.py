@@ -0,0 +1,71 @@
+"""
+Trace sinks - destinations for traces written by CertTracer.
+
+A sink receives every trace dictionary logged by the tracer. The default
+sink appends JSONL to a local file; other sinks (e.g. the database sink in
+``cert.database``) can be passed to ``CertTracer`` or ``@trace`` alongside
+or instead of it.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict
+
+from cert.core.serialization import dumps
+
+
+class TraceSink(ABC):
+    """Destination for traces logged by CertTracer.
+
+    ``write`` runs on the traced call's path, so sinks that do network I/O
+    should hand traces off to a background thread rather than block.
+    """
+
+    @abstractmethod
+    def write(self, trace: Dict[str, Any]) -> None:
+        """Record one trace.
+
+        Args:
+            trace: Dictionary containing trace data
+        """
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until buffered traces are persisted.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if everything buffered was persisted within the timeout
+        """
+        return True
+
+    def close(self) -> None:
+        """Flush buffered traces and release resources."""
+        self.flush()
+
+
+class JSONLSink(TraceSink):
+    """Append traces as JSON lines to a local file."""
+
+    def __init__(self, log_path: str = "cert_traces.jsonl"):
+        """Initialize sink with log file path.
+
+        Args:
+            log_path: Path to JSONL log file (default: cert_traces.jsonl)
+        """
+        self.log_path = Path(log_path)
+        # Ensure parent directory exists
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, trace: Dict[str, Any]) -> None:
+        """Write trace to JSONL file.
+
+        Uses orjson when installed; unsupported values are stringified.
+
+        Args:
+            trace: Dictionary containing trace data
+        """
+        line = dumps(trace) + "\n"
+        with open(self.log_path, "a") as f:
+            f.write(line)
@@ -8,40 +8,63 @@ For evaluation features, install: pip install cert-framework[evaluation]
 """
 
 import functools
-import json
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from cert.core.sinks import JSONLSink, TraceSink
 
 
 class CertTracer:
-    """Minimal tracer - just structured logging to JSONL."""
+    """Minimal tracer - structured logging to JSONL or other trace sinks."""
 
-    def __init__(self, log_path: str = "cert_traces.jsonl"):
+    def __init__(
+        self, log_path: str = "cert_traces.jsonl", sinks: Optional[List[TraceSink]] = None
+    ):
         """Initialize tracer with log file path.
 
         Args:
             log_path: Path to JSONL log file (default: cert_traces.jsonl)
+            sinks: Trace sinks to write to instead of the JSONL file
+                (include a JSONLSink to keep the file as well)
         """
         self.log_path = Path(log_path)
-        # Ensure parent directory exists
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.sinks: List[TraceSink] = sinks if sinks is not None else [JSONLSink(log_path)]
 
     def log_trace(self, trace: Dict[str, Any]) -> None:
-        """Write trace to JSONL file.
+        """Write trace to every sink.
 
         Args:
             trace: Dictionary containing trace data
         """
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(trace, default=str) + "\n")
+        for sink in self.sinks:
+            sink.write(trace)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all sinks have persisted buffered traces.
+
+        Args:
+            timeout: Maximum seconds to wait per sink
+
+        Returns:
+            True if every sink flushed within the timeout
+        """
+        # Flush every sink, even after one times out
+        results = [sink.flush(timeout) for sink in self.sinks]
+        return all(results)
+
+    def close(self) -> None:
+        """Flush and close all sinks."""
+        for sink in self.sinks:
+            sink.close()
 
 
 def trace(
     _func: Optional[Callable] = None,
     *,
     log_path: str = "cert_traces.jsonl",
+    sinks: Optional[List[TraceSink]] = None,
     metadata: Optional[Dict] = None,
     input_key: Optional[str] = None,
     output_key: Optional[str] = None,
@@ -53,6 +76,8 @@ def trace(
 
     Args:
         log_path: Path to JSONL log file (default: cert_traces.jsonl)
+        sinks: Trace sinks to write to instead of the JSONL file
+            (e.g. a DatabaseTraceSink from cert.database)
         metadata: Optional metadata to include in traces
         input_key: Explicit key name for input in kwargs or result dict (e.g., "query", "question")
         output_key: Explicit key name for output in result dict (e.g., "response", "answer")
@@ -82,6 +107,14 @@ def trace(
         ... def my_rag_pipeline(query):
         ...     return {"context": context, "answer": answer}
         >>>
+        >>> # Also write to the dashboard database, batched in the background
+        >>> from cert.core.sinks import JSONLSink
+        >>> from cert.database import DatabaseTraceSink, PostgresTraceWriter
+        >>> db_sink = DatabaseTraceSink(PostgresTraceWriter(dsn), user_id=user_id)
+        >>> @trace(sinks=[JSONLSink("traces.jsonl"), db_sink])
+        ... def my_rag_pipeline(query):
+        ...     return {"context": context, "answer": answer}
+        >>>
         >>> # With metadata
         >>> @trace(metadata={"service": "rag", "version": "1.0"})
         ... def my_rag_pipeline(query):
@@ -94,7 +127,7 @@ def trace(
     """
 
     def decorator(func: Callable) -> Callable:
-        tracer = CertTracer(log_path)
+        tracer = CertTracer(log_path, sinks=sinks)
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
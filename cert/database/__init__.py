@@ -1,5 +1,19 @@
-"""Database client for CERT Framework."""
+"""Database client and trace sink for CERT Framework."""
 
 from .client import DatabaseClient
+from .sink import (
+    DatabaseTraceSink,
+    PostgresTraceWriter,
+    SQLiteTraceWriter,
+    TraceWriter,
+    trace_to_row,
+)
 
-__all__ = ["DatabaseClient"]
+__all__ = [
+    "DatabaseClient",
+    "DatabaseTraceSink",
+    "TraceWriter",
+    "PostgresTraceWriter",
+    "SQLiteTraceWriter",
+    "trace_to_row",
+]
@@ -8,13 +8,30 @@ Setup:
     3. Set environment variables:
        export SUPABASE_URL="https://xxx.supabase.co"
        export SUPABASE_KEY="your-key-here"
+       export CERT_DB_USER_ID="owner-uuid"  # traces.user_id is required
+
+Bulk ingestion:
+    ``insert_traces_batch`` / ``insert_measurements_batch`` write many rows
+    per request, and ``buffer_trace`` / ``buffer_measurement`` queue rows
+    that are flushed every ``batch_size`` rows (or on ``flush()`` / leaving
+    a ``with`` block). Set the default batch size with CERT_DB_BATCH_SIZE.
+
+Pagination:
+    ``get_traces`` and ``iter_traces`` page on ``(created_at, id)`` with a
+    cursor, which stays fast at any depth, unlike ``offset``.
 """
 
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
+# Rows per insert request for batched and buffered writes
+DEFAULT_BATCH_SIZE = 500
+
+# Accepted trace statuses mapped to the traces.status values of database/schema.sql
+TRACE_STATUSES = {"success": "ok", "ok": "ok", "error": "error", "unset": "unset"}
+
 
 class DatabaseClient:
     """
@@ -24,18 +41,42 @@ class DatabaseClient:
     Install with: pip install supabase
     """
 
-    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        supabase_key: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        client: Optional[Any] = None,
+        user_id: Optional[UUID] = None,
+    ):
         """
         Initialize database client.
 
         Args:
             supabase_url: Supabase project URL (or set SUPABASE_URL env var)
             supabase_key: Supabase API key (or set SUPABASE_KEY env var)
+            batch_size: Rows per insert request for batched writes
+                (or set CERT_DB_BATCH_SIZE env var, default 500)
+            client: Existing Supabase client to use instead of creating one
+            user_id: Owner of traces written without their own user_id
+                (or set CERT_DB_USER_ID env var)
 
         Raises:
-            ValueError: If credentials not provided
+            ValueError: If credentials not provided or batch_size < 1
             ImportError: If supabase package not installed
         """
+        self.batch_size = batch_size or int(os.getenv("CERT_DB_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+        if self.batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {self.batch_size}")
+
+        self.user_id = user_id or os.getenv("CERT_DB_USER_ID")
+        self._trace_buffer: List[Dict[str, Any]] = []
+        self._measurement_buffer: List[Dict[str, Any]] = []
+
+        if client is not None:
+            self.client = client
+            return
+
         try:
             from supabase import Client, create_client
         except ImportError:
@@ -71,20 +112,24 @@ class DatabaseClient:
         Insert a trace into the database.
 
         Args:
-            function_name: Name of the function being traced
+            function_name: Name of the function being traced (the ``name`` column)
             duration_ms: Execution time in milliseconds
-            status: 'success' or 'error'
+            status: 'ok' (or 'success'), 'error' or 'unset'
             input_text: Input to the function
             output_text: Output from the function
             context: Additional context (e.g., RAG context)
             error_message: Error message if status='error'
             metadata: Additional metadata as dict
-            user_id: User who triggered the trace
+            user_id: User who triggered the trace (default: the client's user_id)
             project_id: Project this trace belongs to
 
         Returns:
             UUID of inserted trace
 
+        Raises:
+            ValueError: If no user_id is given here or to the client, or the
+                status is unknown
+
         Example:
             >>> db = DatabaseClient()
             >>> trace_id = db.insert_trace(
@@ -95,31 +140,25 @@ class DatabaseClient:
             ...     output_text="Paris is the capital of France.",
             ... )
         """
-        trace_id = uuid4()
-
-        data = {
-            "id": str(trace_id),
-            "function_name": function_name,
-            "duration_ms": duration_ms,
-            "status": status,
-            "input_text": input_text,
-            "output_text": output_text,
-            "context": context,
-            "error_message": error_message,
-            "metadata": metadata or {},
-        }
-
-        if user_id:
-            data["user_id"] = str(user_id)
-        if project_id:
-            data["project_id"] = str(project_id)
+        data = self._trace_row(
+            function_name=function_name,
+            duration_ms=duration_ms,
+            status=status,
+            input_text=input_text,
+            output_text=output_text,
+            context=context,
+            error_message=error_message,
+            metadata=metadata,
+            user_id=user_id,
+            project_id=project_id,
+        )
 
         response = self.client.table("traces").insert(data).execute()
 
         if not response.data:
             raise Exception(f"Failed to insert trace: {response}")
 
-        return trace_id
+        return UUID(data["id"])
 
     def insert_measurement(
         self,
@@ -150,25 +189,207 @@ class DatabaseClient:
             ...     grounding_score=0.8,
             ... )
         """
-        measurement_id = uuid4()
-        passed = confidence >= threshold
+        data = self._measurement_row(
+            trace_id=trace_id,
+            confidence=confidence,
+            semantic_score=semantic_score,
+            grounding_score=grounding_score,
+            threshold=threshold,
+        )
+
+        response = self.client.table("measurements").insert(data).execute()
+
+        if not response.data:
+            raise Exception(f"Failed to insert measurement: {response}")
+
+        return UUID(data["id"])
+
+    def _trace_row(
+        self,
+        function_name: str,
+        duration_ms: float,
+        status: str,
+        input_text: Optional[str] = None,
+        output_text: Optional[str] = None,
+        context: Optional[str] = None,
+        error_message: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        user_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+        id: Optional[Union[UUID, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a traces row; takes the arguments of insert_trace plus an optional id.
+
+        Columns follow the traces table of database/schema.sql, as
+        ``cert.database.sink.trace_to_row`` does.
+        """
+        user_id = user_id or self.user_id
+        if not user_id:
+            raise ValueError("Traces require a user_id; pass one to the call or the client")
+        if status not in TRACE_STATUSES:
+            raise ValueError(
+                f"Unknown trace status '{status}'. Use one of {sorted(TRACE_STATUSES)}"
+            )
 
         data = {
-            "id": str(measurement_id),
+            "id": str(id or uuid4()),
+            "user_id": str(user_id),
+            "name": function_name,
+            "duration_ms": duration_ms,
+            "status": TRACE_STATUSES[status],
+            "input_text": input_text,
+            "output_text": output_text,
+            "context": context,
+            "error_message": error_message,
+            "metadata": metadata or {},
+        }
+
+        if project_id:
+            data["project_id"] = str(project_id)
+
+        return data
+
+    @staticmethod
+    def _measurement_row(
+        trace_id: Union[UUID, str],
+        confidence: float,
+        semantic_score: float,
+        grounding_score: float,
+        threshold: float = 0.5,
+        id: Optional[Union[UUID, str]] = None,
+    ) -> Dict[str, Any]:
+        """Build a measurements row; takes the arguments of insert_measurement plus an optional id."""
+        return {
+            "id": str(id or uuid4()),
             "trace_id": str(trace_id),
             "confidence": confidence,
             "semantic_score": semantic_score,
             "grounding_score": grounding_score,
             "threshold": threshold,
-            "passed": passed,
+            "passed": confidence >= threshold,
         }
 
-        response = self.client.table("measurements").insert(data).execute()
+    def _write_rows(
+        self, table: str, rows: List[Dict[str, Any]], upsert: bool, on_conflict: str
+    ) -> None:
+        """Write rows with one request per batch_size rows."""
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start : start + self.batch_size]
+            query = self.client.table(table)
+            if upsert:
+                query = query.upsert(chunk, on_conflict=on_conflict)
+            else:
+                query = query.insert(chunk)
+
+            response = query.execute()
+
+            if not response.data:
+                raise Exception(f"Failed to insert {table} batch: {response}")
+
+    def insert_traces_batch(
+        self, traces: Iterable[Dict[str, Any]], upsert: bool = False
+    ) -> List[UUID]:
+        """
+        Insert many traces with one request per ``batch_size`` rows.
 
-        if not response.data:
-            raise Exception(f"Failed to insert measurement: {response}")
+        Args:
+            traces: Dicts taking the keyword arguments of insert_trace,
+                plus an optional "id"
+            upsert: Update rows whose id already exists instead of failing,
+                so a retried batch does not duplicate traces
+
+        Returns:
+            UUIDs of the traces, in input order
+
+        Example:
+            >>> trace_ids = db.insert_traces_batch([
+            ...     {"function_name": "rag", "duration_ms": 210.0, "status": "success"},
+            ...     {"function_name": "rag", "duration_ms": 180.5, "status": "error"},
+            ... ])
+        """
+        rows = [self._trace_row(**trace) for trace in traces]
+        self._write_rows("traces", rows, upsert, on_conflict="id")
+        return [UUID(row["id"]) for row in rows]
+
+    def insert_measurements_batch(
+        self, measurements: Iterable[Dict[str, Any]], upsert: bool = False
+    ) -> List[UUID]:
+        """
+        Insert many measurements with one request per ``batch_size`` rows.
+
+        Args:
+            measurements: Dicts taking the keyword arguments of
+                insert_measurement, plus an optional "id"
+            upsert: Replace the existing measurement of a trace instead of
+                failing (measurements are unique per trace)
+
+        Returns:
+            UUIDs of the measurements, in input order
+        """
+        rows = [self._measurement_row(**measurement) for measurement in measurements]
+        self._write_rows("measurements", rows, upsert, on_conflict="trace_id")
+        return [UUID(row["id"]) for row in rows]
+
+    def buffer_trace(self, **fields: Any) -> UUID:
+        """
+        Queue a trace for a batched write.
+
+        The buffers are flushed once ``batch_size`` traces are queued.
+
+        Args:
+            **fields: Keyword arguments of insert_trace, plus an optional id
+
+        Returns:
+            UUID the trace will be stored under
+        """
+        row = self._trace_row(**fields)
+        self._trace_buffer.append(row)
+        if len(self._trace_buffer) >= self.batch_size:
+            self.flush()
+        return UUID(row["id"])
 
-        return measurement_id
+    def buffer_measurement(self, **fields: Any) -> UUID:
+        """
+        Queue a measurement for a batched write.
+
+        The buffers are flushed once ``batch_size`` measurements are queued.
+
+        Args:
+            **fields: Keyword arguments of insert_measurement, plus an optional id
+
+        Returns:
+            UUID the measurement will be stored under
+        """
+        row = self._measurement_row(**fields)
+        self._measurement_buffer.append(row)
+        if len(self._measurement_buffer) >= self.batch_size:
+            self.flush()
+        return UUID(row["id"])
+
+    def flush(self) -> None:
+        """
+        Write all buffered traces, then all buffered measurements.
+
+        Buffered rows are upserted on their generated ids, so rows are kept
+        queued when a write fails and a later flush can safely retry them.
+        """
+        # Traces first, so buffered measurements never reference a missing trace
+        if self._trace_buffer:
+            self._write_rows("traces", self._trace_buffer, upsert=True, on_conflict="id")
+            self._trace_buffer = []
+
+        if self._measurement_buffer:
+            self._write_rows(
+                "measurements", self._measurement_buffer, upsert=True, on_conflict="trace_id"
+            )
+            self._measurement_buffer = []
+
+    def __enter__(self) -> "DatabaseClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
 
     def get_traces(
         self,
@@ -178,17 +399,25 @@ class DatabaseClient:
         offset: int = 0,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        after: Optional[Tuple[str, str]] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Query traces with filters.
+        Query traces with filters, most recent first.
+
+        Results are ordered by ``(created_at, id)`` descending. Pass the
+        cursor of the previous page (see ``page_cursor``) as ``after`` to
+        page through them; ``offset`` still works but rescans every skipped
+        row, so it slows down the deeper it pages.
 
         Args:
             project_id: Filter by project
-            status: Filter by status ('success' or 'error')
+            status: Filter by status ('ok', 'error' or 'unset'; 'success'
+                is read as 'ok')
             limit: Max number of results (default 100)
-            offset: Number of results to skip (for pagination)
+            offset: Number of results to skip (prefer ``after``)
             start_date: Only traces after this date
             end_date: Only traces before this date
+            after: ``(created_at, id)`` cursor; only traces that sort after it
 
         Returns:
             List of trace dictionaries
@@ -212,7 +441,7 @@ class DatabaseClient:
             query = query.eq("project_id", str(project_id))
 
         if status:
-            query = query.eq("status", status)
+            query = query.eq("status", TRACE_STATUSES.get(status, status))
 
         if start_date:
             query = query.gte("created_at", start_date.isoformat())
@@ -220,15 +449,61 @@ class DatabaseClient:
         if end_date:
             query = query.lte("created_at", end_date.isoformat())
 
-        # Order by most recent first
-        query = query.order("created_at", desc=True)
+        # Keyset pagination: rows strictly after the cursor in sort order
+        if after:
+            created_at, trace_id = after
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{trace_id})'
+            )
+
+        # Order by most recent first; id breaks ties between equal timestamps
+        query = query.order("created_at", desc=True).order("id", desc=True)
 
         # Pagination
-        query = query.limit(limit).offset(offset)
+        query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
 
         response = query.execute()
         return response.data
 
+    @staticmethod
+    def page_cursor(traces: List[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        """
+        Cursor continuing after a page returned by get_traces.
+
+        Returns:
+            ``(created_at, id)`` of the last trace, or None for an empty page
+        """
+        if not traces:
+            return None
+        last = traces[-1]
+        return last["created_at"], last["id"]
+
+    def iter_traces(self, page_size: int = 1000, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all matching traces using keyset pagination.
+
+        Args:
+            page_size: Traces fetched per request
+            **filters: Filters accepted by get_traces (project_id, status,
+                start_date, end_date)
+
+        Yields:
+            Trace dictionaries, most recent first
+
+        Example:
+            >>> for trace in db.iter_traces(status="error"):
+            ...     print(trace["name"])
+        """
+        cursor = None
+        while True:
+            page = self.get_traces(limit=page_size, after=cursor, **filters)
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = self.page_cursor(page)
+
     def get_trace_with_measurement(self, trace_id: UUID) -> Dict[str, Any]:
         """
         Get a trace and its measurement (if exists).
@@ -0,0 +1,610 @@
+"""
+Database trace sink with buffered background writes.
+
+``DatabaseTraceSink`` plugs into ``CertTracer`` (see ``cert.core.sinks``)
+and sends traces to the dashboard database without a network round trip on
+the traced call's path:
+
+- ``write`` only enqueues; a daemon thread drains the queue in batches of
+  ``batch_size`` or every ``flush_interval`` seconds
+- failed batches are retried with exponential backoff
+- batches that still fail, and traces arriving while the queue is full,
+  are appended to a local spool file and replayed after the next
+  successful write
+
+Writers perform the actual batch insert:
+- ``PostgresTraceWriter``: multi-row INSERT ... ON CONFLICT DO NOTHING, or
+  COPY (requires psycopg2)
+- ``SQLiteTraceWriter``: local stand-in with the same columns, for tests
+  and single-host setups
+
+Example:
+    >>> from cert.core.tracer import trace
+    >>> from cert.database import DatabaseTraceSink, PostgresTraceWriter
+    >>>
+    >>> sink = DatabaseTraceSink(
+    ...     PostgresTraceWriter("postgresql://localhost/cert"),
+    ...     spool_path="cert_spool.jsonl",
+    ...     user_id=user_id,
+    ... )
+    >>> @trace(sinks=[sink])
+    ... def my_rag_pipeline(query):
+    ...     ...
+"""
+
+import atexit
+import csv
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from cert.core.serialization import dumps
+from cert.core.sinks import TraceSink
+
+logger = logging.getLogger(__name__)
+
+# Columns of the traces table (database/schema.sql) written by the sink
+TRACE_COLUMNS = (
+    "id",
+    "created_at",
+    "start_time",
+    "user_id",
+    "project_id",
+    "name",
+    "vendor",
+    "model",
+    "input_text",
+    "output_text",
+    "context",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "duration_ms",
+    "status",
+    "error_message",
+    "evaluation_score",
+    "evaluation_status",
+    "metadata",
+    "source",
+    "cost",
+    "sample_weight",
+)
+
+# Columns holding JSON documents (JSONB in Postgres, TEXT in SQLite)
+JSON_COLUMNS = ("context", "metadata")
+
+
+def _text(value: Any) -> Optional[str]:
+    """Stringify a captured input/output value."""
+    if value is None or isinstance(value, str):
+        return value
+    return dumps(value)
+
+
+def trace_to_row(
+    trace: Dict[str, Any],
+    user_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+) -> Dict[str, Any]:
+    """
+    Map a tracer or connector trace to a traces table row.
+
+    Args:
+        trace: Trace dictionary as written to the JSONL log
+        user_id: Owner of the trace
+        project_id: Project of the trace
+
+    Returns:
+        Row with a value for every column in TRACE_COLUMNS; JSON columns
+        are serialized
+    """
+    metadata = trace.get("metadata")
+    metadata = dict(metadata) if isinstance(metadata, dict) else {}
+    evaluation = trace.get("evaluation") if isinstance(trace.get("evaluation"), dict) else {}
+
+    timestamp = trace.get("timestamp") or datetime.utcnow().isoformat() + "Z"
+    error = trace.get("error")
+    prompt_tokens = metadata.get("prompt_tokens") or metadata.get("input_tokens") or 0
+    completion_tokens = metadata.get("completion_tokens") or metadata.get("output_tokens") or 0
+
+    score = evaluation.get("confidence", metadata.get("confidence"))
+    evaluation_status = None
+    if "matched" in evaluation:
+        evaluation_status = "pass" if evaluation["matched"] else "fail"
+
+    context = trace.get("context")
+    weight = metadata.get("sample_weight")
+
+    return {
+        "id": str(trace.get("id") or uuid4()),
+        "created_at": timestamp,
+        "start_time": timestamp,
+        "user_id": str(user_id) if user_id else None,
+        "project_id": str(project_id) if project_id else None,
+        "name": trace.get("function") or trace.get("name") or trace.get("platform") or "unknown",
+        "vendor": trace.get("platform") or metadata.get("platform"),
+        "model": trace.get("model") or metadata.get("model"),
+        "input_text": _text(trace.get("input", trace.get("input_data"))),
+        "output_text": _text(trace.get("answer", trace.get("output_data"))),
+        "context": dumps(context) if context is not None else None,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": metadata.get("total_tokens") or prompt_tokens + completion_tokens,
+        "duration_ms": trace.get("duration_ms")
+        or trace.get("latency_ms")
+        or metadata.get("latency_ms")
+        or 0,
+        "status": "error" if error or trace.get("status") == "error" else "ok",
+        "error_message": _text(error),
+        "evaluation_score": score,
+        "evaluation_status": evaluation_status,
+        "metadata": dumps(metadata),
+        "source": "sdk",
+        "cost": trace.get("cost") or metadata.get("cost") or 0,
+        "sample_weight": weight if isinstance(weight, (int, float)) and weight > 0 else 1.0,
+    }
+
+
+class TraceWriter(ABC):
+    """Writes batches of trace rows to a database."""
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of rows in one transaction.
+
+        Rows whose id already exists are skipped, so a retried batch does
+        not duplicate traces.
+
+        Args:
+            rows: Rows as returned by trace_to_row
+
+        Raises:
+            Exception: If the batch could not be written
+        """
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Close the database connection."""
+
+
+class PostgresTraceWriter(TraceWriter):
+    """
+    Batch writer for the Postgres traces table.
+
+    Note: Requires psycopg2.
+    Install with: pip install psycopg2-binary
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        table: str = "traces",
+        use_copy: bool = False,
+    ):
+        """
+        Initialize Postgres writer.
+
+        Args:
+            dsn: Connection string (or set CERT_DATABASE_URL env var)
+            table: Target table
+            use_copy: Load batches with COPY instead of a multi-row INSERT.
+                COPY is faster for large batches but cannot skip existing
+                ids, so a batch retried after a lost commit acknowledgement
+                fails on the primary key instead of being deduplicated
+
+        Raises:
+            ValueError: If no connection string is provided
+            ImportError: If psycopg2 is not installed
+        """
+        try:
+            import psycopg2  # noqa: F401
+        except ImportError:
+            raise ImportError("psycopg2 required. Install with: pip install psycopg2-binary")
+
+        self.dsn = dsn or os.getenv("CERT_DATABASE_URL")
+        if not self.dsn:
+            raise ValueError("Postgres connection string required (dsn or CERT_DATABASE_URL)")
+
+        self.table = table
+        self.use_copy = use_copy
+        self._conn = None
+
+    def _connection(self):
+        import psycopg2
+
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(self.dsn)
+        return self._conn
+
+    def write_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Insert a batch of rows; see TraceWriter.write_rows."""
+        conn = self._connection()
+        try:
+            with conn.cursor() as cursor:
+                if self.use_copy:
+                    self._copy(cursor, rows)
+                else:
+                    self._insert(cursor, rows)
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                # Broken connection; reconnect on the next batch
+                self.close()
+            raise
+
+    def _insert(self, cursor, rows: Sequence[Dict[str, Any]]) -> None:
+        from psycopg2.extras import execute_values
+
+        columns = ", ".join(TRACE_COLUMNS)
+        template = (
+            "("
+            + ", ".join("%s::jsonb" if column in JSON_COLUMNS else "%s" for column in TRACE_COLUMNS)
+            + ")"
+        )
+        execute_values(
+            cursor,
+            f"INSERT INTO {self.table} ({columns}) VALUES %s ON CONFLICT (id) DO NOTHING",
+            [tuple(row[column] for column in TRACE_COLUMNS) for row in rows],
+            template=template,
+            page_size=len(rows),
+        )
+
+    def _copy(self, cursor, rows: Sequence[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Unquoted empty fields load as NULL
+            writer.writerow(["" if row[c] is None else row[c] for c in TRACE_COLUMNS])
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.table} ({', '.join(TRACE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn = None
+
+
+class SQLiteTraceWriter(TraceWriter):
+    """
+    SQLite stand-in for the Postgres writer.
+
+    Creates a traces table with the sink's columns (JSON stored as text)
+    and ``ingested_at``, for tests and local development.
+
+    Example:
+        >>> writer = SQLiteTraceWriter("traces.db")
+        >>> sink = DatabaseTraceSink(writer)
+    """
+
+    def __init__(self, path: str = ":memory:", table: str = "traces"):
+        """
+        Initialize SQLite writer.
+
+        Args:
+            path: Database file (default: in-memory database)
+            table: Target table, created if missing
+        """
+        self.path = path
+        self.table = table
+        # Used from the sink's writer thread and by callers reading results
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                + ", ".join(
+                    "id TEXT PRIMARY KEY" if column == "id" else column for column in TRACE_COLUMNS
+                )
+                # Write time, as set by the Postgres column default
+                + ", ingested_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+                + ")"
+            )
+
+    def write_rows(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """Insert a batch of rows; see TraceWriter.write_rows."""
+        placeholders = ", ".join("?" for _ in TRACE_COLUMNS)
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO {self.table} ({', '.join(TRACE_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [tuple(row[column] for column in TRACE_COLUMNS) for row in rows],
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+
+class DatabaseTraceSink(TraceSink):
+    """
+    Trace sink that batches traces to a database from a background thread.
+
+    Writes never block on the database: the traced call only enqueues. The
+    worker thread starts with the first trace.
+    """
+
+    def __init__(
+        self,
+        writer: TraceWriter,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        spool_path: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            writer: Database writer receiving batches of rows
+            batch_size: Maximum traces per write
+            flush_interval: Maximum seconds a trace waits before its batch is written
+            max_queue_size: Maximum traces waiting in memory; further traces
+                are spooled (or dropped without a spool)
+            max_retries: Retries of a failed batch before it is spooled
+            retry_backoff: Delay before the first retry, doubled each retry
+            spool_path: JSONL file holding rows that could not be written;
+                replayed after the next successful write. Lines that cannot
+                be decoded (e.g. torn by a crash) are moved to
+                ``<spool_path>.corrupt``
+            user_id: Owner recorded on every trace (required by the
+                Postgres schema)
+            project_id: Project recorded on every trace
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.spool_path = Path(spool_path) if spool_path else None
+        self.user_id = user_id
+        self.project_id = project_id
+
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._spool_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._flush_requested = 0
+        self._flushed = 0
+        self._shutdown = False
+
+        self.traces_written = 0
+        self.traces_spooled = 0
+        self.traces_dropped = 0
+        self.write_failures = 0
+        self.spool_corrupt = 0
+
+        atexit.register(self.close)
+
+    @property
+    def queue_size(self) -> int:
+        """Number of traces waiting to be written."""
+        return len(self._queue)
+
+    def write(self, trace: Dict[str, Any]) -> None:
+        """
+        Enqueue a trace without blocking on the database.
+
+        Args:
+            trace: Dictionary containing trace data
+        """
+        with self._condition:
+            if self._shutdown:
+                return
+            if len(self._queue) >= self.max_queue_size:
+                overflow = True
+            else:
+                overflow = False
+                self._queue.append(trace)
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="cert-db-trace-sink", daemon=True
+                    )
+                    self._worker.start()
+                if len(self._queue) >= self.batch_size:
+                    self._condition.notify()
+
+        if overflow:
+            # Database is falling behind; keep the trace on disk instead
+            if not self._spool([self._row(trace)]):
+                self.traces_dropped += 1
+
+    def _row(self, trace: Dict[str, Any]) -> Dict[str, Any]:
+        return trace_to_row(trace, user_id=self.user_id, project_id=self.project_id)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._shutdown and self._flush_requested == self._flushed:
+                    if len(self._queue) < self.batch_size:
+                        self._condition.wait(self.flush_interval)
+
+                flush_target = self._flush_requested
+                shutting_down = self._shutdown
+
+            try:
+                self._write_pending()
+            except Exception as e:
+                # Keep the worker alive; the batch in hand is lost but later traces are not
+                logger.error(f"Trace sink worker error: {e}")
+
+            with self._condition:
+                self._flushed = flush_target
+                self._condition.notify_all()
+                if shutting_down:
+                    return
+
+    def _write_pending(self) -> None:
+        """Write everything queued at the time of the call, in batches."""
+        pending = len(self._queue)
+        while pending > 0:
+            size = min(pending, self.batch_size)
+            rows = [self._row(self._queue.popleft()) for _ in range(size)]
+            pending -= size
+
+            if self._write_with_retry(rows):
+                self.traces_written += len(rows)
+                self._replay_spool()
+            elif not self._spool(rows):
+                self.traces_dropped += len(rows)
+
+    def _write_with_retry(self, rows: List[Dict[str, Any]], retries: Optional[int] = None) -> bool:
+        """Write a batch, retrying with exponential backoff."""
+        retries = self.max_retries if retries is None else retries
+        delay = self.retry_backoff
+        for attempt in range(retries + 1):
+            try:
+                self.writer.write_rows(rows)
+                return True
+            except Exception as e:
+                self.write_failures += 1
+                logger.warning(
+                    f"Trace batch write failed (attempt {attempt + 1}/{retries + 1}): {e}"
+                )
+                if attempt < retries and not self._shutdown:
+                    time.sleep(delay)
+                    delay *= 2
+        return False
+
+    def _spool(self, rows: List[Dict[str, Any]]) -> bool:
+        """Append rows to the spool file; False when spooling is disabled or fails."""
+        if self.spool_path is None:
+            return False
+        try:
+            with self._spool_lock:
+                self._append_spool(self.spool_path, (json.dumps(row) for row in rows))
+        except OSError as e:
+            logger.warning(f"Failed to spool {len(rows)} traces to {self.spool_path}: {e}")
+            return False
+        self.traces_spooled += len(rows)
+        return True
+
+    @staticmethod
+    def _append_spool(path: Path, lines: Iterable[str]) -> None:
+        """Append lines, first terminating a line torn by a crash mid-append."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab+") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            for line in lines:
+                f.write(line.encode("utf-8") + b"\n")
+
+    def _load_spooled(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Decode spooled rows, moving undecodable lines to ``<spool>.corrupt``."""
+        corrupt_path = self.spool_path.with_name(self.spool_path.name + ".corrupt")
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping corrupt spooled trace, kept in {corrupt_path}: {e}")
+                self.spool_corrupt += 1
+                try:
+                    self._append_spool(corrupt_path, [line.rstrip("\n")])
+                except OSError:
+                    pass
+
+    def _replay_spool(self) -> None:
+        """Write spooled rows now that the database accepts writes again."""
+        if self.spool_path is None:
+            return
+
+        replay_path = self.spool_path.with_name(self.spool_path.name + ".replay")
+        with self._spool_lock:
+            # A replay file left by an interrupted replay is processed first
+            if not replay_path.exists():
+                if not self.spool_path.exists() or self.spool_path.stat().st_size == 0:
+                    return
+                os.replace(self.spool_path, replay_path)
+
+        with open(replay_path, encoding="utf-8", errors="replace") as f:
+            batch: List[Dict[str, Any]] = []
+            for row in self._load_spooled(f):
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    if not self._replay_batch(batch, f):
+                        return
+                    batch = []
+            if batch and not self._replay_batch(batch, f):
+                return
+
+        replay_path.unlink()
+
+    def _replay_batch(self, batch: List[Dict[str, Any]], remaining) -> bool:
+        """Write one spooled batch; on failure move it and the rest back to the spool."""
+        if self._write_with_retry(batch, retries=0):
+            self.traces_written += len(batch)
+            return True
+
+        rest = list(self._load_spooled(remaining))
+        remaining.close()
+        replay_path = Path(remaining.name)
+        with self._spool_lock:
+            self._append_spool(self.spool_path, (json.dumps(row) for row in batch + rest))
+            replay_path.unlink()
+        return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Write all queued traces.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was written (or spooled) within the timeout
+        """
+        with self._condition:
+            worker_alive = self._worker is not None and self._worker.is_alive()
+
+        if not worker_alive:
+            # Write on the caller's thread, without blocking producers in write()
+            self._write_pending()
+            return True
+
+        with self._condition:
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._flushed >= target, timeout)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Write queued traces, stop the worker and close the writer."""
+        with self._condition:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._condition.notify_all()
+            worker = self._worker
+
+        if worker is not None:
+            worker.join(timeout)
+        else:
+            self._write_pending()
+        self.writer.close()
@@ -4,9 +4,15 @@ Lazy model loading for evaluation engines.
 Models are loaded only when first needed (lazy evaluation) and cached
 in memory for subsequent uses. This improves cold start time and reduces
 memory usage when evaluation is not needed.
+
+The loader shares the model caches used by ``cert.measure``, so a model
+preloaded here (e.g. in a worker process initializer) is the same instance
+that ``measure()`` and the evaluators use.
 """
 
 import threading
+import time
+from typing import Dict, Optional
 
 
 class LazyModelLoader:
@@ -42,10 +48,10 @@ class LazyModelLoader:
             with cls._lock:
                 if cls._embedding_engine is None:
                     try:
-                        from cert.measure.embeddings import EmbeddingEngine
+                        from cert.measure.embeddings import get_embedding_engine
 
                         print(f"Loading embedding model: {model_name}...")
-                        cls._embedding_engine = EmbeddingEngine(model_name)
+                        cls._embedding_engine = get_embedding_engine(model_name)
                         cls._embedding_model_name = model_name
                         print("✓ Embedding model loaded")
                     except ImportError as e:
@@ -75,10 +81,10 @@ class LazyModelLoader:
             with cls._lock:
                 if cls._nli_engine is None:
                     try:
-                        from cert.measure.nli import NLIEngine
+                        from cert.measure.nli import get_nli_engine
 
                         print(f"Loading NLI model: {model_name}...")
-                        cls._nli_engine = NLIEngine(model_name)
+                        cls._nli_engine = get_nli_engine(model_name)
                         cls._nli_model_name = model_name
                         print("✓ NLI model loaded")
                     except ImportError as e:
@@ -89,6 +95,32 @@ class LazyModelLoader:
 
         return cls._nli_engine
 
+    @classmethod
+    def preload(
+        cls,
+        embedding_model: Optional[str] = "all-MiniLM-L6-v2",
+        nli_model: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """Load models ahead of first use, e.g. once per worker process.
+
+        Args:
+            embedding_model: Embedding model to load (None to skip)
+            nli_model: NLI model to load (None to skip)
+
+        Returns:
+            Dictionary of load time in seconds per engine type
+        """
+        timings = {}
+        if embedding_model:
+            start = time.perf_counter()
+            cls.get_embedding_engine(embedding_model)
+            timings["embedding"] = time.perf_counter() - start
+        if nli_model:
+            start = time.perf_counter()
+            cls.get_nli_engine(nli_model)
+            timings["nli"] = time.perf_counter() - start
+        return timings
+
     @classmethod
     def clear_cache(cls):
         """Clear loaded models (useful for testing or memory management)."""
@@ -97,6 +129,20 @@ class LazyModelLoader:
             cls._nli_engine = None
             cls._embedding_model_name = None
             cls._nli_model_name = None
+
+            # Drop the shared caches too, otherwise the models stay referenced
+            try:
+                from cert.measure.embeddings import _EMBEDDING_MODEL_CACHE
+
+                _EMBEDDING_MODEL_CACHE.clear()
+            except ImportError:
+                pass
+            try:
+                from cert.measure.nli import _NLI_MODEL_CACHE
+
+                _NLI_MODEL_CACHE.clear()
+            except ImportError:
+                pass
             print("✓ Model cache cleared")
 
     @classmethod
@@ -1,7 +1,7 @@
 """
 Semantic similarity evaluator (default for CERT).
 
-Uses cosine similarity + NLI + grounding analysis to evaluate
+Uses cosine similarity + grounding analysis to evaluate
 if an answer is grounded in provided context.
 """
 
@@ -13,29 +13,33 @@ from cert.evaluation.base import AccuracyEvaluator
 class SemanticEvaluator(AccuracyEvaluator):
     """Default evaluator using semantic similarity.
 
-    Combines three signals:
+    Combines two signals, as ``cert.measure.measure`` does:
     - Semantic similarity (embeddings)
-    - Natural Language Inference (entailment)
     - Term grounding (lexical overlap)
 
     Suitable for general-purpose LLM applications where semantic
     equivalence is acceptable.
     """
 
-    def __init__(self):
-        """Initialize semantic evaluator with ML models."""
+    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2"):
+        """Initialize semantic evaluator with ML models.
+
+        Args:
+            embedding_model: Sentence transformer model for semantic similarity
+        """
         try:
-            from cert.measure import measure
+            from cert.measure.measure import measure_detailed
         except ImportError as e:
             raise ImportError(
                 "SemanticEvaluator requires: pip install cert-framework[evaluation]\n"
                 f"Original error: {e}"
             )
-        self._measure = measure
+        self._measure = measure_detailed
+        self.embedding_model = embedding_model
 
     @property
     def description(self) -> str:
-        return "Semantic similarity using embeddings + NLI + grounding"
+        return "Semantic similarity using embeddings + grounding"
 
     def evaluate(self, context: str, answer: str, threshold: float = 0.7) -> Dict[str, Any]:
         """Evaluate using semantic similarity.
@@ -48,13 +52,13 @@ class SemanticEvaluator(AccuracyEvaluator):
         Returns:
             Dict with matched, confidence, and component scores
         """
-        result = self._measure(text1=answer, text2=context, threshold=threshold)
+        result = self._measure(answer, context, embedding_model=self.embedding_model)
 
         return {
-            "matched": result.matched,
+            "matched": result.is_accurate(threshold),
             "confidence": result.confidence,
             "semantic_score": result.semantic_score,
-            "nli_score": result.nli_score,
+            "nli_score": None,  # measure() does not run NLI
             "grounding_score": result.grounding_score,
             "evaluator": self.name,
         }
@@ -11,8 +11,9 @@ Usage:
 
 import functools
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 try:
     from anthropic import Anthropic
@@ -23,6 +24,7 @@ except ImportError:
 
 from cert.integrations.base import ConnectorAdapter, TracedCall
 from cert.integrations.registry import register_connector
+from cert.integrations.streaming import StreamAccumulator, TracedStream
 
 logger = logging.getLogger(__name__)
 
@@ -71,9 +73,13 @@ class AnthropicConnector(ConnectorAdapter):
     def _trace_message(self, client_self, original_method, *args, **kwargs) -> Any:
         """Trace a message API call."""
         start_time = datetime.utcnow()
+        started = time.perf_counter()
 
         try:
             response = original_method(client_self, *args, **kwargs)
+            if kwargs.get("stream", False):
+                return self._wrap_stream(response, kwargs, start_time, started)
+
             traced_call = self._build_traced_call(kwargs, response, start_time)
             self.log_call(traced_call)
             return response
@@ -91,6 +97,81 @@ class AnthropicConnector(ConnectorAdapter):
             self.log_call(traced_call)
             raise
 
+    def _wrap_stream(
+        self,
+        stream: Iterator,
+        request_kwargs: Dict,
+        start_time: datetime,
+        started: Optional[float] = None,
+    ) -> TracedStream:
+        """Wrap a streaming response, keeping the SDK stream's context manager and attributes."""
+        return TracedStream(stream, self._trace_stream(stream, request_kwargs, start_time, started))
+
+    def _trace_stream(
+        self,
+        stream: Iterator,
+        request_kwargs: Dict,
+        start_time: datetime,
+        started: Optional[float] = None,
+    ) -> Iterator:
+        """Yield stream events, folding them into running state and logging when complete."""
+        accumulator = StreamAccumulator(started)
+
+        try:
+            for event in stream:
+                self._fold_event(accumulator, event)
+                yield event
+
+            model = request_kwargs.get("model", "unknown")
+            metadata = accumulator.metadata()
+            traced_call = TracedCall(
+                timestamp=self.format_timestamp(start_time),
+                platform="anthropic",
+                model=model,
+                input_data=request_kwargs.get("messages"),
+                output_data=accumulator.text,
+                metadata=metadata,
+                cost=self._calculate_cost_from_tokens(
+                    model, metadata.get("input_tokens", 0), metadata.get("output_tokens", 0)
+                ),
+            )
+            self.log_call(traced_call)
+
+        except Exception as e:
+            traced_call = TracedCall(
+                timestamp=self.format_timestamp(start_time),
+                platform="anthropic",
+                model=request_kwargs.get("model", "unknown"),
+                input_data=request_kwargs.get("messages"),
+                output_data=None,
+                metadata=accumulator.metadata(),
+                error=str(e),
+            )
+            self.log_call(traced_call)
+            raise
+
+    @staticmethod
+    def _fold_event(accumulator: StreamAccumulator, event: Any) -> None:
+        """Fold a Messages API stream event into the accumulator."""
+        event_type = getattr(event, "type", None)
+        text = None
+        stop_reason = None
+        usage = None
+
+        if event_type == "message_start":
+            message_usage = getattr(getattr(event, "message", None), "usage", None)
+            if message_usage is not None:
+                usage = {"input_tokens": getattr(message_usage, "input_tokens", None)}
+        elif event_type == "content_block_delta":
+            text = getattr(getattr(event, "delta", None), "text", None)
+        elif event_type == "message_delta":
+            stop_reason = getattr(getattr(event, "delta", None), "stop_reason", None)
+            delta_usage = getattr(event, "usage", None)
+            if delta_usage is not None:
+                usage = {"output_tokens": getattr(delta_usage, "output_tokens", None)}
+
+        accumulator.add_chunk(text, stop_reason, usage)
+
     def _build_traced_call(self, request: Dict, response: Any, start_time: datetime) -> TracedCall:
         """Build a TracedCall from Anthropic request/response."""
         model = request.get("model", "unknown")
@@ -102,6 +183,7 @@ class AnthropicConnector(ConnectorAdapter):
 
         # Build metadata
         metadata = self.extract_metadata(response)
+        metadata["latency_ms"] = round((datetime.utcnow() - start_time).total_seconds() * 1000, 3)
 
         # Calculate cost
         cost = self._calculate_cost_from_usage(model, response)
@@ -148,9 +230,14 @@ class AnthropicConnector(ConnectorAdapter):
             return None
 
         usage = response.usage
-        input_tokens = getattr(usage, "input_tokens", 0)
-        output_tokens = getattr(usage, "output_tokens", 0)
+        return self._calculate_cost_from_tokens(
+            model, getattr(usage, "input_tokens", 0), getattr(usage, "output_tokens", 0)
+        )
 
+    def _calculate_cost_from_tokens(
+        self, model: str, input_tokens: int, output_tokens: int
+    ) -> Optional[float]:
+        """Calculate cost from token counts."""
         # Find pricing for this model
         pricing = None
         for model_prefix, model_pricing in ANTHROPIC_PRICING.items():
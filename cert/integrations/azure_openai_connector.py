@@ -91,6 +91,7 @@ class AzureOpenAIConnector(ConnectorAdapter):
 
         # Build metadata
         metadata = self.extract_metadata(response)
+        metadata["latency_ms"] = round((datetime.utcnow() - start_time).total_seconds() * 1000, 3)
 
         # Calculate cost
         cost = self._calculate_cost_from_usage(model, response)
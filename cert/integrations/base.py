@@ -12,19 +12,29 @@ The connector architecture follows these principles:
 4. Abstract interface for platform-specific logic
 """
 
+import atexit
+import logging
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+from cert.integrations.payload import PayloadCapture
+from cert.integrations.performance import get_performance_monitor
+from cert.integrations.sampling import SamplingPolicy
+
+logger = logging.getLogger(__name__)
 
 
-@dataclass
 class TracedCall:
     """
     Standard format for all traced AI/LLM calls.
 
     This unified structure ensures consistency across all platforms
-    and makes it easy to aggregate, analyze, and export traces.
+    and makes it easy to aggregate, analyze, and export traces. It uses
+    ``__slots__`` to keep per-call memory small on hot paths.
 
     Attributes:
         timestamp: ISO 8601 formatted timestamp with Z suffix
@@ -37,23 +47,66 @@ class TracedCall:
         error: Error message if the call failed (None if successful)
     """
 
-    timestamp: str
-    platform: str
-    model: str
-    input_data: Any
-    output_data: Any
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    cost: Optional[float] = None
-    error: Optional[str] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+    __slots__ = (
+        "timestamp",
+        "platform",
+        "model",
+        "input_data",
+        "output_data",
+        "metadata",
+        "cost",
+        "error",
+    )
+
+    def __init__(
+        self,
+        timestamp: str,
+        platform: str,
+        model: str,
+        input_data: Any,
+        output_data: Any,
+        metadata: Optional[Dict[str, Any]] = None,
+        cost: Optional[float] = None,
+        error: Optional[str] = None,
+    ):
+        self.timestamp = timestamp
+        self.platform = platform
+        self.model = model
+        self.input_data = input_data
+        self.output_data = output_data
+        self.metadata = metadata if metadata is not None else {}
+        self.cost = cost
+        self.error = error
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TracedCall):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (
+            f"TracedCall(timestamp={self.timestamp!r}, platform={self.platform!r}, "
+            f"model={self.model!r}, cost={self.cost!r}, error={self.error!r})"
+        )
+
+    def to_dict(self, capture: Optional[PayloadCapture] = None) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization.
+
+        Args:
+            capture: Payload capture policy applied to input and output data
+        """
+        input_data, output_data = self.input_data, self.output_data
+        if capture is not None and not capture.is_passthrough:
+            input_data = capture.capture_input(input_data)
+            output_data = capture.capture_output(output_data)
+
         return {
             "timestamp": self.timestamp,
             "platform": self.platform,
             "model": self.model,
-            "input_data": self.input_data,
-            "output_data": self.output_data,
+            "input_data": input_data,
+            "output_data": output_data,
             "metadata": self.metadata,
             "cost": self.cost,
             "error": self.error,
@@ -96,6 +149,11 @@ class ConnectorAdapter(ABC):
             tracer: The CERT tracer instance for logging traces
         """
         self.tracer = tracer
+        self.payload_capture = PayloadCapture.from_env(
+            str(tracer.log_path) if hasattr(tracer, "log_path") else None
+        )
+        self.sampling = SamplingPolicy.from_env()
+        self.sampled_out = 0  # Calls dropped by head sampling
         self.enabled = True
         self.failure_count = 0
         self.max_failures = 3  # Disable after this many consecutive failures
@@ -169,6 +227,9 @@ class ConnectorAdapter(ABC):
         - Disables connector after max_failures
         - Resets failure count on success
 
+        Calls are first passed through the connector's SamplingPolicy;
+        calls dropped by head sampling are counted in ``sampled_out``.
+
         Args:
             traced_call: The TracedCall object to log
         """
@@ -176,9 +237,25 @@ class ConnectorAdapter(ABC):
             # Circuit breaker is open, skip logging
             return
 
+        if self._sample(traced_call):
+            self._write_call(traced_call)
+
+    def _sample(self, traced_call: TracedCall) -> bool:
+        """Apply the sampling policy; returns True if the call should be written."""
+        if self.sampling.apply(traced_call):
+            return True
+        self.sampled_out += 1
+        return False
+
+    def _write_call(self, traced_call: TracedCall) -> None:
+        """Write a call through the tracer with circuit breaker protection."""
+        if not self.enabled:
+            return
+
+        start = time.perf_counter()
         try:
             # Log the trace
-            self.tracer.log_trace(traced_call.to_dict())
+            self.tracer.log_trace(traced_call.to_dict(self.payload_capture))
 
             # Reset failure count on success
             self.failure_count = 0
@@ -199,6 +276,10 @@ class ConnectorAdapter(ABC):
                     f"WARNING: CERT connector '{self.__class__.__name__}' "
                     f"logging failed ({self.failure_count}/{self.max_failures}): {e}"
                 )
+        finally:
+            get_performance_monitor().record_overhead(
+                self.__class__.__name__, (time.perf_counter() - start) * 1000
+            )
 
     def reset_circuit_breaker(self) -> None:
         """
@@ -235,21 +316,143 @@ class ConnectorAdapter(ABC):
         return dt.isoformat() + "Z"
 
 
+class BackgroundCallWriter:
+    """
+    Bounded hand-off queue drained by a writer thread.
+
+    Lets async code paths log calls without doing blocking I/O on the
+    event loop: ``submit`` only enqueues, and a daemon thread performs the
+    actual (synchronous) write. When the queue is full, calls are dropped
+    and counted rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[TracedCall], None],
+        max_queue_size: int = 10000,
+        name: str = "cert-trace-writer",
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            write: Blocking function that persists one call
+            max_queue_size: Maximum calls waiting to be written
+            name: Writer thread name
+        """
+        self._write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self.dropped = 0
+        atexit.register(self.flush)
+
+    def submit(self, traced_call: TracedCall) -> bool:
+        """
+        Enqueue a call without blocking.
+
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        try:
+            self._queue.put_nowait(traced_call)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self) -> None:
+        while True:
+            traced_call = self._queue.get()
+            try:
+                self._write(traced_call)
+            except Exception as e:
+                logger.warning(f"Background trace write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting to be written."""
+        return self._queue.qsize()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until all queued calls are written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+
 class AsyncConnectorAdapter(ConnectorAdapter):
     """
     Base class for connectors that need to handle async operations.
 
     Some platforms (like streaming responses) require async handling.
-    This class extends ConnectorAdapter with async-aware methods.
+    This class extends ConnectorAdapter with async-aware methods:
+    ``log_call_async`` hands calls to a background writer thread so that
+    tracing never blocks the caller's event loop.
     """
 
+    max_pending_calls = 10000
+
+    _writer: Optional[BackgroundCallWriter] = None
+
     async def log_call_async(self, traced_call: TracedCall) -> None:
         """
         Async version of log_call for non-blocking logging.
 
+        The call is sampled, then enqueued for the writer thread, which
+        applies the usual circuit breaker logic. The time spent on the event
+        loop is reported to the PerformanceMonitor.
+
         Args:
             traced_call: The TracedCall object to log
         """
-        # For now, we just call the sync version
-        # In the future, this could use async I/O for better performance
-        self.log_call(traced_call)
+        if not self.enabled:
+            return
+
+        start = time.perf_counter()
+        # Sample before enqueueing so dropped calls never occupy the queue
+        if not self._sample(traced_call):
+            return
+        if self._writer is None:
+            self._writer = BackgroundCallWriter(
+                self._write_call,
+                max_queue_size=self.max_pending_calls,
+                name=f"cert-{self.__class__.__name__}-writer",
+            )
+        self._writer.submit(traced_call)
+
+        get_performance_monitor().record_overhead(
+            f"{self.__class__.__name__}.async", (time.perf_counter() - start) * 1000
+        )
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait for calls logged with ``log_call_async`` to be written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if all pending calls were written
+        """
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    @property
+    def dropped_calls(self) -> int:
+        """Calls dropped because the background queue was full."""
+        return self._writer.dropped if self._writer is not None else 0
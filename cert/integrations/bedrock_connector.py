@@ -22,6 +22,7 @@ Usage:
 import functools
 import json
 import logging
+import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
@@ -34,10 +35,43 @@ except ImportError:
 
 from cert.integrations.base import ConnectorAdapter, TracedCall
 from cert.integrations.registry import register_connector
+from cert.integrations.streaming import StreamAccumulator
 
 logger = logging.getLogger(__name__)
 
 
+# Bedrock on-demand pricing per 1M tokens, us-east-1 (as of November 2025)
+# Source: https://aws.amazon.com/bedrock/pricing/
+# Matched against model IDs without the cross-region inference prefix
+# ("us.", "eu.", ...); longer prefixes of the same family come first.
+BEDROCK_PRICING = {
+    # Anthropic Claude
+    "anthropic.claude-sonnet-4": {"input": 3.0, "output": 15.0},
+    "anthropic.claude-3-7-sonnet": {"input": 3.0, "output": 15.0},
+    "anthropic.claude-3-5-sonnet": {"input": 3.0, "output": 15.0},
+    "anthropic.claude-3-5-haiku": {"input": 0.80, "output": 4.0},
+    "anthropic.claude-3-opus": {"input": 15.0, "output": 75.0},
+    "anthropic.claude-3-sonnet": {"input": 3.0, "output": 15.0},
+    "anthropic.claude-3-haiku": {"input": 0.25, "output": 1.25},
+    "anthropic.claude-v2": {"input": 8.0, "output": 24.0},
+    "anthropic.claude-instant": {"input": 0.80, "output": 2.40},
+    # Meta Llama
+    "meta.llama3-70b-instruct": {"input": 2.65, "output": 3.50},
+    "meta.llama3-8b-instruct": {"input": 0.30, "output": 0.60},
+    # Amazon Titan
+    "amazon.titan-text-premier": {"input": 0.50, "output": 1.50},
+    "amazon.titan-text-express": {"input": 0.20, "output": 0.60},
+    "amazon.titan-text-lite": {"input": 0.15, "output": 0.20},
+    # Cohere Command
+    "cohere.command-r-plus": {"input": 3.0, "output": 15.0},
+    "cohere.command-r": {"input": 0.50, "output": 1.50},
+}
+
+# Token counts Bedrock returns as HTTP headers on invoke_model
+INPUT_TOKENS_HEADER = "x-amzn-bedrock-input-token-count"
+OUTPUT_TOKENS_HEADER = "x-amzn-bedrock-output-token-count"
+
+
 @register_connector
 class BedrockConnector(ConnectorAdapter):
     """
@@ -50,7 +84,7 @@ class BedrockConnector(ConnectorAdapter):
     - Support for multiple model families (Claude, Llama, Titan, etc.)
     - Handles different request/response formats per model
     - Streaming support
-    - Region-aware pricing (where available)
+    - Cost from Bedrock's token counts (us-east-1 on-demand prices)
     """
 
     def __init__(self, tracer):
@@ -156,13 +190,16 @@ class BedrockConnector(ConnectorAdapter):
             The response from the original method (with wrapped stream)
         """
         start_time = datetime.utcnow()
+        started = time.perf_counter()
 
         try:
             # Call the original method
             response = original_method(**kwargs)
 
             # Wrap the stream to accumulate chunks
-            response["body"] = self._wrap_stream(response["body"], kwargs, response, start_time)
+            response["body"] = self._wrap_stream(
+                response["body"], kwargs, response, start_time, started
+            )
 
             return response
 
@@ -179,29 +216,39 @@ class BedrockConnector(ConnectorAdapter):
             self.log_call(traced_call)
             raise
 
-    def _wrap_stream(self, stream, request_kwargs, response_metadata, start_time):
+    def _wrap_stream(
+        self,
+        stream,
+        request_kwargs,
+        response_metadata,
+        start_time,
+        started: Optional[float] = None,
+    ):
         """
-        Wrap a streaming response to accumulate and log when complete.
+        Wrap a streaming response, folding events into running state and
+        logging when complete.
 
         Args:
             stream: The streaming body
             request_kwargs: Original request parameters
             response_metadata: Response metadata
             start_time: When the request started
+            started: ``time.perf_counter()`` value when the request started
 
         Yields:
             Stream chunks
         """
-        chunks = []
+        accumulator = StreamAccumulator(started)
+        model_id = request_kwargs.get("modelId", "unknown")
 
         try:
             for event in stream:
-                chunks.append(event)
+                self._fold_event(accumulator, event, model_id)
                 yield event
 
             # Stream complete, log it
             traced_call = self._build_streaming_traced_call(
-                request_kwargs, chunks, response_metadata, start_time
+                request_kwargs, accumulator, response_metadata, start_time
             )
             self.log_call(traced_call)
 
@@ -209,15 +256,56 @@ class BedrockConnector(ConnectorAdapter):
             traced_call = TracedCall(
                 timestamp=self.format_timestamp(start_time),
                 platform="bedrock",
-                model=request_kwargs.get("modelId", "unknown"),
+                model=model_id,
                 input_data=self._parse_request_body(request_kwargs.get("body")),
                 output_data=None,
-                metadata={"streaming": True},
+                metadata=accumulator.metadata(),
                 error=str(e),
             )
             self.log_call(traced_call)
             raise
 
+    def _fold_event(self, accumulator: StreamAccumulator, event: Dict, model_id: str) -> None:
+        """
+        Fold one response stream event into the accumulator.
+
+        Args:
+            accumulator: Running stream state
+            event: Event from the response body stream
+            model_id: Model identifier
+        """
+        chunk_data = event.get("chunk", {}) if isinstance(event, dict) else {}
+        if not chunk_data:
+            accumulator.add_chunk()
+            return
+
+        try:
+            chunk_json = json.loads(chunk_data.get("bytes", b"").decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            accumulator.add_chunk()
+            return
+
+        text = self._extract_streaming_text(chunk_json, model_id)
+
+        # Claude uses delta.stop_reason, Llama stop_reason, Titan completionReason
+        delta = chunk_json.get("delta")
+        finish_reason = (
+            (delta.get("stop_reason") if isinstance(delta, dict) else None)
+            or chunk_json.get("stop_reason")
+            or chunk_json.get("completionReason")
+        )
+
+        # Bedrock appends invocation metrics to the final chunk
+        usage = None
+        invocation_metrics = chunk_json.get("amazon-bedrock-invocationMetrics")
+        if invocation_metrics:
+            usage = {
+                "input_tokens": invocation_metrics.get("inputTokenCount"),
+                "output_tokens": invocation_metrics.get("outputTokenCount"),
+            }
+
+        accumulator.add_chunk(text, finish_reason, usage)
+
     def _build_traced_call(self, request: Dict, response: Dict, start_time: datetime) -> TracedCall:
         """
         Build a TracedCall from a Bedrock request/response.
@@ -244,9 +332,13 @@ class BedrockConnector(ConnectorAdapter):
 
         # Build metadata
         metadata = self.extract_metadata(response)
+        metadata["latency_ms"] = round((datetime.utcnow() - start_time).total_seconds() * 1000, 3)
+        metadata.update(self._response_usage(response, response_body))
 
         # Calculate cost (if possible)
-        cost = self._calculate_bedrock_cost(model_id, request_body, response_body)
+        cost = self._calculate_bedrock_cost(
+            model_id, metadata.get("input_tokens"), metadata.get("output_tokens")
+        )
 
         return TracedCall(
             timestamp=self.format_timestamp(start_time),
@@ -261,7 +353,7 @@ class BedrockConnector(ConnectorAdapter):
     def _build_streaming_traced_call(
         self,
         request: Dict,
-        chunks: list,
+        accumulator: StreamAccumulator,
         response_metadata: Dict,
         start_time: datetime,
     ) -> TracedCall:
@@ -270,7 +362,7 @@ class BedrockConnector(ConnectorAdapter):
 
         Args:
             request: Request parameters
-            chunks: List of stream chunks
+            accumulator: State folded from all stream events
             response_metadata: Response metadata
             start_time: When the request started
 
@@ -280,35 +372,18 @@ class BedrockConnector(ConnectorAdapter):
         model_id = request.get("modelId", "unknown")
         request_body = self._parse_request_body(request.get("body"))
 
-        # Accumulate chunks
-        accumulated_text = []
-        for chunk in chunks:
-            chunk_data = chunk.get("chunk", {})
-            if chunk_data:
-                chunk_bytes = chunk_data.get("bytes", b"")
-                chunk_json = json.loads(chunk_bytes.decode("utf-8"))
-
-                # Extract text based on model family
-                text = self._extract_streaming_text(chunk_json, model_id)
-                if text:
-                    accumulated_text.append(text)
-
-        output_data = "".join(accumulated_text)
-
-        metadata = {
-            "streaming": True,
-            "chunk_count": len(chunks),
-        }
-
-        cost = self._calculate_bedrock_cost(model_id, request_body, None)
+        # Token counts from the invocation metrics on the final chunk
+        cost = self._calculate_bedrock_cost(
+            model_id, accumulator.usage.get("input_tokens"), accumulator.usage.get("output_tokens")
+        )
 
         return TracedCall(
             timestamp=self.format_timestamp(start_time),
             platform="bedrock",
             model=model_id,
             input_data=request_body,
-            output_data=output_data,
-            metadata=metadata,
+            output_data=accumulator.text,
+            metadata=accumulator.metadata(),
             cost=cost,
         )
 
@@ -340,39 +415,87 @@ class BedrockConnector(ConnectorAdapter):
         """
         Calculate cost from Bedrock call data.
 
-        Note: Bedrock pricing is complex and varies by model, region,
-        and pricing tier. We return None for most cases and recommend
-        users check AWS billing for accurate costs.
+        Note: Bedrock responses do not name the model, so a response alone
+        cannot be priced and this returns None. Traced calls are priced from
+        the request's ``modelId`` and the reported token counts instead
+        (see ``_calculate_bedrock_cost``).
 
         Args:
             call_data: Bedrock response data
 
         Returns:
-            Cost in USD, or None
+            None
         """
-        # Bedrock pricing is too complex to calculate accurately
-        # Different models, regions, and pricing models
         return None
 
+    def _response_usage(self, response: Dict, response_body: Optional[Dict]) -> Dict[str, int]:
+        """
+        Token counts of an invoke_model response.
+
+        Args:
+            response: Bedrock API response (token count headers)
+            response_body: Parsed response body, used when headers are missing
+
+        Returns:
+            ``input_tokens`` and ``output_tokens`` where reported
+        """
+        headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        usage = {}
+        for key, header in (
+            ("input_tokens", INPUT_TOKENS_HEADER),
+            ("output_tokens", OUTPUT_TOKENS_HEADER),
+        ):
+            try:
+                usage[key] = int(headers[header])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        # Claude bodies also carry usage
+        body_usage = response_body.get("usage") if isinstance(response_body, dict) else None
+        if isinstance(body_usage, dict):
+            for key in ("input_tokens", "output_tokens"):
+                if key not in usage and isinstance(body_usage.get(key), int):
+                    usage[key] = body_usage[key]
+        return usage
+
     def _calculate_bedrock_cost(
-        self, model_id: str, request_body: Dict, response_body: Optional[Dict]
+        self, model_id: str, input_tokens: Optional[int], output_tokens: Optional[int]
     ) -> Optional[float]:
         """
-        Attempt to calculate Bedrock cost.
+        Estimate Bedrock cost from token counts.
 
         This is a best-effort estimation. Actual costs may vary.
 
         Args:
-            model_id: Bedrock model ID
-            request_body: Request body
-            response_body: Response body (None for streaming)
+            model_id: Bedrock model ID, optionally with a cross-region prefix
+            input_tokens: Prompt tokens reported by Bedrock
+            output_tokens: Completion tokens reported by Bedrock
 
         Returns:
             Estimated cost in USD, or None
         """
-        # For now, return None
-        # In the future, we could add pricing tables for common models/regions
-        return None
+        if input_tokens is None and output_tokens is None:
+            return None
+
+        # "us.anthropic.claude-..." -> "anthropic.claude-..."
+        prefix, _, rest = model_id.partition(".")
+        if "." in rest and prefix in ("us", "eu", "apac", "us-gov", "global"):
+            model_id = rest
+
+        pricing = None
+        for model_prefix, model_pricing in BEDROCK_PRICING.items():
+            if model_id.startswith(model_prefix):
+                pricing = model_pricing
+                break
+
+        if not pricing:
+            return None
+
+        # Pricing is per 1M tokens
+        input_cost = ((input_tokens or 0) / 1_000_000) * pricing["input"]
+        output_cost = ((output_tokens or 0) / 1_000_000) * pricing["output"]
+
+        return input_cost + output_cost
 
     def _parse_request_body(self, body_bytes) -> Any:
         """
@@ -20,6 +20,7 @@ Usage:
 
 import functools
 import logging
+import time
 from datetime import datetime
 from typing import Any, Dict, Iterator, Optional
 
@@ -30,8 +31,9 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
-from cert.integrations.base import ConnectorAdapter, TracedCall
+from cert.integrations.base import AsyncConnectorAdapter, TracedCall
 from cert.integrations.registry import register_connector
+from cert.integrations.streaming import StreamAccumulator
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +56,7 @@ OPENAI_PRICING = {
 
 
 @register_connector
-class OpenAIConnector(ConnectorAdapter):
+class OpenAIConnector(AsyncConnectorAdapter):
     """
     Connector for OpenAI SDK.
 
@@ -64,7 +66,8 @@ class OpenAIConnector(ConnectorAdapter):
     Features:
     - Automatic token counting and cost calculation
     - Support for streaming responses
-    - Support for async calls
+    - Support for async calls (logged from a background writer so the
+      event loop never blocks on trace I/O)
     - Handles multiple models with different pricing
     """
 
@@ -117,6 +120,7 @@ class OpenAIConnector(ConnectorAdapter):
             The response from the original method
         """
         start_time = datetime.utcnow()
+        started = time.perf_counter()
         stream = kwargs.get("stream", False)
 
         try:
@@ -126,7 +130,7 @@ class OpenAIConnector(ConnectorAdapter):
             # Handle streaming vs non-streaming differently
             if stream:
                 # For streaming, we need to wrap the iterator
-                return self._wrap_stream(response, kwargs, start_time)
+                return self._wrap_stream(response, kwargs, start_time, started)
             else:
                 # For non-streaming, log immediately
                 traced_call = self._build_traced_call(kwargs, response, start_time)
@@ -161,6 +165,7 @@ class OpenAIConnector(ConnectorAdapter):
             The response from the original method
         """
         start_time = datetime.utcnow()
+        started = time.perf_counter()
         stream = kwargs.get("stream", False)
 
         try:
@@ -169,10 +174,10 @@ class OpenAIConnector(ConnectorAdapter):
 
             # Handle streaming vs non-streaming
             if stream:
-                return self._wrap_async_stream(response, kwargs, start_time)
+                return self._wrap_async_stream(response, kwargs, start_time, started)
             else:
                 traced_call = self._build_traced_call(kwargs, response, start_time)
-                self.log_call(traced_call)
+                await self.log_call_async(traced_call)
                 return response
 
         except Exception as e:
@@ -185,43 +190,38 @@ class OpenAIConnector(ConnectorAdapter):
                 metadata={},
                 error=str(e),
             )
-            self.log_call(traced_call)
+            await self.log_call_async(traced_call)
             raise
 
     def _wrap_stream(
-        self, stream: Iterator, request_kwargs: Dict, start_time: datetime
+        self,
+        stream: Iterator,
+        request_kwargs: Dict,
+        start_time: datetime,
+        started: Optional[float] = None,
     ) -> Iterator:
         """
-        Wrap a streaming response to accumulate chunks and log when complete.
+        Wrap a streaming response, folding chunks into running state and
+        logging when complete.
 
         Args:
             stream: The original stream iterator
             request_kwargs: The request parameters
             start_time: When the request started
+            started: ``time.perf_counter()`` value when the request started
 
         Yields:
             Individual chunks from the stream
         """
-        chunks = []
-        accumulated_text = []
+        accumulator = StreamAccumulator(started)
 
         try:
             for chunk in stream:
-                chunks.append(chunk)
-
-                # Try to extract text from this chunk
-                if hasattr(chunk, "choices") and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if hasattr(delta, "content") and delta.content:
-                        accumulated_text.append(delta.content)
-
+                self._fold_chunk(accumulator, chunk)
                 yield chunk
 
             # Stream complete, log it
-            full_response = "".join(accumulated_text)
-            traced_call = self._build_streaming_traced_call(
-                request_kwargs, full_response, chunks, start_time
-            )
+            traced_call = self._build_streaming_traced_call(request_kwargs, accumulator, start_time)
             self.log_call(traced_call)
 
         except Exception as e:
@@ -232,13 +232,19 @@ class OpenAIConnector(ConnectorAdapter):
                 model=request_kwargs.get("model", "unknown"),
                 input_data=request_kwargs.get("messages"),
                 output_data=None,
-                metadata={"streaming": True},
+                metadata=accumulator.metadata(),
                 error=str(e),
             )
             self.log_call(traced_call)
             raise
 
-    async def _wrap_async_stream(self, stream, request_kwargs: Dict, start_time: datetime):
+    async def _wrap_async_stream(
+        self,
+        stream,
+        request_kwargs: Dict,
+        start_time: datetime,
+        started: Optional[float] = None,
+    ):
         """
         Wrap an async streaming response.
 
@@ -246,30 +252,21 @@ class OpenAIConnector(ConnectorAdapter):
             stream: The async stream iterator
             request_kwargs: The request parameters
             start_time: When the request started
+            started: ``time.perf_counter()`` value when the request started
 
         Yields:
             Individual chunks from the stream
         """
-        chunks = []
-        accumulated_text = []
+        accumulator = StreamAccumulator(started)
 
         try:
             async for chunk in stream:
-                chunks.append(chunk)
-
-                if hasattr(chunk, "choices") and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if hasattr(delta, "content") and delta.content:
-                        accumulated_text.append(delta.content)
-
+                self._fold_chunk(accumulator, chunk)
                 yield chunk
 
             # Stream complete, log it
-            full_response = "".join(accumulated_text)
-            traced_call = self._build_streaming_traced_call(
-                request_kwargs, full_response, chunks, start_time
-            )
-            self.log_call(traced_call)
+            traced_call = self._build_streaming_traced_call(request_kwargs, accumulator, start_time)
+            await self.log_call_async(traced_call)
 
         except Exception as e:
             traced_call = TracedCall(
@@ -278,12 +275,45 @@ class OpenAIConnector(ConnectorAdapter):
                 model=request_kwargs.get("model", "unknown"),
                 input_data=request_kwargs.get("messages"),
                 output_data=None,
-                metadata={"streaming": True},
+                metadata=accumulator.metadata(),
                 error=str(e),
             )
-            self.log_call(traced_call)
+            await self.log_call_async(traced_call)
             raise
 
+    @staticmethod
+    def _fold_chunk(accumulator: StreamAccumulator, chunk: Any) -> None:
+        """
+        Fold a chat completion chunk into the accumulator.
+
+        Args:
+            accumulator: Running stream state
+            chunk: ChatCompletionChunk from the SDK
+        """
+        text = None
+        finish_reason = None
+        choices = getattr(chunk, "choices", None)
+        if choices:
+            choice = choices[0]
+            text = getattr(getattr(choice, "delta", None), "content", None)
+            finish_reason = getattr(choice, "finish_reason", None)
+
+        # Final chunk carries usage when stream_options={"include_usage": True}
+        usage = None
+        chunk_usage = getattr(chunk, "usage", None)
+        if chunk_usage is not None:
+            usage = {
+                "prompt_tokens": getattr(chunk_usage, "prompt_tokens", None),
+                "completion_tokens": getattr(chunk_usage, "completion_tokens", None),
+                "total_tokens": getattr(chunk_usage, "total_tokens", None),
+            }
+
+        accumulator.add_chunk(
+            text if isinstance(text, str) else None,
+            finish_reason if isinstance(finish_reason, str) else None,
+            usage,
+        )
+
     def _build_traced_call(self, request: Dict, response: Any, start_time: datetime) -> TracedCall:
         """
         Build a TracedCall from a non-streaming request/response.
@@ -307,6 +337,7 @@ class OpenAIConnector(ConnectorAdapter):
 
         # Build metadata
         metadata = self.extract_metadata(response)
+        metadata["latency_ms"] = round((datetime.utcnow() - start_time).total_seconds() * 1000, 3)
 
         # Calculate cost
         cost = self._calculate_cost_from_usage(model, response)
@@ -324,8 +355,7 @@ class OpenAIConnector(ConnectorAdapter):
     def _build_streaming_traced_call(
         self,
         request: Dict,
-        accumulated_output: str,
-        chunks: list,
+        accumulator: StreamAccumulator,
         start_time: datetime,
     ) -> TracedCall:
         """
@@ -333,43 +363,34 @@ class OpenAIConnector(ConnectorAdapter):
 
         Args:
             request: Request parameters
-            accumulated_output: Accumulated text from all chunks
-            chunks: List of all stream chunks
+            accumulator: State folded from all stream chunks
             start_time: When the request started
 
         Returns:
             TracedCall object
         """
         model = request.get("model", "unknown")
+        output = accumulator.text
+        metadata = accumulator.metadata()
 
-        # Extract metadata from last chunk if available
-        metadata = {"streaming": True, "chunk_count": len(chunks)}
+        if "prompt_tokens" in metadata and "completion_tokens" in metadata:
+            prompt_tokens = metadata["prompt_tokens"]
+            completion_tokens = metadata["completion_tokens"]
+        else:
+            # Usage is only streamed when requested; estimate otherwise
+            prompt_tokens = self._estimate_tokens(str(request.get("messages", "")))
+            completion_tokens = self._estimate_tokens(output)
+            metadata["estimated_prompt_tokens"] = prompt_tokens
+            metadata["estimated_completion_tokens"] = completion_tokens
 
-        # Try to get finish reason from last chunk
-        if chunks and hasattr(chunks[-1], "choices") and len(chunks[-1].choices) > 0:
-            finish_reason = chunks[-1].choices[0].finish_reason
-            if finish_reason:
-                metadata["finish_reason"] = finish_reason
-
-        # Estimate tokens (we don't get usage data in streaming mode)
-        metadata["estimated_prompt_tokens"] = self._estimate_tokens(
-            str(request.get("messages", ""))
-        )
-        metadata["estimated_completion_tokens"] = self._estimate_tokens(accumulated_output)
-
-        # Calculate estimated cost
-        cost = self._calculate_estimated_cost(
-            model,
-            metadata["estimated_prompt_tokens"],
-            metadata["estimated_completion_tokens"],
-        )
+        cost = self._calculate_estimated_cost(model, prompt_tokens, completion_tokens)
 
         return TracedCall(
             timestamp=self.format_timestamp(start_time),
             platform="openai",
             model=model,
             input_data=request.get("messages"),
-            output_data=accumulated_output,
+            output_data=output,
             metadata=metadata,
             cost=cost,
         )
@@ -0,0 +1,207 @@
+"""
+Payload Capture for Connector Traces
+====================================
+
+Controls how much of each call's input and output is written to traces.
+
+Capture modes:
+- ``full``: payloads are written unchanged (default)
+- ``truncated``: strings are cut to ``max_chars``
+- ``hashed``: payloads are replaced by their SHA-256 digest and length
+- ``off``: payloads are omitted
+
+With deduplication enabled, long message contents (typically system
+prompts) are written once to a content-addressed sidecar file next to the
+trace log and referenced from traces as ``{"content_ref": "<sha256>"}``.
+
+Configuration from the environment:
+    CERT_PAYLOAD_CAPTURE=truncated
+    CERT_PAYLOAD_MAX_CHARS=2000
+    CERT_PAYLOAD_DEDUP=1
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cert.core.serialization import content_hash, dumps
+
+CAPTURE_MODES = ("full", "truncated", "hashed", "off")
+
+
+class PayloadStore:
+    """
+    Append-only content-addressed store for repeated payloads.
+
+    Each distinct content is written once as ``{"ref": ..., "content": ...}``
+    to a JSONL file; the set of known references is kept in memory.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store, loading references already on disk.
+
+        Args:
+            path: Path to the JSONL payload file
+        """
+        self.path = Path(path)
+        self._known = set()
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        self._known.add(json.loads(line)["ref"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue
+
+    def __contains__(self, ref: str) -> bool:
+        return ref in self._known
+
+    def put(self, content: str) -> str:
+        """
+        Store content if it is new.
+
+        Args:
+            content: Payload text
+
+        Returns:
+            Content reference (SHA-256 hex digest)
+        """
+        ref = content_hash(content)
+        if ref in self._known:
+            return ref
+
+        with self._lock:
+            if ref not in self._known:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(dumps({"ref": ref, "content": content}) + "\n")
+                self._known.add(ref)
+        return ref
+
+    def load(self) -> Dict[str, str]:
+        """Read all stored payloads as a reference -> content mapping."""
+        payloads: Dict[str, str] = {}
+        if not self.path.exists():
+            return payloads
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    payloads[entry["ref"]] = entry["content"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        return payloads
+
+
+class PayloadCapture:
+    """
+    Payload capture policy applied when a TracedCall is serialized.
+
+    Example:
+        >>> capture = PayloadCapture(mode="truncated", max_chars=500)
+        >>> capture.capture_output("x" * 10_000)[:20]
+        'xxxxxxxxxxxxxxxxxxxx'
+    """
+
+    __slots__ = ("mode", "max_chars", "dedupe_min_chars", "store")
+
+    def __init__(
+        self,
+        mode: str = "full",
+        max_chars: int = 2000,
+        dedupe_min_chars: int = 512,
+        store: Optional[PayloadStore] = None,
+    ):
+        """
+        Initialize the capture policy.
+
+        Args:
+            mode: One of ``CAPTURE_MODES``
+            max_chars: Maximum characters per string in ``truncated`` mode
+            dedupe_min_chars: Minimum message length stored by reference
+            store: Content-addressed store; deduplication is off without one
+        """
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode '{mode}'. Choose from {CAPTURE_MODES}")
+
+        self.mode = mode
+        self.max_chars = max_chars
+        self.dedupe_min_chars = dedupe_min_chars
+        self.store = store
+
+    @classmethod
+    def from_env(cls, log_path: Optional[str] = None) -> "PayloadCapture":
+        """
+        Load the capture policy from environment variables.
+
+        Args:
+            log_path: Trace log path; the payload store is created beside it
+                when ``CERT_PAYLOAD_DEDUP`` is enabled
+        """
+        store = None
+        if log_path and os.getenv("CERT_PAYLOAD_DEDUP", "").lower() in ("1", "true", "yes"):
+            store = PayloadStore(str(Path(log_path).with_suffix(".payloads.jsonl")))
+
+        return cls(
+            mode=os.getenv("CERT_PAYLOAD_CAPTURE", "full").lower(),
+            max_chars=int(os.getenv("CERT_PAYLOAD_MAX_CHARS", "2000")),
+            store=store,
+        )
+
+    @property
+    def is_passthrough(self) -> bool:
+        """True when payloads are written unchanged."""
+        return self.mode == "full" and self.store is None
+
+    def _truncate(self, value: Any) -> Any:
+        if isinstance(value, str):
+            if len(value) <= self.max_chars:
+                return value
+            return value[: self.max_chars] + f"...[truncated {len(value) - self.max_chars} chars]"
+        if isinstance(value, dict):
+            return {k: self._truncate(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._truncate(v) for v in value]
+        if value is None or isinstance(value, (int, float, bool)):
+            return value
+        return self._truncate(str(value))
+
+    def _hash(self, value: Any) -> Optional[Dict[str, Any]]:
+        if value is None:
+            return None
+        text = value if isinstance(value, str) else dumps(value)
+        return {"sha256": content_hash(text), "chars": len(text)}
+
+    def _dedupe_messages(self, messages: list) -> list:
+        deduped = []
+        for message in messages:
+            content = message.get("content") if isinstance(message, dict) else None
+            if isinstance(content, str) and len(content) >= self.dedupe_min_chars:
+                message = {k: v for k, v in message.items() if k != "content"}
+                message["content_ref"] = self.store.put(content)
+            deduped.append(message)
+        return deduped
+
+    def capture_input(self, value: Any) -> Any:
+        """Apply the policy to a call's input (prompt or message list)."""
+        if self.mode == "off":
+            return None
+        if self.mode == "hashed":
+            return self._hash(value)
+
+        if self.store is not None and isinstance(value, list):
+            value = self._dedupe_messages(value)
+        return self._truncate(value) if self.mode == "truncated" else value
+
+    def capture_output(self, value: Any) -> Any:
+        """Apply the policy to a call's output."""
+        if self.mode == "off":
+            return None
+        if self.mode == "hashed":
+            return self._hash(value)
+        return self._truncate(value) if self.mode == "truncated" else value
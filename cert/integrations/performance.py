@@ -7,48 +7,218 @@ overhead remains < 5ms per traced call.
 """
 
 import logging
+import math
 import statistics
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Overhead target per traced call
+OVERHEAD_TARGET_MS = 5.0
+
+# Recording threads registered between sweeps for exited threads
+PRUNE_EVERY_REGISTRATIONS = 64
+
+# Bucket upper bounds (seconds) used when exporting overhead to Prometheus
+PROMETHEUS_OVERHEAD_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+
+
+class OverheadHistogram:
+    """
+    HDR-style log-linear histogram of overhead values.
+
+    Values are recorded in integer microseconds. Below ``2**precision_bits``
+    every microsecond has its own bucket; above that each power of two is
+    split into ``2**(precision_bits - 1)`` equal buckets, so the relative
+    error of any reported percentile is below ``2**-(precision_bits - 1)``
+    (about 1.6% with the default 7 bits). Counts, sum, min and max are exact.
+
+    Buckets live in a fixed-size list, so recording never allocates and
+    histograms with the same configuration merge by adding counts.
+    """
+
+    __slots__ = ("precision_bits", "max_value_us", "counts", "count", "sum_us", "min_us", "max_us")
+
+    def __init__(self, precision_bits: int = 7, max_value_us: int = 60_000_000):
+        """
+        Initialize the histogram.
+
+        Args:
+            precision_bits: Significant bits kept per value
+            max_value_us: Largest trackable value; larger values are clamped
+                into the top bucket (min/max/sum stay exact)
+        """
+        self.precision_bits = precision_bits
+        self.max_value_us = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.count = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        sub_buckets = 1 << self.precision_bits
+        if value_us < sub_buckets:
+            return value_us
+        shift = value_us.bit_length() - self.precision_bits
+        half = sub_buckets >> 1
+        return sub_buckets + (shift - 1) * half + (value_us >> shift) - half
+
+    def _bucket_bounds(self, index: int) -> Tuple[int, int]:
+        """Inclusive ``(lowest, highest)`` microsecond values of a bucket."""
+        sub_buckets = 1 << self.precision_bits
+        if index < sub_buckets:
+            return index, index
+        half = sub_buckets >> 1
+        shift = (index - sub_buckets) // half + 1
+        lowest = ((index - sub_buckets) % half + half) << shift
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, value_ms: float) -> None:
+        """
+        Record one overhead measurement.
+
+        Args:
+            value_ms: Overhead in milliseconds
+        """
+        value_us = max(0, int(round(value_ms * 1000)))
+        self.counts[self._index(min(value_us, self.max_value_us))] += 1
+        self.count += 1
+        self.sum_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "OverheadHistogram") -> "OverheadHistogram":
+        """
+        Add another histogram's counts into this one.
+
+        Args:
+            other: Histogram with the same configuration
+
+        Returns:
+            This histogram
+        """
+        if (other.precision_bits, other.max_value_us) != (self.precision_bits, self.max_value_us):
+            raise ValueError("Cannot merge histograms with different configurations")
+
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.sum_us += other.sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def copy(self) -> "OverheadHistogram":
+        """Snapshot of this histogram."""
+        return OverheadHistogram(self.precision_bits, self.max_value_us).merge(self)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Value at a percentile, in milliseconds.
+
+        Args:
+            percentile: Percentile in [0, 100]
+
+        Returns:
+            Highest value equivalent to the percentile's bucket, capped at the
+            recorded maximum (0.0 when empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._bucket_bounds(index)[1], self.max_us) / 1000
+        return self.max_us / 1000
+
+    def count_at_or_below(self, value_ms: float) -> int:
+        """
+        Number of recorded values at or below ``value_ms``.
+
+        Exact when ``value_ms`` falls on a bucket boundary; otherwise the
+        containing bucket is counted if its highest value fits.
+        """
+        limit_us = int(round(value_ms * 1000))
+        total = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                if self._bucket_bounds(index)[1] > limit_us:
+                    break
+                total += bucket_count
+        return total if limit_us < self.max_value_us else self.count
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_us / self.count / 1000 if self.count else 0.0
+
+    @property
+    def min_ms(self) -> float:
+        return self.min_us / 1000 if self.min_us is not None else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_us / 1000
+
 
 @dataclass
 class PerformanceMetrics:
-    """Performance metrics for a connector."""
+    """Performance metrics for a connector, backed by a merged histogram."""
 
     connector_name: str
-    call_count: int = 0
-    total_overhead_ms: float = 0.0
-    min_overhead_ms: float = float("inf")
-    max_overhead_ms: float = 0.0
-    measurements: List[float] = field(default_factory=list)
+    histogram: OverheadHistogram
+
+    @property
+    def call_count(self) -> int:
+        return self.histogram.count
 
     @property
     def average_overhead_ms(self) -> float:
         """Calculate average overhead in milliseconds."""
-        return self.total_overhead_ms / self.call_count if self.call_count > 0 else 0.0
+        return self.histogram.mean_ms
 
     @property
     def median_overhead_ms(self) -> float:
         """Calculate median overhead in milliseconds."""
-        return statistics.median(self.measurements) if self.measurements else 0.0
+        return self.histogram.percentile(50)
 
     @property
     def p95_overhead_ms(self) -> float:
         """Calculate 95th percentile overhead."""
-        if not self.measurements:
-            return 0.0
-        sorted_measurements = sorted(self.measurements)
-        index = int(len(sorted_measurements) * 0.95)
-        return sorted_measurements[min(index, len(sorted_measurements) - 1)]
+        return self.histogram.percentile(95)
+
+    @property
+    def p99_overhead_ms(self) -> float:
+        """Calculate 99th percentile overhead."""
+        return self.histogram.percentile(99)
 
     @property
     def exceeds_target(self) -> bool:
         """Check if overhead exceeds 5ms target."""
-        return self.average_overhead_ms > 5.0
+        return self.average_overhead_ms > OVERHEAD_TARGET_MS
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -58,8 +228,9 @@ class PerformanceMetrics:
             "average_overhead_ms": round(self.average_overhead_ms, 3),
             "median_overhead_ms": round(self.median_overhead_ms, 3),
             "p95_overhead_ms": round(self.p95_overhead_ms, 3),
-            "min_overhead_ms": round(self.min_overhead_ms, 3),
-            "max_overhead_ms": round(self.max_overhead_ms, 3),
+            "p99_overhead_ms": round(self.p99_overhead_ms, 3),
+            "min_overhead_ms": round(self.histogram.min_ms, 3),
+            "max_overhead_ms": round(self.histogram.max_ms, 3),
             "exceeds_target": self.exceeds_target,
         }
 
@@ -70,11 +241,21 @@ class PerformanceMonitor:
 
     This class tracks the overhead introduced by connectors and provides
     metrics to ensure performance targets are met.
+
+    Each thread records into its own histograms, so recording takes no
+    lock; readers merge the per-thread histograms on demand.
     """
 
     def __init__(self):
-        self.metrics: Dict[str, PerformanceMetrics] = {}
         self.enabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # (connector name, recording thread, histogram) for live recorders
+        self._histograms: List[Tuple[str, threading.Thread, OverheadHistogram]] = []
+        self._registrations = 0
+        # Histograms of threads that have exited, folded per connector
+        self._retired: Dict[str, OverheadHistogram] = {}
 
     def enable(self):
         """Enable performance monitoring."""
@@ -86,6 +267,35 @@ class PerformanceMonitor:
         self.enabled = False
         logger.info("Performance monitoring disabled")
 
+    def _thread_histogram(self, connector_name: str) -> OverheadHistogram:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.generation = self._generation
+            local.histograms = {}
+
+        histogram = local.histograms.get(connector_name)
+        if histogram is None:
+            histogram = local.histograms[connector_name] = OverheadHistogram()
+            with self._lock:
+                self._histograms.append((connector_name, threading.current_thread(), histogram))
+                # Short-lived threads would otherwise pile up until metrics are read
+                self._registrations += 1
+                if self._registrations % PRUNE_EVERY_REGISTRATIONS == 0:
+                    self._prune_locked()
+        return histogram
+
+    def _prune_locked(self) -> None:
+        """Fold histograms of exited threads into ``_retired``; hold ``_lock``."""
+        live = []
+        for entry in self._histograms:
+            name, thread, histogram = entry
+            if thread.is_alive():
+                live.append(entry)
+            else:
+                # The thread can no longer record; fold it in for good
+                self._retired.setdefault(name, OverheadHistogram()).merge(histogram)
+        self._histograms = live
+
     def record_overhead(self, connector_name: str, overhead_ms: float):
         """
         Record overhead measurement for a connector.
@@ -97,24 +307,27 @@ class PerformanceMonitor:
         if not self.enabled:
             return
 
-        if connector_name not in self.metrics:
-            self.metrics[connector_name] = PerformanceMetrics(connector_name)
-
-        metrics = self.metrics[connector_name]
-        metrics.call_count += 1
-        metrics.total_overhead_ms += overhead_ms
-        metrics.min_overhead_ms = min(metrics.min_overhead_ms, overhead_ms)
-        metrics.max_overhead_ms = max(metrics.max_overhead_ms, overhead_ms)
-        metrics.measurements.append(overhead_ms)
-
-        # Keep only last 1000 measurements to prevent memory growth
-        if len(metrics.measurements) > 1000:
-            metrics.measurements = metrics.measurements[-1000:]
+        self._thread_histogram(connector_name).record(overhead_ms)
 
         # Warn if overhead is high
         if overhead_ms > 10.0:
             logger.warning(f"{connector_name} overhead high: {overhead_ms:.2f}ms (target: < 5ms)")
 
+    @property
+    def metrics(self) -> Dict[str, PerformanceMetrics]:
+        """Per-connector metrics merged across threads."""
+        with self._lock:
+            self._prune_locked()
+            live = self._histograms
+            merged = {name: histogram.copy() for name, histogram in self._retired.items()}
+
+        for name, _, histogram in live:
+            if name in merged:
+                merged[name].merge(histogram)
+            else:
+                merged[name] = histogram.copy()
+        return {name: PerformanceMetrics(name, h) for name, h in merged.items()}
+
     def get_metrics(self, connector_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Get performance metrics.
@@ -125,11 +338,12 @@ class PerformanceMonitor:
         Returns:
             Dictionary of metrics
         """
+        metrics = self.metrics
         if connector_name:
-            metrics = self.metrics.get(connector_name)
-            return metrics.to_dict() if metrics else {}
+            connector_metrics = metrics.get(connector_name)
+            return connector_metrics.to_dict() if connector_metrics else {}
 
-        return {name: metrics.to_dict() for name, metrics in self.metrics.items()}
+        return {name: m.to_dict() for name, m in metrics.items()}
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -138,39 +352,71 @@ class PerformanceMonitor:
         Returns:
             Summary statistics
         """
-        if not self.metrics:
+        metrics = self.metrics
+        if not metrics:
             return {"message": "No performance data collected"}
 
-        all_measurements = []
-        for metrics in self.metrics.values():
-            all_measurements.extend(metrics.measurements)
-
-        total_calls = sum(m.call_count for m in self.metrics.values())
+        overall = OverheadHistogram()
+        for connector_metrics in metrics.values():
+            overall.merge(connector_metrics.histogram)
 
         return {
-            "total_calls": total_calls,
-            "connector_count": len(self.metrics),
-            "overall_average_ms": round(statistics.mean(all_measurements), 3)
-            if all_measurements
-            else 0.0,
-            "overall_median_ms": round(statistics.median(all_measurements), 3)
-            if all_measurements
-            else 0.0,
-            "overall_p95_ms": round(
-                sorted(all_measurements)[int(len(all_measurements) * 0.95)]
-                if all_measurements
-                else 0.0,
-                3,
-            ),
+            "total_calls": overall.count,
+            "connector_count": len(metrics),
+            "overall_average_ms": round(overall.mean_ms, 3),
+            "overall_median_ms": round(overall.percentile(50), 3),
+            "overall_p95_ms": round(overall.percentile(95), 3),
+            "overall_p99_ms": round(overall.percentile(99), 3),
             "connectors_exceeding_target": [
-                name for name, metrics in self.metrics.items() if metrics.exceeds_target
+                name for name, m in metrics.items() if m.exceeds_target
             ],
-            "by_connector": self.get_metrics(),
+            "by_connector": {name: m.to_dict() for name, m in metrics.items()},
         }
 
+    def to_prometheus(self, namespace: str = "cert") -> str:
+        """
+        Render connector overhead in Prometheus text format.
+
+        Exposes ``<namespace>_connector_overhead_seconds`` as a histogram per
+        connector plus the overhead target as a gauge, so alerts can compare
+        ``histogram_quantile`` against ``<namespace>_connector_overhead_target_seconds``.
+
+        Args:
+            namespace: Metric name prefix
+
+        Returns:
+            Prometheus exposition text (empty when nothing was recorded)
+        """
+        metrics = self.metrics
+        if not metrics:
+            return ""
+
+        name = f"{namespace}_connector_overhead_seconds"
+        lines = [
+            f"# HELP {name} Tracing overhead added by CERT connectors per call",
+            f"# TYPE {name} histogram",
+        ]
+        for connector, connector_metrics in metrics.items():
+            histogram = connector_metrics.histogram
+            for bound in PROMETHEUS_OVERHEAD_BUCKETS:
+                count = histogram.count_at_or_below(bound * 1000)
+                lines.append(f'{name}_bucket{{connector="{connector}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{connector="{connector}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{connector="{connector}"}} {histogram.sum_us / 1_000_000}')
+            lines.append(f'{name}_count{{connector="{connector}"}} {histogram.count}')
+
+        target = f"{namespace}_connector_overhead_target_seconds"
+        lines.append(f"# HELP {target} Per-call connector overhead target")
+        lines.append(f"# TYPE {target} gauge")
+        lines.append(f"{target} {OVERHEAD_TARGET_MS / 1000}")
+        return "\n".join(lines) + "\n"
+
     def reset(self):
         """Reset all metrics."""
-        self.metrics.clear()
+        with self._lock:
+            self._generation += 1
+            self._histograms = []
+            self._retired = {}
         logger.info("Performance metrics reset")
 
 
@@ -16,6 +16,7 @@ import logging
 from typing import List, Optional, Type
 
 from cert.integrations.base import ConnectorAdapter
+from cert.integrations.sampling import SamplingPolicy
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,11 @@ def register_connector(connector_class: Type[ConnectorAdapter]) -> Type[Connecto
     return connector_class
 
 
-def activate_all(tracer, skip_on_import_error: bool = True) -> List[ConnectorAdapter]:
+def activate_all(
+    tracer,
+    skip_on_import_error: bool = True,
+    sampling: Optional[SamplingPolicy] = None,
+) -> List[ConnectorAdapter]:
     """
     Activate all registered connectors.
 
@@ -70,6 +75,8 @@ def activate_all(tracer, skip_on_import_error: bool = True) -> List[ConnectorAda
     Args:
         tracer: The CERT tracer instance to pass to connectors
         skip_on_import_error: If True, skip connectors whose platforms aren't installed
+        sampling: Sampling policy shared by all connectors (defaults to each
+            connector's policy from the CERT_SAMPLE_* environment variables)
 
     Returns:
         List of successfully activated connector instances
@@ -88,6 +95,8 @@ def activate_all(tracer, skip_on_import_error: bool = True) -> List[ConnectorAda
         try:
             # Instantiate the connector
             connector = connector_cls(tracer)
+            if sampling is not None:
+                connector.sampling = sampling
 
             # Activate it
             connector.activate()
@@ -0,0 +1,207 @@
+"""
+Trace Sampling for Connectors
+=============================
+
+Decides which intercepted calls are written to the trace log.
+
+Two mechanisms combine:
+- Head sampling: each call is kept with a probability configured per
+  platform, per model or per ``platform:model`` pair.
+- Tail-based retention: calls that matter for analysis are always kept,
+  regardless of the head sampling rate: errors, slow calls, high-cost calls
+  and low-confidence evaluations.
+
+Calls kept by head sampling carry ``metadata["sample_weight"] = 1 / rate`` so
+that aggregations (``MetricsEngine``, ``CostAnalyzer``) can weight them back up
+to unbiased totals. Calls kept by a tail rule are recorded with weight 1 and
+``metadata["retained_by"]`` naming the rule.
+
+Configuration from the environment:
+    CERT_SAMPLE_RATE=0.1
+    CERT_SAMPLE_RATES=openai:gpt-4o-mini=0.01,bedrock=0.5
+    CERT_TAIL_SLOW_MS=5000
+    CERT_TAIL_MIN_COST=0.05
+    CERT_TAIL_MIN_CONFIDENCE=0.7
+"""
+
+import os
+import random
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from cert.integrations.base import TracedCall
+
+# Metadata keys checked, in order, for a call's latency
+LATENCY_KEYS = ("latency_ms", "duration_ms", "stream_duration_ms")
+
+
+def sample_weight(trace: Dict[str, Any]) -> float:
+    """
+    Number of calls a logged trace stands for.
+
+    Args:
+        trace: Trace dictionary as read from the trace log
+
+    Returns:
+        ``metadata["sample_weight"]`` when present, otherwise 1.0
+    """
+    metadata = trace.get("metadata")
+    if isinstance(metadata, dict):
+        weight = metadata.get("sample_weight")
+        if isinstance(weight, (int, float)) and weight > 0:
+            return float(weight)
+    return 1.0
+
+
+class SamplingPolicy:
+    """
+    Head sampling with tail-based retention.
+
+    Example:
+        >>> policy = SamplingPolicy(default_rate=0.1, slow_ms=2000, min_cost=0.05)
+        >>> policy.rate_for("openai", "gpt-4o-mini")
+        0.1
+    """
+
+    __slots__ = ("default_rate", "rates", "slow_ms", "min_cost", "min_confidence", "_random")
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        rates: Optional[Dict[str, float]] = None,
+        slow_ms: Optional[float] = None,
+        min_cost: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            default_rate: Keep probability for calls without a specific rate
+            rates: Keep probabilities keyed by ``platform:model``, model or platform
+            slow_ms: Always keep calls at least this slow
+            min_cost: Always keep calls costing at least this much (USD)
+            min_confidence: Always keep calls whose ``confidence`` is below this
+            seed: Seed for the sampling random generator (for reproducible tests)
+        """
+        for rate in [default_rate, *(rates or {}).values()]:
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"Sample rates must be between 0 and 1, got {rate}")
+
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self.slow_ms = slow_ms
+        self.min_cost = min_cost
+        self.min_confidence = min_confidence
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_env(cls) -> "SamplingPolicy":
+        """Load the sampling policy from environment variables."""
+        rates = {}
+        for entry in os.getenv("CERT_SAMPLE_RATES", "").split(","):
+            key, sep, value = entry.strip().rpartition("=")
+            if sep and key:
+                rates[key.strip()] = float(value)
+
+        def optional_float(name: str) -> Optional[float]:
+            value = os.getenv(name)
+            return float(value) if value else None
+
+        return cls(
+            default_rate=float(os.getenv("CERT_SAMPLE_RATE", "1.0")),
+            rates=rates,
+            slow_ms=optional_float("CERT_TAIL_SLOW_MS"),
+            min_cost=optional_float("CERT_TAIL_MIN_COST"),
+            min_confidence=optional_float("CERT_TAIL_MIN_CONFIDENCE"),
+        )
+
+    @property
+    def keeps_everything(self) -> bool:
+        """True when every call is kept unweighted."""
+        return self.default_rate >= 1.0 and all(rate >= 1.0 for rate in self.rates.values())
+
+    def rate_for(self, platform: str, model: str) -> float:
+        """
+        Head sampling rate for a platform and model.
+
+        The most specific match wins: ``platform:model``, then model, then
+        platform, then the default rate.
+        """
+        for key in (f"{platform}:{model}", model, platform):
+            if key in self.rates:
+                return self.rates[key]
+        return self.default_rate
+
+    def retention_reason(self, traced_call: "TracedCall") -> Optional[str]:
+        """
+        Tail rule that forces a call to be kept, if any.
+
+        Returns:
+            ``"error"``, ``"slow"``, ``"cost"``, ``"confidence"`` or None
+        """
+        if traced_call.error:
+            return "error"
+
+        metadata = traced_call.metadata
+        if self.slow_ms is not None:
+            for key in LATENCY_KEYS:
+                latency = metadata.get(key)
+                if isinstance(latency, (int, float)):
+                    if latency >= self.slow_ms:
+                        return "slow"
+                    break
+
+        if self.min_cost is not None and (traced_call.cost or 0) >= self.min_cost:
+            return "cost"
+
+        confidence = metadata.get("confidence")
+        if (
+            self.min_confidence is not None
+            and isinstance(confidence, (int, float))
+            and confidence < self.min_confidence
+        ):
+            return "confidence"
+
+        return None
+
+    def decide(self, traced_call: "TracedCall") -> Tuple[bool, float, Optional[str]]:
+        """
+        Decide whether to keep a call.
+
+        Args:
+            traced_call: Call about to be logged
+
+        Returns:
+            ``(keep, sample_weight, retained_by)``
+        """
+        reason = self.retention_reason(traced_call)
+        if reason is not None:
+            return True, 1.0, reason
+
+        rate = self.rate_for(traced_call.platform, traced_call.model)
+        if rate >= 1.0:
+            return True, 1.0, None
+        if rate <= 0.0 or self._random.random() >= rate:
+            return False, 0.0, None
+        return True, 1.0 / rate, None
+
+    def apply(self, traced_call: "TracedCall") -> bool:
+        """
+        Decide whether to keep a call and annotate its metadata.
+
+        Returns:
+            True if the call should be logged
+        """
+        if self.keeps_everything:
+            return True
+
+        keep, weight, reason = self.decide(traced_call)
+        if not keep:
+            return False
+        if weight != 1.0:
+            traced_call.metadata["sample_weight"] = weight
+        if reason is not None:
+            traced_call.metadata["retained_by"] = reason
+        return True
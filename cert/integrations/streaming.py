@@ -0,0 +1,192 @@
+"""
+Streaming Response Accumulation
+===============================
+
+Incremental state for traced streaming calls.
+
+Connectors fold each stream chunk into a StreamAccumulator as it passes
+through instead of retaining the SDK chunk objects until the stream ends.
+Only the text fragments, the latest finish reason and usage, and a handful
+of timing counters are kept, so memory stays proportional to the generated
+text rather than to the number of chunks.
+
+Timing uses a monotonic clock:
+- time to first token: request start until the first chunk carrying text
+- inter-token latency: gaps between consecutive text-bearing chunks
+
+TracedStream hands the tracing iterator back to the caller in place of the
+SDK stream object, keeping the stream's context manager, ``close()`` and
+other attributes such as ``response``.
+"""
+
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StreamAccumulator:
+    """
+    Running state for one streaming response.
+
+    Example:
+        >>> acc = StreamAccumulator()
+        >>> acc.add_chunk("Hel")
+        >>> acc.add_chunk("lo", finish_reason="stop")
+        >>> acc.text
+        'Hello'
+    """
+
+    __slots__ = (
+        "started",
+        "chunk_count",
+        "finish_reason",
+        "usage",
+        "_parts",
+        "_first_token_at",
+        "_last_token_at",
+        "_gap_count",
+        "_gap_total",
+        "_gap_max",
+    )
+
+    def __init__(self, started: Optional[float] = None):
+        """
+        Initialize the accumulator.
+
+        Args:
+            started: ``time.perf_counter()`` value when the request was sent;
+                defaults to now
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.chunk_count = 0
+        self.finish_reason: Optional[str] = None
+        self.usage: Dict[str, int] = {}
+        self._parts: List[str] = []
+        self._first_token_at: Optional[float] = None
+        self._last_token_at: Optional[float] = None
+        self._gap_count = 0
+        self._gap_total = 0.0
+        self._gap_max = 0.0
+
+    def add_chunk(
+        self,
+        text: Optional[str] = None,
+        finish_reason: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        Fold one chunk into the running state.
+
+        Args:
+            text: Text carried by the chunk, if any
+            finish_reason: Finish/stop reason reported by the chunk, if any
+            usage: Token counts reported by the chunk; merged into ``usage``
+        """
+        self.chunk_count += 1
+
+        if text:
+            now = time.perf_counter()
+            if self._first_token_at is None:
+                self._first_token_at = now
+            else:
+                gap = now - self._last_token_at
+                self._gap_count += 1
+                self._gap_total += gap
+                if gap > self._gap_max:
+                    self._gap_max = gap
+            self._last_token_at = now
+            self._parts.append(text)
+
+        if finish_reason:
+            self.finish_reason = finish_reason
+        if usage:
+            self.usage.update({k: v for k, v in usage.items() if v is not None})
+
+    @property
+    def text(self) -> str:
+        """Text accumulated so far."""
+        if len(self._parts) > 1:
+            # Collapse the fragments so repeated reads stay cheap
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def timing_metadata(self) -> Dict[str, Any]:
+        """
+        Timing fields for the traced call's metadata.
+
+        Returns:
+            Dictionary with ``time_to_first_token_ms`` (None if no text was
+            received), ``stream_duration_ms`` and, when more than one
+            text chunk arrived, inter-token latency mean and max in ms
+        """
+        metadata: Dict[str, Any] = {
+            "time_to_first_token_ms": None,
+            "stream_duration_ms": round((time.perf_counter() - self.started) * 1000, 3),
+        }
+        if self._first_token_at is not None:
+            metadata["time_to_first_token_ms"] = round(
+                (self._first_token_at - self.started) * 1000, 3
+            )
+        if self._gap_count:
+            metadata["inter_token_latency_ms_mean"] = round(
+                self._gap_total / self._gap_count * 1000, 3
+            )
+            metadata["inter_token_latency_ms_max"] = round(self._gap_max * 1000, 3)
+        return metadata
+
+    def metadata(self) -> Dict[str, Any]:
+        """Streaming metadata: chunk count, finish reason, usage and timing."""
+        metadata: Dict[str, Any] = {"streaming": True, "chunk_count": self.chunk_count}
+        if self.finish_reason:
+            metadata["finish_reason"] = self.finish_reason
+        metadata.update(self.usage)
+        metadata.update(self.timing_metadata())
+        return metadata
+
+
+class TracedStream:
+    """
+    SDK stream stand-in whose iteration goes through a tracing generator.
+
+    ``close()`` and the context manager protocol close both the generator
+    and the SDK stream; any other attribute is read from the SDK stream.
+
+    Example:
+        >>> with client.messages.create(..., stream=True) as stream:
+        ...     for event in stream:
+        ...         ...
+    """
+
+    def __init__(self, stream: Any, traced: Iterator):
+        """
+        Initialize the proxy.
+
+        Args:
+            stream: Stream object returned by the SDK
+            traced: Iterator yielding the stream's events while tracing them
+        """
+        self._stream = stream
+        self._traced = traced
+
+    def __iter__(self) -> "TracedStream":
+        return self
+
+    def __next__(self) -> Any:
+        return next(self._traced)
+
+    def __enter__(self) -> "TracedStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop tracing and close the SDK stream."""
+        close_traced = getattr(self._traced, "close", None)
+        if close_traced is not None:
+            close_traced()
+        close_stream = getattr(self._stream, "close", None)
+        if close_stream is not None:
+            close_stream()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
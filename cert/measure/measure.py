@@ -72,13 +72,20 @@ def measure(text1: str, text2: str) -> float:
     return confidence
 
 
-def measure_detailed(text1: str, text2: str) -> MeasurementResult:
+def measure_detailed(
+    text1: str, text2: str, embedding_model: str = "all-MiniLM-L6-v2"
+) -> MeasurementResult:
     """
     Measure accuracy with detailed breakdown.
 
     Returns full result object showing both semantic and grounding scores.
     Use this when you need to debug why confidence is low.
 
+    Args:
+        text1: First text (typically LLM output)
+        text2: Second text (typically ground truth)
+        embedding_model: Sentence transformer model for semantic similarity
+
     Example:
         >>> result = measure_detailed(
         ...     "Apple's revenue was $450B",
@@ -101,7 +108,7 @@ def measure_detailed(text1: str, text2: str) -> MeasurementResult:
     from cert.measure.grounding import compute_grounding_score
 
     # Compute components
-    embedding_engine = get_embedding_engine()
+    embedding_engine = get_embedding_engine(embedding_model)
     semantic = embedding_engine.compute_similarity(text1, text2)
     grounding = compute_grounding_score(text1, text2)
     confidence = 0.5 * semantic + 0.5 * grounding
@@ -7,6 +7,7 @@ This module provides a single source of truth for LLM system monitoring.
 """
 
 from cert.metrics.config import MetricConfig
+from cert.metrics.database import DatabaseMetricsEngine
 from cert.metrics.engine import MetricsEngine
 from cert.metrics.types import (
     CostMetric,
@@ -18,6 +19,7 @@ from cert.metrics.types import (
 
 __all__ = [
     "MetricsEngine",
+    "DatabaseMetricsEngine",
     "MetricConfig",
     "CostMetric",
     "HealthMetric",
@@ -0,0 +1,758 @@
+"""
+Database Metrics Engine
+=======================
+
+Computes the Cost, Health and Quality metrics inside the database when
+traces are stored in the ``traces`` table (see ``cert.database``), instead
+of loading every trace into Python.
+
+Cost and quality totals come from ``trace_rollups_hourly``, an hourly
+rollup per project, vendor and model. Postgres materialized views can only
+be refreshed by recomputing them entirely, so the rollup is a table that
+``refresh_rollups`` maintains incrementally: only hours after the stored
+watermark (plus a late-arrival margin) are recomputed, along with older
+hours that received traces since the last refresh (by ``ingested_at``, as
+replayed traces keep their original ``created_at``). Partial hours at the
+edges of a time window, and hours not rolled up yet, are aggregated from
+the raw table in the same query.
+
+Health needs the configurable latency thresholds and the P95 latency, so it
+is computed from the raw rows of the window with SQL aggregates and a
+(weighted) percentile query served by the ``created_at`` indexes.
+
+Postgres (psycopg2) and SQLite connections are supported; SQLite is meant
+for tests and single-host setups.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from cert.metrics.config import MetricConfig
+from cert.metrics.engine import MetricsEngine
+from cert.metrics.types import CostMetric, HealthMetric, MetricsSnapshot, QualityMetric, TimeWindow
+
+ROLLUP_TABLE = "trace_rollups_hourly"
+ROLLUP_STATE_TABLE = "trace_rollup_state"
+# State row holding when the last refresh looked for late traces
+INGEST_STATE = f"{ROLLUP_TABLE}:ingested"
+# Allowance for database/host clock skew and transactions committed after
+# their ``ingested_at`` default was taken
+INGEST_MARGIN = timedelta(minutes=5)
+
+# Summed rollup measures, in column order
+ROLLUP_MEASURES = (
+    "trace_count",
+    "calls",
+    "cost",
+    "error_calls",
+    "evaluated_calls",
+    "score_sum",
+    "passed_calls",
+)
+
+
+class _Dialect:
+    """SQL differences between the supported databases."""
+
+    name = "postgres"
+    placeholder = "%s"
+    timestamp_type = "TIMESTAMP WITH TIME ZONE"
+    uuid_type = "UUID"
+
+    def ts(self, expr: str) -> str:
+        """Comparable timestamp expression."""
+        return expr
+
+    def hour(self, expr: str) -> str:
+        """UTC hour bucket of a timestamp expression."""
+        return f"date_trunc('hour', {expr} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+    def param(self, value: datetime) -> Any:
+        """Bind value for a naive UTC datetime."""
+        return value.replace(tzinfo=timezone.utc)
+
+    def parse(self, value: Any) -> datetime:
+        """Naive UTC datetime from a stored timestamp."""
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class _SQLiteDialect(_Dialect):
+    """SQLite stores timestamps as ISO 8601 text."""
+
+    name = "sqlite"
+    placeholder = "?"
+    timestamp_type = "TEXT"
+    uuid_type = "TEXT"
+
+    def ts(self, expr: str) -> str:
+        return f"julianday({expr})"
+
+    def hour(self, expr: str) -> str:
+        return f"strftime('%Y-%m-%dT%H:00:00Z', {expr})"
+
+    def param(self, value: datetime) -> Any:
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    def parse(self, value: Any) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+class DatabaseMetricsEngine(MetricsEngine):
+    """
+    Metrics engine aggregating traces with SQL.
+
+    Returns the same metric types as ``MetricsEngine``. Quality is computed
+    from the evaluation scores stored on traces; the ``ground_truth``
+    method, which re-evaluates traces in Python, needs the file-based
+    engine.
+
+    Example:
+        >>> engine = DatabaseMetricsEngine.from_url("postgresql://localhost/cert")
+        >>> engine.refresh_rollups()
+        >>> metrics = engine.get_metrics("week")
+        >>> print(f"Cost: €{metrics.cost.value:.2f}")
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        config: Optional[MetricConfig] = None,
+        project_id: Optional[UUID] = None,
+        use_rollups: bool = True,
+        refresh_interval: float = 60.0,
+        late_arrival_hours: int = 3,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            connection: DB-API connection (psycopg2 or sqlite3)
+            config: Optional configuration (uses sensible defaults if not provided)
+            project_id: Only aggregate traces of this project
+            use_rollups: Read complete hours from the rollup table
+            refresh_interval: Minimum seconds between rollup refreshes
+                triggered by ``reload_traces``
+            late_arrival_hours: Hours before the watermark recomputed on
+                every refresh, picking up traces written late (e.g. replayed
+                from a sink spool)
+        """
+        super().__init__(traces_path="", config=config)
+        # Traces stay in the database; nothing is loaded into memory
+        self._traces = []
+
+        self.connection = connection
+        self.dialect = (
+            _SQLiteDialect() if isinstance(connection, sqlite3.Connection) else _Dialect()
+        )
+        self.project_id = project_id
+        self.use_rollups = use_rollups
+        self.refresh_interval = refresh_interval
+        self.late_arrival_hours = late_arrival_hours
+
+        self._lock = threading.Lock()
+        self._tables_ready = False
+        self._last_refresh = 0.0
+
+    @classmethod
+    def from_url(cls, dsn: str, config: Optional[MetricConfig] = None, **kwargs: Any):
+        """
+        Create an engine connected to Postgres.
+
+        Note: Requires psycopg2.
+
+        Args:
+            dsn: Postgres connection string
+            config: Optional configuration
+            **kwargs: Further arguments for ``__init__``
+        """
+        try:
+            import psycopg2
+        except ImportError:
+            raise ImportError("psycopg2 required. Install with: pip install psycopg2-binary")
+
+        return cls(psycopg2.connect(dsn), config=config, **kwargs)
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        """Run a read query; ``?`` marks parameters in every dialect."""
+        sql = sql.replace("?", self.dialect.placeholder)
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(sql, tuple(params))
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            # End the read transaction so the next query sees new traces
+            self.connection.commit()
+        return rows
+
+    def _execute(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        """Run write statements in one transaction."""
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                for sql, params in statements:
+                    cursor.execute(sql.replace("?", self.dialect.placeholder), tuple(params))
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def _window(self, column: str, inclusive_end: bool = True) -> str:
+        """Condition restricting a timestamp column to [?, ?] (or [?, ?))."""
+        ts = self.dialect.ts
+        end = "<=" if inclusive_end else "<"
+        return f"{ts(column)} >= {ts('?')} AND {ts(column)} {end} {ts('?')}"
+
+    def _project_filter(self) -> Tuple[str, List[Any]]:
+        if self.project_id is None:
+            return "", []
+        return " AND project_id = ?", [str(self.project_id)]
+
+    def _passed_expr(self) -> str:
+        """Weight of passed evaluations (explicit status, else score vs threshold)."""
+        return (
+            "CASE WHEN evaluation_status = 'pass' OR (evaluation_status IS NULL "
+            "AND evaluation_score >= ?) THEN sample_weight ELSE 0 END"
+        )
+
+    def ensure_rollup_tables(self) -> None:
+        """Create the rollup and watermark tables if they do not exist."""
+        if self._tables_ready:
+            return
+
+        d = self.dialect
+        measures = ",\n    ".join(
+            f"{m} INTEGER NOT NULL DEFAULT 0"
+            if m == "trace_count"
+            else f"{m} FLOAT NOT NULL DEFAULT 0"
+            for m in ROLLUP_MEASURES
+        )
+        self._execute(
+            [
+                (
+                    f"CREATE TABLE IF NOT EXISTS {ROLLUP_TABLE} (\n"
+                    f"    bucket {d.timestamp_type} NOT NULL,\n"
+                    f"    project_id {d.uuid_type},\n"
+                    "    vendor TEXT NOT NULL,\n"
+                    "    model TEXT NOT NULL,\n"
+                    f"    {measures}\n"
+                    ")",
+                    (),
+                ),
+                (
+                    f"CREATE INDEX IF NOT EXISTS idx_{ROLLUP_TABLE}_bucket "
+                    f"ON {ROLLUP_TABLE}(bucket, project_id)",
+                    (),
+                ),
+                (
+                    f"CREATE TABLE IF NOT EXISTS {ROLLUP_STATE_TABLE} ("
+                    f"name TEXT PRIMARY KEY, watermark {d.timestamp_type} NOT NULL, "
+                    "semantic_threshold FLOAT NOT NULL)",
+                    (),
+                ),
+            ]
+        )
+        self._tables_ready = True
+
+    def rollup_watermark(self) -> Optional[datetime]:
+        """
+        End of the rolled-up period (exclusive).
+
+        Returns:
+            Watermark, or None before the first refresh and when the
+            rollup was built with another quality semantic threshold
+        """
+        self.ensure_rollup_tables()
+        rows = self._query(
+            f"SELECT watermark, semantic_threshold FROM {ROLLUP_STATE_TABLE} WHERE name = ?",
+            [ROLLUP_TABLE],
+        )
+        if not rows or rows[0][1] != self.config.quality.semantic_threshold:
+            return None
+        return self.dialect.parse(rows[0][0])
+
+    def refresh_rollups(self, full: bool = False, now: Optional[datetime] = None) -> None:
+        """
+        Recompute the rollup for complete hours since the last refresh.
+
+        The whole rollup is rebuilt on the first refresh and after the
+        quality semantic threshold, which is applied when rolling up, changes.
+        Older hours are recomputed too when traces were ingested into them
+        since the last refresh (e.g. a spool replayed after an outage).
+
+        Args:
+            full: Rebuild the whole rollup
+            now: Current UTC time (default: ``datetime.utcnow()``)
+        """
+        self.ensure_rollup_tables()
+        d = self.dialect
+
+        ingested_through = datetime.utcnow()
+        upper = _floor_hour(now or ingested_through)
+        watermark = None if full else self.rollup_watermark()
+        lower = watermark - timedelta(hours=self.late_arrival_hours) if watermark else None
+
+        statements = self._rollup_statements(lower, upper)
+        if lower is not None:
+            for bucket in self._late_buckets(lower):
+                statements += self._rollup_statements(bucket, bucket + timedelta(hours=1))
+
+        threshold = self.config.quality.semantic_threshold
+        self._execute(
+            statements
+            + [
+                (
+                    f"DELETE FROM {ROLLUP_STATE_TABLE} WHERE name IN (?, ?)",
+                    [ROLLUP_TABLE, INGEST_STATE],
+                ),
+                (
+                    f"INSERT INTO {ROLLUP_STATE_TABLE} (name, watermark, semantic_threshold) "
+                    "VALUES (?, ?, ?), (?, ?, ?)",
+                    [
+                        ROLLUP_TABLE,
+                        d.param(upper),
+                        threshold,
+                        INGEST_STATE,
+                        d.param(ingested_through),
+                        threshold,
+                    ],
+                ),
+            ]
+        )
+        self._last_refresh = time.monotonic()
+
+    def _late_buckets(self, before: datetime) -> List[datetime]:
+        """
+        Hours before ``before`` that received traces since the last refresh.
+
+        Replayed or backfilled traces keep their original ``created_at``,
+        which can be older than the late-arrival margin; they are found by
+        ``ingested_at`` instead.
+        """
+        d = self.dialect
+        ts = d.ts
+        rows = self._query(
+            f"SELECT watermark FROM {ROLLUP_STATE_TABLE} WHERE name = ?", [INGEST_STATE]
+        )
+        if not rows:
+            return []
+        since = d.parse(rows[0][0]) - INGEST_MARGIN
+        rows = self._query(
+            f"SELECT DISTINCT {d.hour('created_at')} FROM traces "
+            f"WHERE {ts('ingested_at')} >= {ts('?')} AND {ts('created_at')} < {ts('?')}",
+            [d.param(since), d.param(before)],
+        )
+        return sorted(d.parse(row[0]) for row in rows)
+
+    def _rollup_statements(
+        self, lower: Optional[datetime], upper: datetime
+    ) -> List[Tuple[str, Sequence[Any]]]:
+        """Statements recomputing the rollup for [lower, upper) (or all hours before upper)."""
+        d = self.dialect
+        ts = d.ts
+
+        bucket_range = f"{ts('bucket')} < {ts('?')}"
+        trace_range = f"{ts('created_at')} < {ts('?')}"
+        range_params: List[Any] = [d.param(upper)]
+        if lower is not None:
+            bucket_range = f"{ts('bucket')} >= {ts('?')} AND " + bucket_range
+            trace_range = f"{ts('created_at')} >= {ts('?')} AND " + trace_range
+            range_params = [d.param(lower)] + range_params
+
+        columns = ", ".join(("bucket", "project_id", "vendor", "model") + ROLLUP_MEASURES)
+        threshold = self.config.quality.semantic_threshold
+        return [
+            (f"DELETE FROM {ROLLUP_TABLE} WHERE {bucket_range}", range_params),
+            (
+                f"INSERT INTO {ROLLUP_TABLE} ({columns})\n"
+                f"SELECT {d.hour('created_at')}, project_id,\n"
+                "    COALESCE(vendor, 'unknown'), COALESCE(model, 'unknown'),\n"
+                "    COUNT(*),\n"
+                "    SUM(sample_weight),\n"
+                "    SUM(cost * sample_weight),\n"
+                "    SUM(CASE WHEN status = 'error' THEN sample_weight ELSE 0 END),\n"
+                "    SUM(CASE WHEN evaluation_score IS NOT NULL"
+                " THEN sample_weight ELSE 0 END),\n"
+                "    SUM(COALESCE(evaluation_score, 0) * sample_weight),\n"
+                f"    SUM({self._passed_expr()})\n"
+                f"FROM traces WHERE {trace_range}\n"
+                "GROUP BY 1, 2, 3, 4",
+                [threshold] + range_params,
+            ),
+        ]
+
+    def reload_traces(self) -> None:
+        """Refresh the rollups when ``refresh_interval`` has elapsed."""
+        if self.use_rollups and time.monotonic() - self._last_refresh >= self.refresh_interval:
+            self.refresh_rollups()
+
+    def _totals(self, start: datetime, end: datetime) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """
+        Summed rollup measures per (vendor, model) for [start, end].
+
+        Complete hours below the watermark are read from the rollup; the
+        rest of the window is aggregated from raw traces.
+        """
+        self.ensure_rollup_tables()
+        d = self.dialect
+        threshold = self.config.quality.semantic_threshold
+        project_sql, project_params = self._project_filter()
+
+        watermark = self.rollup_watermark() if self.use_rollups else None
+        rollup_from = _ceil_hour(start)
+        rollup_to = min(_floor_hour(end), watermark) if watermark else rollup_from
+        if rollup_to <= rollup_from:
+            rollup_from = rollup_to = start
+
+        measures = ", ".join(f"SUM({m})" for m in ROLLUP_MEASURES)
+        sql = (
+            f"SELECT vendor, model, {measures} FROM (\n"
+            f"  SELECT vendor, model, {', '.join(ROLLUP_MEASURES)} FROM {ROLLUP_TABLE}\n"
+            f"  WHERE {self._window('bucket', inclusive_end=False)}{project_sql}\n"
+            "  UNION ALL\n"
+            "  SELECT COALESCE(vendor, 'unknown'), COALESCE(model, 'unknown'),\n"
+            "    1, sample_weight, cost * sample_weight,\n"
+            "    CASE WHEN status = 'error' THEN sample_weight ELSE 0 END,\n"
+            "    CASE WHEN evaluation_score IS NOT NULL THEN sample_weight ELSE 0 END,\n"
+            "    COALESCE(evaluation_score, 0) * sample_weight,\n"
+            f"    {self._passed_expr()}\n"
+            "  FROM traces\n"
+            f"  WHERE (({self._window('created_at', inclusive_end=False)})"
+            f" OR ({self._window('created_at')})){project_sql}\n"
+            ") combined GROUP BY vendor, model"
+        )
+        params = (
+            [d.param(rollup_from), d.param(rollup_to)]
+            + project_params
+            + [threshold, d.param(start), d.param(rollup_from), d.param(rollup_to), d.param(end)]
+            + project_params
+        )
+        return {
+            (vendor, model): dict(zip(ROLLUP_MEASURES, (float(v or 0) for v in values)))
+            for vendor, model, *values in self._query(sql, params)
+        }
+
+    @staticmethod
+    def _sum(totals: Dict[Tuple[str, str], Dict[str, float]], measure: str) -> float:
+        return sum(row[measure] for row in totals.values())
+
+    def _health_totals(self, start: datetime, end: datetime) -> Dict[str, float]:
+        """Weighted call, error and latency threshold counts for [start, end]."""
+        health = self.config.health
+        project_sql, project_params = self._project_filter()
+        rows = self._query(
+            "SELECT SUM(sample_weight),\n"
+            "  SUM(CASE WHEN status = 'error' THEN sample_weight ELSE 0 END),\n"
+            "  SUM(CASE WHEN duration_ms > 0 THEN sample_weight ELSE 0 END),\n"
+            "  SUM(CASE WHEN duration_ms > ? THEN sample_weight ELSE 0 END),\n"
+            "  SUM(CASE WHEN duration_ms > 0 AND duration_ms <= ? THEN sample_weight ELSE 0 END),\n"
+            "  SUM(CASE WHEN duration_ms > 0 THEN 1 ELSE 0 END),\n"
+            "  MIN(CASE WHEN duration_ms > 0 THEN sample_weight END),\n"
+            "  MAX(CASE WHEN duration_ms > 0 THEN sample_weight END)\n"
+            f"FROM traces WHERE {self._window('created_at')}{project_sql}",
+            [
+                health.p95_latency_threshold_ms,
+                health.max_latency_threshold_ms,
+                self.dialect.param(start),
+                self.dialect.param(end),
+            ]
+            + project_params,
+        )
+        keys = (
+            "calls",
+            "error_calls",
+            "latency_calls",
+            "slow_calls",
+            "sla_calls",
+            "latency_count",
+            "min_weight",
+            "max_weight",
+        )
+        return {k: float(v or 0) for k, v in zip(keys, rows[0])}
+
+    def _latency_percentile(
+        self, start: datetime, end: datetime, p: float, totals: Dict[str, float]
+    ) -> float:
+        """
+        Latency percentile over [start, end], matching ``MetricsEngine``.
+
+        Unweighted traces use linear interpolation between the two nearest
+        ranks; sampled traces use the smallest latency whose cumulative
+        weight reaches p percent.
+        """
+        count = int(totals["latency_count"])
+        if count == 0:
+            return 0.0
+
+        project_sql, project_params = self._project_filter()
+        window = f"{self._window('created_at')} AND duration_ms > 0{project_sql}"
+        window_params = [self.dialect.param(start), self.dialect.param(end)] + project_params
+
+        if totals["min_weight"] == totals["max_weight"] == 1.0:
+            k = (count - 1) * p / 100
+            f = int(k)
+            rows = self._query(
+                f"SELECT duration_ms FROM traces WHERE {window} "
+                "ORDER BY duration_ms LIMIT 2 OFFSET ?",
+                window_params + [f],
+            )
+            lower = rows[0][0]
+            if len(rows) == 1 or k == f:
+                return lower
+            return lower * (f + 1 - k) + rows[1][0] * (k - f)
+
+        rows = self._query(
+            "SELECT duration_ms FROM (\n"
+            "  SELECT duration_ms, SUM(sample_weight) OVER (\n"
+            "    ORDER BY duration_ms ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW\n"
+            "  ) AS cumulative\n"
+            f"  FROM traces WHERE {window}\n"
+            ") ranked WHERE cumulative >= ? ORDER BY duration_ms LIMIT 1",
+            window_params + [totals["latency_calls"] * p / 100],
+        )
+        if rows:
+            return rows[0][0]
+        # Floating point shortfall on the last row
+        return self._query(f"SELECT MAX(duration_ms) FROM traces WHERE {window}", window_params)[0][
+            0
+        ]
+
+    def _cost_from_totals(
+        self,
+        current: Dict[Tuple[str, str], Dict[str, float]],
+        previous: Dict[Tuple[str, str], Dict[str, float]],
+        time_window: str,
+    ) -> CostMetric:
+        current_cost = self._sum(current, "cost")
+        previous_cost = self._sum(previous, "cost")
+
+        if previous_cost > 0:
+            trend = ((current_cost - previous_cost) / previous_cost) * 100
+        else:
+            trend = 0.0 if current_cost == 0 else 100.0
+
+        by_model: Dict[str, float] = {}
+        by_platform: Dict[str, float] = {}
+        for (vendor, model), row in current.items():
+            by_model[model] = by_model.get(model, 0.0) + row["cost"]
+            by_platform[vendor] = by_platform.get(vendor, 0.0) + row["cost"]
+
+        window_days = TimeWindow(time_window).to_days()
+        daily_average = current_cost / window_days if window_days > 0 else 0
+
+        budget_utilization = None
+        budget = None
+        if time_window == "week" and self.config.cost.weekly_budget:
+            budget = self.config.cost.weekly_budget
+            budget_utilization = (current_cost / budget) * 100 if budget > 0 else 0
+        elif time_window == "month" and self.config.cost.monthly_budget:
+            budget = self.config.cost.monthly_budget
+            budget_utilization = (current_cost / budget) * 100 if budget > 0 else 0
+
+        return CostMetric(
+            value=current_cost,
+            trend=trend,
+            currency=self.config.cost.currency,
+            by_model=by_model,
+            by_platform=by_platform,
+            daily_average=daily_average,
+            monthly_projection=daily_average * 30,
+            budget=budget,
+            budget_utilization=budget_utilization,
+            time_window=time_window,
+            trace_count=round(self._sum(current, "calls")),
+        )
+
+    def _quality_from_totals(
+        self,
+        current: Dict[Tuple[str, str], Dict[str, float]],
+        previous: Dict[Tuple[str, str], Dict[str, float]],
+        time_window: str,
+    ) -> QualityMetric:
+        evaluated_weight = self._sum(current, "evaluated_calls")
+        if evaluated_weight == 0:
+            return QualityMetric(
+                value=100.0,  # No data = assume quality is good
+                trend=0.0,
+                method="semantic_consistency",
+                time_window=time_window,
+            )
+
+        current_quality = self._sum(current, "score_sum") * 100 / evaluated_weight
+        passed_weight = self._sum(current, "passed_calls")
+
+        by_model_totals: Dict[str, List[float]] = {}
+        for (_, model), row in current.items():
+            scored = by_model_totals.setdefault(model, [0.0, 0.0])
+            scored[0] += row["score_sum"]
+            scored[1] += row["evaluated_calls"]
+        model_quality = {
+            model: score_sum * 100 / weight
+            for model, (score_sum, weight) in by_model_totals.items()
+            if weight > 0
+        }
+
+        previous_quality = 100.0
+        previous_weight = self._sum(previous, "evaluated_calls")
+        if previous_weight > 0:
+            previous_quality = self._sum(previous, "score_sum") * 100 / previous_weight
+
+        return QualityMetric(
+            value=current_quality,
+            trend=current_quality - previous_quality,
+            method="semantic_consistency",
+            accuracy_rate=passed_weight / evaluated_weight,
+            consistency_score=current_quality / 100,
+            evaluated_count=round(evaluated_weight),
+            passed_count=round(passed_weight),
+            failed_count=round(evaluated_weight) - round(passed_weight),
+            by_model=model_quality,
+            time_window=time_window,
+        )
+
+    def cost_metric(self, time_window: str = "week") -> CostMetric:
+        """
+        Calculate cost metric for the time window with SQL aggregation.
+
+        Args:
+            time_window: Time window for calculation (hour, day, week, month)
+
+        Returns:
+            CostMetric with value, trend, and breakdowns
+        """
+        current_start, current_end, previous_start, previous_end = self._get_time_window_dates(
+            time_window
+        )
+        return self._cost_from_totals(
+            self._totals(current_start, current_end),
+            self._totals(previous_start, previous_end),
+            time_window,
+        )
+
+    def health_metric(self, time_window: str = "week") -> HealthMetric:
+        """
+        Calculate health metric for the time window with SQL aggregation.
+
+        Args:
+            time_window: Time window for calculation (hour, day, week, month)
+
+        Returns:
+            HealthMetric with score, trend, and components
+        """
+        current_start, current_end, previous_start, previous_end = self._get_time_window_dates(
+            time_window
+        )
+        health = self.config.health
+        current = self._health_totals(current_start, current_end)
+
+        if current["calls"] == 0:
+            return HealthMetric(
+                value=100.0,
+                trend=0.0,
+                error_rate=0.0,
+                p95_latency=0.0,
+                time_window=time_window,
+            )
+
+        error_rate = current["error_calls"] / current["calls"]
+        p95_latency = self._latency_percentile(current_start, current_end, 95, current)
+        latency_penalty = (current["slow_calls"] / current["calls"]) * health.latency_penalty_weight
+        health_score = max(0.0, 100.0 * (1 - error_rate - latency_penalty))
+        sla_compliance = (
+            current["sla_calls"] / current["latency_calls"] * 100
+            if current["latency_calls"]
+            else 100.0
+        )
+
+        previous_health = 100.0
+        previous = self._health_totals(previous_start, previous_end)
+        if previous["calls"] > 0:
+            prev_error_rate = previous["error_calls"] / previous["calls"]
+            prev_latency_penalty = (
+                previous["slow_calls"] / previous["calls"]
+            ) * health.latency_penalty_weight
+            previous_health = max(0.0, 100.0 * (1 - prev_error_rate - prev_latency_penalty))
+
+        issues = []
+        if error_rate > health.critical_error_rate:
+            issues.append(f"Critical: Error rate ({error_rate * 100:.1f}%) exceeds threshold")
+        elif error_rate > health.warning_error_rate:
+            issues.append(f"Warning: Elevated error rate ({error_rate * 100:.1f}%)")
+
+        if p95_latency > health.p95_latency_threshold_ms:
+            issues.append(f"Warning: P95 latency ({p95_latency:.0f}ms) exceeds threshold")
+
+        return HealthMetric(
+            value=health_score,
+            trend=health_score - previous_health,
+            error_rate=error_rate,
+            p95_latency=p95_latency,
+            latency_penalty=latency_penalty,
+            sla_compliance=sla_compliance,
+            total_requests=round(current["calls"]),
+            error_count=round(current["error_calls"]),
+            slow_request_count=round(current["slow_calls"]),
+            issues=issues,
+            time_window=time_window,
+        )
+
+    def quality_metric(self, time_window: str = "week") -> QualityMetric:
+        """
+        Calculate quality metric from stored evaluation scores.
+
+        Args:
+            time_window: Time window for calculation (hour, day, week, month)
+
+        Returns:
+            QualityMetric with score, trend, and evaluation details
+        """
+        current_start, current_end, previous_start, previous_end = self._get_time_window_dates(
+            time_window
+        )
+        return self._quality_from_totals(
+            self._totals(current_start, current_end),
+            self._totals(previous_start, previous_end),
+            time_window,
+        )
+
+    def get_metrics(self, time_window: Optional[str] = None) -> MetricsSnapshot:
+        """
+        Get all three metrics as a snapshot.
+
+        Cost and quality share one aggregation query per period.
+
+        Args:
+            time_window: Time window for calculations (uses config default if not specified)
+
+        Returns:
+            MetricsSnapshot with cost, health, and quality metrics
+        """
+        window = time_window or self.config.default_time_window
+        current_start, current_end, previous_start, previous_end = self._get_time_window_dates(
+            window
+        )
+        current = self._totals(current_start, current_end)
+        previous = self._totals(previous_start, previous_end)
+
+        return MetricsSnapshot(
+            cost=self._cost_from_totals(current, previous, window),
+            health=self.health_metric(window),
+            quality=self._quality_from_totals(current, previous, window),
+            time_window=window,
+        )
@@ -7,12 +7,12 @@ Aggregates data from existing CERT components with sensible defaults.
 """
 
 import json
-import statistics
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from cert.integrations.sampling import sample_weight
 from cert.metrics.config import MetricConfig
 from cert.metrics.types import (
     CostMetric,
@@ -28,7 +28,9 @@ class MetricsEngine:
     Unified metrics computation engine.
 
     Computes the three primary metrics (Cost, Health, Quality) from trace data
-    with sensible defaults that work out of the box.
+    with sensible defaults that work out of the box. Traces written under head
+    sampling are weighted by their ``sample_weight`` so totals, rates and
+    percentiles estimate the full call population.
 
     Example:
         >>> engine = MetricsEngine("cert_traces.jsonl")
@@ -135,10 +137,14 @@ class MetricsEngine:
 
         return filtered
 
-    def _calculate_percentile(self, values: List[float], p: float) -> float:
-        """Calculate percentile of a list of values."""
+    def _calculate_percentile(
+        self, values: List[float], p: float, weights: Optional[List[float]] = None
+    ) -> float:
+        """Calculate percentile of a list of values, optionally weighted."""
         if not values:
             return 0.0
+        if weights is not None and any(w != 1.0 for w in weights):
+            return self._calculate_weighted_percentile(values, weights, p)
         sorted_values = sorted(values)
         k = (len(sorted_values) - 1) * p / 100
         f = int(k)
@@ -147,6 +153,34 @@ class MetricsEngine:
             return sorted_values[int(k)]
         return sorted_values[f] * (c - k) + sorted_values[c] * (k - f)
 
+    @staticmethod
+    def _calculate_weighted_percentile(
+        values: List[float], weights: List[float], p: float
+    ) -> float:
+        """Smallest value whose cumulative weight reaches p percent of the total."""
+        pairs = sorted(zip(values, weights))
+        target = sum(weights) * p / 100
+        cumulative = 0.0
+        for value, weight in pairs:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return pairs[-1][0]
+
+    @staticmethod
+    def _trace_cost(trace: Dict[str, Any]) -> float:
+        """Weighted cost of a trace."""
+        cost = trace.get("cost", 0) or trace.get("metadata", {}).get("cost", 0) or 0
+        return cost * sample_weight(trace)
+
+    @staticmethod
+    def _trace_latency(trace: Dict[str, Any]) -> Optional[float]:
+        return (
+            trace.get("duration_ms")
+            or trace.get("latency_ms")
+            or trace.get("metadata", {}).get("latency_ms")
+        )
+
     def cost_metric(self, time_window: str = "week") -> CostMetric:
         """
         Calculate cost metric for the time window.
@@ -168,14 +202,10 @@ class MetricsEngine:
         previous_traces = self._filter_traces_by_date(self.traces, previous_start, previous_end)
 
         # Calculate current period cost
-        current_cost = sum(
-            t.get("cost", 0) or t.get("metadata", {}).get("cost", 0) or 0 for t in current_traces
-        )
+        current_cost = sum(self._trace_cost(t) for t in current_traces)
 
         # Calculate previous period cost
-        previous_cost = sum(
-            t.get("cost", 0) or t.get("metadata", {}).get("cost", 0) or 0 for t in previous_traces
-        )
+        previous_cost = sum(self._trace_cost(t) for t in previous_traces)
 
         # Calculate trend
         if previous_cost > 0:
@@ -187,8 +217,7 @@ class MetricsEngine:
         by_model: Dict[str, float] = defaultdict(float)
         for trace in current_traces:
             model = trace.get("model") or trace.get("metadata", {}).get("model") or "unknown"
-            cost = trace.get("cost", 0) or trace.get("metadata", {}).get("cost", 0) or 0
-            by_model[model] += cost
+            by_model[model] += self._trace_cost(trace)
 
         # Breakdown by platform
         by_platform: Dict[str, float] = defaultdict(float)
@@ -196,8 +225,7 @@ class MetricsEngine:
             platform = (
                 trace.get("platform") or trace.get("metadata", {}).get("platform") or "unknown"
             )
-            cost = trace.get("cost", 0) or trace.get("metadata", {}).get("cost", 0) or 0
-            by_platform[platform] += cost
+            by_platform[platform] += self._trace_cost(trace)
 
         # Calculate daily average and projection
         window_days = TimeWindow(time_window).to_days()
@@ -225,7 +253,7 @@ class MetricsEngine:
             budget=budget,
             budget_utilization=budget_utilization,
             time_window=time_window,
-            trace_count=len(current_traces),
+            trace_count=round(sum(sample_weight(t) for t in current_traces)),
         )
 
     def health_metric(self, time_window: str = "week") -> HealthMetric:
@@ -259,62 +287,63 @@ class MetricsEngine:
                 time_window=time_window,
             )
 
+        # Estimated call count (sampled traces stand for several calls)
+        total_weight = sum(sample_weight(t) for t in current_traces)
+
         # Calculate error rate
-        error_count = sum(1 for t in current_traces if t.get("error") or t.get("status") == "error")
-        error_rate = error_count / len(current_traces)
+        error_weight = sum(
+            sample_weight(t) for t in current_traces if t.get("error") or t.get("status") == "error"
+        )
+        error_rate = error_weight / total_weight
 
         # Calculate latencies
         latencies = []
+        latency_weights = []
         for trace in current_traces:
-            latency = (
-                trace.get("duration_ms")
-                or trace.get("latency_ms")
-                or trace.get("metadata", {}).get("latency_ms")
-            )
+            latency = self._trace_latency(trace)
             if latency is not None:
                 latencies.append(latency)
+                latency_weights.append(sample_weight(trace))
 
         # Calculate P95 latency
-        p95_latency = self._calculate_percentile(latencies, 95) if latencies else 0.0
+        p95_latency = (
+            self._calculate_percentile(latencies, 95, latency_weights) if latencies else 0.0
+        )
 
         # Calculate latency penalty (slow requests)
         threshold = self.config.health.p95_latency_threshold_ms
-        slow_count = sum(1 for lat in latencies if lat > threshold)
-        latency_penalty = (
-            slow_count / len(current_traces)
-        ) * self.config.health.latency_penalty_weight
+        slow_weight = sum(w for lat, w in zip(latencies, latency_weights) if lat > threshold)
+        latency_penalty = (slow_weight / total_weight) * self.config.health.latency_penalty_weight
 
         # Calculate health score
         health_score = max(0.0, 100.0 * (1 - error_rate - latency_penalty))
 
         # Calculate SLA compliance
-        sla_compliant_count = sum(
-            1 for lat in latencies if lat <= self.config.health.max_latency_threshold_ms
+        sla_compliant_weight = sum(
+            w
+            for lat, w in zip(latencies, latency_weights)
+            if lat <= self.config.health.max_latency_threshold_ms
         )
-        sla_compliance = (sla_compliant_count / len(latencies) * 100) if latencies else 100.0
+        sla_compliance = (sla_compliant_weight / sum(latency_weights) * 100) if latencies else 100.0
 
         # Calculate previous period health for trend
         previous_health = 100.0
         if previous_traces:
-            prev_error_count = sum(
-                1 for t in previous_traces if t.get("error") or t.get("status") == "error"
+            prev_total_weight = sum(sample_weight(t) for t in previous_traces)
+            prev_error_weight = sum(
+                sample_weight(t)
+                for t in previous_traces
+                if t.get("error") or t.get("status") == "error"
             )
-            prev_error_rate = prev_error_count / len(previous_traces)
-            prev_latencies = []
+            prev_error_rate = prev_error_weight / prev_total_weight
+            prev_slow_weight = 0.0
             for trace in previous_traces:
-                latency = (
-                    trace.get("duration_ms")
-                    or trace.get("latency_ms")
-                    or trace.get("metadata", {}).get("latency_ms")
-                )
-                if latency is not None:
-                    prev_latencies.append(latency)
-            prev_slow_count = sum(1 for lat in prev_latencies if lat > threshold)
+                latency = self._trace_latency(trace)
+                if latency is not None and latency > threshold:
+                    prev_slow_weight += sample_weight(trace)
             prev_latency_penalty = (
-                (prev_slow_count / len(previous_traces)) * self.config.health.latency_penalty_weight
-                if previous_traces
-                else 0
-            )
+                prev_slow_weight / prev_total_weight
+            ) * self.config.health.latency_penalty_weight
             previous_health = max(0.0, 100.0 * (1 - prev_error_rate - prev_latency_penalty))
 
         trend = health_score - previous_health
@@ -336,9 +365,9 @@ class MetricsEngine:
             p95_latency=p95_latency,
             latency_penalty=latency_penalty,
             sla_compliance=sla_compliance,
-            total_requests=len(current_traces),
-            error_count=error_count,
-            slow_request_count=slow_count,
+            total_requests=round(total_weight),
+            error_count=round(error_weight),
+            slow_request_count=round(slow_weight),
             issues=issues,
             time_window=time_window,
         )
@@ -386,9 +415,10 @@ class MetricsEngine:
         """
         # Look for traces with evaluation results or confidence scores
         evaluations = []
-        by_model: Dict[str, List[float]] = defaultdict(list)
+        by_model: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
 
         for trace in current_traces:
+            weight = sample_weight(trace)
             # Check for existing evaluation results
             if "evaluation" in trace:
                 eval_result = trace["evaluation"]
@@ -397,10 +427,11 @@ class MetricsEngine:
                     {
                         "passed": eval_result.get("matched", False),
                         "score": score,
+                        "weight": weight,
                     }
                 )
                 model = trace.get("model", "unknown")
-                by_model[model].append(score)
+                by_model[model].append((score, weight))
 
             # Check for confidence in metadata
             elif trace.get("metadata", {}).get("confidence"):
@@ -409,10 +440,11 @@ class MetricsEngine:
                     {
                         "passed": conf >= self.config.quality.semantic_threshold,
                         "score": conf * 100,
+                        "weight": weight,
                     }
                 )
                 model = trace.get("model", "unknown")
-                by_model[model].append(conf * 100)
+                by_model[model].append((conf * 100, weight))
 
             # Check for context and answer to compute basic quality
             elif trace.get("context") and trace.get("answer"):
@@ -430,10 +462,11 @@ class MetricsEngine:
                     {
                         "passed": score >= self.config.quality.semantic_threshold * 100,
                         "score": score,
+                        "weight": weight,
                     }
                 )
                 model = trace.get("model", "unknown")
-                by_model[model].append(score)
+                by_model[model].append((score, weight))
 
         if not evaluations:
             return QualityMetric(
@@ -443,15 +476,18 @@ class MetricsEngine:
                 time_window=time_window,
             )
 
-        # Calculate current quality
-        current_quality = statistics.mean(e["score"] for e in evaluations)
-        passed_count = sum(1 for e in evaluations if e["passed"])
-        accuracy_rate = passed_count / len(evaluations)
+        # Calculate current quality (weighted by sample weight)
+        evaluated_weight = sum(e["weight"] for e in evaluations)
+        current_quality = sum(e["score"] * e["weight"] for e in evaluations) / evaluated_weight
+        passed_weight = sum(e["weight"] for e in evaluations if e["passed"])
+        accuracy_rate = passed_weight / evaluated_weight
         consistency_score = current_quality / 100
 
         # Calculate by-model quality
         model_quality = {
-            model: statistics.mean(scores) if scores else 0 for model, scores in by_model.items()
+            model: sum(score * weight for score, weight in scored)
+            / sum(weight for _, weight in scored)
+            for model, scored in by_model.items()
         }
 
         # Calculate previous quality for trend
@@ -460,12 +496,17 @@ class MetricsEngine:
             prev_evaluations = []
             for trace in previous_traces:
                 if "evaluation" in trace:
-                    prev_evaluations.append(trace["evaluation"].get("confidence", 0) * 100)
+                    score = trace["evaluation"].get("confidence", 0) * 100
                 elif trace.get("metadata", {}).get("confidence"):
-                    prev_evaluations.append(trace["metadata"]["confidence"] * 100)
+                    score = trace["metadata"]["confidence"] * 100
+                else:
+                    continue
+                prev_evaluations.append((score, sample_weight(trace)))
 
             if prev_evaluations:
-                previous_quality = statistics.mean(prev_evaluations)
+                previous_quality = sum(s * w for s, w in prev_evaluations) / sum(
+                    w for _, w in prev_evaluations
+                )
 
         trend = current_quality - previous_quality
 
@@ -475,9 +516,9 @@ class MetricsEngine:
             method="semantic_consistency",
             accuracy_rate=accuracy_rate,
             consistency_score=consistency_score,
-            evaluated_count=len(evaluations),
-            passed_count=passed_count,
-            failed_count=len(evaluations) - passed_count,
+            evaluated_count=round(evaluated_weight),
+            passed_count=round(passed_weight),
+            failed_count=round(evaluated_weight) - round(passed_weight),
             by_model=model_quality,
             time_window=time_window,
         )
@@ -225,13 +225,20 @@ def metrics_endpoint() -> str:
     """
     Return Prometheus metrics in text format.
 
+    Connector overhead histograms from the PerformanceMonitor are appended
+    when monitoring is enabled; they do not depend on prometheus_client.
+
     Returns:
         Metrics in Prometheus exposition format
     """
+    from cert.integrations.performance import get_performance_monitor
+
+    overhead = get_performance_monitor().to_prometheus()
+
     if not PROMETHEUS_AVAILABLE:
-        return "# Metrics not available (prometheus_client not installed)\n"
+        return "# Metrics not available (prometheus_client not installed)\n" + overhead
 
-    return generate_latest(REGISTRY).decode("utf-8")
+    return generate_latest(REGISTRY).decode("utf-8") + overhead
 
 
 def create_metrics_app(host: str = "0.0.0.0", port: int = 9090):
@@ -8,9 +8,17 @@ for production LLM observability.
 from cert.observability.telemetry.custom_metrics import CustomMetrics, MetricType
 from cert.observability.telemetry.opentelemetry_exporter import OpenTelemetryExporter
 from cert.observability.telemetry.prometheus_metrics import PrometheusMetrics
+from cert.observability.telemetry.span_processor import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OTLPSpanExporter,
+)
 
 __all__ = [
     "OpenTelemetryExporter",
+    "BatchSpanProcessor",
+    "FileSpanExporter",
+    "OTLPSpanExporter",
     "PrometheusMetrics",
     "CustomMetrics",
     "MetricType",
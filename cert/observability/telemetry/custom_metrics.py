@@ -6,8 +6,8 @@ LLM monitoring needs.
 """
 
 import json
-import statistics
-from collections import deque
+import math
+import warnings
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -36,13 +36,132 @@ class MetricDefinition:
     aggregation: str = "sum"  # sum, avg, max, min, p50, p90, p99
 
 
-@dataclass
-class MetricDataPoint:
-    """Single metric data point."""
+# Aggregations computed from raw points rather than rollups
+PERCENTILE_AGGREGATIONS = ("p50", "p90", "p99")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch for a naive UTC datetime."""
+    return (timestamp - _EPOCH).total_seconds()
+
+
+class RollupBucket:
+    """Aggregates of the observations in one time bucket."""
+
+    __slots__ = ("count", "sum", "sum_sq", "min", "max", "delta")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.delta = 0.0
+
+    def add(self, value: float, delta: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.sum_sq += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.delta += delta
+
+
+class RingBuffer:
+    """
+    Fixed-capacity NumPy ring buffer of (timestamp, value) points.
+
+    Requires: pip install cert-framework[monitoring]
+    """
+
+    def __init__(self, capacity: int):
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError(
+                "Raw metric points require: pip install cert-framework[monitoring]\n"
+                "This includes the numpy dependency."
+            )
+
+        self._np = np
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        self.size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, value: float) -> None:
+        self.timestamps[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def ordered(self) -> tuple[Any, Any]:
+        """Timestamps and values in insertion order."""
+        if self.size < self.capacity:
+            return self.timestamps[: self.size], self.values[: self.size]
+        order = self._np.r_[self._next : self.capacity, 0 : self._next]
+        return self.timestamps[order], self.values[order]
+
+    def since(self, cutoff: float) -> Any:
+        """Values recorded at or after ``cutoff`` (epoch seconds)."""
+        timestamps, values = self.ordered()
+        return values[timestamps >= cutoff]
+
+
+class MetricSeries:
+    """
+    One (metric, label set) series.
+
+    Holds the current value in O(1), time-bucketed rollups for window
+    queries and, optionally, a ring buffer of raw points for percentiles.
+    """
 
-    value: float
-    labels: dict[str, str]
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    def __init__(
+        self,
+        labels: dict[str, str],
+        bucket_seconds: int,
+        max_buckets: int,
+        raw_capacity: int = 0,
+    ):
+        self.labels = labels
+        self.bucket_seconds = bucket_seconds
+        self.max_buckets = max_buckets
+        self.current: float | None = None
+        self.sequence = 0
+        self.count = 0
+        self.rollups: dict[int, RollupBucket] = {}
+        self.raw = RingBuffer(raw_capacity) if raw_capacity else None
+
+    def observe(self, value: float, timestamp: datetime, sequence: int, delta: float = 0.0) -> None:
+        seconds = _epoch_seconds(timestamp)
+        key = int(seconds // self.bucket_seconds)
+
+        bucket = self.rollups.get(key)
+        if bucket is None:
+            bucket = self.rollups[key] = RollupBucket()
+            if len(self.rollups) > self.max_buckets:
+                del self.rollups[min(self.rollups)]
+        bucket.add(value, delta)
+
+        if self.raw is not None:
+            self.raw.append(seconds, value)
+
+        self.current = value
+        self.sequence = sequence
+        self.count += 1
+
+    def buckets_since(self, cutoff: float) -> list[tuple[int, RollupBucket]]:
+        """Rollup buckets overlapping the window starting at ``cutoff``."""
+        first = int(cutoff // self.bucket_seconds)
+        return [(key, bucket) for key, bucket in self.rollups.items() if key >= first]
 
 
 class CustomMetrics:
@@ -52,6 +171,11 @@ class CustomMetrics:
     Provides flexible metric definition and collection for
     domain-specific monitoring needs.
 
+    Each (metric, label set) pair is a ``MetricSeries``: recording and
+    incrementing are O(1), and window queries read per-minute rollups
+    rather than raw history. Raw points (needed only for percentiles) are
+    kept in NumPy ring buffers when ``keep_raw_points`` is enabled.
+
     Example:
         metrics = CustomMetrics()
 
@@ -74,19 +198,30 @@ class CustomMetrics:
         self,
         max_history: int = 100000,
         default_window_minutes: int = 60,
+        keep_raw_points: bool = False,
+        rollup_seconds: int = 60,
+        retention_minutes: int = 24 * 60,
     ):
         """
         Initialize custom metrics.
 
         Args:
-            max_history: Maximum data points to keep per metric
+            max_history: Maximum raw data points to keep per series
             default_window_minutes: Default time window for aggregations
+            keep_raw_points: Keep raw points in NumPy ring buffers for
+                percentiles (requires [monitoring])
+            rollup_seconds: Width of rollup buckets
+            retention_minutes: How long rollups are kept
         """
         self.max_history = max_history
         self.default_window_minutes = default_window_minutes
+        self.keep_raw_points = keep_raw_points
+        self.rollup_seconds = rollup_seconds
+        self.max_rollups = max(1, retention_minutes * 60 // rollup_seconds)
 
         self._definitions: dict[str, MetricDefinition] = {}
-        self._data: dict[str, deque[MetricDataPoint]] = {}
+        self._series: dict[str, dict[tuple[tuple[str, str], ...], MetricSeries]] = {}
+        self._sequence = 0
 
     def define(
         self,
@@ -107,7 +242,19 @@ class CustomMetrics:
             unit: Unit of measurement
             labels: Expected label names
             aggregation: Default aggregation method
+
+        Warns when a percentile aggregation or a histogram is defined
+        without ``keep_raw_points``, as percentiles would never be reported.
         """
+        if not self.keep_raw_points and (
+            aggregation in PERCENTILE_AGGREGATIONS or metric_type == MetricType.HISTOGRAM
+        ):
+            warnings.warn(
+                f"Metric '{name}' needs percentiles, but raw points are not kept; "
+                "create CustomMetrics with keep_raw_points=True",
+                stacklevel=2,
+            )
+
         self._definitions[name] = MetricDefinition(
             name=name,
             metric_type=metric_type,
@@ -116,7 +263,28 @@ class CustomMetrics:
             labels=labels or [],
             aggregation=aggregation,
         )
-        self._data[name] = deque(maxlen=self.max_history)
+        self._series[name] = {}
+
+    def _get_series(self, name: str, labels: dict[str, str] | None) -> MetricSeries:
+        """Get or create the series for an exact label set."""
+        key = tuple(sorted(labels.items())) if labels else ()
+        series = self._series[name].get(key)
+        if series is None:
+            series = self._series[name][key] = MetricSeries(
+                dict(labels or {}),
+                self.rollup_seconds,
+                self.max_rollups,
+                self.max_history if self.keep_raw_points else 0,
+            )
+        return series
+
+    def _matching_series(self, name: str, labels: dict[str, str] | None) -> list[MetricSeries]:
+        """Series whose labels include all of ``labels``."""
+        series = self._series.get(name, {})
+        if not labels:
+            return list(series.values())
+
+        return [s for s in series.values() if all(s.labels.get(k) == v for k, v in labels.items())]
 
     def record(
         self,
@@ -141,13 +309,10 @@ class CustomMetrics:
             # Auto-define as gauge if not defined
             self.define(name, MetricType.GAUGE, f"Auto-defined metric: {name}")
 
-        point = MetricDataPoint(
-            value=value,
-            labels=labels or {},
-            timestamp=timestamp or datetime.utcnow(),
-        )
-
-        self._data[name].append(point)
+        series = self._get_series(name, labels)
+        delta = value - series.current if series.current is not None else value
+        self._sequence += 1
+        series.observe(value, timestamp or datetime.utcnow(), self._sequence, delta)
         return True
 
     def increment(
@@ -167,10 +332,9 @@ class CustomMetrics:
         if name not in self._definitions:
             self.define(name, MetricType.COUNTER, f"Auto-defined counter: {name}")
 
-        # Get current value
-        current = self.get_current(name, labels)
-        new_value = (current or 0.0) + delta
-        self.record(name, new_value, labels)
+        series = self._get_series(name, labels)
+        self._sequence += 1
+        series.observe((series.current or 0.0) + delta, datetime.utcnow(), self._sequence, delta)
 
     def get_current(
         self,
@@ -187,21 +351,11 @@ class CustomMetrics:
         Returns:
             Current value or None
         """
-        if name not in self._data:
-            return None
-
-        data = list(self._data[name])
-        if not data:
-            return None
-
-        # Filter by labels if provided
-        if labels:
-            data = [d for d in data if all(d.labels.get(k) == v for k, v in labels.items())]
-
-        if not data:
+        matching = [s for s in self._matching_series(name, labels) if s.current is not None]
+        if not matching:
             return None
 
-        return data[-1].value
+        return max(matching, key=lambda s: s.sequence).current
 
     def get_statistics(
         self,
@@ -212,6 +366,9 @@ class CustomMetrics:
         """
         Get statistics for a metric.
 
+        The window is resolved at rollup granularity. Percentiles are
+        included only when raw points are kept.
+
         Args:
             name: Metric name
             window_minutes: Time window
@@ -220,38 +377,54 @@ class CustomMetrics:
         Returns:
             Dictionary of statistics
         """
-        if name not in self._data:
+        if name not in self._series:
             return {}
 
         window = window_minutes or self.default_window_minutes
-        cutoff = datetime.utcnow() - timedelta(minutes=window)
-
-        data = [d for d in self._data[name] if d.timestamp >= cutoff]
-
-        # Filter by labels
-        if labels:
-            data = [d for d in data if all(d.labels.get(k) == v for k, v in labels.items())]
-
-        if not data:
+        cutoff = _epoch_seconds(datetime.utcnow() - timedelta(minutes=window))
+
+        matching = self._matching_series(name, labels)
+        count = 0
+        total = total_sq = 0.0
+        minimum, maximum = math.inf, -math.inf
+        latest: MetricSeries | None = None
+        for series in matching:
+            buckets = series.buckets_since(cutoff)
+            for _, bucket in buckets:
+                count += bucket.count
+                total += bucket.sum
+                total_sq += bucket.sum_sq
+                minimum = min(minimum, bucket.min)
+                maximum = max(maximum, bucket.max)
+            if buckets and (latest is None or series.sequence > latest.sequence):
+                latest = series
+
+        if count == 0:
             return {"count": 0}
 
-        values = [d.value for d in data]
-
+        mean = total / count
         stats = {
-            "count": len(values),
-            "sum": sum(values),
-            "mean": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "current": values[-1],
+            "count": count,
+            "sum": total,
+            "mean": mean,
+            "min": minimum,
+            "max": maximum,
+            "current": latest.current if latest else None,
         }
 
-        if len(values) > 1:
-            stats["std"] = statistics.stdev(values)
-            sorted_values = sorted(values)
-            stats["p50"] = sorted_values[len(sorted_values) // 2]
-            stats["p90"] = sorted_values[int(len(sorted_values) * 0.9)]
-            stats["p99"] = sorted_values[int(len(sorted_values) * 0.99)]
+        if count > 1:
+            variance = max(total_sq - count * mean * mean, 0.0) / (count - 1)
+            stats["std"] = math.sqrt(variance)
+
+            raw = [s.raw.since(cutoff) for s in matching if s.raw is not None]
+            if raw:
+                import numpy as np
+
+                values = np.sort(np.concatenate(raw))
+                if len(values):
+                    stats["p50"] = float(values[len(values) // 2])
+                    stats["p90"] = float(values[int(len(values) * 0.9)])
+                    stats["p99"] = float(values[int(len(values) * 0.99)])
 
         return stats
 
@@ -264,6 +437,9 @@ class CustomMetrics:
         """
         Calculate rate of change per minute.
 
+        Counters report the total increment per minute; other metrics report
+        the sum of recorded values per minute.
+
         Args:
             name: Metric name
             window_minutes: Time window
@@ -272,11 +448,19 @@ class CustomMetrics:
         Returns:
             Rate per minute
         """
-        stats = self.get_statistics(name, window_minutes, labels)
-        if stats.get("count", 0) == 0:
+        definition = self._definitions.get(name)
+        if definition is None:
             return 0.0
 
-        return stats["sum"] / window_minutes
+        cutoff = _epoch_seconds(datetime.utcnow() - timedelta(minutes=window_minutes))
+        use_delta = definition.metric_type == MetricType.COUNTER
+
+        total = 0.0
+        for series in self._matching_series(name, labels):
+            for _, bucket in series.buckets_since(cutoff):
+                total += bucket.delta if use_delta else bucket.sum
+
+        return total / window_minutes
 
     def get_trend(
         self,
@@ -297,40 +481,30 @@ class CustomMetrics:
         Returns:
             List of bucketed statistics
         """
-        if name not in self._data:
+        if name not in self._series:
             return []
 
-        cutoff = datetime.utcnow() - timedelta(minutes=window_minutes)
-        data = [d for d in self._data[name] if d.timestamp >= cutoff]
-
-        if labels:
-            data = [d for d in data if all(d.labels.get(k) == v for k, v in labels.items())]
-
-        if not data:
-            return []
+        cutoff = _epoch_seconds(datetime.utcnow() - timedelta(minutes=window_minutes))
+        trend_seconds = bucket_minutes * 60
 
-        # Group by bucket
-        buckets: dict[int, list[float]] = {}
-        for d in data:
-            bucket_key = int(d.timestamp.timestamp() // (bucket_minutes * 60))
-            if bucket_key not in buckets:
-                buckets[bucket_key] = []
-            buckets[bucket_key].append(d.value)
-
-        trend = []
-        for bucket_key in sorted(buckets.keys()):
-            values = buckets[bucket_key]
-            bucket_time = datetime.fromtimestamp(bucket_key * bucket_minutes * 60)
-            trend.append(
-                {
-                    "timestamp": bucket_time.isoformat(),
-                    "count": len(values),
-                    "mean": statistics.mean(values),
-                    "sum": sum(values),
-                }
-            )
+        # Merge rollups into trend buckets: key -> [count, sum]
+        merged: dict[int, list[float]] = {}
+        for series in self._matching_series(name, labels):
+            for key, bucket in series.buckets_since(cutoff):
+                trend_key = int(key * self.rollup_seconds // trend_seconds)
+                entry = merged.setdefault(trend_key, [0, 0.0])
+                entry[0] += bucket.count
+                entry[1] += bucket.sum
 
-        return trend
+        return [
+            {
+                "timestamp": (_EPOCH + timedelta(seconds=key * trend_seconds)).isoformat(),
+                "count": int(count),
+                "mean": total / count,
+                "sum": total,
+            }
+            for key, (count, total) in sorted(merged.items())
+        ]
 
     def list_metrics(self) -> list[dict[str, Any]]:
         """List all defined metrics."""
@@ -341,14 +515,47 @@ class CustomMetrics:
                 "description": d.description,
                 "unit": d.unit,
                 "labels": d.labels,
-                "data_points": len(self._data.get(d.name, [])),
+                "series": len(self._series.get(d.name, {})),
+                "data_points": sum(s.count for s in self._series.get(d.name, {}).values()),
             }
             for d in self._definitions.values()
         ]
 
     def export(self, filepath: str) -> bool:
-        """Export all metrics to JSON file."""
+        """Export current values, rollups and any raw points to a JSON file."""
         try:
+            data: dict[str, list[dict[str, Any]]] = {}
+            for name, series_by_labels in self._series.items():
+                data[name] = []
+                for series in series_by_labels.values():
+                    entry: dict[str, Any] = {
+                        "labels": series.labels,
+                        "current": series.current,
+                        "count": series.count,
+                        "rollups": [
+                            {
+                                "timestamp": (
+                                    _EPOCH + timedelta(seconds=key * self.rollup_seconds)
+                                ).isoformat(),
+                                "count": bucket.count,
+                                "sum": bucket.sum,
+                                "min": bucket.min,
+                                "max": bucket.max,
+                            }
+                            for key, bucket in sorted(series.rollups.items())
+                        ],
+                    }
+                    if series.raw is not None:
+                        timestamps, values = series.raw.ordered()
+                        entry["points"] = [
+                            {
+                                "value": float(value),
+                                "timestamp": (_EPOCH + timedelta(seconds=float(ts))).isoformat(),
+                            }
+                            for ts, value in zip(timestamps, values)
+                        ]
+                    data[name].append(entry)
+
             export_data = {
                 "definitions": [
                     {
@@ -359,17 +566,7 @@ class CustomMetrics:
                     }
                     for d in self._definitions.values()
                 ],
-                "data": {
-                    name: [
-                        {
-                            "value": dp.value,
-                            "labels": dp.labels,
-                            "timestamp": dp.timestamp.isoformat(),
-                        }
-                        for dp in data
-                    ]
-                    for name, data in self._data.items()
-                },
+                "data": data,
             }
             with open(filepath, "w") as f:
                 json.dump(export_data, f, indent=2)
@@ -380,8 +577,8 @@ class CustomMetrics:
     def clear(self, name: str | None = None) -> None:
         """Clear metric data."""
         if name:
-            if name in self._data:
-                self._data[name].clear()
+            if name in self._series:
+                self._series[name].clear()
         else:
-            for data in self._data.values():
-                data.clear()
+            for series in self._series.values():
+                series.clear()
@@ -7,10 +7,18 @@ standard for production LLM systems.
 
 import json
 import time
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Callable
 
+from cert.observability.telemetry.span_processor import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    OTLPSpanExporter,
+)
+
 
 @dataclass
 class Span:
@@ -65,6 +73,10 @@ class OpenTelemetryExporter:
     Provides distributed tracing capabilities compatible with
     OpenTelemetry collectors and backends (Jaeger, Zipkin, etc.).
 
+    Finished spans are handed to a BatchSpanProcessor and exported in
+    batches from a background thread; only the most recent
+    ``max_retained_spans`` are kept in memory for ``get_traces``.
+
     Example:
         exporter = OpenTelemetryExporter(
             service_name="my-llm-service",
@@ -85,16 +97,24 @@ class OpenTelemetryExporter:
         export_to_console: bool = False,
         export_to_file: str | None = None,
         batch_size: int = 100,
+        max_queue_size: int = 2048,
+        schedule_delay_ms: float = 5000,
+        max_retained_spans: int = 10000,
+        headers: dict[str, str] | None = None,
     ):
         """
         Initialize the exporter.
 
         Args:
             service_name: Name of the service for tracing
-            endpoint: OTLP collector endpoint
+            endpoint: OTLP/HTTP collector endpoint (``file://`` path for a local stand-in)
             export_to_console: Print traces to console
             export_to_file: Export traces to JSONL file
-            batch_size: Batch size for export
+            batch_size: Maximum spans per export batch
+            max_queue_size: Maximum spans waiting for export before new spans are dropped
+            schedule_delay_ms: Maximum time a span waits before its batch is exported
+            max_retained_spans: Recent spans kept in memory for get_traces
+            headers: Extra HTTP headers sent to the OTLP endpoint
         """
         self.service_name = service_name
         self.endpoint = endpoint
@@ -102,7 +122,7 @@ class OpenTelemetryExporter:
         self.export_to_file = export_to_file
         self.batch_size = batch_size
 
-        self._spans: list[Span] = []
+        self._spans: deque[Span] = deque(maxlen=max_retained_spans)
         self._current_trace_id: str | None = None
         self._span_counter = 0
 
@@ -118,6 +138,23 @@ class OpenTelemetryExporter:
         except ImportError:
             pass
 
+        exporters = []
+        if export_to_console:
+            exporters.append(ConsoleSpanExporter())
+        if export_to_file:
+            exporters.append(FileSpanExporter(export_to_file))
+        if endpoint:
+            exporters.append(OTLPSpanExporter(endpoint, service_name, headers=headers))
+
+        self.processor: BatchSpanProcessor | None = None
+        if exporters:
+            self.processor = BatchSpanProcessor(
+                exporters,
+                max_queue_size=max_queue_size,
+                max_export_batch_size=batch_size,
+                schedule_delay_ms=schedule_delay_ms,
+            )
+
     def _generate_id(self, length: int = 16) -> str:
         """Generate a random ID."""
         import random
@@ -178,16 +215,32 @@ class OpenTelemetryExporter:
             self._export_span(span)
 
     def _export_span(self, span: Span) -> None:
-        """Export a single span."""
-        if self.export_to_console:
-            print(f"[TRACE] {span.name}: {span.to_dict()}")
+        """Queue a finished span for batched export."""
+        if self.processor is not None:
+            self.processor.on_end(span)
 
-        if self.export_to_file:
-            try:
-                with open(self.export_to_file, "a") as f:
-                    f.write(json.dumps(span.to_dict()) + "\n")
-            except Exception:
-                pass
+    def force_flush(self, timeout: float = 30.0) -> bool:
+        """Export all queued spans now."""
+        if self.processor is None:
+            return True
+        return self.processor.force_flush(timeout)
+
+    def shutdown(self) -> None:
+        """Flush queued spans and stop the background exporter."""
+        if self.processor is not None:
+            self.processor.shutdown()
+
+    def get_export_stats(self) -> dict[str, int]:
+        """Get export queue and drop counters."""
+        if self.processor is None:
+            return {
+                "queue_size": 0,
+                "spans_exported": 0,
+                "spans_dropped": 0,
+                "spans_failed": 0,
+                "export_failures": 0,
+            }
+        return self.processor.get_stats()
 
     def record_llm_request(
         self,
@@ -240,7 +293,9 @@ class OpenTelemetryExporter:
 
     def get_traces(self, limit: int | None = None) -> list[dict[str, Any]]:
         """Get recorded traces."""
-        spans = self._spans[-limit:] if limit else self._spans
+        spans = list(self._spans)
+        if limit:
+            spans = spans[-limit:]
         return [s.to_dict() for s in spans]
 
     def export_all(self, filepath: str) -> bool:
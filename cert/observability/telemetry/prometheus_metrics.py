@@ -5,20 +5,77 @@ Provides Prometheus-compatible metrics collection and export
 for LLM systems monitoring.
 """
 
-import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+import threading
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime
 from typing import Any
 
+LabelSet = tuple[tuple[str, str], ...]
 
-@dataclass
-class MetricValue:
-    """Single metric data point."""
+# Quantiles exported for summaries
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
 
-    value: float
-    labels: dict[str, str]
-    timestamp: float = field(default_factory=time.time)
+
+class Histogram:
+    """
+    Pre-bucketed histogram for one label set.
+
+    Observations are counted into fixed buckets on arrival, so memory is
+    O(buckets) and observing is a binary search.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        # Last slot counts observations above the largest bound (+Inf)
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        """Cumulative counts per bucket, ending with the +Inf bucket."""
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class Summary:
+    """
+    Bounded-memory summary for one label set.
+
+    Keeps an exact running count and sum, and computes quantiles over a
+    sliding window of the most recent ``max_samples`` observations.
+    """
+
+    __slots__ = ("window", "sum", "count")
+
+    def __init__(self, max_samples: int):
+        self.window: deque = deque(maxlen=max_samples)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.window.append(value)
+        self.sum += value
+        self.count += 1
+
+    def quantiles(self, quantiles: tuple[float, ...] = SUMMARY_QUANTILES) -> dict[float, float]:
+        """Quantiles over the current window."""
+        if not self.window:
+            return {q: float("nan") for q in quantiles}
+        ordered = sorted(self.window)
+        last = len(ordered) - 1
+        return {q: ordered[int(round(q * last))] for q in quantiles}
 
 
 class PrometheusMetrics:
@@ -47,6 +104,7 @@ class PrometheusMetrics:
         namespace: str = "cert",
         port: int = 8000,
         auto_start_server: bool = False,
+        summary_max_samples: int = 1024,
     ):
         """
         Initialize metrics collector.
@@ -55,15 +113,23 @@ class PrometheusMetrics:
             namespace: Metric namespace prefix
             port: Port for HTTP server
             auto_start_server: Start HTTP server automatically
+            summary_max_samples: Observations kept per summary series for quantiles
         """
         self.namespace = namespace
         self.port = port
+        self.summary_max_samples = summary_max_samples
+
+        # Metric storage: metric name -> label set -> series
+        self._counters: dict[str, dict[LabelSet, float]] = {}
+        self._gauges: dict[str, dict[LabelSet, float]] = {}
+        self._histograms: dict[str, dict[LabelSet, Histogram]] = {}
+        self._summaries: dict[str, dict[LabelSet, Summary]] = {}
+        self._histogram_types: dict[str, str] = {}
 
-        # Metric storage
-        self._counters: dict[str, list[MetricValue]] = defaultdict(list)
-        self._gauges: dict[str, MetricValue] = {}
-        self._histograms: dict[str, list[tuple[float, dict[str, str]]]] = defaultdict(list)
-        self._summaries: dict[str, list[tuple[float, dict[str, str]]]] = defaultdict(list)
+        # Interned label sets and their rendered form
+        self._label_sets: dict[LabelSet, LabelSet] = {}
+        self._label_strings: dict[LabelSet, str] = {}
+        self._lock = threading.Lock()
 
         # Histogram bucket definitions
         self._histogram_buckets = {
@@ -94,11 +160,17 @@ class PrometheusMetrics:
         """Get full metric name with namespace."""
         return f"{self.namespace}_{name}"
 
-    def _labels_key(self, labels: dict[str, str]) -> str:
-        """Generate key from labels."""
+    def _label_set(self, labels: dict[str, str] | None) -> LabelSet:
+        """Get the interned label tuple for a labels dict."""
         if not labels:
-            return ""
-        return ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+            return ()
+        key = tuple(sorted(labels.items()))
+        interned = self._label_sets.get(key)
+        if interned is None:
+            # Render before publishing so export never sees an unrendered set
+            self._label_strings[key] = ",".join(f'{k}="{v}"' for k, v in key)
+            interned = self._label_sets.setdefault(key, key)
+        return interned
 
     def register_metric(
         self,
@@ -123,14 +195,10 @@ class PrometheusMetrics:
             value: Value to add (default 1)
             labels: Metric labels
         """
-        labels = labels or {}
-        key = f"{name}:{self._labels_key(labels)}"
-
-        if key in self._counters:
-            # Add to existing counter
-            self._counters[key][-1].value += value
-        else:
-            self._counters[key].append(MetricValue(value=value, labels=labels))
+        label_set = self._label_set(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[label_set] = series.get(label_set, 0.0) + value
 
     def set_gauge(
         self,
@@ -146,9 +214,9 @@ class PrometheusMetrics:
             value: Gauge value
             labels: Metric labels
         """
-        labels = labels or {}
-        key = f"{name}:{self._labels_key(labels)}"
-        self._gauges[key] = MetricValue(value=value, labels=labels)
+        label_set = self._label_set(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[label_set] = value
 
     def observe_histogram(
         self,
@@ -164,10 +232,22 @@ class PrometheusMetrics:
             name: Histogram name
             value: Observed value
             labels: Metric labels
-            bucket_type: Type of buckets to use
+            bucket_type: Type of buckets to use (fixed by the first observation
+                of each histogram)
         """
-        labels = labels or {}
-        self._histograms[name].append((value, labels))
+        label_set = self._label_set(labels)
+        with self._lock:
+            series = self._histograms.get(name)
+            if series is None:
+                series = self._histograms[name] = {}
+                self._histogram_types[name] = bucket_type
+            histogram = series.get(label_set)
+            if histogram is None:
+                bounds = self._histogram_buckets.get(
+                    self._histogram_types[name], self._histogram_buckets["default"]
+                )
+                histogram = series[label_set] = Histogram(bounds)
+            histogram.observe(value)
 
     def observe_summary(
         self,
@@ -183,8 +263,13 @@ class PrometheusMetrics:
             value: Observed value
             labels: Metric labels
         """
-        labels = labels or {}
-        self._summaries[name].append((value, labels))
+        label_set = self._label_set(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(label_set)
+            if summary is None:
+                summary = series[label_set] = Summary(self.summary_max_samples)
+            summary.observe(value)
 
     # Pre-defined LLM metrics
     def record_llm_request(
@@ -231,10 +316,23 @@ class PrometheusMetrics:
         """Set current active request count."""
         self.set_gauge("llm_active_requests", count)
 
+    def _header(self, lines: list[str], name: str, metric_type: str) -> str:
+        full_name = self._full_name(name)
+        if name in self._descriptions:
+            lines.append(f"# HELP {full_name} {self._descriptions[name]}")
+        lines.append(f"# TYPE {full_name} {metric_type}")
+        return full_name
+
+    def _with_label(self, label_set: LabelSet, extra: str) -> str:
+        labels_key = self._label_strings.get(label_set, "")
+        return f"{labels_key},{extra}" if labels_key else extra
+
     def export_text(self) -> str:
         """
         Export metrics in Prometheus text format.
 
+        Cost is O(series x buckets), independent of the number of observations.
+
         Returns:
             Prometheus-formatted metrics string
         """
@@ -243,84 +341,81 @@ class PrometheusMetrics:
         lines.append(f"# Generated at {datetime.utcnow().isoformat()}")
         lines.append("")
 
-        # Export counters
-        for key, values in self._counters.items():
-            name = key.split(":")[0]
-            full_name = self._full_name(name)
-
-            if name in self._descriptions:
-                lines.append(f"# HELP {full_name} {self._descriptions[name]}")
-            lines.append(f"# TYPE {full_name} counter")
-
-            for mv in values:
-                labels_str = "{" + self._labels_key(mv.labels) + "}" if mv.labels else ""
-                lines.append(f"{full_name}{labels_str} {mv.value}")
-            lines.append("")
-
-        # Export gauges
-        exported_gauges = set()
-        for key, mv in self._gauges.items():
-            name = key.split(":")[0]
-            full_name = self._full_name(name)
-
-            if name not in exported_gauges:
-                if name in self._descriptions:
-                    lines.append(f"# HELP {full_name} {self._descriptions[name]}")
-                lines.append(f"# TYPE {full_name} gauge")
-                exported_gauges.add(name)
-
-            labels_str = "{" + self._labels_key(mv.labels) + "}" if mv.labels else ""
-            lines.append(f"{full_name}{labels_str} {mv.value}")
-        if exported_gauges:
-            lines.append("")
-
-        # Export histograms
-        for name, observations in self._histograms.items():
-            full_name = self._full_name(name)
-            lines.append(f"# TYPE {full_name} histogram")
-
-            # Group by labels
-            by_labels: dict[str, list[float]] = defaultdict(list)
-            for value, labels in observations:
-                labels_key = self._labels_key(labels)
-                by_labels[labels_key].append(value)
-
-            buckets = self._histogram_buckets.get("default", [])
-            for labels_key, values in by_labels.items():
-                labels_str = "{" + labels_key + "}" if labels_key else ""
-
-                # Bucket counts
-                for bucket in buckets:
-                    count = sum(1 for v in values if v <= bucket)
-                    le_labels = labels_key + f',le="{bucket}"' if labels_key else f'le="{bucket}"'
-                    lines.append(f"{full_name}_bucket{{{le_labels}}} {count}")
-
-                # +Inf bucket
-                inf_labels = labels_key + ',le="+Inf"' if labels_key else 'le="+Inf"'
-                lines.append(f"{full_name}_bucket{{{inf_labels}}} {len(values)}")
-
-                # Sum and count
-                lines.append(f"{full_name}_sum{labels_str} {sum(values)}")
-                lines.append(f"{full_name}_count{labels_str} {len(values)}")
-            lines.append("")
+        with self._lock:
+            # Export counters and gauges
+            for metric_type, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in metrics.items():
+                    full_name = self._header(lines, name, metric_type)
+                    for label_set, value in series.items():
+                        labels_key = self._label_strings.get(label_set, "")
+                        labels_str = "{" + labels_key + "}" if labels_key else ""
+                        lines.append(f"{full_name}{labels_str} {value}")
+                    lines.append("")
+
+            # Export histograms
+            for name, histograms in self._histograms.items():
+                full_name = self._header(lines, name, "histogram")
+                for label_set, histogram in histograms.items():
+                    labels_key = self._label_strings.get(label_set, "")
+                    labels_str = "{" + labels_key + "}" if labels_key else ""
+                    cumulative = histogram.cumulative_counts()
+
+                    for bound, count in zip(histogram.bounds, cumulative):
+                        le_labels = self._with_label(label_set, f'le="{bound}"')
+                        lines.append(f"{full_name}_bucket{{{le_labels}}} {count}")
+                    inf_labels = self._with_label(label_set, 'le="+Inf"')
+                    lines.append(f"{full_name}_bucket{{{inf_labels}}} {cumulative[-1]}")
+
+                    lines.append(f"{full_name}_sum{labels_str} {histogram.sum}")
+                    lines.append(f"{full_name}_count{labels_str} {histogram.count}")
+                lines.append("")
+
+            # Export summaries
+            for name, summaries in self._summaries.items():
+                full_name = self._header(lines, name, "summary")
+                for label_set, summary in summaries.items():
+                    labels_key = self._label_strings.get(label_set, "")
+                    labels_str = "{" + labels_key + "}" if labels_key else ""
+
+                    for quantile, value in summary.quantiles().items():
+                        q_labels = self._with_label(label_set, f'quantile="{quantile}"')
+                        lines.append(f"{full_name}{{{q_labels}}} {value}")
+
+                    lines.append(f"{full_name}_sum{labels_str} {summary.sum}")
+                    lines.append(f"{full_name}_count{labels_str} {summary.count}")
+                lines.append("")
 
         return "\n".join(lines)
 
     def get_summary(self) -> dict[str, Any]:
         """Get metrics summary as dictionary."""
-        return {
-            "counters": {
-                key: values[-1].value if values else 0 for key, values in self._counters.items()
-            },
-            "gauges": {key: mv.value for key, mv in self._gauges.items()},
-            "histogram_counts": {
-                name: len(observations) for name, observations in self._histograms.items()
-            },
-        }
+        with self._lock:
+            return {
+                "counters": {
+                    f"{name}:{self._label_strings.get(label_set, '')}": value
+                    for name, series in self._counters.items()
+                    for label_set, value in series.items()
+                },
+                "gauges": {
+                    f"{name}:{self._label_strings.get(label_set, '')}": value
+                    for name, series in self._gauges.items()
+                    for label_set, value in series.items()
+                },
+                "histogram_counts": {
+                    name: sum(h.count for h in series.values())
+                    for name, series in self._histograms.items()
+                },
+                "summary_counts": {
+                    name: sum(s.count for s in series.values())
+                    for name, series in self._summaries.items()
+                },
+            }
 
     def reset(self) -> None:
         """Reset all metrics."""
-        self._counters.clear()
-        self._gauges.clear()
-        self._histograms.clear()
-        self._summaries.clear()
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._summaries.clear()
+            self._histogram_types.clear()
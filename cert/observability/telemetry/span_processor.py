@@ -0,0 +1,356 @@
+"""
+Batch Span Processing
+
+Background batching of finished spans for OpenTelemetryExporter.
+
+Finished spans are placed on a bounded queue and exported in batches by a
+worker thread, either when ``max_export_batch_size`` spans are waiting or
+every ``schedule_delay_ms``. When the queue is full new spans are dropped
+and counted instead of blocking the traced code. Processors that were not
+shut down are flushed by a single interpreter exit hook.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import urllib.request
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from cert.observability.telemetry.opentelemetry_exporter import Span
+
+logger = logging.getLogger(__name__)
+
+# Processors not shut down yet, flushed at interpreter exit
+_active_processors: "weakref.WeakSet[BatchSpanProcessor]" = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_active_processors() -> None:
+    for processor in list(_active_processors):
+        processor.shutdown()
+
+
+class SpanExporter(Protocol):
+    """Destination for batches of finished spans."""
+
+    def export(self, spans: list["Span"]) -> bool:
+        """Export a batch. Returns True on success."""
+        ...
+
+    def shutdown(self) -> None:
+        """Release any resources held by the exporter."""
+        ...
+
+
+class ConsoleSpanExporter:
+    """Print spans to stdout."""
+
+    def export(self, spans: list["Span"]) -> bool:
+        for span in spans:
+            print(f"[TRACE] {span.name}: {span.to_dict()}")
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter:
+    """Append spans to a JSONL file, one write per batch."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: list["Span"]) -> bool:
+        payload = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with open(self.path, "a") as f:
+            f.write(payload)
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp_json(spans: list["Span"], service_name: str) -> dict[str, Any]:
+    """
+    Build an OTLP/HTTP JSON ``ExportTraceServiceRequest`` body.
+
+    Args:
+        spans: Finished spans
+        service_name: Value of the ``service.name`` resource attribute
+
+    Returns:
+        Request body as a dictionary
+    """
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": _otlp_attributes(span.attributes),
+            "events": [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(int(event["timestamp"] * 1e9)),
+                    "attributes": _otlp_attributes(event.get("attributes", {})),
+                }
+                for event in span.events
+            ],
+            "status": {
+                "code": 2 if span.status == "ERROR" else 1,
+                "message": span.status_message,
+            },
+        }
+        if span.parent_span_id:
+            otlp_span["parentSpanId"] = span.parent_span_id
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [{"scope": {"name": "cert-framework"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+class OTLPSpanExporter:
+    """
+    Export span batches to an OTLP/HTTP collector as JSON.
+
+    A ``file://`` endpoint acts as a local collector stand-in: each export
+    request body is appended to that file as one JSON line.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            endpoint: Collector base URL (``/v1/traces`` is appended) or ``file://`` path
+            service_name: Service name resource attribute
+            headers: Extra HTTP headers (e.g. authentication)
+            timeout: Request timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.headers = headers or {}
+        self.timeout = timeout
+
+    def export(self, spans: list["Span"]) -> bool:
+        body = json.dumps(to_otlp_json(spans, self.service_name), default=str)
+
+        if self.endpoint.startswith("file://"):
+            with open(self.endpoint[len("file://") :], "a") as f:
+                f.write(body + "\n")
+            return True
+
+        url = self.endpoint.rstrip("/")
+        if not url.endswith("/v1/traces"):
+            url += "/v1/traces"
+        request = urllib.request.Request(
+            url,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/json", **self.headers},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return 200 <= response.status < 300
+
+    def shutdown(self) -> None:
+        pass
+
+
+class BatchSpanProcessor:
+    """
+    Bounded-queue batch processor for finished spans.
+
+    Example:
+        processor = BatchSpanProcessor([FileSpanExporter("spans.jsonl")])
+        processor.on_end(span)
+        processor.force_flush()
+        processor.shutdown()
+    """
+
+    def __init__(
+        self,
+        exporters: list[SpanExporter],
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 512,
+        schedule_delay_ms: float = 5000,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            exporters: Destinations each batch is exported to
+            max_queue_size: Maximum spans waiting for export; further spans are dropped
+            max_export_batch_size: Maximum spans per export call
+            schedule_delay_ms: Maximum time a span waits before its batch is exported
+        """
+        self.exporters = exporters
+        self.max_queue_size = max_queue_size
+        self.max_export_batch_size = min(max_export_batch_size, max_queue_size)
+        self.schedule_delay = schedule_delay_ms / 1000
+
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self._flush_requested = 0
+        self._flushed = 0
+        self._shutdown = False
+
+        self.spans_dropped = 0
+        self.spans_exported = 0
+        self.spans_failed = 0
+        self.export_failures = 0
+
+        _active_processors.add(self)
+
+    @property
+    def queue_size(self) -> int:
+        """Number of spans waiting for export."""
+        return len(self._queue)
+
+    def on_end(self, span: "Span") -> None:
+        """
+        Enqueue a finished span without blocking.
+
+        Args:
+            span: Finished span
+        """
+        with self._condition:
+            if self._shutdown:
+                return
+            if len(self._queue) >= self.max_queue_size:
+                self.spans_dropped += 1
+                return
+
+            self._queue.append(span)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="cert-span-processor", daemon=True
+                )
+                self._worker.start()
+            if len(self._queue) >= self.max_export_batch_size:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._shutdown and self._flush_requested == self._flushed:
+                    if len(self._queue) < self.max_export_batch_size:
+                        self._condition.wait(self.schedule_delay)
+
+                flush_target = self._flush_requested
+                shutting_down = self._shutdown
+
+            self._export_pending()
+
+            with self._condition:
+                self._flushed = flush_target
+                self._condition.notify_all()
+                if shutting_down:
+                    return
+
+    def _export_pending(self) -> None:
+        """Export everything queued at the time of the call, in batches."""
+        pending = len(self._queue)
+        while pending > 0:
+            batch_size = min(pending, self.max_export_batch_size)
+            batch = [self._queue.popleft() for _ in range(batch_size)]
+            pending -= batch_size
+
+            exported = True
+            for exporter in self.exporters:
+                try:
+                    if not exporter.export(batch):
+                        exported = False
+                        self.export_failures += 1
+                except Exception as e:
+                    exported = False
+                    self.export_failures += 1
+                    logger.warning(f"Span export to {type(exporter).__name__} failed: {e}")
+
+            # A span counts as exported once every exporter accepted it
+            if exported:
+                self.spans_exported += len(batch)
+            else:
+                self.spans_failed += len(batch)
+
+    def force_flush(self, timeout: float = 30.0) -> bool:
+        """
+        Export all queued spans.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queue was flushed within the timeout
+        """
+        with self._condition:
+            if self._worker is None or not self._worker.is_alive():
+                self._export_pending()
+                return True
+
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._flushed >= target, timeout)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Flush queued spans, stop the worker and shut down exporters."""
+        with self._condition:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            self._condition.notify_all()
+            worker = self._worker
+        _active_processors.discard(self)
+
+        if worker is not None:
+            worker.join(timeout)
+        else:
+            self._export_pending()
+
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get processor counters."""
+        return {
+            "queue_size": self.queue_size,
+            "spans_exported": self.spans_exported,
+            "spans_dropped": self.spans_dropped,
+            "spans_failed": self.spans_failed,
+            "export_failures": self.export_failures,
+        }
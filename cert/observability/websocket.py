@@ -17,6 +17,11 @@ Usage:
 
     # Client-side (JavaScript/TypeScript)
     const ws = new WebSocket('ws://localhost:8765');
+    ws.onopen = () => ws.send(JSON.stringify({
+        type: 'subscribe',
+        filters: {statuses: ['error']},
+        fields: ['timestamp', 'model', 'error'],
+    }));
     ws.onmessage = (event) => {
         const trace = JSON.parse(event.data);
         console.log('New trace:', trace);
@@ -26,10 +31,12 @@ Usage:
 import asyncio
 import json
 import logging
+import random
 import threading
-from dataclasses import asdict, dataclass
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, Optional, Set
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +62,296 @@ class TraceEvent:
     source: str = "cert"
 
 
+def _trace_status(trace: Dict[str, Any]) -> str:
+    if trace.get("status"):
+        return trace["status"]
+    return "error" if trace.get("error") else "success"
+
+
+def _trace_model(trace: Dict[str, Any]) -> Optional[str]:
+    return trace.get("model") or (trace.get("metadata") or {}).get("model")
+
+
+def _trace_latency(trace: Dict[str, Any]) -> Optional[float]:
+    latency = trace.get("duration_ms")
+    if latency is None:
+        latency = trace.get("latency_ms")
+    return latency
+
+
+@dataclass
+class Subscription:
+    """
+    Client-side view of the trace stream.
+
+    Filters are applied to the raw trace before serialization; only the
+    projected fields of accepted traces are serialized and sent.
+
+    Clients subscribe by sending:
+        {"type": "subscribe",
+         "filters": {"functions": [...], "models": [...], "statuses": ["error"],
+                     "min_latency_ms": 1000},
+         "sample_rate": 0.1,
+         "fields": ["timestamp", "model", "status", "duration_ms"],
+         "event_types": ["trace", "alert"]}
+    """
+
+    functions: Optional[FrozenSet[str]] = None
+    models: Optional[FrozenSet[str]] = None
+    statuses: Optional[FrozenSet[str]] = None
+    min_latency_ms: Optional[float] = None
+    sample_rate: float = 1.0
+    fields: Optional[Tuple[str, ...]] = None
+    event_types: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "Subscription":
+        """
+        Build a subscription from a client ``subscribe`` message.
+
+        Raises:
+            ValueError: If the message contains invalid values
+        """
+        filters = message.get("filters") or {}
+
+        def _set(value: Any) -> Optional[FrozenSet[str]]:
+            if value is None:
+                return None
+            if isinstance(value, str):
+                value = [value]
+            return frozenset(str(v) for v in value)
+
+        sample_rate = float(message.get("sample_rate", 1.0))
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+
+        min_latency = filters.get("min_latency_ms")
+        fields = message.get("fields")
+        if isinstance(fields, str):
+            fields = [fields]
+
+        return cls(
+            functions=_set(filters.get("functions")),
+            models=_set(filters.get("models")),
+            statuses=_set(filters.get("statuses")),
+            min_latency_ms=float(min_latency) if min_latency is not None else None,
+            sample_rate=sample_rate,
+            fields=tuple(str(f) for f in fields) if fields else None,
+            event_types=_set(message.get("event_types")),
+        )
+
+    def accepts(self, event_type: str, trace: Dict[str, Any]) -> bool:
+        """Whether an event passes the filters and the sampling draw."""
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        if event_type != "trace":
+            return True
+
+        if self.functions is not None and trace.get("function") not in self.functions:
+            return False
+        if self.models is not None and _trace_model(trace) not in self.models:
+            return False
+        if self.statuses is not None and _trace_status(trace) not in self.statuses:
+            return False
+        if self.min_latency_ms is not None:
+            latency = _trace_latency(trace)
+            if latency is None or latency < self.min_latency_ms:
+                return False
+
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def project(self, trace: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the subscribed fields of a trace."""
+        if self.fields is None:
+            return trace
+        return {key: trace[key] for key in self.fields if key in trace}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the subscription (echoed back to the client)."""
+        return {
+            "filters": {
+                "functions": sorted(self.functions) if self.functions is not None else None,
+                "models": sorted(self.models) if self.models is not None else None,
+                "statuses": sorted(self.statuses) if self.statuses is not None else None,
+                "min_latency_ms": self.min_latency_ms,
+            },
+            "sample_rate": self.sample_rate,
+            "fields": list(self.fields) if self.fields is not None else None,
+            "event_types": sorted(self.event_types) if self.event_types is not None else None,
+        }
+
+
+# Overflow policies for per-client send queues
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "coalesce")
+
+
+class ClientSession:
+    """
+    Per-client send queue and sender task.
+
+    Events are queued as pre-serialized JSON strings, so each event is
+    serialized once no matter how many clients receive it. A dedicated
+    sender task drains the queue and packs waiting events into a single
+    ``batch`` frame, so a slow client only ever delays itself.
+
+    Overflow policies when the queue is full:
+    - ``drop_oldest``: discard the oldest pending event
+    - ``drop_newest``: discard the incoming event
+    - ``coalesce``: replace any pending event with the same coalesce key
+      (e.g. the latest value of a metric), then fall back to ``drop_oldest``
+    """
+
+    def __init__(
+        self,
+        websocket,
+        max_queue_size: int = 1000,
+        overflow_policy: str = "drop_oldest",
+        max_batch_size: int = 100,
+        batch_window: float = 0.0,
+    ):
+        """
+        Initialize client session.
+
+        Args:
+            websocket: Connected WebSocket
+            max_queue_size: Maximum pending events
+            overflow_policy: One of ``OVERFLOW_POLICIES``
+            max_batch_size: Maximum events packed into one frame
+            batch_window: Seconds to wait for more events before sending a frame
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}'. Choose from {OVERFLOW_POLICIES}"
+            )
+
+        self.websocket = websocket
+        self.client_id = id(websocket)
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.subscription: Optional[Subscription] = None
+
+        self._queue: Deque[Tuple[Optional[str], str]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.events_dropped = 0
+        self.events_coalesced = 0
+        self.frames_sent = 0
+        self._dropped_since_frame = 0
+
+    @property
+    def queue_size(self) -> int:
+        """Number of pending events."""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """Start the sender task on the running loop."""
+        self._task = asyncio.get_running_loop().create_task(self._sender())
+
+    def stop(self) -> None:
+        """Cancel the sender task."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def enqueue(self, message: str, coalesce_key: Optional[str] = None) -> None:
+        """
+        Queue a serialized event without blocking.
+
+        Args:
+            message: Serialized event JSON
+            coalesce_key: Key identifying events that supersede each other
+        """
+        if self.overflow_policy == "coalesce" and coalesce_key is not None:
+            for index, (key, _) in enumerate(self._queue):
+                if key == coalesce_key:
+                    self._queue[index] = (coalesce_key, message)
+                    self.events_coalesced += 1
+                    return
+
+        if len(self._queue) >= self.max_queue_size:
+            self.events_dropped += 1
+            self._dropped_since_frame += 1
+            if self.overflow_policy == "drop_newest":
+                return
+            self._queue.popleft()
+
+        self._queue.append((coalesce_key, message))
+        self._wakeup.set()
+
+    def next_frame(self) -> Optional[str]:
+        """
+        Pop up to ``max_batch_size`` pending events as one frame.
+
+        A single event is sent unchanged; several events are wrapped in a
+        ``batch`` event whose ``data.events`` holds them in order.
+        """
+        if not self._queue:
+            return None
+
+        count = min(len(self._queue), self.max_batch_size)
+        messages = [self._queue.popleft()[1] for _ in range(count)]
+        dropped, self._dropped_since_frame = self._dropped_since_frame, 0
+
+        if count == 1 and not dropped:
+            return messages[0]
+
+        return (
+            '{"event_type": "batch", "timestamp": "'
+            + datetime.utcnow().isoformat()
+            + 'Z", "data": {"count": '
+            + str(count)
+            + ', "dropped": '
+            + str(dropped)
+            + ', "events": ['
+            + ", ".join(messages)
+            + ']}, "source": "cert"}'
+        )
+
+    async def _sender(self) -> None:
+        """
+        Send queued events as frames until the connection closes.
+
+        A failed send closes the connection, so the server's connection
+        handler returns and unregisters the session instead of queueing
+        events for a client that no longer receives them.
+        """
+        while True:
+            await self._wakeup.wait()
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            self._wakeup.clear()
+
+            while self._queue:
+                frame = self.next_frame()
+                try:
+                    await self.websocket.send(frame)
+                    self.frames_sent += 1
+                except ConnectionClosed:
+                    return
+                except Exception as e:
+                    logger.warning(f"Error sending to client {self.client_id}, closing: {e}")
+                    self._queue.clear()
+                    try:
+                        await self.websocket.close(code=1011, reason="send failed")
+                    except Exception as close_error:
+                        logger.debug(f"Error closing client {self.client_id}: {close_error}")
+                    return
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-client delivery counters."""
+        return {
+            "client_id": self.client_id,
+            "queue_size": self.queue_size,
+            "frames_sent": self.frames_sent,
+            "events_dropped": self.events_dropped,
+            "events_coalesced": self.events_coalesced,
+            "subscription": self.subscription.to_dict() if self.subscription else None,
+        }
+
+
 class WebSocketTraceServer:
     """
     WebSocket server for streaming traces in real-time.
@@ -62,7 +359,8 @@ class WebSocketTraceServer:
     Features:
     - Broadcasts traces to all connected clients
     - Supports multiple concurrent connections
-    - Auto-reconnection handling
+    - Per-client bounded send queues with drop/coalesce overflow policies
+    - Micro-batching of events into frames, sent concurrently per client
     - Heartbeat for connection health
 
     Usage:
@@ -76,7 +374,16 @@ class WebSocketTraceServer:
         server.stop()
     """
 
-    def __init__(self, host: str = "localhost", port: int = 8765, heartbeat_interval: int = 30):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8765,
+        heartbeat_interval: int = 30,
+        client_queue_size: int = 1000,
+        overflow_policy: str = "drop_oldest",
+        max_batch_size: int = 100,
+        batch_window_ms: float = 0.0,
+    ):
         """
         Initialize WebSocket trace server.
 
@@ -84,6 +391,10 @@ class WebSocketTraceServer:
             host: Server host address
             port: Server port
             heartbeat_interval: Seconds between heartbeat messages
+            client_queue_size: Maximum pending events per client
+            overflow_policy: "drop_oldest", "drop_newest" or "coalesce"
+            max_batch_size: Maximum events packed into one frame
+            batch_window_ms: Time to wait for more events before sending a frame
         """
         if not WEBSOCKETS_AVAILABLE:
             raise ImportError(
@@ -94,7 +405,21 @@ class WebSocketTraceServer:
         self.host = host
         self.port = port
         self.heartbeat_interval = heartbeat_interval
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}'. Choose from {OVERFLOW_POLICIES}"
+            )
+        self.client_queue_size = client_queue_size
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000
         self.clients: Set = set()
+        self._sessions: Dict[Any, ClientSession] = {}
+
+        # Events handed over from producer threads, drained on the loop
+        self._ingress: Deque[Tuple[TraceEvent, Optional[str]]] = deque()
+        self._ingress_lock = threading.Lock()
+        self._drain_scheduled = False
         self._server = None
         self._loop = None
         self._thread = None
@@ -102,8 +427,16 @@ class WebSocketTraceServer:
 
     async def _handler(self, websocket) -> None:
         """Handle a WebSocket connection."""
+        session = ClientSession(
+            websocket,
+            max_queue_size=self.client_queue_size,
+            overflow_policy=self.overflow_policy,
+            max_batch_size=self.max_batch_size,
+            batch_window=self.batch_window,
+        )
         self.clients.add(websocket)
-        client_id = id(websocket)
+        self._sessions[websocket] = session
+        client_id = session.client_id
         logger.info(f"Client connected: {client_id}. Total clients: {len(self.clients)}")
 
         try:
@@ -121,6 +454,7 @@ class WebSocketTraceServer:
                     }
                 )
             )
+            session.start()
 
             # Keep connection alive and handle incoming messages
             async for message in websocket:
@@ -128,59 +462,125 @@ class WebSocketTraceServer:
                 try:
                     data = json.loads(message)
                     if data.get("type") == "ping":
-                        await websocket.send(
-                            json.dumps(
-                                {
-                                    "event_type": "pong",
-                                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                                    "data": {},
-                                    "source": "cert",
-                                }
+                        await websocket.send(self._control_message("pong", {}))
+                    elif data.get("type") == "subscribe":
+                        try:
+                            session.subscription = Subscription.from_message(data)
+                            await websocket.send(
+                                self._control_message("subscribed", session.subscription.to_dict())
                             )
-                        )
-                except json.JSONDecodeError:
+                        except (TypeError, ValueError) as e:
+                            await websocket.send(
+                                self._control_message("error", {"message": str(e)})
+                            )
+                    elif data.get("type") == "unsubscribe":
+                        session.subscription = None
+                        await websocket.send(self._control_message("subscribed", {}))
+                except (json.JSONDecodeError, AttributeError):
                     pass
 
         except ConnectionClosed:
             pass
         finally:
+            session.stop()
+            self._sessions.pop(websocket, None)
             self.clients.discard(websocket)
             logger.info(f"Client disconnected: {client_id}. Total clients: {len(self.clients)}")
 
+    @staticmethod
+    def _control_message(event_type: str, data: Dict[str, Any]) -> str:
+        return json.dumps(
+            {
+                "event_type": event_type,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "data": data,
+                "source": "cert",
+            }
+        )
+
     async def _heartbeat(self) -> None:
         """Send periodic heartbeat to all clients."""
         while self._running:
             if self.clients:
+                event = TraceEvent(
+                    event_type="heartbeat",
+                    timestamp=datetime.utcnow().isoformat() + "Z",
+                    data={"clients": len(self.clients)},
+                )
+                await self._broadcast_async(event, coalesce_key="heartbeat")
+
+            await asyncio.sleep(self.heartbeat_interval)
+
+    async def _broadcast_async(self, event: TraceEvent, coalesce_key: Optional[str] = None) -> None:
+        """Queue an event for every connected client."""
+        self._fan_out(event, coalesce_key)
+
+    def _fan_out(self, event: TraceEvent, coalesce_key: Optional[str] = None) -> None:
+        """
+        Append an event to each subscribed client's send queue (runs on the loop).
+
+        Filters and sampling run on the raw event; each distinct field
+        projection is serialized at most once per event.
+        """
+        serialized: Dict[Optional[Tuple[str, ...]], str] = {}
+
+        for session in list(self._sessions.values()):
+            subscription = session.subscription
+            projection = None
+            if subscription is not None:
+                if not subscription.accepts(event.event_type, event.data):
+                    continue
+                if event.event_type == "trace":
+                    projection = subscription.fields
+
+            message = serialized.get(projection)
+            if message is None:
+                data = subscription.project(event.data) if projection else event.data
                 message = json.dumps(
                     {
-                        "event_type": "heartbeat",
-                        "timestamp": datetime.utcnow().isoformat() + "Z",
-                        "data": {"clients": len(self.clients)},
-                        "source": "cert",
-                    }
+                        "event_type": event.event_type,
+                        "timestamp": event.timestamp,
+                        "data": data,
+                        "source": event.source,
+                    },
+                    default=str,
                 )
-                await self._broadcast_async(message)
+                serialized[projection] = message
 
-            await asyncio.sleep(self.heartbeat_interval)
+            session.enqueue(message, coalesce_key)
+
+    def _submit(self, event: TraceEvent, coalesce_key: Optional[str] = None) -> None:
+        """
+        Hand an event to the event loop from any thread.
 
-    async def _broadcast_async(self, message: str) -> None:
-        """Broadcast message to all connected clients."""
-        if not self.clients:
+        Events accumulate in an ingress queue; at most one drain callback
+        is scheduled on the loop regardless of how many events arrive.
+        Serialization happens on the loop, after client filters are applied.
+        """
+        if not self._running or not self._loop:
             return
 
-        # Send to all clients, ignore failures
-        disconnected = set()
-        for client in self.clients:
-            try:
-                await client.send(message)
-            except ConnectionClosed:
-                disconnected.add(client)
-            except Exception as e:
-                logger.warning(f"Error sending to client: {e}")
-                disconnected.add(client)
+        with self._ingress_lock:
+            self._ingress.append((event, coalesce_key))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+
+        try:
+            self._loop.call_soon_threadsafe(self._drain_ingress)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
 
-        # Remove disconnected clients
-        self.clients -= disconnected
+    def _drain_ingress(self) -> None:
+        """Move all handed-over events into client queues."""
+        with self._ingress_lock:
+            pending = list(self._ingress)
+            self._ingress.clear()
+            self._drain_scheduled = False
+
+        for event, coalesce_key in pending:
+            self._fan_out(event, coalesce_key)
 
     def broadcast(self, trace_data: Dict[str, Any]) -> None:
         """
@@ -197,13 +597,11 @@ class WebSocketTraceServer:
         event = TraceEvent(
             event_type="trace",
             timestamp=trace_data.get("timestamp", datetime.utcnow().isoformat() + "Z"),
-            data=trace_data,
+            # Copy so later changes by the caller do not race with serialization
+            data=dict(trace_data),
         )
 
-        message = json.dumps(asdict(event), default=str)
-
-        # Schedule broadcast in event loop
-        asyncio.run_coroutine_threadsafe(self._broadcast_async(message), self._loop)
+        self._submit(event)
 
     def broadcast_metric(self, metric_name: str, value: float, tags: Optional[Dict] = None) -> None:
         """
@@ -223,9 +621,7 @@ class WebSocketTraceServer:
             data={"metric": metric_name, "value": value, "tags": tags or {}},
         )
 
-        message = json.dumps(asdict(event), default=str)
-
-        asyncio.run_coroutine_threadsafe(self._broadcast_async(message), self._loop)
+        self._submit(event, coalesce_key=f"metric:{metric_name}")
 
     def broadcast_alert(self, alert_type: str, message: str, severity: str = "info") -> None:
         """
@@ -245,9 +641,7 @@ class WebSocketTraceServer:
             data={"alert_type": alert_type, "message": message, "severity": severity},
         )
 
-        message_str = json.dumps(asdict(event), default=str)
-
-        asyncio.run_coroutine_threadsafe(self._broadcast_async(message_str), self._loop)
+        self._submit(event)
 
     async def _run_server(self) -> None:
         """Run the WebSocket server."""
@@ -305,6 +699,10 @@ class WebSocketTraceServer:
         """Get number of connected clients."""
         return len(self.clients)
 
+    def get_client_stats(self) -> List[Dict[str, Any]]:
+        """Get delivery counters for each connected client."""
+        return [session.get_stats() for session in list(self._sessions.values())]
+
 
 class WebSocketTracer:
     """
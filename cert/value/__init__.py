@@ -20,4 +20,23 @@ __all__ = [
     "CostAnalyzer",
     "ROICalculator",
     "Optimizer",
+    # Requires [monitoring]
+    "CostTimeSeries",
+    "ReplaySimulator",
 ]
+
+
+# Lazy import for features requiring [monitoring] extras
+def __getattr__(name):
+    """Lazy load numpy-dependent features."""
+    if name == "CostTimeSeries":
+        from cert.value.timeseries import CostTimeSeries
+
+        return CostTimeSeries
+
+    if name == "ReplaySimulator":
+        from cert.value.simulator import ReplaySimulator
+
+        return ReplaySimulator
+
+    raise AttributeError(f"module 'cert.value' has no attribute '{name}'")
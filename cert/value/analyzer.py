@@ -11,7 +11,12 @@ import statistics
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from cert.integrations.sampling import sample_weight
+
+if TYPE_CHECKING:
+    from cert.value.timeseries import CostTimeSeries
 
 
 class CostAnalyzer:
@@ -19,7 +24,8 @@ class CostAnalyzer:
     Analyzer for AI/LLM costs.
 
     This class loads traces from JSONL files and provides various
-    cost analysis methods.
+    cost analysis methods. Costs of head-sampled traces are scaled by their
+    ``sample_weight`` so totals estimate spend across all calls.
     """
 
     def __init__(self, traces_path: str):
@@ -71,7 +77,7 @@ class CostAnalyzer:
             Total cost in USD
         """
         filtered = self._filter_by_date(self.traces, start_date, end_date)
-        return sum(t.get("cost", 0) or 0 for t in filtered)
+        return sum(self._trace_cost(t) for t in filtered)
 
     def cost_by_model(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -91,7 +97,7 @@ class CostAnalyzer:
 
         for trace in filtered:
             model = trace.get("model", "unknown")
-            cost = trace.get("cost", 0) or 0
+            cost = self._trace_cost(trace)
             costs[model] += cost
 
         return dict(costs)
@@ -114,7 +120,7 @@ class CostAnalyzer:
 
         for trace in filtered:
             platform = trace.get("platform", "unknown")
-            cost = trace.get("cost", 0) or 0
+            cost = self._trace_cost(trace)
             costs[platform] += cost
 
         return dict(costs)
@@ -145,7 +151,7 @@ class CostAnalyzer:
                 continue
 
             date_key = self._truncate_timestamp(timestamp, granularity)
-            cost = trace.get("cost", 0) or 0
+            cost = self._trace_cost(trace)
             trends[date_key] += cost
 
         return dict(sorted(trends.items()))
@@ -187,6 +193,57 @@ class CostAnalyzer:
 
         return sorted(anomalies, key=lambda x: x["deviation"], reverse=True)
 
+    def cost_timeseries(
+        self,
+        freq: str = "hour",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> "CostTimeSeries":
+        """
+        Build a dense, vectorized cost series for time-series analysis.
+
+        Requires: pip install cert-framework[monitoring]
+
+        Args:
+            freq: Bucket width ("hour" or "day")
+            start_date: Start of period
+            end_date: End of period
+
+        Returns:
+            CostTimeSeries with rolling z-scores, decomposition and forecasting
+
+        Example:
+            >>> series = analyzer.cost_timeseries("hour")
+            >>> series.detect_anomalies(window=24, threshold=3.0)
+        """
+        from cert.value.timeseries import CostTimeSeries
+
+        return CostTimeSeries.from_traces(self.traces, freq, start_date, end_date)
+
+    def budget_burn(
+        self,
+        budget: float,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+        freq: str = "hour",
+    ) -> Dict[str, Any]:
+        """
+        Project spend against a budget for the current billing period.
+
+        Requires: pip install cert-framework[monitoring]
+
+        Args:
+            budget: Budget for the billing period
+            period_start: Start of billing period (defaults to start of current month)
+            period_end: End of billing period (defaults to start of next month)
+            freq: Bucket width used for the forecast ("hour" or "day")
+
+        Returns:
+            Spent amount, projected total and projected budget exhaustion time
+        """
+        series = self.cost_timeseries(freq)
+        return series.budget_burn(budget, period_start, period_end, as_of=datetime.utcnow())
+
     def cost_per_successful_task(self, accuracy_threshold: float = 0.7) -> Optional[float]:
         """
         Calculate cost divided by success rate.
@@ -200,7 +257,7 @@ class CostAnalyzer:
         total_cost = self.total_cost()
 
         successful = sum(
-            1
+            sample_weight(t)
             for t in self.traces
             if t.get("metadata", {}).get("confidence", 0) >= accuracy_threshold
             or (not t.get("error") and t.get("output_data"))
@@ -265,9 +322,19 @@ class CostAnalyzer:
                 "percentage": round((top_model[1] / total * 100) if total > 0 else 0, 1),
             },
             "anomalies": anomalies,
-            "total_traces": len(self._filter_by_date(self.traces, start_date, end_date)),
+            "total_traces": round(
+                sum(
+                    sample_weight(t)
+                    for t in self._filter_by_date(self.traces, start_date, end_date)
+                )
+            ),
         }
 
+    @staticmethod
+    def _trace_cost(trace: Dict[str, Any]) -> float:
+        """Cost of a trace scaled by its sample weight."""
+        return (trace.get("cost", 0) or 0) * sample_weight(trace)
+
     def _filter_by_date(
         self, traces: List[Dict], start_date: Optional[datetime], end_date: Optional[datetime]
     ) -> List[Dict]:
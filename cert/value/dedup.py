@@ -0,0 +1,297 @@
+"""
+Near-Duplicate Prompt Clustering
+================================
+
+Streaming MinHash/LSH index that groups near-identical prompts in a single
+pass with bounded memory, used to size semantic-cache opportunities.
+
+Signatures use one-permutation MinHash (each shingle is hashed once and
+binned, with empty bins densified from their neighbours), so computing a
+signature is O(shingles + num_perm) in pure Python. Candidate clusters are
+found through LSH banding and confirmed against the cluster
+representative's signature.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_MASK64 = (1 << 64) - 1
+_WHITESPACE = re.compile(r"\s+")
+
+# Distinct exact variants tracked per cluster
+MAX_TRACKED_VARIANTS = 64
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def prompt_text(input_data: Any) -> str:
+    """
+    Extract comparable prompt text from a trace ``input_data`` value.
+
+    Chat message lists are reduced to their ``content`` fields so that role
+    and formatting boilerplate does not inflate similarity between prompts.
+    """
+    if isinstance(input_data, str):
+        return input_data
+    if isinstance(input_data, dict):
+        if "messages" in input_data:
+            return prompt_text(input_data["messages"])
+        if "content" in input_data:
+            return prompt_text(input_data["content"])
+        if "prompt" in input_data:
+            return prompt_text(input_data["prompt"])
+    if isinstance(input_data, (list, tuple)):
+        return "\n".join(prompt_text(item) for item in input_data)
+    return str(input_data)
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """
+    Hash word ``size``-grams of normalized text.
+
+    Texts shorter than ``size`` words fall back to character 5-grams.
+    """
+    normalized = _WHITESPACE.sub(" ", text.lower()).strip()
+    words = normalized.split(" ")
+
+    if len(words) >= size:
+        grams = (" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+    elif normalized:
+        grams = (normalized[i : i + 5] for i in range(max(1, len(normalized) - 4)))
+    else:
+        return set()
+
+    return {_hash64(gram.encode("utf-8")) for gram in grams}
+
+
+def minhash_signature(shingle_hashes: Iterable[int], num_perm: int = 64) -> Tuple[int, ...]:
+    """
+    One-permutation MinHash signature with rotation densification.
+
+    Args:
+        shingle_hashes: 64-bit shingle hashes
+        num_perm: Number of signature slots
+
+    Returns:
+        Signature tuple of length ``num_perm`` (all zeros for empty input)
+    """
+    slot_width = (_MASK64 + 1) // num_perm
+    slots: List[Optional[int]] = [None] * num_perm
+
+    for h in shingle_hashes:
+        # Remix so that slot and offset are independent of shingle hash bits
+        h = (h * 0x9E3779B97F4A7C15) & _MASK64
+        index, offset = divmod(h, slot_width)
+        current = slots[index]
+        if current is None or offset < current:
+            slots[index] = offset
+
+    filled = [i for i, v in enumerate(slots) if v is not None]
+    if not filled:
+        return (0,) * num_perm
+
+    # Densify: borrow the next filled slot to the right, salted by distance
+    result = list(slots)
+    for i in range(num_perm):
+        if result[i] is None:
+            distance = 1
+            while slots[(i + distance) % num_perm] is None:
+                distance += 1
+            result[i] = slots[(i + distance) % num_perm] + distance * slot_width
+    return tuple(result)  # type: ignore[arg-type]
+
+
+def estimate_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity between two MinHash signatures."""
+    if not a:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+@dataclass
+class PromptCluster:
+    """A group of near-identical prompts."""
+
+    cluster_id: int
+    signature: Tuple[int, ...]
+    preview: str
+    # Prompts added, and the calls they stand for under head sampling
+    count: int = 0
+    calls: float = 0.0
+    total_cost: float = 0.0
+    similarity_sum: float = 0.0
+    variants: Set[int] = field(default_factory=set)
+    band_keys: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def cost_per_call(self) -> float:
+        return self.total_cost / self.calls if self.calls else 0.0
+
+    @property
+    def avg_similarity(self) -> float:
+        return self.similarity_sum / self.count if self.count else 0.0
+
+    @property
+    def distinct_prompts(self) -> int:
+        """Distinct exact prompts (capped at ``MAX_TRACKED_VARIANTS``)."""
+        return len(self.variants)
+
+    def estimated_savings(self, hit_rate: float = 1.0) -> float:
+        """Savings if every call after the first were served from a semantic cache."""
+        return self.cost_per_call * max(self.calls - 1, 0) * hit_rate
+
+    def to_dict(self, hit_rate: float = 1.0) -> Dict[str, Any]:
+        return {
+            "cluster_id": self.cluster_id,
+            "input_preview": self.preview,
+            "repetitions": round(self.calls, 2),
+            "distinct_prompts": self.distinct_prompts,
+            "match_type": "exact" if self.distinct_prompts == 1 else "near_duplicate",
+            "avg_similarity": round(self.avg_similarity, 3),
+            "cost_per_call": round(self.cost_per_call, 4),
+            "total_cost": round(self.total_cost, 2),
+            "potential_savings": round(self.estimated_savings(hit_rate), 2),
+        }
+
+
+class PromptClusterIndex:
+    """
+    Streaming near-duplicate index over prompts.
+
+    Memory is bounded by ``max_clusters``: when the limit is exceeded, the
+    oldest single-prompt clusters are evicted first, since they cannot
+    contribute cache savings unless they recur.
+
+    Example:
+        >>> index = PromptClusterIndex(similarity_threshold=0.7)
+        >>> for trace in traces:
+        ...     index.add(prompt_text(trace["input_data"]), trace.get("cost", 0))
+        >>> clusters = index.clusters(min_size=5)
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        max_clusters: int = 50_000,
+        preview_length: int = 100,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            similarity_threshold: Minimum estimated Jaccard similarity to join a cluster
+            num_perm: MinHash signature length
+            bands: Number of LSH bands (``num_perm`` must be divisible by it)
+            max_clusters: Maximum clusters kept in memory
+            preview_length: Characters of the first prompt kept for display
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_clusters = max_clusters
+        self.preview_length = preview_length
+
+        self._clusters: Dict[int, PromptCluster] = {}
+        self._buckets: Dict[Tuple[int, int], int] = {}
+        self._singletons: OrderedDict[int, None] = OrderedDict()
+        self._next_id = 0
+        self.total_prompts = 0
+        self.evicted_clusters = 0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        rows = self.rows
+        return [
+            (band, hash(signature[band * rows : (band + 1) * rows])) for band in range(self.bands)
+        ]
+
+    def add(self, text: str, cost: float = 0.0, weight: float = 1.0) -> int:
+        """
+        Add a prompt to the index.
+
+        Args:
+            text: Prompt text
+            cost: Cost of the call that used this prompt
+            weight: Calls the prompt stands for (``sample_weight`` of its trace)
+
+        Returns:
+            Id of the cluster the prompt was assigned to
+        """
+        self.total_prompts += 1
+        signature = minhash_signature(shingles(text), self.num_perm)
+        band_keys = self._band_keys(signature)
+
+        best: Optional[PromptCluster] = None
+        best_similarity = 0.0
+        for cluster_id in {self._buckets[k] for k in band_keys if k in self._buckets}:
+            cluster = self._clusters[cluster_id]
+            similarity = estimate_similarity(signature, cluster.signature)
+            if similarity > best_similarity:
+                best, best_similarity = cluster, similarity
+
+        if best is None or best_similarity < self.similarity_threshold:
+            best = self._create_cluster(signature, text, band_keys)
+            best_similarity = 1.0
+        elif best.count == 1:
+            self._singletons.pop(best.cluster_id, None)
+
+        best.count += 1
+        best.calls += weight
+        best.total_cost += (cost or 0.0) * weight
+        best.similarity_sum += best_similarity
+        if len(best.variants) < MAX_TRACKED_VARIANTS:
+            best.variants.add(_hash64(text.encode("utf-8")))
+
+        return best.cluster_id
+
+    def _create_cluster(
+        self, signature: Tuple[int, ...], text: str, band_keys: List[Tuple[int, int]]
+    ) -> PromptCluster:
+        if len(self._clusters) >= self.max_clusters:
+            self._evict()
+
+        preview = text[: self.preview_length] + "..." if len(text) > self.preview_length else text
+        cluster = PromptCluster(self._next_id, signature, preview)
+        self._next_id += 1
+
+        for key in band_keys:
+            if key not in self._buckets:
+                self._buckets[key] = cluster.cluster_id
+                cluster.band_keys.append(key)
+
+        self._clusters[cluster.cluster_id] = cluster
+        self._singletons[cluster.cluster_id] = None
+        return cluster
+
+    def _evict(self) -> None:
+        """Drop the oldest singleton cluster, or the smallest cluster if none."""
+        if self._singletons:
+            cluster_id, _ = self._singletons.popitem(last=False)
+        else:
+            cluster_id = min(self._clusters.values(), key=lambda c: c.count).cluster_id
+
+        cluster = self._clusters.pop(cluster_id)
+        for key in cluster.band_keys:
+            if self._buckets.get(key) == cluster_id:
+                del self._buckets[key]
+        self.evicted_clusters += 1
+
+    def clusters(self, min_size: int = 2) -> List[PromptCluster]:
+        """
+        Get clusters standing for at least ``min_size`` calls, largest savings first.
+        """
+        found = [c for c in self._clusters.values() if c.calls >= min_size]
+        return sorted(found, key=lambda c: c.estimated_savings(), reverse=True)
@@ -6,11 +6,13 @@ Analyzes traces to identify cost optimization opportunities including
 model downgrades, caching, and prompt optimization.
 """
 
-import statistics
-from collections import Counter, defaultdict
-from typing import Any, Dict, List
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
 
+from cert.integrations.sampling import sample_weight
 from cert.value.analyzer import CostAnalyzer
+from cert.value.dedup import PromptClusterIndex, prompt_text
 
 
 class Optimizer:
@@ -18,7 +20,8 @@ class Optimizer:
     Cost optimization recommendations engine.
 
     This class analyzes traces and suggests ways to reduce costs while
-    maintaining quality.
+    maintaining quality. Like ``CostAnalyzer``, costs and call counts of
+    head-sampled traces are scaled by their ``sample_weight``.
     """
 
     def __init__(self, traces_path: str):
@@ -55,21 +58,20 @@ class Optimizer:
         }
 
         for model, traces in tasks_by_model.items():
-            if len(traces) < 10:  # Need sufficient data
+            calls = sum(sample_weight(t) for t in traces)
+            if calls < 10:  # Need sufficient data
                 continue
 
-            # Calculate average confidence
-            confidences = [
-                t.get("metadata", {}).get("confidence", 0.5)
-                for t in traces
-                if "confidence" in t.get("metadata", {})
-            ]
+            # Calculate average confidence, weighted by calls
+            confident = [t for t in traces if "confidence" in t.get("metadata", {})]
 
-            if not confidences:
+            if not confident:
                 continue
 
-            avg_confidence = statistics.mean(confidences)
-            total_cost = sum(t.get("cost", 0) or 0 for t in traces)
+            avg_confidence = sum(
+                t["metadata"]["confidence"] * sample_weight(t) for t in confident
+            ) / sum(sample_weight(t) for t in confident)
+            total_cost = sum(CostAnalyzer._trace_cost(t) for t in traces)
 
             # If confidence is consistently high, might be over-engineering
             if avg_confidence > confidence_threshold:
@@ -88,66 +90,55 @@ class Optimizer:
                             "current_cost": round(total_cost, 2),
                             "estimated_savings": round(estimated_savings, 2),
                             "estimated_percentage": 60,
-                            "task_count": len(traces),
+                            "task_count": round(calls),
                             "confidence_level": "high" if avg_confidence > 0.9 else "medium",
                         }
                     )
 
         return sorted(recommendations, key=lambda x: x["estimated_savings"], reverse=True)
 
-    def find_caching_opportunities(self, min_repetitions: int = 5) -> List[Dict[str, Any]]:
+    def find_caching_opportunities(
+        self,
+        min_repetitions: int = 5,
+        similarity_threshold: float = 0.7,
+        max_clusters: int = 50_000,
+    ) -> List[Dict[str, Any]]:
         """
-        Identify repeated prompts that could be cached.
+        Identify repeated and near-duplicate prompts that could be cached.
+
+        Prompts are clustered in one streaming pass with a MinHash/LSH index,
+        so memory is bounded by ``max_clusters`` rather than the number of
+        traces. Exact repeats form clusters with a single distinct prompt.
 
         Args:
-            min_repetitions: Minimum number of repetitions to recommend caching
+            min_repetitions: Minimum number of prompts in a cluster to recommend caching
+            similarity_threshold: Minimum estimated Jaccard similarity between
+                prompts in a cluster (1.0 approximates exact matching)
+            max_clusters: Maximum clusters kept in memory
 
         Returns:
-            List of caching opportunities
+            List of caching opportunities with estimated semantic-cache savings
         """
-        opportunities = []
+        index = PromptClusterIndex(
+            similarity_threshold=similarity_threshold, max_clusters=max_clusters
+        )
 
-        # Count input occurrences
-        inputs = []
         for trace in self.analyzer.traces:
             input_data = trace.get("input_data")
             if input_data:
-                # Convert to string for comparison
-                input_str = str(input_data)
-                inputs.append((input_str, trace.get("cost", 0) or 0))
-
-        # Count occurrences
-        input_counts = Counter([inp[0] for inp in inputs])
-
-        # Calculate costs per input
-        input_costs = defaultdict(float)
-        for input_str, cost in inputs:
-            input_costs[input_str] += cost
-
-        for input_str, count in input_counts.items():
-            if count >= min_repetitions:
-                total_cost = input_costs[input_str]
-                cost_per_call = total_cost / count
+                index.add(prompt_text(input_data), trace.get("cost", 0) or 0, sample_weight(trace))
 
-                # Potential savings: all but first call could be cached
-                potential_savings = cost_per_call * (count - 1)
-
-                # Truncate long prompts for display
-                display_input = input_str[:100] + "..." if len(input_str) > 100 else input_str
-
-                opportunities.append(
-                    {
-                        "type": "caching",
-                        "input_preview": display_input,
-                        "repetitions": count,
-                        "cost_per_call": round(cost_per_call, 4),
-                        "total_cost": round(total_cost, 2),
-                        "potential_savings": round(potential_savings, 2),
-                        "recommendation": "Implement prompt caching or memoization",
-                    }
-                )
+        opportunities = []
+        for cluster in index.clusters(min_size=min_repetitions):
+            opportunity = {"type": "caching", **cluster.to_dict()}
+            opportunity["recommendation"] = (
+                "Implement prompt caching or memoization"
+                if opportunity["match_type"] == "exact"
+                else "Implement semantic caching for near-identical prompts"
+            )
+            opportunities.append(opportunity)
 
-        return sorted(opportunities, key=lambda x: x["potential_savings"], reverse=True)
+        return opportunities
 
     def suggest_prompt_optimizations(
         self, long_prompt_threshold: int = 1000
@@ -168,7 +159,7 @@ class Optimizer:
             estimated_tokens = len(input_data) // 4  # Rough estimate
 
             if estimated_tokens > long_prompt_threshold:
-                cost = trace.get("cost", 0) or 0
+                cost = CostAnalyzer._trace_cost(trace)
 
                 # Estimate savings from 30% prompt reduction
                 potential_savings = cost * 0.3
@@ -199,8 +190,9 @@ class Optimizer:
         hourly_groups = self._group_by_hour(self.analyzer.traces)
 
         for hour, traces in hourly_groups.items():
-            if len(traces) >= 10:  # Significant number of calls
-                total_cost = sum(t.get("cost", 0) or 0 for t in traces)
+            calls = sum(sample_weight(t) for t in traces)
+            if calls >= 10:  # Significant number of calls
+                total_cost = sum(CostAnalyzer._trace_cost(t) for t in traces)
 
                 # Estimate 20% savings from batching
                 estimated_savings = total_cost * 0.2
@@ -209,7 +201,7 @@ class Optimizer:
                     {
                         "type": "batching",
                         "time_window": hour,
-                        "call_count": len(traces),
+                        "call_count": round(calls),
                         "current_cost": round(total_cost, 2),
                         "potential_savings": round(estimated_savings, 2),
                         "recommendation": "Batch similar requests to reduce API overhead",
@@ -269,6 +261,51 @@ class Optimizer:
             },
         }
 
+    def simulate_policies(
+        self,
+        scenarios: Optional[Dict[str, Sequence[Any]]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Replay the trace window under alternative cost policies.
+
+        Requires: pip install cert-framework[monitoring]
+
+        Args:
+            scenarios: Mapping of scenario name to policy list (defaults to
+                batching, model routing, truncation and all three combined)
+            start_date: Start of the replayed window
+            end_date: End of the replayed window
+            pricing: Per-1K-token price overrides used when repricing calls
+
+        Returns:
+            Projected cost, latency and quality deltas per scenario, largest
+            savings first
+
+        Example:
+            >>> from cert.value.simulator import BatchPolicy
+            >>> optimizer.simulate_policies({"nightly": [BatchPolicy(window_seconds=86400)]})
+        """
+        from cert.value.simulator import (
+            BatchPolicy,
+            ModelRoutingPolicy,
+            ReplaySimulator,
+            TruncationPolicy,
+        )
+
+        if scenarios is None:
+            scenarios = {
+                "batching": [BatchPolicy()],
+                "model_routing": [ModelRoutingPolicy()],
+                "truncation": [TruncationPolicy()],
+                "combined": [ModelRoutingPolicy(), TruncationPolicy(), BatchPolicy()],
+            }
+
+        traces = self.analyzer._filter_by_date(self.analyzer.traces, start_date, end_date)
+        return ReplaySimulator(traces, pricing).compare(scenarios)
+
     def _group_by_model(self, traces: List[Dict]) -> Dict[str, List[Dict]]:
         """
         Group traces by model.
@@ -0,0 +1,493 @@
+"""
+Policy Replay Simulator
+=======================
+
+Replays a historical trace window under alternative cost policies and
+projects the cost, latency and quality deltas:
+
+- BatchPolicy: route non-interactive calls through a discounted batch API
+- ModelRoutingPolicy: downgrade models for high-confidence task types
+- TruncationPolicy: cap prompt length
+
+Traces are converted once into columnar NumPy arrays; every policy is a
+handful of vectorized array operations, so a month of traces replays in
+well under a second.
+
+Requires: pip install cert-framework[monitoring]
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "Policy simulation requires: pip install cert-framework[monitoring]\n"
+        "This includes the numpy dependency."
+    )
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _first_number(*values: Any) -> float:
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return float("nan")
+
+
+class TraceFrame:
+    """
+    Columnar view of a trace window.
+
+    Attributes:
+        timestamps: Epoch seconds (naive UTC)
+        cost: Cost in USD (0 where unknown)
+        prompt_tokens: Prompt tokens (reported, estimated, or len(input) / 4)
+        completion_tokens: Completion tokens (reported or estimated)
+        latency_ms: Latency in milliseconds (NaN where unknown)
+        confidence: Evaluation confidence (NaN where unknown)
+        error: Whether the call failed
+        model_codes / models: Integer codes into the ``models`` list
+        task_codes / task_types: Integer codes into the ``task_types`` list
+    """
+
+    def __init__(self, traces: Sequence[Dict[str, Any]]):
+        """
+        Build the frame.
+
+        Args:
+            traces: Trace dictionaries as written by CertTracer and connectors
+        """
+        n = len(traces)
+        self.timestamps = np.zeros(n)
+        self.cost = np.zeros(n)
+        self.prompt_tokens = np.zeros(n)
+        self.completion_tokens = np.zeros(n)
+        self.latency_ms = np.full(n, np.nan)
+        self.confidence = np.full(n, np.nan)
+        self.error = np.zeros(n, dtype=bool)
+
+        model_index: Dict[str, int] = {}
+        task_index: Dict[str, int] = {}
+        self.model_codes = np.zeros(n, dtype=np.int64)
+        self.task_codes = np.zeros(n, dtype=np.int64)
+
+        for i, trace in enumerate(traces):
+            metadata = trace.get("metadata") or {}
+
+            timestamp = trace.get("timestamp")
+            if timestamp:
+                try:
+                    dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                    self.timestamps[i] = (dt.replace(tzinfo=None) - _EPOCH).total_seconds()
+                except (ValueError, AttributeError):
+                    pass
+
+            self.cost[i] = trace.get("cost") or metadata.get("cost") or 0.0
+
+            prompt = _first_number(
+                metadata.get("prompt_tokens"),
+                metadata.get("input_tokens"),
+                metadata.get("estimated_prompt_tokens"),
+            )
+            if np.isnan(prompt):
+                prompt = len(str(trace.get("input_data") or trace.get("input") or "")) // 4
+            completion = _first_number(
+                metadata.get("completion_tokens"),
+                metadata.get("output_tokens"),
+                metadata.get("estimated_completion_tokens"),
+            )
+            if np.isnan(completion):
+                completion = len(str(trace.get("output_data") or trace.get("answer") or "")) // 4
+            self.prompt_tokens[i] = prompt
+            self.completion_tokens[i] = completion
+
+            self.latency_ms[i] = _first_number(
+                trace.get("duration_ms"), trace.get("latency_ms"), metadata.get("latency_ms")
+            )
+            evaluation = trace.get("evaluation") or {}
+            self.confidence[i] = _first_number(
+                metadata.get("confidence"), evaluation.get("confidence")
+            )
+            self.error[i] = bool(trace.get("error")) or trace.get("status") == "error"
+
+            model = trace.get("model") or metadata.get("model") or "unknown"
+            task = metadata.get("task_type") or trace.get("function") or "unknown"
+            self.model_codes[i] = model_index.setdefault(model, len(model_index))
+            self.task_codes[i] = task_index.setdefault(task, len(task_index))
+
+        self.models: List[str] = list(model_index)
+        self.task_types: List[str] = list(task_index)
+
+    def __len__(self) -> int:
+        return len(self.cost)
+
+    def model_mask(self, models: Optional[Sequence[str]]) -> "np.ndarray":
+        """Boolean mask of calls made with any of ``models`` (all calls if None)."""
+        if models is None:
+            return np.ones(len(self), dtype=bool)
+        codes = [self.models.index(m) for m in models if m in self.models]
+        return np.isin(self.model_codes, codes)
+
+    def task_mask(self, task_types: Optional[Sequence[str]]) -> "np.ndarray":
+        """Boolean mask of calls with any of ``task_types`` (all calls if None)."""
+        if task_types is None:
+            return np.ones(len(self), dtype=bool)
+        codes = [self.task_types.index(t) for t in task_types if t in self.task_types]
+        return np.isin(self.task_codes, codes)
+
+
+class PriceTable:
+    """Per-1K-token prices with longest-prefix model matching."""
+
+    def __init__(self, pricing: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Initialize the price table.
+
+        Args:
+            pricing: Overrides merged over ``MODEL_PRICING`` (per 1K tokens)
+        """
+        from cert.monitoring.realtime.token_analytics import MODEL_PRICING
+
+        self.pricing = dict(MODEL_PRICING)
+        if pricing:
+            self.pricing.update(pricing)
+        self._keys = sorted((k for k in self.pricing if k != "default"), key=len, reverse=True)
+
+    def get(self, model: str) -> Dict[str, float]:
+        """Get input/output prices for a model."""
+        if model in self.pricing:
+            return self.pricing[model]
+        model_lower = model.lower()
+        for key in self._keys:
+            if key in model_lower:
+                return self.pricing[key]
+        return self.pricing["default"]
+
+    def arrays(self, models: Sequence[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Input and output prices per 1K tokens, indexed by model code."""
+        prices = [self.get(m) for m in models]
+        return (
+            np.array([p["input"] for p in prices], dtype=np.float64),
+            np.array([p["output"] for p in prices], dtype=np.float64),
+        )
+
+
+@dataclass
+class ReplayState:
+    """Mutable per-call projections that policies transform in sequence."""
+
+    cost: "np.ndarray"
+    latency_ms: "np.ndarray"
+    confidence: "np.ndarray"
+    prompt_tokens: "np.ndarray"
+    model_codes: "np.ndarray"
+    models: List[str]
+    affected: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BatchPolicy:
+    """
+    Send eligible calls through a discounted batch API.
+
+    Calls are grouped into fixed windows; a call waits until its window
+    closes and is then processed within ``processing_seconds``. Windows with
+    fewer than ``min_batch_size`` eligible calls stay on the realtime API.
+
+    Attributes:
+        window_seconds: Batch collection window
+        discount: Fractional price reduction (0.5 for typical batch APIs)
+        min_batch_size: Minimum calls in a window for it to be batched
+        processing_seconds: Expected batch processing time after the window closes
+        task_types: Task types eligible for batching (None = all)
+        models: Models eligible for batching (None = all)
+    """
+
+    window_seconds: float = 3600.0
+    discount: float = 0.5
+    min_batch_size: int = 10
+    processing_seconds: float = 0.0
+    task_types: Optional[List[str]] = None
+    models: Optional[List[str]] = None
+    name: str = "batch"
+
+    def apply(self, frame: TraceFrame, state: ReplayState, prices: PriceTable) -> None:
+        eligible = frame.task_mask(self.task_types) & frame.model_mask(self.models) & ~frame.error
+        if not eligible.any():
+            state.affected[self.name] = 0
+            return
+
+        windows = np.floor_divide(frame.timestamps, self.window_seconds)
+        _, window_ids, window_counts = np.unique(
+            windows[eligible], return_inverse=True, return_counts=True
+        )
+        batched = np.zeros(len(frame), dtype=bool)
+        batched[eligible] = window_counts[window_ids] >= self.min_batch_size
+
+        window_end = (windows + 1) * self.window_seconds
+        wait_ms = (window_end - frame.timestamps + self.processing_seconds) * 1000.0
+
+        state.cost = np.where(batched, state.cost * (1.0 - self.discount), state.cost)
+        state.latency_ms = np.where(batched, state.latency_ms + wait_ms, state.latency_ms)
+        state.affected[self.name] = int(batched.sum())
+
+
+@dataclass
+class ModelRoutingPolicy:
+    """
+    Downgrade models for task types that are consistently high-confidence.
+
+    A (task type, model) group is routed when its mean confidence is at
+    least ``min_confidence`` over at least ``min_samples`` evaluated calls.
+    Routed calls are repriced at the target model's token prices.
+
+    Attributes:
+        downgrades: Mapping of current model to cheaper target model
+        min_confidence: Minimum mean confidence of a (task type, model) group
+        min_samples: Minimum evaluated calls in a group
+        confidence_drop: Expected confidence loss on routed calls
+        latency_ratio: Target latency as a fraction of current latency
+        task_types: Task types eligible for routing (None = all)
+    """
+
+    downgrades: Dict[str, str] = field(
+        default_factory=lambda: {
+            "gpt-4": "gpt-4o-mini",
+            "gpt-4-turbo": "gpt-4o-mini",
+            "gpt-4o": "gpt-4o-mini",
+            "claude-3-opus": "claude-3-haiku",
+            "claude-3-sonnet": "claude-3-haiku",
+        }
+    )
+    min_confidence: float = 0.85
+    min_samples: int = 10
+    confidence_drop: float = 0.05
+    latency_ratio: float = 0.6
+    task_types: Optional[List[str]] = None
+    name: str = "model_routing"
+
+    def apply(self, frame: TraceFrame, state: ReplayState, prices: PriceTable) -> None:
+        n_models = len(frame.models)
+        group = frame.task_codes * n_models + frame.model_codes
+        n_groups = (len(frame.task_types) or 1) * (n_models or 1)
+
+        evaluated = ~np.isnan(frame.confidence)
+        counts = np.bincount(group[evaluated], minlength=n_groups)
+        sums = np.bincount(
+            group[evaluated], weights=frame.confidence[evaluated], minlength=n_groups
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_conf = np.where(counts > 0, sums / counts, 0.0)
+        confident_group = (counts >= self.min_samples) & (mean_conf >= self.min_confidence)
+
+        # Map each model code to its target code (or itself when not downgraded)
+        target_codes = np.arange(len(state.models))
+        for code, model in enumerate(list(state.models)):
+            target = self.downgrades.get(model)
+            if target:
+                if target not in state.models:
+                    state.models.append(target)
+                target_codes[code] = state.models.index(target)
+
+        new_codes = target_codes[state.model_codes]
+        routed = (
+            confident_group[group]
+            & (new_codes != state.model_codes)
+            & frame.task_mask(self.task_types)
+        )
+        if not routed.any():
+            state.affected[self.name] = 0
+            return
+
+        input_price, output_price = prices.arrays(state.models)
+        new_rate = (
+            state.prompt_tokens * input_price[new_codes]
+            + frame.completion_tokens * output_price[new_codes]
+        )
+        old_rate = (
+            state.prompt_tokens * input_price[state.model_codes]
+            + frame.completion_tokens * output_price[state.model_codes]
+        )
+        # Scale the projected cost so discounts from earlier policies carry over
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(old_rate > 0, new_rate / old_rate, 1.0)
+
+        state.cost = np.where(routed, state.cost * ratio, state.cost)
+        state.latency_ms = np.where(routed, state.latency_ms * self.latency_ratio, state.latency_ms)
+        state.confidence = np.where(
+            routed, np.clip(state.confidence - self.confidence_drop, 0.0, 1.0), state.confidence
+        )
+        state.model_codes = np.where(routed, new_codes, state.model_codes)
+        state.affected[self.name] = int(routed.sum())
+
+
+@dataclass
+class TruncationPolicy:
+    """
+    Cap prompt length at ``max_prompt_tokens``.
+
+    Attributes:
+        max_prompt_tokens: Maximum prompt tokens after truncation
+        confidence_drop_per_fraction: Confidence loss per fraction of prompt removed
+        prefill_ms_per_token: Latency saved per removed prompt token
+        task_types: Task types eligible for truncation (None = all)
+    """
+
+    max_prompt_tokens: int = 2000
+    confidence_drop_per_fraction: float = 0.2
+    prefill_ms_per_token: float = 0.05
+    task_types: Optional[List[str]] = None
+    name: str = "truncation"
+
+    def apply(self, frame: TraceFrame, state: ReplayState, prices: PriceTable) -> None:
+        truncated = (state.prompt_tokens > self.max_prompt_tokens) & frame.task_mask(
+            self.task_types
+        )
+        if not truncated.any():
+            state.affected[self.name] = 0
+            return
+
+        input_price, output_price = prices.arrays(state.models)
+        removed = np.where(truncated, state.prompt_tokens - self.max_prompt_tokens, 0.0)
+        removed_fraction = np.where(truncated, removed / np.maximum(state.prompt_tokens, 1), 0.0)
+
+        total_rate = (
+            state.prompt_tokens * input_price[state.model_codes]
+            + frame.completion_tokens * output_price[state.model_codes]
+        )
+        removed_rate = removed * input_price[state.model_codes]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kept = np.where(total_rate > 0, 1.0 - removed_rate / total_rate, 1.0)
+
+        state.cost = state.cost * kept
+        state.latency_ms = np.maximum(state.latency_ms - removed * self.prefill_ms_per_token, 0.0)
+        state.confidence = np.clip(
+            state.confidence - removed_fraction * self.confidence_drop_per_fraction, 0.0, 1.0
+        )
+        state.prompt_tokens = state.prompt_tokens - removed
+        state.affected[self.name] = int(truncated.sum())
+
+
+def _percentile(values: "np.ndarray", q: float) -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return float(np.percentile(values, q)) if len(values) else None
+
+
+def _mean(values: "np.ndarray") -> Optional[float]:
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def _delta(new: Optional[float], old: Optional[float]) -> Optional[float]:
+    return None if new is None or old is None else new - old
+
+
+class ReplaySimulator:
+    """
+    Replay a trace window under alternative policies.
+
+    Example:
+        >>> simulator = ReplaySimulator(analyzer.traces)
+        >>> result = simulator.simulate([BatchPolicy(task_types=["summarize"])])
+        >>> result["cost"]["delta"]
+        -123.4
+        >>> simulator.compare({
+        ...     "batch": [BatchPolicy()],
+        ...     "routing": [ModelRoutingPolicy()],
+        ...     "combined": [ModelRoutingPolicy(), BatchPolicy(), TruncationPolicy()],
+        ... })
+    """
+
+    def __init__(
+        self,
+        traces: Sequence[Dict[str, Any]],
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        """
+        Initialize the simulator.
+
+        Args:
+            traces: Historical trace window
+            pricing: Per-1K-token price overrides merged over the default table
+        """
+        self.frame = TraceFrame(traces)
+        self.prices = PriceTable(pricing)
+
+    def simulate(self, policies: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Apply policies in order and project cost, latency and quality.
+
+        Args:
+            policies: Policy objects with an ``apply(frame, state, prices)`` method
+
+        Returns:
+            Baseline, projected and delta values for cost, latency and quality,
+            plus the number of calls each policy affected
+        """
+        frame = self.frame
+        state = ReplayState(
+            cost=frame.cost.copy(),
+            latency_ms=frame.latency_ms.copy(),
+            confidence=frame.confidence.copy(),
+            prompt_tokens=frame.prompt_tokens.copy(),
+            model_codes=frame.model_codes.copy(),
+            models=list(frame.models),
+        )
+
+        for policy in policies:
+            policy.apply(frame, state, self.prices)
+
+        baseline_cost = float(frame.cost.sum())
+        projected_cost = float(state.cost.sum())
+        baseline_p50 = _percentile(frame.latency_ms, 50)
+        baseline_p95 = _percentile(frame.latency_ms, 95)
+        projected_p50 = _percentile(state.latency_ms, 50)
+        projected_p95 = _percentile(state.latency_ms, 95)
+        baseline_quality = _mean(frame.confidence)
+        projected_quality = _mean(state.confidence)
+
+        return {
+            "policies": [getattr(p, "name", type(p).__name__) for p in policies],
+            "trace_count": len(frame),
+            "affected_calls": dict(state.affected),
+            "cost": {
+                "baseline": round(baseline_cost, 4),
+                "projected": round(projected_cost, 4),
+                "delta": round(projected_cost - baseline_cost, 4),
+                "delta_percentage": round((projected_cost - baseline_cost) / baseline_cost * 100, 1)
+                if baseline_cost > 0
+                else 0.0,
+            },
+            "latency_ms": {
+                "baseline_p50": baseline_p50,
+                "baseline_p95": baseline_p95,
+                "projected_p50": projected_p50,
+                "projected_p95": projected_p95,
+                "delta_p95": _delta(projected_p95, baseline_p95),
+            },
+            "quality": {
+                "baseline": baseline_quality,
+                "projected": projected_quality,
+                "delta": _delta(projected_quality, baseline_quality),
+            },
+        }
+
+    def compare(self, scenarios: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        """
+        Simulate several named scenarios, largest savings first.
+
+        Args:
+            scenarios: Mapping of scenario name to policy list
+
+        Returns:
+            List of simulation results with a ``scenario`` key
+        """
+        results = [
+            {"scenario": name, **self.simulate(policies)} for name, policies in scenarios.items()
+        ]
+        return sorted(results, key=lambda r: r["cost"]["delta"])
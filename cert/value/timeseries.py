@@ -0,0 +1,451 @@
+"""
+Cost Time-Series Engine
+=======================
+
+Vectorized analysis of cost rollups: rolling z-score anomaly detection,
+seasonal decomposition, short-horizon forecasting and budget-burn
+projection. All operations work on dense NumPy arrays of fixed-width
+buckets, so months of hourly data are processed in milliseconds.
+
+Requires: pip install cert-framework[monitoring]
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from cert.integrations.sampling import sample_weight
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError(
+        "Cost time-series analysis requires: pip install cert-framework[monitoring]\n"
+        "This includes the numpy dependency."
+    )
+
+
+BUCKET_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+}
+
+# Seasonal period (in buckets) used when none is given
+DEFAULT_PERIODS = {
+    "hour": 24,
+    "day": 7,
+}
+
+# Lower bound on baseline standard deviation, relative to the baseline mean
+MIN_RELATIVE_STD = 0.01
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _parse_timestamp(timestamp_str: str) -> Optional[float]:
+    """Parse an ISO 8601 timestamp to naive-UTC epoch seconds."""
+    try:
+        dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+        return (dt.replace(tzinfo=None) - _EPOCH).total_seconds()
+    except (ValueError, AttributeError):
+        return None
+
+
+def _rolling_sum(values: "np.ndarray", window: int) -> "np.ndarray":
+    """Trailing sums of ``window`` elements ending at each index (O(n))."""
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    sums = cumsum[window:] - cumsum[:-window]
+    return np.concatenate((np.full(window - 1, np.nan), sums))
+
+
+class CostTimeSeries:
+    """
+    Dense, fixed-width bucketed cost series.
+
+    Example:
+        >>> series = CostTimeSeries.from_traces(analyzer.traces, freq="hour")
+        >>> anomalies = series.detect_anomalies(window=24, threshold=3.0)
+        >>> forecast = series.forecast(horizon=48)
+        >>> burn = series.budget_burn(budget=500.0, period_end=datetime(2025, 1, 31))
+    """
+
+    def __init__(self, start: datetime, values: "np.ndarray", freq: str = "hour"):
+        """
+        Initialize the series.
+
+        Args:
+            start: Start of the first bucket (naive UTC)
+            values: Cost per bucket
+            freq: Bucket width ("hour" or "day")
+        """
+        if freq not in BUCKET_SECONDS:
+            raise ValueError(f"Unsupported frequency: {freq}. Use one of {list(BUCKET_SECONDS)}")
+
+        self.start = start
+        self.values = np.asarray(values, dtype=np.float64)
+        self.freq = freq
+        self.bucket_seconds = BUCKET_SECONDS[freq]
+
+    @classmethod
+    def from_traces(
+        cls,
+        traces: Iterable[Dict[str, Any]],
+        freq: str = "hour",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> "CostTimeSeries":
+        """
+        Build a series by bucketing trace costs.
+
+        Empty buckets between the first and last trace are filled with zero.
+        Costs of head-sampled traces are scaled by their sample weight.
+
+        Args:
+            traces: Trace dictionaries with ``timestamp`` and ``cost``
+            freq: Bucket width ("hour" or "day")
+            start_date: Optional start of range (inclusive)
+            end_date: Optional end of range (inclusive)
+
+        Returns:
+            CostTimeSeries covering the traces
+        """
+        if freq not in BUCKET_SECONDS:
+            raise ValueError(f"Unsupported frequency: {freq}. Use one of {list(BUCKET_SECONDS)}")
+
+        seconds: List[float] = []
+        costs: List[float] = []
+        for trace in traces:
+            timestamp_str = trace.get("timestamp")
+            if not timestamp_str:
+                continue
+            ts = _parse_timestamp(timestamp_str)
+            if ts is None:
+                continue
+            seconds.append(ts)
+            costs.append((trace.get("cost", 0) or 0) * sample_weight(trace))
+
+        ts_arr = np.asarray(seconds, dtype=np.float64)
+        cost_arr = np.asarray(costs, dtype=np.float64)
+
+        if start_date is not None or end_date is not None:
+            mask = np.ones(len(ts_arr), dtype=bool)
+            if start_date is not None:
+                mask &= ts_arr >= (start_date - _EPOCH).total_seconds()
+            if end_date is not None:
+                mask &= ts_arr <= (end_date - _EPOCH).total_seconds()
+            ts_arr, cost_arr = ts_arr[mask], cost_arr[mask]
+
+        return cls.from_arrays(ts_arr, cost_arr, freq)
+
+    @classmethod
+    def from_arrays(
+        cls, epoch_seconds: "np.ndarray", costs: "np.ndarray", freq: str = "hour"
+    ) -> "CostTimeSeries":
+        """
+        Build a series from parallel arrays of epoch seconds and costs.
+
+        Args:
+            epoch_seconds: Naive-UTC epoch seconds per event
+            costs: Cost per event
+            freq: Bucket width ("hour" or "day")
+
+        Returns:
+            CostTimeSeries covering the events
+        """
+        width = BUCKET_SECONDS[freq]
+        epoch_seconds = np.asarray(epoch_seconds, dtype=np.float64)
+
+        if len(epoch_seconds) == 0:
+            return cls(_EPOCH, np.zeros(0), freq)
+
+        buckets = np.floor_divide(epoch_seconds, width).astype(np.int64)
+        first = int(buckets.min())
+        values = np.bincount(buckets - first, weights=np.asarray(costs, dtype=np.float64))
+
+        return cls(_EPOCH + timedelta(seconds=first * width), values, freq)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def end(self) -> datetime:
+        """End (exclusive) of the last bucket."""
+        return self.bucket_start(len(self.values))
+
+    def bucket_start(self, index: int) -> datetime:
+        """Start time of the bucket at ``index``."""
+        return self.start + timedelta(seconds=index * self.bucket_seconds)
+
+    def rolling_zscore(self, window: int = 24) -> "np.ndarray":
+        """
+        Z-score of each bucket against the preceding ``window`` buckets.
+
+        The current bucket is excluded from its own baseline so that a spike
+        does not inflate the statistics it is compared against.
+
+        Args:
+            window: Number of preceding buckets in the baseline
+
+        Returns:
+            Array of z-scores (NaN where the baseline is incomplete or all zero)
+        """
+        n = len(self.values)
+        z = np.full(n, np.nan)
+        if n <= window or window < 2:
+            return z
+
+        # Center on the global mean to limit cancellation in the variance
+        offset = self.values.mean()
+        centered = self.values - offset
+        sums = _rolling_sum(centered, window)
+        sq_sums = _rolling_sum(centered**2, window)
+
+        # Baseline for index i is the window ending at i - 1
+        mean = sums[window - 1 : n - 1] / window
+        var = (sq_sums[window - 1 : n - 1] - window * mean**2) / (window - 1)
+        std = np.sqrt(np.clip(var, 0.0, None))
+        mean += offset
+        # Flat baselines get a noise floor so spikes over them still score
+        std = np.maximum(std, MIN_RELATIVE_STD * np.abs(mean))
+
+        current = self.values[window:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z[window:] = np.where(std > 0, (current - mean) / std, np.nan)
+
+        return z
+
+    def detect_anomalies(self, window: int = 24, threshold: float = 3.0) -> List[Dict[str, Any]]:
+        """
+        Detect cost spikes with a rolling z-score.
+
+        Args:
+            window: Number of preceding buckets in the baseline
+            threshold: Z-score above which a bucket is anomalous
+
+        Returns:
+            List of anomalies sorted by deviation, highest first
+        """
+        z = self.rolling_zscore(window)
+        hits = np.nonzero(np.nan_to_num(z, nan=0.0) > threshold)[0]
+        if len(hits) == 0:
+            return []
+
+        sums = _rolling_sum(self.values, window)
+        anomalies = []
+        for i in hits:
+            expected = sums[i - 1] / window
+            cost = self.values[i]
+            anomalies.append(
+                {
+                    "timestamp": self.bucket_start(int(i)).isoformat() + "Z",
+                    "cost": round(float(cost), 4),
+                    "expected": round(float(expected), 4),
+                    "deviation": round(float(z[i]), 2),
+                    "severity": "critical" if z[i] > threshold * 1.5 else "high",
+                    "percent_increase": round(float((cost - expected) / expected * 100), 1)
+                    if expected > 0
+                    else None,
+                }
+            )
+
+        return sorted(anomalies, key=lambda x: x["deviation"], reverse=True)
+
+    def decompose(self, period: Optional[int] = None) -> Dict[str, "np.ndarray"]:
+        """
+        Additive seasonal decomposition (trend + seasonal + residual).
+
+        Trend is a centered moving average over one period, seasonal is the
+        zero-mean average detrended value per phase, and residual is the
+        remainder. Trend edges are extended from the nearest full window.
+
+        Args:
+            period: Seasonal period in buckets (defaults to 24 for hourly, 7 for daily)
+
+        Returns:
+            Dict with ``trend``, ``seasonal`` and ``residual`` arrays
+        """
+        period = period or DEFAULT_PERIODS[self.freq]
+        n = len(self.values)
+
+        if n < 2 * period:
+            trend = np.full(n, self.values.mean() if n else 0.0)
+            seasonal = np.zeros(n)
+            return {"trend": trend, "seasonal": seasonal, "residual": self.values - trend}
+
+        if period % 2 == 0:
+            # 2 x period moving average keeps even periods centered
+            kernel = np.concatenate(([0.5], np.ones(period - 1), [0.5])) / period
+        else:
+            kernel = np.ones(period) / period
+
+        half = len(kernel) // 2
+        valid = np.convolve(self.values, kernel, mode="valid")
+        trend = np.concatenate(
+            (np.full(half, valid[0]), valid, np.full(n - len(valid) - half, valid[-1]))
+        )
+
+        detrended = self.values - trend
+        phases = np.arange(n) % period
+        phase_means = np.bincount(phases, weights=detrended, minlength=period) / np.bincount(
+            phases, minlength=period
+        )
+        phase_means -= phase_means.mean()
+        seasonal = phase_means[phases]
+
+        return {
+            "trend": trend,
+            "seasonal": seasonal,
+            "residual": self.values - trend - seasonal,
+        }
+
+    def forecast(
+        self,
+        horizon: int = 24,
+        period: Optional[int] = None,
+        fit_window: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Forecast the next ``horizon`` buckets.
+
+        Fits a least-squares linear trend to the deseasonalized recent history
+        and re-applies the seasonal profile. The interval is +/- 1.96 residual
+        standard deviations. Forecasts are clipped at zero.
+
+        Args:
+            horizon: Number of buckets to forecast
+            period: Seasonal period in buckets
+            fit_window: Number of recent buckets used for the trend fit
+                (defaults to four periods)
+
+        Returns:
+            Dict with ``timestamps``, ``forecast``, ``lower`` and ``upper``
+        """
+        period = period or DEFAULT_PERIODS[self.freq]
+        n = len(self.values)
+        future_idx = np.arange(n, n + horizon)
+
+        if n == 0:
+            zeros = np.zeros(horizon)
+            return {"timestamps": [], "forecast": zeros, "lower": zeros, "upper": zeros}
+
+        components = self.decompose(period)
+        deseasonalized = self.values - components["seasonal"]
+
+        fit_window = min(n, fit_window or 4 * period)
+        x = np.arange(n - fit_window, n)
+        y = deseasonalized[-fit_window:]
+        if fit_window >= 2:
+            slope, intercept = np.polyfit(x, y, 1)
+        else:
+            slope, intercept = 0.0, float(y[-1])
+
+        if n >= 2 * period:
+            seasonal_profile = components["seasonal"][(future_idx - n) % period + n - period]
+        else:
+            seasonal_profile = np.zeros(horizon)
+
+        point = intercept + slope * future_idx + seasonal_profile
+        resid_std = float(np.std(components["residual"][-fit_window:]))
+        point = np.clip(point, 0.0, None)
+
+        return {
+            "timestamps": [self.bucket_start(int(i)).isoformat() + "Z" for i in future_idx],
+            "forecast": point,
+            "lower": np.clip(point - 1.96 * resid_std, 0.0, None),
+            "upper": point + 1.96 * resid_std,
+        }
+
+    def budget_burn(
+        self,
+        budget: float,
+        period_start: Optional[datetime] = None,
+        period_end: Optional[datetime] = None,
+        as_of: Optional[datetime] = None,
+        period: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Project spend against a budget for a billing period.
+
+        Args:
+            budget: Budget for the billing period
+            period_start: Start of billing period (defaults to first of ``as_of`` month)
+            period_end: End of billing period (defaults to first of next month)
+            as_of: Projection time (defaults to end of the series)
+            period: Seasonal period in buckets for the forecast
+
+        Returns:
+            Dict with spent, projected total, projected utilization and the
+            projected exhaustion time (None if the budget holds)
+        """
+        as_of = as_of or self.end
+        if period_start is None:
+            period_start = as_of.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if period_end is None:
+            next_month = period_start.replace(day=28) + timedelta(days=4)
+            period_end = next_month.replace(day=1)
+
+        width = self.bucket_seconds
+        start_idx = max(0, int((period_start - self.start).total_seconds() // width))
+        as_of_idx = max(0, int((as_of - self.start).total_seconds() // width))
+        as_of_bucket = self.bucket_start(as_of_idx)
+
+        # Buckets between the last trace and as_of had no spend; pad them so
+        # the forecast starts at as_of instead of where the data stops
+        values = self.values[:as_of_idx]
+        if len(values) < as_of_idx:
+            values = np.concatenate((values, np.zeros(as_of_idx - len(values))))
+        spent = float(values[start_idx:].sum())
+
+        # Spend already observed in the bucket as_of falls into. When the
+        # series ends in that bucket, all of it happened before as_of;
+        # otherwise only the elapsed share is counted
+        elapsed = min(max((as_of - as_of_bucket).total_seconds() / width, 0.0), 1.0)
+        if elapsed > 0 and as_of_idx < len(self.values) and as_of_idx >= start_idx:
+            partial = float(self.values[as_of_idx])
+            spent += partial if as_of_idx == len(self.values) - 1 else partial * elapsed
+
+        # Forecast whole buckets from the one as_of falls into, counting only
+        # the share of each bucket that lies between as_of and period_end
+        remaining = max(0, int(np.ceil((period_end - as_of_bucket).total_seconds() / width)))
+        bucket_starts = np.arange(remaining) * width
+        window_start = (as_of - as_of_bucket).total_seconds()
+        window_end = (period_end - as_of_bucket).total_seconds()
+        shares = (
+            np.clip(
+                np.minimum(bucket_starts + width, window_end)
+                - np.maximum(bucket_starts, window_start),
+                0.0,
+                width,
+            )
+            / width
+        )
+
+        history = CostTimeSeries(self.start, values, self.freq)
+        projection = history.forecast(horizon=remaining, period=period)
+
+        cumulative = spent + np.cumsum(projection["forecast"] * shares)
+        projected_total = float(cumulative[-1]) if remaining else spent
+
+        exhausted_at = None
+        if spent >= budget:
+            exhausted_at = as_of
+        else:
+            over = np.nonzero(cumulative >= budget)[0]
+            if len(over):
+                exhausted_at = history.bucket_start(as_of_idx + int(over[0]) + 1)
+                exhausted_at = min(max(exhausted_at, as_of), period_end)
+
+        return {
+            "budget": budget,
+            "period_start": period_start.isoformat() + "Z",
+            "period_end": period_end.isoformat() + "Z",
+            "as_of": as_of.isoformat() + "Z",
+            "spent": round(spent, 4),
+            "projected_total": round(projected_total, 4),
+            "projected_upper": round(spent + float((projection["upper"] * shares).sum()), 4),
+            "utilization": round(spent / budget * 100, 1) if budget > 0 else None,
+            "projected_utilization": round(projected_total / budget * 100, 1)
+            if budget > 0
+            else None,
+            "projected_exhaustion": exhausted_at.isoformat() + "Z" if exhausted_at else None,
+            "on_track": projected_total <= budget,
+        }
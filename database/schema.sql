@@ -109,6 +109,13 @@ CREATE TABLE IF NOT EXISTS traces (
     evaluated_at TIMESTAMP WITH TIME ZONE,
     evaluated_by TEXT,  -- judge model name or 'human'
 
+    -- Cost (sample_weight: calls a head-sampled trace stands for)
+    cost FLOAT NOT NULL DEFAULT 0,
+    sample_weight FLOAT NOT NULL DEFAULT 1,
+
+    -- When the row was written; differs from created_at for replayed traces
+    ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
     -- Metadata
     metadata JSONB DEFAULT '{}',
     source TEXT DEFAULT 'sdk' CHECK (source IN ('otlp', 'sdk', 'manual')),
@@ -117,8 +124,14 @@ CREATE TABLE IF NOT EXISTS traces (
     CONSTRAINT valid_duration CHECK (duration_ms >= 0)
 );
 
+-- Upgrade path for databases created before the cost and ingested_at columns existed
+ALTER TABLE traces ADD COLUMN IF NOT EXISTS cost FLOAT NOT NULL DEFAULT 0;
+ALTER TABLE traces ADD COLUMN IF NOT EXISTS sample_weight FLOAT NOT NULL DEFAULT 1;
+ALTER TABLE traces ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+
 -- Indexes for fast queries
 CREATE INDEX IF NOT EXISTS idx_traces_created_at ON traces(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_traces_ingested_at ON traces(ingested_at);
 CREATE INDEX IF NOT EXISTS idx_traces_user_id ON traces(user_id);
 CREATE INDEX IF NOT EXISTS idx_traces_project_id ON traces(project_id);
 CREATE INDEX IF NOT EXISTS idx_traces_status ON traces(status);
@@ -126,6 +139,37 @@ CREATE INDEX IF NOT EXISTS idx_traces_vendor ON traces(vendor);
 CREATE INDEX IF NOT EXISTS idx_traces_model ON traces(model);
 CREATE INDEX IF NOT EXISTS idx_traces_evaluation_status ON traces(evaluation_status);
 
+-- Keyset pagination: get_traces orders by (created_at, id) and pages with
+-- a cursor, so these indexes serve every page without an OFFSET scan
+CREATE INDEX IF NOT EXISTS idx_traces_created_at_id ON traces(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_traces_project_created_at_id
+    ON traces(project_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_traces_status_created_at_id
+    ON traces(status, created_at DESC, id DESC);
+
+-- Traces are append-only and arrive in time order; a BRIN index keeps
+-- date-range scans cheap on very large tables at a tiny storage cost
+CREATE INDEX IF NOT EXISTS idx_traces_created_at_brin ON traces USING BRIN (created_at);
+
+-- Partitioning hint (millions of rows per month):
+-- Range-partition traces by month on created_at so old months can be
+-- detached or dropped instead of deleted row by row. Postgres requires the
+-- partition key in the primary key, so a partitioned table is declared as
+--
+--   CREATE TABLE traces (
+--       id UUID NOT NULL DEFAULT gen_random_uuid(),
+--       created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+--       ...
+--       PRIMARY KEY (id, created_at)
+--   ) PARTITION BY RANGE (created_at);
+--
+--   CREATE TABLE traces_2025_01 PARTITION OF traces
+--       FOR VALUES FROM ('2025-01-01') TO ('2025-02-01');
+--
+-- Foreign keys to traces(id) (measurements.trace_id) then need to
+-- reference (id, created_at) or be enforced by the application. The
+-- indexes above are created on each partition automatically.
+
 -- ============================================================
 -- 4. MEASUREMENTS TABLE (legacy - for detailed evaluation breakdown)
 -- ============================================================
@@ -150,6 +194,7 @@ CREATE TABLE IF NOT EXISTS measurements (
 
 CREATE INDEX IF NOT EXISTS idx_measurements_trace_id ON measurements(trace_id);
 CREATE INDEX IF NOT EXISTS idx_measurements_passed ON measurements(passed);
+CREATE INDEX IF NOT EXISTS idx_measurements_created_at ON measurements(created_at DESC);
 
 -- ============================================================
 -- 5. COMPLIANCE CHECKS TABLE
@@ -186,6 +231,8 @@ CREATE TABLE IF NOT EXISTS compliance_checks (
 
 CREATE INDEX IF NOT EXISTS idx_compliance_checks_project_id ON compliance_checks(project_id);
 CREATE INDEX IF NOT EXISTS idx_compliance_checks_created_at ON compliance_checks(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_compliance_checks_project_created_at
+    ON compliance_checks(project_id, created_at DESC);
 
 -- ============================================================
 -- 6. SESSIONS TABLE (for authentication)
@@ -208,6 +255,37 @@ CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_token ON sessions(token);
 CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at);
 
+-- ============================================================
+-- 7. METRICS ROLLUPS (maintained by cert.metrics.database)
+-- ============================================================
+-- Hourly cost/quality totals per project, vendor and model. This is a
+-- table rather than a MATERIALIZED VIEW because REFRESH MATERIALIZED VIEW
+-- recomputes everything; DatabaseMetricsEngine.refresh_rollups only
+-- recomputes the hours after the watermark stored in trace_rollup_state,
+-- and older hours with traces ingested since the last refresh.
+CREATE TABLE IF NOT EXISTS trace_rollups_hourly (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    project_id UUID,
+    vendor TEXT NOT NULL,
+    model TEXT NOT NULL,
+    trace_count INTEGER NOT NULL DEFAULT 0,
+    calls FLOAT NOT NULL DEFAULT 0,            -- sum of sample_weight
+    cost FLOAT NOT NULL DEFAULT 0,             -- sum of cost * sample_weight
+    error_calls FLOAT NOT NULL DEFAULT 0,
+    evaluated_calls FLOAT NOT NULL DEFAULT 0,
+    score_sum FLOAT NOT NULL DEFAULT 0,        -- sum of evaluation_score * sample_weight
+    passed_calls FLOAT NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_trace_rollups_hourly_bucket
+    ON trace_rollups_hourly(bucket, project_id);
+
+CREATE TABLE IF NOT EXISTS trace_rollup_state (
+    name TEXT PRIMARY KEY,
+    watermark TIMESTAMP WITH TIME ZONE NOT NULL,
+    semantic_threshold FLOAT NOT NULL
+);
+
 -- ============================================================
 -- VIEWS
 -- ============================================================
@@ -239,6 +317,6 @@ $$ LANGUAGE plpgsql;
 DO $$
 BEGIN
     RAISE NOTICE 'CERT Framework database schema created successfully!';
-    RAISE NOTICE 'Tables created: users, projects, traces, measurements, compliance_checks, sessions';
+    RAISE NOTICE 'Tables created: users, projects, traces, measurements, compliance_checks, sessions, trace_rollups_hourly, trace_rollup_state';
     RAISE NOTICE 'Views created: traces_with_user';
 END $$;
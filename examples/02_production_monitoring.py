@@ -58,11 +58,14 @@ def production_example_with_tracing():
 def production_example_with_database():
     """Example using database for persistent storage."""
     # Check if Supabase credentials are available
-    if not os.getenv("SUPABASE_URL") or not os.getenv("SUPABASE_KEY"):
-        print("⚠️  Skipping database example (SUPABASE_URL and SUPABASE_KEY not set)")
+    if not all(os.getenv(var) for var in ("SUPABASE_URL", "SUPABASE_KEY", "CERT_DB_USER_ID")):
+        print(
+            "⚠️  Skipping database example (SUPABASE_URL, SUPABASE_KEY or CERT_DB_USER_ID not set)"
+        )
         print("Set these environment variables to use database storage:")
         print("  export SUPABASE_URL='https://xxx.supabase.co'")
         print("  export SUPABASE_KEY='your-key-here'")
+        print("  export CERT_DB_USER_ID='your-user-uuid'")
         return
 
     from cert.database.client import DatabaseClient
@@ -7,12 +7,18 @@ Converts assessment JSON data into a professional PDF report.
 Usage:
     python generate_assessment_pdf.py assessment.json --output report.pdf
     python generate_assessment_pdf.py assessment.json --output report.pdf --email user@example.com
+
+Library use:
+    The backend workers import this module and call render_assessment_pdf()
+    in-process. Paragraph styles are built once per process and reused.
 """
 
 import argparse
 import json
 import sys
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 
 try:
@@ -30,10 +36,10 @@ try:
         KeepTogether,
     )
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+
+    REPORTLAB_AVAILABLE = True
 except ImportError:
-    print("Error: reportlab not installed")
-    print("Install with: pip install reportlab")
-    sys.exit(1)
+    REPORTLAB_AVAILABLE = False
 
 
 def load_assessment_data(filepath):
@@ -60,20 +66,79 @@ def get_risk_color(risk_level):
     return risk_colors.get(risk_level, colors.gray)
 
 
+@lru_cache(maxsize=1)
+def get_styles():
+    """
+    Build the report paragraph styles once per process.
+
+    Returns:
+        dict: Style name to ParagraphStyle
+    """
+    if not REPORTLAB_AVAILABLE:
+        raise ImportError("reportlab not installed. Install with: pip install reportlab")
+
+    styles = getSampleStyleSheet()
+
+    return {
+        "title": ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            textColor=colors.HexColor("#1a365d"),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName="Helvetica-Bold",
+        ),
+        "heading": ParagraphStyle(
+            "CustomHeading",
+            parent=styles["Heading2"],
+            fontSize=16,
+            textColor=colors.HexColor("#2c5282"),
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName="Helvetica-Bold",
+        ),
+        "normal": ParagraphStyle(
+            "CustomNormal",
+            parent=styles["Normal"],
+            fontSize=11,
+            leading=16,
+        ),
+        "center": ParagraphStyle("center", alignment=TA_CENTER, fontSize=10, textColor=colors.gray),
+        "footer": ParagraphStyle("footer", fontSize=9, textColor=colors.gray, alignment=TA_LEFT),
+    }
+
+
+def render_assessment_pdf(assessment_data, email=None):
+    """
+    Render the assessment report PDF in memory.
+
+    Args:
+        assessment_data: Dict with assessment results
+        email: Optional email address for the report recipient
+
+    Returns:
+        bytes: PDF document
+    """
+    buffer = BytesIO()
+    generate_assessment_pdf(assessment_data, buffer, email)
+    return buffer.getvalue()
+
+
 def generate_assessment_pdf(assessment_data, output_path, email=None):
     """
     Generate professional assessment report PDF.
 
     Args:
         assessment_data: Dict with assessment results
-        output_path: Path to save PDF
+        output_path: Path or writable binary file object to save PDF to
         email: Optional email address for the report recipient
     """
     print(f"Generating assessment PDF: {output_path}")
 
     # Create PDF document
     doc = SimpleDocTemplate(
-        str(output_path),
+        output_path if hasattr(output_path, "write") else str(output_path),
         pagesize=letter,
         rightMargin=0.75 * inch,
         leftMargin=0.75 * inch,
@@ -84,36 +149,11 @@ def generate_assessment_pdf(assessment_data, output_path, email=None):
     # Container for PDF elements
     elements = []
 
-    # Define styles
-    styles = getSampleStyleSheet()
-
-    # Custom styles
-    title_style = ParagraphStyle(
-        "CustomTitle",
-        parent=styles["Heading1"],
-        fontSize=24,
-        textColor=colors.HexColor("#1a365d"),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName="Helvetica-Bold",
-    )
-
-    heading_style = ParagraphStyle(
-        "CustomHeading",
-        parent=styles["Heading2"],
-        fontSize=16,
-        textColor=colors.HexColor("#2c5282"),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName="Helvetica-Bold",
-    )
-
-    normal_style = ParagraphStyle(
-        "CustomNormal",
-        parent=styles["Normal"],
-        fontSize=11,
-        leading=16,
-    )
+    # Shared styles
+    styles = get_styles()
+    title_style = styles["title"]
+    heading_style = styles["heading"]
+    normal_style = styles["normal"]
 
     # Extract data
     risk_level = assessment_data.get("riskLevel", "UNKNOWN")
@@ -157,7 +197,7 @@ def generate_assessment_pdf(assessment_data, output_path, email=None):
     gen_info = f"Generated: {datetime.now().strftime('%B %d, %Y')}"
     if email:
         gen_info += f" | {email}"
-    elements.append(Paragraph(gen_info, ParagraphStyle("center", alignment=TA_CENTER, fontSize=10, textColor=colors.gray)))
+    elements.append(Paragraph(gen_info, styles["center"]))
 
     elements.append(PageBreak())
 
@@ -261,7 +301,7 @@ def generate_assessment_pdf(assessment_data, output_path, email=None):
     elements.append(Paragraph(
         "<i>This assessment is based on your responses to the CERT AI Readiness Assessment questionnaire. "
         "For detailed implementation guidance and support, contact the CERT team.</i>",
-        ParagraphStyle("footer", fontSize=9, textColor=colors.gray, alignment=TA_LEFT)
+        styles["footer"]
     ))
 
     # Build PDF
@@ -271,6 +311,11 @@ def generate_assessment_pdf(assessment_data, output_path, email=None):
 
 def main():
     """Main execution function."""
+    if not REPORTLAB_AVAILABLE:
+        print("Error: reportlab not installed")
+        print("Install with: pip install reportlab")
+        sys.exit(1)
+
     parser = argparse.ArgumentParser(description="Generate EU AI Act Assessment Report PDF")
     parser.add_argument("assessment_json", help="Path to assessment JSON file")
     parser.add_argument("--output", "-o", required=True, help="Output PDF path")
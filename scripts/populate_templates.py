@@ -15,19 +15,96 @@ What it does NOT do:
     - Fill in [EXPERT INPUT REQUIRED] sections (that's your job)
     - Validate the data (assumes cert-framework output is correct)
     - Handle errors gracefully (if it fails, it fails loudly)
+
+Library use:
+    The backend workers import this module and call generate_documents()
+    in-process. Template files are read once per process and cached, so
+    repeated jobs skip the interpreter start, the python-docx import and
+    the template disk reads.
 """
 
 import json
 import sys
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
 
 try:
     from docx import Document
 except ImportError:
-    print("Error: python-docx not installed")
-    print("Install with: pip install python-docx")
-    sys.exit(1)
+    Document = None
+
+# Template bytes cached per process, keyed by path and modification time
+_TEMPLATE_CACHE = {}
+
+# (template, output, display name) for templates without automated placeholders
+REMAINING_TEMPLATES = [
+    (
+        "audit_trail_template.docx",
+        "Audit_Trail_Setup_Guide.docx",
+        "Audit Trail Guide",
+    ),
+    (
+        "monitoring_framework_template.docx",
+        "Monitoring_Framework.docx",
+        "Monitoring Framework",
+    ),
+    (
+        "conformity_checklist_template.docx",
+        "Conformity_Assessment_Checklist.docx",
+        "Conformity Checklist",
+    ),
+]
+
+
+def _template_bytes(template_path):
+    """
+    Read a template file, reusing the cached copy while it is unchanged.
+
+    Args:
+        template_path: Path to a .docx template
+
+    Returns:
+        bytes: Template file contents
+    """
+    template_path = Path(template_path)
+    key = (template_path, template_path.stat().st_mtime_ns)
+    data = _TEMPLATE_CACHE.get(key)
+    if data is None:
+        data = template_path.read_bytes()
+        _TEMPLATE_CACHE[key] = data
+    return data
+
+
+def load_template(template_path):
+    """
+    Open a fresh, independently editable copy of a Word template.
+
+    Args:
+        template_path: Path to a .docx template
+
+    Returns:
+        docx.Document object
+    """
+    if Document is None:
+        raise ImportError("python-docx not installed. Install with: pip install python-docx")
+    return Document(BytesIO(_template_bytes(template_path)))
+
+
+def preload_templates(templates_dir):
+    """
+    Cache every .docx template in a directory.
+
+    Args:
+        templates_dir: Templates directory
+
+    Returns:
+        int: Number of templates cached
+    """
+    templates = list(Path(templates_dir).glob("*.docx"))
+    for template_path in templates:
+        _template_bytes(template_path)
+    return len(templates)
 
 
 def load_json(filepath):
@@ -171,7 +248,7 @@ def populate_risk_classification(template_path, output_path, risk_data):
     print("Populating risk classification report...")
 
     # Load template
-    doc = Document(template_path)
+    doc = load_template(template_path)
 
     # Extract data from JSON
     classification = risk_data.get("classification", {})
@@ -239,7 +316,7 @@ def populate_annex_iv(template_path, output_path, compliance_data, risk_data):
     """
     print("Populating Annex IV documentation...")
 
-    doc = Document(template_path)
+    doc = load_template(template_path)
 
     # Extract data structures
     metadata = compliance_data.get("metadata", {})
@@ -342,18 +419,81 @@ def copy_template_as_is(template_path, output_path, doc_name):
         output_path: Destination
         doc_name: Human-readable name for logging
     """
-    import shutil
-
-    shutil.copy(template_path, output_path)
+    Path(output_path).write_bytes(_template_bytes(template_path))
     print(f"✓ Copied {doc_name} (requires manual population)")
 
 
+def generate_documents(risk_data, compliance_data, output_dir, templates_dir):
+    """
+    Populate all compliance document templates.
+
+    Args:
+        risk_data: JSON from 'cert classify-system' command
+        compliance_data: JSON from 'cert generate-docs' command
+        output_dir: Directory to save populated documents in
+        templates_dir: Directory containing the .docx templates
+
+    Returns:
+        list: Paths of the documents written
+
+    A template that fails to populate is reported and skipped, so one
+    broken template does not prevent the others from being generated.
+    """
+    output_dir = Path(output_dir)
+    templates_dir = Path(templates_dir)
+    generated = []
+
+    # 1. Risk Classification Report
+    try:
+        output_path = output_dir / "Risk_Classification_Report.docx"
+        populate_risk_classification(
+            templates_dir / "risk_classification_template.docx",
+            output_path,
+            risk_data,
+        )
+        generated.append(output_path)
+    except Exception as e:
+        print(f"✗ Failed to populate risk classification: {e}")
+
+    # 2. Annex IV Technical Documentation
+    try:
+        output_path = output_dir / "Annex_IV_Technical_Documentation.docx"
+        populate_annex_iv(
+            templates_dir / "annex_iv_template.docx",
+            output_path,
+            compliance_data,
+            risk_data,
+        )
+        generated.append(output_path)
+    except Exception as e:
+        print(f"✗ Failed to populate Annex IV: {e}")
+
+    # 3-5. Copy remaining templates (they don't have automated placeholders)
+    for template_name, output_name, display_name in REMAINING_TEMPLATES:
+        template_path = templates_dir / template_name
+        if template_path.exists():
+            try:
+                copy_template_as_is(template_path, output_dir / output_name, display_name)
+                generated.append(output_dir / output_name)
+            except Exception as e:
+                print(f"✗ Failed to copy {display_name}: {e}")
+        else:
+            print(f"⚠ Template not found: {template_name} (skipping)")
+
+    return generated
+
+
 def main():
     """
     Main execution function.
 
     Parses command line arguments, loads data, populates templates.
     """
+    if Document is None:
+        print("Error: python-docx not installed")
+        print("Install with: pip install python-docx")
+        sys.exit(1)
+
     # Parse arguments
     if len(sys.argv) < 4:
         print(
@@ -410,55 +550,7 @@ def main():
     print("\nPopulating templates...")
     print("=" * 70)
 
-    # 1. Risk Classification Report
-    try:
-        populate_risk_classification(
-            templates_dir / "risk_classification_template.docx",
-            output_dir / "Risk_Classification_Report.docx",
-            risk_data,
-        )
-    except Exception as e:
-        print(f"✗ Failed to populate risk classification: {e}")
-
-    # 2. Annex IV Technical Documentation
-    try:
-        populate_annex_iv(
-            templates_dir / "annex_iv_template.docx",
-            output_dir / "Annex_IV_Technical_Documentation.docx",
-            compliance_data,
-            risk_data,
-        )
-    except Exception as e:
-        print(f"✗ Failed to populate Annex IV: {e}")
-
-    # 3-5. Copy remaining templates (they don't have automated placeholders)
-    remaining_templates = [
-        (
-            "audit_trail_template.docx",
-            "Audit_Trail_Setup_Guide.docx",
-            "Audit Trail Guide",
-        ),
-        (
-            "monitoring_framework_template.docx",
-            "Monitoring_Framework.docx",
-            "Monitoring Framework",
-        ),
-        (
-            "conformity_checklist_template.docx",
-            "Conformity_Assessment_Checklist.docx",
-            "Conformity Checklist",
-        ),
-    ]
-
-    for template_name, output_name, display_name in remaining_templates:
-        template_path = templates_dir / template_name
-        if template_path.exists():
-            try:
-                copy_template_as_is(template_path, output_dir / output_name, display_name)
-            except Exception as e:
-                print(f"✗ Failed to copy {display_name}: {e}")
-        else:
-            print(f"⚠ Template not found: {template_name} (skipping)")
+    generate_documents(risk_data, compliance_data, output_dir, templates_dir)
 
     print("=" * 70)
     print(f"\n✓ All documents generated in {output_dir}")
@@ -0,0 +1,279 @@
+"""
+Fixtures for backend service tests.
+
+The backend tasks import ``celery`` and ``redis`` at module level. The
+``backend_modules`` fixture imports them with minimal stand-ins for either
+package when it is not installed, and unloads both again afterwards so the
+rest of the suite (e.g. ``cert.api.server``) still sees them as missing.
+Tests replace dispatch (``apply_async``, ``chord``, ``group``) and Redis
+connections with the fakes below either way.
+"""
+
+import fnmatch
+import importlib.util
+import sys
+import types
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import pytest
+
+from backend.config import Config
+from backend.storage.local_client import LocalStorageClient
+
+
+class FakeRedis:
+    """In-memory subset of ``redis.Redis`` used by the backend."""
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expiry: Dict[str, float] = {}
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "FakeRedis":
+        return cls()
+
+    @staticmethod
+    def _bytes(value: Any) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._bytes(value)
+        if ex:
+            self.expiry[key] = ex
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def expire(self, key, seconds):
+        self.expiry[key] = seconds
+        return key in self.data
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.data.setdefault(key, {})
+        for name, item in (mapping or {field: value}).items():
+            fields[self._bytes(name)] = self._bytes(item)
+
+    def hsetnx(self, key, field, value):
+        fields = self.data.setdefault(key, {})
+        if self._bytes(field) in fields:
+            return 0
+        fields[self._bytes(field)] = self._bytes(value)
+        return 1
+
+    def hincrby(self, key, field, amount=1):
+        fields = self.data.setdefault(key, {})
+        value = int(fields.get(self._bytes(field), b"0")) + amount
+        fields[self._bytes(field)] = self._bytes(value)
+        return value
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(self._bytes(field))
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def rpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items.extend(self._bytes(value) for value in values)
+        return len(items)
+
+    def ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        self.data[key] = items[start : end + 1 if end >= 0 else len(items) + end + 1]
+
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        return items[start : end + 1 if end >= 0 else len(items) + end + 1]
+
+    def keys(self, pattern="*"):
+        return [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+
+    def eval(self, script, numkeys, key, owner, *args):
+        """Run the artifact cache's compare-and-delete/expire claim scripts."""
+        if self.data.get(key) != self._bytes(owner):
+            return 0
+        if '"del"' in script:
+            return self.delete(key)
+        return int(self.expire(key, int(args[0])))
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues ``FakeRedis`` commands until ``execute``."""
+
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls: List[Any] = []
+
+    def __getattr__(self, name):
+        method = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append(lambda: method(*args, **kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [call() for call in self._calls]
+
+
+class _RedisError(Exception):
+    pass
+
+
+class _Signature:
+    def __init__(self, task, args=(), kwargs=None):
+        self.task = task
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.options: Dict[str, Any] = {}
+
+    def set(self, **options):
+        self.options.update(options)
+        return self
+
+    def link_error(self, errback):
+        self.options.setdefault("link_error", []).append(errback)
+        return errback
+
+    def __call__(self, *args, **kwargs):
+        return self.task(*args, *self.args, **{**self.kwargs, **kwargs})
+
+
+class _Task:
+    autoretry_for = ()
+    retry_kwargs: Dict[str, Any] = {}
+    retry_backoff = False
+    name: Optional[str] = None
+
+    def __init__(self, run, bind):
+        self._run = run
+        self._bind = bind
+        self.request = types.SimpleNamespace(id=None)
+        self.backend = types.SimpleNamespace(store_result=lambda *args, **kwargs: None)
+
+    def __call__(self, *args, **kwargs):
+        if self._bind:
+            return self._run(self, *args, **kwargs)
+        return self._run(*args, **kwargs)
+
+    def s(self, *args, **kwargs):
+        return _Signature(self, args, kwargs)
+
+    def apply_async(self, args=(), kwargs=None, task_id=None, **options):
+        return types.SimpleNamespace(id=task_id or str(uuid4()))
+
+    def delay(self, *args, **kwargs):
+        return self.apply_async(args, kwargs)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        pass
+
+
+class _Celery:
+    def __init__(self, *args, **kwargs):
+        self.conf = types.SimpleNamespace(update=lambda **settings: None)
+
+    def autodiscover_tasks(self, *args, **kwargs):
+        pass
+
+    def task(self, *args, bind=False, base=_Task, name=None, **options):
+        def decorator(run):
+            task_class = type(run.__name__, (base,), {"name": name or run.__name__})
+            return task_class(run, bind)
+
+        return decorator
+
+
+class _Signal:
+    def connect(self, receiver=None, **kwargs):
+        return receiver
+
+
+def _missing(name: str) -> bool:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        return True
+    return False
+
+
+def _install_stubs() -> List[str]:
+    """Register stand-ins for missing packages and return their names."""
+    stubbed = []
+    if _missing("celery"):
+        celery = types.ModuleType("celery")
+        celery.Celery = _Celery
+        celery.Task = _Task
+        celery.chord = lambda header: lambda callback: None
+        celery.group = lambda tasks: list(tasks)
+        signals = types.ModuleType("celery.signals")
+        signals.worker_process_init = _Signal()
+        celery.signals = signals
+        sys.modules["celery"] = celery
+        sys.modules["celery.signals"] = signals
+        stubbed += ["celery", "celery.signals"]
+
+    if _missing("redis"):
+        redis = types.ModuleType("redis")
+        redis.Redis = FakeRedis
+        redis.RedisError = _RedisError
+        sys.modules["redis"] = redis
+        stubbed.append("redis")
+    return stubbed
+
+
+# Modules bound to the stand-ins, unloaded again after each test
+_BACKEND_MODULES = ("backend.celery_app", "backend.tasks", "backend.storage.artifact_cache")
+
+
+@pytest.fixture
+def backend_modules():
+    """Celery task and artifact cache modules, importable without celery or redis."""
+    loaded = set(sys.modules)
+    stubbed = _install_stubs()
+    yield types.SimpleNamespace(
+        audit_runner=importlib.import_module("backend.tasks.audit_runner"),
+        progress=importlib.import_module("backend.tasks.progress"),
+        document_generation=importlib.import_module("backend.tasks.document_generation"),
+        pdf_generation=importlib.import_module("backend.tasks.pdf_generation"),
+        artifact_cache=importlib.import_module("backend.storage.artifact_cache"),
+    )
+    if stubbed:
+        for name in set(sys.modules) - loaded:
+            if name in stubbed or name.startswith(_BACKEND_MODULES):
+                del sys.modules[name]
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Route storage calls to a local client under tmp_path."""
+    client = LocalStorageClient(str(tmp_path / "storage"))
+    monkeypatch.setattr("backend.storage.minio_client._minio_client", client)
+    monkeypatch.setattr(Config, "PAYLOAD_STAGING_DIR", None)
+    monkeypatch.setattr(Config, "PAYLOAD_INLINE_MAX_BYTES", 16)
+    return client
+
+
+@pytest.fixture
+def fake_redis(backend_modules, monkeypatch):
+    """Fake Redis behind audit progress and the artifact cache."""
+    redis = FakeRedis()
+    monkeypatch.setattr(backend_modules.progress, "_redis", redis)
+    cache = backend_modules.artifact_cache.ArtifactCache()
+    cache.redis = redis
+    monkeypatch.setattr(backend_modules.artifact_cache, "_artifact_cache", cache)
+    return redis
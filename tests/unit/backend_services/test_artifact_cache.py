@@ -0,0 +1,163 @@
+"""
+Unit tests for the generated artifact cache.
+
+Tests cache keys, cache hits, coalescing of identical in-flight requests
+and claim release, against a fake Redis and the local storage stand-in.
+"""
+
+import types
+
+import pytest
+
+from backend.config import Config
+
+
+class FakeTask:
+    """Records dispatches and stored results like a Celery task."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.sent = []
+        self.stored = []
+        self.backend = types.SimpleNamespace(store_result=lambda *args: self.stored.append(args))
+
+    def apply_async(self, args=(), kwargs=None, task_id=None):
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        self.sent.append((list(args), kwargs, task_id))
+
+    def delay(self, *args):
+        self.sent.append((list(args), None, None))
+        return types.SimpleNamespace(id="delayed")
+
+
+@pytest.fixture
+def cache_module(backend_modules, fake_redis, storage, monkeypatch):
+    monkeypatch.setattr(Config, "ARTIFACT_CACHE_ENABLED", True)
+    monkeypatch.setattr("backend.renderers.renderer_version", lambda kind: "v1")
+    return backend_modules.artifact_cache
+
+
+def _submit(cache_module, task, report):
+    return cache_module.submit_artifact_job(
+        task, "generate_assessment_pdf", [report], lambda: [report], bucket_name="reports"
+    )
+
+
+class TestArtifactKey:
+    """Test content-addressed cache keys."""
+
+    def test_key_ignores_dict_order(self, backend_modules):
+        artifact_key = backend_modules.artifact_cache.artifact_key
+
+        first = artifact_key("pdf", [{"a": 1, "b": 2}], "v1", "2025-01-01")
+        second = artifact_key("pdf", [{"b": 2, "a": 1}], "v1", "2025-01-01")
+
+        assert first == second
+        assert first.startswith("cert:artifact:pdf:")
+
+    def test_key_changes_with_version_and_date(self, backend_modules):
+        artifact_key = backend_modules.artifact_cache.artifact_key
+        key = artifact_key("pdf", [{"a": 1}], "v1", "2025-01-01")
+
+        assert artifact_key("pdf", [{"a": 1}], "v2", "2025-01-01") != key
+        # The renderers print the generation date into the artifact
+        assert artifact_key("pdf", [{"a": 1}], "v1", "2025-01-02") != key
+
+
+class TestSubmitArtifactJob:
+    """Test cache hits, coalescing and claims."""
+
+    def test_miss_dispatches_and_claims(self, cache_module, fake_redis):
+        task = FakeTask()
+
+        response = _submit(cache_module, task, {"system": "a"})
+
+        assert response["status"] == "pending"
+        args, kwargs, task_id = task.sent[0]
+        assert args == [{"system": "a"}]
+        assert task_id == response["job_id"]
+        key = kwargs["cache_key"]
+        claim = fake_redis.get(cache_module.CLAIM_PREFIX + cache_module.key_digest(key))
+        assert claim.decode() == task_id
+
+    def test_identical_request_is_coalesced(self, cache_module):
+        task = FakeTask()
+
+        first = _submit(cache_module, task, {"system": "a"})
+        second = _submit(cache_module, task, {"system": "a"})
+        other = _submit(cache_module, task, {"system": "b"})
+
+        assert second == {"job_id": first["job_id"], "status": "pending", "coalesced": True}
+        assert other["job_id"] != first["job_id"]
+        assert len(task.sent) == 2
+
+    def test_hit_is_served_from_cache(self, cache_module, storage):
+        task = FakeTask()
+        first = _submit(cache_module, task, {"system": "a"})
+        key = task.sent[0][1]["cache_key"]
+
+        object_name = storage.upload_bytes(b"%PDF", "reports", "report.pdf")
+        cache = cache_module.get_artifact_cache()
+        cache.store(key, {"object_name": object_name, "file_url": "url"})
+        cache.release(key, first["job_id"])
+
+        response = _submit(cache_module, task, {"system": "a"})
+
+        assert response["cached"] is True
+        assert response["result"]["file_url"] == "url"
+        assert task.stored[0][0] == response["job_id"]
+        assert len(task.sent) == 1
+
+    def test_hit_without_object_regenerates(self, cache_module):
+        task = FakeTask()
+        first = _submit(cache_module, task, {"system": "a"})
+        key = task.sent[0][1]["cache_key"]
+        cache = cache_module.get_artifact_cache()
+        cache.store(key, {"object_name": "deleted.pdf"})
+        cache.release(key, first["job_id"])
+
+        response = _submit(cache_module, task, {"system": "a"})
+
+        assert "cached" not in response
+        assert cache.get(key, "reports") is None
+        assert len(task.sent) == 2
+
+    def test_failed_dispatch_releases_claim(self, cache_module):
+        with pytest.raises(ConnectionError):
+            _submit(cache_module, FakeTask(fail=True), {"system": "a"})
+
+        task = FakeTask()
+        response = _submit(cache_module, task, {"system": "a"})
+
+        assert "coalesced" not in response
+        assert len(task.sent) == 1
+
+    def test_release_only_by_owner(self, cache_module):
+        cache = cache_module.get_artifact_cache()
+
+        assert cache.claim("cert:artifact:pdf:abc", "job-1") == "job-1"
+        cache.release("cert:artifact:pdf:abc", "job-2")
+        assert cache.claim("cert:artifact:pdf:abc", "job-3") == "job-1"
+
+    def test_refresh_only_by_owner(self, cache_module, fake_redis):
+        cache = cache_module.get_artifact_cache()
+        claim_key = cache_module.CLAIM_PREFIX + "abc"
+        cache.claim("cert:artifact:pdf:abc", "job-1")
+        fake_redis.expiry[claim_key] = 5
+
+        assert not cache.refresh("cert:artifact:pdf:abc", "job-2")
+        assert fake_redis.expiry[claim_key] == 5
+        assert cache.refresh("cert:artifact:pdf:abc", "job-1")
+        assert fake_redis.expiry[claim_key] == cache.claim_ttl
+
+        cache.release("cert:artifact:pdf:abc", "job-1")
+        assert not cache.refresh("cert:artifact:pdf:abc", "job-1")
+
+    def test_disabled_cache_dispatches_directly(self, cache_module, monkeypatch):
+        monkeypatch.setattr(Config, "ARTIFACT_CACHE_ENABLED", False)
+        task = FakeTask()
+
+        response = _submit(cache_module, task, {"system": "a"})
+
+        assert response == {"job_id": "delayed", "status": "pending"}
@@ -0,0 +1,310 @@
+"""
+Unit tests for the audit runner tasks.
+
+Tests in-process evaluation, worker model preload and trace parsing, with
+payloads stored through the local storage stand-in.
+"""
+
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from backend.config import Config
+
+pytestmark = pytest.mark.usefixtures("fake_redis")
+
+PASSING = {"context": "The price is 100 dollars", "answer": "The price is 100 dollars"}
+FAILING = {"context": "The price is 100 dollars", "answer": "The price is 250 dollars"}
+
+
+def _jsonl(traces):
+    return "".join(json.dumps(trace, ensure_ascii=False) + "\n" for trace in traces)
+
+
+def _summed(fields, name):
+    """Sum a progress count over the per-task fields of a progress hash."""
+    prefix = f"{name}:".encode()
+    return sum(int(value) for field, value in fields.items() if field.startswith(prefix))
+
+
+@pytest.fixture
+def audit_runner(backend_modules):
+    return backend_modules.audit_runner
+
+
+@pytest.fixture
+def dispatched(audit_runner, monkeypatch):
+    """Capture tasks sent by start_audit instead of dispatching them."""
+    sent = {}
+
+    def chord(header):
+        sent["header"] = list(header)
+        return lambda callback: sent.setdefault("callback", callback)
+
+    def apply_async(args=(), kwargs=None, task_id=None, **options):
+        sent["single"] = (tuple(args), task_id)
+
+    monkeypatch.setattr(audit_runner, "chord", chord)
+    monkeypatch.setattr(audit_runner, "group", list)
+    monkeypatch.setattr(audit_runner.run_accuracy_audit, "apply_async", apply_async)
+    return sent
+
+
+class TestParseTraces:
+    """Test JSONL parsing of trace lines."""
+
+    def test_skips_blank_and_invalid_lines(self, audit_runner, caplog):
+        lines = ['{"a": 1}', "", "   ", "{not json", '{"b": 2}']
+
+        traces = audit_runner._parse_traces(lines, first_line=10)
+
+        assert traces == [{"a": 1}, {"b": 2}]
+        assert "line 13" in caplog.text
+
+
+class TestRunAudit:
+    """Test in-process evaluation of audits."""
+
+    def test_evaluates_inline_traces(self, audit_runner):
+        traces = [PASSING, FAILING, {"context": "no answer"}, PASSING]
+
+        response = audit_runner.run_audit("job-1", _jsonl(traces), 0.7, "exact")
+
+        assert response["status"] == "completed"
+        assert response["total_traces"] == 3
+        assert response["passed_traces"] == 2
+        assert response["failed_traces"] == 1
+        assert response["evaluator_type"] == "ExactMatchEvaluator"
+        assert sum(response["score_histogram"]) == 3
+        assert len(response["results"]) == 3
+
+    def test_unicode_line_separator_inside_trace(self, audit_runner):
+        # orjson writes U+2028 unescaped; it must not split the trace
+        trace = {"context": "The price is 100\u2028dollars", "answer": "The price is 100 dollars"}
+
+        response = audit_runner.run_audit("job-1", _jsonl([trace, PASSING]), 0.7, "exact")
+
+        assert response["total_traces"] == 2
+
+    def test_referenced_payload_is_deleted_after_success(self, audit_runner, storage):
+        ref = audit_runner.offload_jsonl(_jsonl([PASSING] * 20))
+        assert ref["compression"] == "gzip"
+
+        response = audit_runner.run_accuracy_audit(ref, 0.7, "exact")
+
+        assert response["total_traces"] == 20
+        assert not storage.file_exists(ref["key"], ref["bucket"])
+
+    def test_semantic_audit_uses_configured_model(self, audit_runner, monkeypatch):
+        from cert.measure.measure import MeasurementResult
+
+        models = []
+
+        def measure_detailed(text1, text2, embedding_model):
+            models.append(embedding_model)
+            score = 1.0 if text1 == text2 else 0.4
+            return MeasurementResult(score, score, score)
+
+        # cert.measure re-exports measure() under the submodule's name
+        monkeypatch.setattr(
+            sys.modules["cert.measure.measure"], "measure_detailed", measure_detailed
+        )
+        monkeypatch.setattr(Config, "AUDIT_EMBEDDING_MODEL", "audit-model")
+        monkeypatch.setattr(audit_runner, "_accuracy_evaluators", {})
+
+        response = audit_runner.run_audit("job-1", _jsonl([PASSING, FAILING]), 0.7, "semantic")
+
+        assert response["evaluator_type"] == "SemanticEvaluator"
+        assert response["passed_traces"] == 1
+        assert response["failed_traces"] == 1
+        assert models == ["audit-model", "audit-model"]
+
+    def test_evaluators_are_cached_per_process(self, audit_runner):
+        exact = audit_runner._get_accuracy_evaluator("exact")
+
+        assert audit_runner._get_accuracy_evaluator("exact") is exact
+
+
+class TestPreload:
+    """Test model preload when a worker process starts."""
+
+    def test_preloads_configured_models(self, audit_runner, monkeypatch):
+        from cert.evaluation.engines import LazyModelLoader
+
+        calls = []
+        monkeypatch.setattr(Config, "AUDIT_PRELOAD_MODELS", True)
+        monkeypatch.setattr(
+            LazyModelLoader, "preload", classmethod(lambda cls, **kwargs: calls.append(kwargs))
+        )
+        monkeypatch.setattr(audit_runner, "_get_accuracy_evaluator", calls.append)
+
+        audit_runner.preload_audit_models()
+
+        assert calls == [
+            {"embedding_model": Config.AUDIT_EMBEDDING_MODEL},
+            "semantic",
+        ]
+
+    def test_disabled_preload(self, audit_runner, monkeypatch):
+        from cert.evaluation.engines import LazyModelLoader
+
+        monkeypatch.setattr(Config, "AUDIT_PRELOAD_MODELS", False)
+        monkeypatch.setattr(LazyModelLoader, "preload", None)
+
+        audit_runner.preload_audit_models()
+
+    def test_preload_failure_is_not_raised(self, audit_runner, monkeypatch, caplog):
+        from cert.evaluation.engines import LazyModelLoader
+
+        def fail(cls, **kwargs):
+            raise OSError("model download failed")
+
+        monkeypatch.setattr(Config, "AUDIT_PRELOAD_MODELS", True)
+        monkeypatch.setattr(LazyModelLoader, "preload", classmethod(fail))
+
+        audit_runner.preload_audit_models()
+
+        assert "model download failed" in caplog.text
+
+
+class TestChunkedAudit:
+    """Test splitting, dispatch and merging of chunked audits."""
+
+    def test_chunk_offsets_end_on_line_boundaries(self, audit_runner):
+        data = b"a\nbb\nccc\ndddd"
+
+        ranges = audit_runner._chunk_offsets(data, 2)
+
+        assert ranges == [(0, 5), (5, 13)]
+        assert [data[start:end] for start, end in ranges] == [b"a\nbb\n", b"ccc\ndddd"]
+
+    def test_small_audit_runs_as_one_task(self, audit_runner, dispatched, storage):
+        job_id = audit_runner.start_audit(_jsonl([PASSING] * 3), 0.8, "exact", chunk_size=10)
+
+        args, task_id = dispatched["single"]
+        assert task_id == job_id
+        assert args[1:] == (0.8, "exact")
+        assert "header" not in dispatched
+
+    def test_large_audit_runs_as_chord(self, audit_runner, dispatched, storage):
+        traces = [PASSING, FAILING] * 5 + [{"context": "100\u2028dollars", "answer": "100 dollars"}]
+
+        job_id = audit_runner.start_audit(_jsonl(traces), 0.7, "exact", chunk_size=4)
+
+        header, callback = dispatched["header"], dispatched["callback"]
+        assert len(header) == 3
+        assert callback.options["task_id"] == job_id
+        source = callback.args[0]
+        assert storage.file_exists(source["key"], source["bucket"])
+
+        chunks = [audit_runner.audit_chunk(*sig.args, **sig.kwargs) for sig in header]
+        merged = audit_runner.merge_audit_results(chunks, *callback.args)
+
+        assert merged["status"] == "completed"
+        assert merged["chunks"] == 3
+        assert merged["total_traces"] == 11
+        assert merged["passed_traces"] == 6
+        assert len(merged["results"]) == 5
+        assert sum(merged["score_histogram"]) == 11
+        assert not storage.file_exists(source["key"], source["bucket"])
+
+    def test_failed_chord_deletes_staged_payload(self, audit_runner, dispatched, storage):
+        audit_runner.start_audit(_jsonl([PASSING] * 4), 0.7, "exact", chunk_size=2)
+
+        callback = dispatched["callback"]
+        source = callback.args[0]
+        (errback,) = callback.options["link_error"]
+        errback("request", RuntimeError("chunk failed"), None)
+
+        assert not storage.file_exists(source["key"], source["bucket"])
+
+    def test_merge_caps_failure_samples(self, audit_runner, monkeypatch):
+        monkeypatch.setattr(Config, "AUDIT_FAILURE_SAMPLES", 3)
+        chunk = {
+            "total_traces": 4,
+            "passed": 2,
+            "evaluator_type": "ExactMatchEvaluator",
+            "score_histogram": [0] * 9 + [4],
+            "failing_samples": [{"i": 1}, {"i": 2}],
+        }
+
+        merged = audit_runner.merge_audit_results([chunk, chunk], None)
+
+        assert merged["pass_rate"] == 0.5
+        assert merged["results"] == [{"i": 1}, {"i": 2}, {"i": 1}]
+        assert merged["score_histogram"][-1] == 8
+
+
+class TestProgress:
+    """Test progress published while audits run, and cancellation."""
+
+    def _run_chord(self, audit_runner, dispatched):
+        header, callback = dispatched["header"], dispatched["callback"]
+        chunks = [audit_runner.audit_chunk(*sig.args, **sig.kwargs) for sig in header]
+        return audit_runner.merge_audit_results(chunks, *callback.args)
+
+    def test_processed_matches_total(
+        self, backend_modules, audit_runner, dispatched, storage, fake_redis
+    ):
+        separator = {
+            "context": "The price is 100\u2028dollars",
+            "answer": "The price is 100 dollars",
+        }
+        text = _jsonl([PASSING, separator, FAILING] * 3) + "\n"
+
+        job_id = audit_runner.start_audit(text, 0.7, "exact", chunk_size=4)
+        merged = self._run_chord(audit_runner, dispatched)
+
+        fields = fake_redis.hgetall(backend_modules.progress.progress_key(job_id))
+        assert _summed(fields, "processed") == int(fields[b"total"]) == 10
+        assert _summed(fields, "evaluated") == 9
+        assert _summed(fields, "passed") == merged["passed_traces"]
+        assert _summed(fields, "done") == int(fields[b"chunks"]) == 3
+        failures = [json.loads(v) for k, v in fields.items() if k.startswith(b"failures:")]
+        assert sum(map(len, failures)) == 3
+
+    def test_retried_task_replaces_its_counts(
+        self, backend_modules, audit_runner, fake_redis, monkeypatch
+    ):
+        monkeypatch.setattr(Config, "AUDIT_PROGRESS_BATCH", 2)
+        monkeypatch.setattr(Config, "AUDIT_PROGRESS_INTERVAL", 0)
+        monkeypatch.setattr(audit_runner.run_accuracy_audit, "request", SimpleNamespace(id="job-1"))
+        text = _jsonl([PASSING, FAILING] * 5)
+
+        # The first attempt publishes two batches, then fails
+        parse = audit_runner._parse_traces
+        batches = []
+
+        def failing_parse(lines, first_line=1):
+            batches.append(first_line)
+            if len(batches) == 3:
+                raise RuntimeError("worker lost")
+            return parse(lines, first_line)
+
+        monkeypatch.setattr(audit_runner, "_parse_traces", failing_parse)
+        with pytest.raises(RuntimeError):
+            audit_runner.run_accuracy_audit(text, 0.7, "exact")
+        monkeypatch.setattr(audit_runner, "_parse_traces", parse)
+
+        response = audit_runner.run_accuracy_audit(text, 0.7, "exact")
+
+        fields = fake_redis.hgetall(backend_modules.progress.progress_key("job-1"))
+        assert _summed(fields, "processed") == _summed(fields, "evaluated") == 10
+        assert _summed(fields, "passed") == response["passed_traces"] == 5
+        assert _summed(fields, "done") == 1
+        assert len(json.loads(fields[b"failures:job-1"])) == 5
+
+    def test_cancelled_audit_stops_early(
+        self, backend_modules, audit_runner, dispatched, storage, fake_redis, monkeypatch
+    ):
+        monkeypatch.setattr(Config, "AUDIT_PROGRESS_BATCH", 2)
+        monkeypatch.setattr(Config, "AUDIT_PROGRESS_INTERVAL", 0)
+
+        job_id = audit_runner.start_audit(_jsonl([PASSING] * 8), 0.7, "exact", chunk_size=4)
+        fake_redis.hset(backend_modules.progress.progress_key(job_id), "cancelled", 1)
+        merged = self._run_chord(audit_runner, dispatched)
+
+        assert merged["status"] == "cancelled"
+        assert merged["total_traces"] == 0
@@ -0,0 +1,73 @@
+"""
+Unit tests for the in-process document renderers.
+
+Tests loading renderer scripts once per process and the renderer versions
+used in artifact cache keys.
+"""
+
+import pytest
+
+from backend import renderers
+from backend.config import Config
+
+
+@pytest.fixture
+def scripts(tmp_path, monkeypatch):
+    """Empty scripts and templates directories with fresh renderer state."""
+    scripts_dir = tmp_path / "scripts"
+    templates_dir = tmp_path / "templates"
+    scripts_dir.mkdir()
+    templates_dir.mkdir()
+    monkeypatch.setattr(Config, "SCRIPTS_DIR", str(scripts_dir))
+    monkeypatch.setattr(Config, "TEMPLATES_DIR", str(templates_dir))
+    monkeypatch.setattr(Config, "ARTIFACT_TEMPLATE_VERSION", None)
+    monkeypatch.setattr(renderers, "_renderers", {})
+    monkeypatch.setattr(renderers, "_file_digests", {})
+    return scripts_dir, templates_dir
+
+
+class TestLoadRenderer:
+    """Test importing renderer scripts as modules."""
+
+    def test_script_is_imported_once(self, scripts):
+        scripts_dir, _ = scripts
+        (scripts_dir / "generate_assessment_pdf.py").write_text("LOADS = []\nLOADS.append(1)\n")
+
+        first = renderers.load_renderer(renderers.PDF_RENDERER)
+        second = renderers.load_renderer(renderers.PDF_RENDERER)
+
+        assert first is second
+        assert first.LOADS == [1]
+
+    def test_missing_script(self, scripts):
+        with pytest.raises(FileNotFoundError):
+            renderers.load_renderer("missing")
+
+
+class TestRendererVersion:
+    """Test renderer versions for artifact cache keys."""
+
+    def test_changes_with_script_contents(self, scripts):
+        scripts_dir, _ = scripts
+        script = scripts_dir / "generate_assessment_pdf.py"
+        script.write_text("VERSION = 1\n")
+        before = renderers.renderer_version(renderers.PDF_RENDERER)
+
+        assert renderers.renderer_version(renderers.PDF_RENDERER) == before
+
+        script.write_text("VERSION = 22\n")
+        assert renderers.renderer_version(renderers.PDF_RENDERER) != before
+
+    def test_document_version_includes_templates(self, scripts):
+        scripts_dir, templates_dir = scripts
+        (scripts_dir / "populate_templates.py").write_text("")
+        before = renderers.renderer_version(renderers.DOCUMENT_RENDERER)
+
+        (templates_dir / "risk.docx").write_bytes(b"template")
+
+        assert renderers.renderer_version(renderers.DOCUMENT_RENDERER) != before
+
+    def test_configured_version_takes_precedence(self, scripts, monkeypatch):
+        monkeypatch.setattr(Config, "ARTIFACT_TEMPLATE_VERSION", "2025.1")
+
+        assert renderers.renderer_version(renderers.PDF_RENDERER) == "2025.1"
@@ -0,0 +1,185 @@
+"""
+Unit tests for backend storage helpers.
+
+Tests the upload stream adapters, the local storage stand-in and task
+payload references stored through it.
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from backend.config import Config
+from backend.storage import payloads
+from backend.storage.local_client import LocalStorageClient
+from backend.storage.streams import IterableReader, iter_zip
+
+
+class TestStreams:
+    """Test file-like adapters."""
+
+    def test_iterable_reader_spans_chunks(self):
+        reader = IterableReader(iter([b"ab", b"", b"cdef", b"g"]))
+        assert reader.read(3) == b"abc"
+        assert reader.read() == b"defg"
+
+    def test_iter_zip_streams_valid_archive(self, tmp_path):
+        paths = []
+        for name in ("a.txt", "b.txt"):
+            path = tmp_path / name
+            path.write_text(name * 100)
+            paths.append(path)
+
+        chunks = list(iter_zip(paths))
+        assert len(chunks) > 1
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            assert archive.namelist() == ["a.txt", "b.txt"]
+            assert archive.read("b.txt") == b"b.txt" * 100
+
+
+class TestLocalStorageClient:
+    """Test the filesystem stand-in for MinIO."""
+
+    def test_round_trip_and_ranges(self, tmp_path):
+        client = LocalStorageClient(str(tmp_path))
+        name = client.upload_stream(iter([b"hello ", b"world"]), bucket_name="b", object_name="x")
+
+        assert client.file_exists(name, "b")
+        assert client.download_bytes(name, "b") == b"hello world"
+        assert client.download_bytes(name, "b", offset=6, length=3) == b"wor"
+
+        response = client.open_object(name, "b", offset=6)
+        try:
+            assert response.read() == b"world"
+        finally:
+            response.close()
+            response.release_conn()
+
+        client.delete_file(name, "b")
+        assert not client.file_exists(name, "b")
+
+    def test_rejects_escaping_object_names(self, tmp_path):
+        client = LocalStorageClient(str(tmp_path))
+        with pytest.raises(ValueError):
+            client.upload_bytes(b"x", bucket_name="b", object_name="../../etc/passwd")
+
+
+class TestPayloads:
+    """Test payload references stored through the storage client."""
+
+    def test_small_payloads_stay_inline(self, storage):
+        assert payloads.offload_jsonl('{"a": 1}') == '{"a": 1}'
+        assert payloads.offload_json({"a": 1}) == {"a": 1}
+
+    def test_jsonl_round_trip(self, storage):
+        text = "".join(json.dumps({"i": i}) + "\n" for i in range(50))
+        ref = payloads.offload_jsonl(text)
+
+        assert payloads.is_payload_ref(ref)
+        assert ref["compression"] == "gzip"
+        assert storage.file_exists(ref["key"], ref["bucket"])
+        assert list(payloads.iter_lines(ref)) == text.splitlines()
+
+        payloads.delete_payload(ref)
+        assert not storage.file_exists(ref["key"], ref["bucket"])
+
+    def test_checksum_mismatch(self, storage):
+        ref = payloads.offload_json({"report": "x" * 100})
+        storage.upload_bytes(b'{"report": "tampered"}', ref["bucket"], ref["key"])
+
+        with pytest.raises(payloads.PayloadChecksumError):
+            payloads.load_json(ref)
+
+    def test_byte_ranges(self, storage):
+        ref = payloads.store_payload(b"line1\nline2\n")
+        assert payloads.read_range(ref, 6, 12) == b"line2\n"
+
+    def test_byte_ranges_need_uncompressed_payloads(self, storage):
+        ref = payloads.store_payload(b"line1\n", compress=True)
+
+        with pytest.raises(ValueError):
+            payloads.read_range(ref, 0, 3)
+
+    def test_json_round_trip(self, storage):
+        value = {"report": "x" * 100, "items": [1, 2, 3]}
+        ref = payloads.offload_json(value)
+
+        assert ref["compression"] is None
+        assert ref["size"] > 16
+        assert payloads.load_json(ref) == value
+
+    def test_compressed_checksum_mismatch_after_streaming(self, storage):
+        ref = payloads.offload_jsonl('{"i": 1}\n{"i": 2}\n')
+        tampered = payloads.gzip.compress(b'{"i": 1}\n{"i": 3}\n')
+        storage.upload_bytes(tampered, ref["bucket"], ref["key"])
+
+        lines = payloads.iter_lines(ref)
+        assert next(lines) == '{"i": 1}'
+        with pytest.raises(payloads.PayloadChecksumError):
+            list(lines)
+
+    def test_staging_directory(self, storage, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "PAYLOAD_STAGING_DIR", str(tmp_path / "staging"))
+        text = '{"i": 1}\n' * 10
+
+        ref = payloads.offload_jsonl(text)
+
+        assert "key" not in ref
+        assert list(payloads.iter_lines(ref)) == ['{"i": 1}'] * 10
+        payloads.delete_payload(ref)
+        assert not payloads.Path(ref["path"]).exists()
+
+    def test_delete_ignores_inline_values(self, storage):
+        payloads.delete_payload('{"a": 1}')
+        payloads.delete_payload(None)
+
+    @pytest.mark.parametrize("inline", [True, False])
+    def test_unicode_line_separators_stay_in_line(self, storage, inline):
+        # orjson writes U+2028 and U+2029 unescaped
+        text = '{"context": "a\u2028b\u2029c\x85d"}\r\n{"i": 2}\n'
+        value = text if inline else payloads.store_payload(text.encode("utf-8"))
+
+        lines = list(payloads.iter_lines(value))
+
+        assert [json.loads(line) for line in lines] == [
+            {"context": "a\u2028b\u2029c\x85d"},
+            {"i": 2},
+        ]
+
+    def test_split_lines_on_bytes(self):
+        data = '{"a": "x\u2028y"}\n\n{"b": 1}'.encode()
+
+        assert payloads.split_lines(data) == ['{"a": "x\u2028y"}', "", '{"b": 1}']
+
+
+class TestPayloadCleanup:
+    """Test that tasks delete their offloaded inputs once they finally fail."""
+
+    def test_single_audit(self, backend_modules, storage):
+        runner = backend_modules.audit_runner
+        ref = payloads.offload_jsonl('{"i": 1}\n' * 10)
+
+        runner.run_accuracy_audit.on_failure(RuntimeError(), "job-1", (ref,), {}, None)
+
+        assert not storage.file_exists(ref["key"], ref["bucket"])
+
+    def test_pdf_generation(self, backend_modules, storage, fake_redis):
+        task = backend_modules.pdf_generation.generate_assessment_pdf
+        ref = payloads.offload_json({"report": "x" * 100})
+
+        task.on_failure(RuntimeError(), "job-1", (ref,), {"cache_key": "k"}, None)
+
+        assert not storage.file_exists(ref["key"], ref["bucket"])
+
+    def test_document_generation(self, backend_modules, storage, fake_redis):
+        task = backend_modules.document_generation.generate_compliance_documents
+        risk = payloads.offload_json({"risk": "x" * 100})
+        compliance = payloads.offload_json({"compliance": "y" * 100})
+
+        task.on_failure(RuntimeError(), "job-1", (risk,), {"compliance_data": compliance}, None)
+
+        for ref in (risk, compliance):
+            assert not storage.file_exists(ref["key"], ref["bucket"])
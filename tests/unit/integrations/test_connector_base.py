@@ -0,0 +1,147 @@
+"""
+Unit tests for the connector base classes.
+
+Tests async call logging through the background writer.
+"""
+
+import asyncio
+import threading
+
+from cert.integrations.base import AsyncConnectorAdapter, TracedCall
+from cert.integrations.performance import get_performance_monitor
+
+
+class RecordingTracer:
+    """Tracer that records which thread each trace was written from."""
+
+    def __init__(self, fail=False):
+        self.traces = []
+        self.threads = []
+        self.fail = fail
+
+    def log_trace(self, trace):
+        if self.fail:
+            raise OSError("disk full")
+        self.threads.append(threading.current_thread().name)
+        self.traces.append(trace)
+
+
+class DummyConnector(AsyncConnectorAdapter):
+    def activate(self):
+        pass
+
+    def extract_metadata(self, call_data):
+        return {}
+
+    def calculate_cost(self, call_data):
+        return None
+
+
+def _call(i=0):
+    return TracedCall(
+        timestamp="2025-01-01T00:00:00Z",
+        platform="dummy",
+        model="m",
+        input_data=f"prompt {i}",
+        output_data="ok",
+    )
+
+
+class TestAsyncCallLogging:
+    """Test non-blocking log_call_async."""
+
+    def test_writes_happen_off_the_event_loop(self):
+        tracer = RecordingTracer()
+        connector = DummyConnector(tracer)
+
+        async def scenario():
+            for i in range(5):
+                await connector.log_call_async(_call(i))
+
+        asyncio.run(scenario())
+
+        assert connector.flush(timeout=5.0)
+        assert [t["input_data"] for t in tracer.traces] == [f"prompt {i}" for i in range(5)]
+        assert set(tracer.threads) == {"cert-DummyConnector-writer"}
+
+    def test_circuit_breaker_applies_to_background_writes(self, capsys):
+        connector = DummyConnector(RecordingTracer(fail=True))
+
+        async def scenario():
+            for i in range(3):
+                await connector.log_call_async(_call(i))
+
+        asyncio.run(scenario())
+
+        assert connector.flush(timeout=5.0)
+        assert not connector.is_healthy()
+
+    def test_overhead_reported_to_performance_monitor(self):
+        monitor = get_performance_monitor()
+        monitor.reset()
+        monitor.enable()
+        try:
+            connector = DummyConnector(RecordingTracer())
+            asyncio.run(connector.log_call_async(_call()))
+            connector.flush(timeout=5.0)
+
+            metrics = monitor.get_metrics("DummyConnector.async")
+            assert metrics["call_count"] == 1
+        finally:
+            monitor.disable()
+            monitor.reset()
+
+
+class TestPayloadCapture:
+    """Test payload capture modes and content-addressed deduplication."""
+
+    MESSAGES = [
+        {"role": "system", "content": "You are a careful assistant. " * 40},
+        {"role": "user", "content": "Hi"},
+    ]
+
+    def _traced(self):
+        return TracedCall(
+            timestamp="2025-01-01T00:00:00Z",
+            platform="dummy",
+            model="m",
+            input_data=self.MESSAGES,
+            output_data="answer " * 100,
+        )
+
+    def test_modes(self):
+        from cert.integrations.payload import PayloadCapture
+
+        truncated = self._traced().to_dict(PayloadCapture(mode="truncated", max_chars=10))
+        assert truncated["input_data"][1]["content"] == "Hi"
+        assert truncated["output_data"].startswith("answer ans...[truncated")
+
+        hashed = self._traced().to_dict(PayloadCapture(mode="hashed"))
+        assert len(hashed["output_data"]["sha256"]) == 64
+        assert hashed["output_data"]["chars"] == 700
+
+        off = self._traced().to_dict(PayloadCapture(mode="off"))
+        assert off["input_data"] is None and off["output_data"] is None
+
+    def test_repeated_system_prompt_written_once(self, tmp_path):
+        from cert.integrations.payload import PayloadCapture, PayloadStore
+
+        store = PayloadStore(str(tmp_path / "traces.payloads.jsonl"))
+        capture = PayloadCapture(store=store)
+
+        first = self._traced().to_dict(capture)
+        second = self._traced().to_dict(capture)
+
+        ref = first["input_data"][0]["content_ref"]
+        assert second["input_data"][0] == {"role": "system", "content_ref": ref}
+        assert second["input_data"][1] == {"role": "user", "content": "Hi"}
+        assert len(store.path.read_text().splitlines()) == 1
+
+        reopened = PayloadStore(str(store.path))
+        assert ref in reopened
+        assert reopened.load()[ref] == self.MESSAGES[0]["content"]
+
+    def test_traced_call_uses_slots(self):
+        call = self._traced()
+        assert not hasattr(call, "__dict__")
+        assert call == self._traced()
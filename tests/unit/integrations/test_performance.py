@@ -0,0 +1,124 @@
+"""
+Unit tests for connector performance monitoring.
+
+Tests the mergeable overhead histogram and per-thread recording.
+"""
+
+import random
+import threading
+
+import pytest
+
+from cert.integrations import performance
+from cert.integrations.performance import OverheadHistogram, PerformanceMonitor
+
+
+class TestOverheadHistogram:
+    """Test the HDR-style overhead histogram."""
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(0, 1) for _ in range(10_000)]
+        histogram = OverheadHistogram()
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for percentile in (50, 95, 99):
+            exact = ordered[int(len(ordered) * percentile / 100) - 1]
+            assert histogram.percentile(percentile) == pytest.approx(exact, rel=0.02, abs=0.002)
+
+        assert histogram.count == 10_000
+        assert histogram.max_ms == pytest.approx(max(values), abs=0.001)
+        assert histogram.mean_ms == pytest.approx(sum(values) / len(values), rel=1e-3)
+
+    def test_merge_matches_single_histogram(self):
+        combined, left, right = OverheadHistogram(), OverheadHistogram(), OverheadHistogram()
+        for i in range(1, 2001):
+            value = i * 0.01
+            combined.record(value)
+            (left if i % 2 else right).record(value)
+
+        merged = left.copy().merge(right)
+        assert merged.counts == combined.counts
+        assert merged.count == combined.count
+        assert merged.min_ms == combined.min_ms
+        assert merged.percentile(95) == combined.percentile(95)
+
+    def test_merge_rejects_different_configuration(self):
+        with pytest.raises(ValueError):
+            OverheadHistogram().merge(OverheadHistogram(precision_bits=5))
+
+    def test_count_at_or_below_bucket_boundary(self):
+        histogram = OverheadHistogram()
+        for value in (1.0, 2.0, 4.0, 8.0, 16.0):
+            histogram.record(value)
+        assert histogram.count_at_or_below(4.096) == 3
+        assert histogram.count_at_or_below(120_000) == 5
+
+
+class TestPerformanceMonitor:
+    """Test per-thread recording and export."""
+
+    def test_threads_merge_into_exact_counts(self):
+        monitor = PerformanceMonitor()
+        monitor.enable()
+
+        def work():
+            for _ in range(1000):
+                monitor.record_overhead("openai", 0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        monitor.record_overhead("openai", 7.0)
+
+        metrics = monitor.get_metrics("openai")
+        assert metrics["call_count"] == 4001
+        assert metrics["median_overhead_ms"] == pytest.approx(0.5, rel=0.016)
+        assert metrics["max_overhead_ms"] == 7.0
+
+        summary = monitor.get_summary()
+        assert summary["total_calls"] == 4001
+        # Exited threads are folded in and dropped from the live registry
+        assert len(monitor._histograms) == 1
+
+    def test_exited_threads_are_pruned_on_registration(self, monkeypatch):
+        monkeypatch.setattr(performance, "PRUNE_EVERY_REGISTRATIONS", 4)
+        monitor = PerformanceMonitor()
+        monitor.enable()
+
+        for _ in range(10):
+            thread = threading.Thread(target=monitor.record_overhead, args=("openai", 1.0))
+            thread.start()
+            thread.join()
+
+        # Never read; registrations alone keep the live registry short
+        assert len(monitor._histograms) < 4
+        assert monitor.get_metrics("openai")["call_count"] == 10
+
+    def test_reset(self):
+        monitor = PerformanceMonitor()
+        monitor.enable()
+        monitor.record_overhead("bedrock", 1.0)
+        monitor.reset()
+        assert monitor.get_summary() == {"message": "No performance data collected"}
+        monitor.record_overhead("bedrock", 2.0)
+        assert monitor.get_metrics("bedrock")["call_count"] == 1
+
+    def test_prometheus_export(self):
+        monitor = PerformanceMonitor()
+        assert monitor.to_prometheus() == ""
+
+        monitor.enable()
+        for value in (1.0, 3.0, 12.0):
+            monitor.record_overhead("openai", value)
+
+        text = monitor.to_prometheus()
+        assert "# TYPE cert_connector_overhead_seconds histogram" in text
+        assert 'cert_connector_overhead_seconds_bucket{connector="openai",le="0.005"} 2' in text
+        assert 'cert_connector_overhead_seconds_bucket{connector="openai",le="+Inf"} 3' in text
+        assert 'cert_connector_overhead_seconds_count{connector="openai"} 3' in text
+        assert "cert_connector_overhead_target_seconds 0.005" in text
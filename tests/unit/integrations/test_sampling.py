@@ -0,0 +1,146 @@
+"""
+Unit tests for connector trace sampling.
+
+Tests head sampling, tail-based retention and weighted aggregation.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from cert.integrations.base import ConnectorAdapter, TracedCall
+from cert.integrations.sampling import SamplingPolicy, sample_weight
+from cert.metrics.engine import MetricsEngine
+from cert.value.analyzer import CostAnalyzer
+
+
+class ListTracer:
+    def __init__(self):
+        self.traces = []
+
+    def log_trace(self, trace):
+        self.traces.append(trace)
+
+
+class DummyConnector(ConnectorAdapter):
+    def activate(self):
+        pass
+
+    def extract_metadata(self, call_data):
+        return {}
+
+    def calculate_cost(self, call_data):
+        return None
+
+
+def _call(model="gpt-4o-mini", cost=0.01, error=None, **metadata):
+    return TracedCall(
+        timestamp=datetime.utcnow().isoformat() + "Z",
+        platform="openai",
+        model=model,
+        input_data="q",
+        output_data="a",
+        metadata=metadata,
+        cost=cost,
+        error=error,
+    )
+
+
+class TestSamplingPolicy:
+    """Test sampling decisions."""
+
+    def test_most_specific_rate_wins(self):
+        policy = SamplingPolicy(
+            default_rate=0.5, rates={"openai": 0.2, "gpt-4o": 0.3, "openai:gpt-4o": 0.4}
+        )
+        assert policy.rate_for("openai", "gpt-4o") == 0.4
+        assert policy.rate_for("azure_openai", "gpt-4o") == 0.3
+        assert policy.rate_for("openai", "gpt-4") == 0.2
+        assert policy.rate_for("bedrock", "titan") == 0.5
+
+    def test_tail_rules_always_keep(self):
+        policy = SamplingPolicy(default_rate=0.0, slow_ms=1000, min_cost=1.0, min_confidence=0.7)
+
+        assert policy.decide(_call(error="timeout")) == (True, 1.0, "error")
+        assert policy.decide(_call(latency_ms=1500)) == (True, 1.0, "slow")
+        assert policy.decide(_call(stream_duration_ms=2000)) == (True, 1.0, "slow")
+        assert policy.decide(_call(cost=2.5)) == (True, 1.0, "cost")
+        assert policy.decide(_call(confidence=0.4)) == (True, 1.0, "confidence")
+        assert policy.decide(_call(latency_ms=10, confidence=0.9))[0] is False
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("CERT_SAMPLE_RATE", "0.25")
+        monkeypatch.setenv("CERT_SAMPLE_RATES", "openai:gpt-4o-mini=0.01, bedrock=0.5")
+        monkeypatch.setenv("CERT_TAIL_SLOW_MS", "5000")
+
+        policy = SamplingPolicy.from_env()
+        assert policy.default_rate == 0.25
+        assert policy.rates == {"openai:gpt-4o-mini": 0.01, "bedrock": 0.5}
+        assert policy.slow_ms == 5000.0
+        assert policy.min_cost is None
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            SamplingPolicy(rates={"openai": 1.5})
+
+
+class TestConnectorSampling:
+    """Test sampling applied by connectors."""
+
+    def test_default_keeps_everything_unannotated(self):
+        tracer = ListTracer()
+        connector = DummyConnector(tracer)
+        connector.log_call(_call())
+
+        assert len(tracer.traces) == 1
+        assert "sample_weight" not in tracer.traces[0]["metadata"]
+
+    def test_sampled_calls_carry_weight(self):
+        tracer = ListTracer()
+        connector = DummyConnector(tracer)
+        connector.sampling = SamplingPolicy(default_rate=0.1, seed=1)
+
+        for _ in range(1000):
+            connector.log_call(_call())
+        connector.log_call(_call(error="rate limited"))
+
+        kept = tracer.traces
+        assert connector.sampled_out + len(kept) == 1001
+        assert 50 < len(kept) < 160
+        assert kept[-1]["metadata"]["retained_by"] == "error"
+        assert {sample_weight(t) for t in kept[:-1]} == {10.0}
+
+
+class TestWeightedAggregation:
+    """Test that sampled trace logs still produce unbiased totals."""
+
+    @pytest.fixture
+    def sampled_log(self, tmp_path):
+        tracer = ListTracer()
+        connector = DummyConnector(tracer)
+        connector.sampling = SamplingPolicy(default_rate=0.1, seed=3)
+
+        # 4000 successful calls and 400 errors; errors are always retained
+        for i in range(4400):
+            connector.log_call(_call(error="boom" if i % 11 == 0 else None, latency_ms=100))
+
+        path = tmp_path / "traces.jsonl"
+        path.write_text("".join(json.dumps(t) + "\n" for t in tracer.traces))
+        return str(path)
+
+    def test_cost_analyzer_totals(self, sampled_log):
+        analyzer = CostAnalyzer(sampled_log)
+        assert analyzer.total_cost() == pytest.approx(44.0, rel=0.1)
+        assert analyzer.cost_by_model()["gpt-4o-mini"] == pytest.approx(44.0, rel=0.1)
+
+    def test_metrics_engine_rates(self, sampled_log):
+        engine = MetricsEngine(sampled_log)
+
+        cost = engine.cost_metric("day")
+        assert cost.value == pytest.approx(44.0, rel=0.1)
+        assert cost.trace_count == pytest.approx(4400, rel=0.1)
+
+        health = engine.health_metric("day")
+        # Unweighted, the retained errors would look like ~50% of traffic
+        assert health.error_rate == pytest.approx(1 / 11, rel=0.15)
@@ -0,0 +1,224 @@
+"""
+Unit tests for streaming call tracing.
+
+Tests incremental chunk accumulation and token timing in the connectors.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from cert.integrations import anthropic_connector, bedrock_connector, openai_connector
+from cert.integrations.streaming import StreamAccumulator
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.traces = []
+
+    def log_trace(self, trace):
+        self.traces.append(trace)
+
+
+def _openai_chunk(content=None, finish_reason=None, usage=None):
+    choices = (
+        []
+        if usage
+        else [SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)]
+    )
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class TestStreamAccumulator:
+    """Test the running stream state."""
+
+    def test_folds_text_finish_reason_and_usage(self):
+        acc = StreamAccumulator()
+        acc.add_chunk()
+        acc.add_chunk("Hel")
+        acc.add_chunk("lo", finish_reason="stop")
+        acc.add_chunk(usage={"prompt_tokens": 3, "completion_tokens": None})
+
+        assert acc.text == "Hello"
+        metadata = acc.metadata()
+        assert metadata["chunk_count"] == 4
+        assert metadata["finish_reason"] == "stop"
+        assert metadata["prompt_tokens"] == 3
+        assert "completion_tokens" not in metadata
+
+    def test_token_timing(self):
+        acc = StreamAccumulator(started=0.0)
+        acc.add_chunk("a")
+        acc.add_chunk("b")
+        acc.add_chunk("c")
+
+        timing = acc.timing_metadata()
+        assert timing["time_to_first_token_ms"] > 0
+        assert 0 <= timing["inter_token_latency_ms_mean"] <= timing["inter_token_latency_ms_max"]
+
+    def test_no_text_has_no_first_token(self):
+        timing = StreamAccumulator().timing_metadata()
+        assert timing["time_to_first_token_ms"] is None
+        assert "inter_token_latency_ms_mean" not in timing
+
+
+class TestConnectorStreams:
+    """Test connector stream wrappers fold chunks instead of retaining them."""
+
+    def test_openai_stream(self, monkeypatch):
+        monkeypatch.setattr(openai_connector, "OPENAI_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = openai_connector.OpenAIConnector(tracer)
+
+        usage = SimpleNamespace(prompt_tokens=12, completion_tokens=2, total_tokens=14)
+        chunks = [
+            _openai_chunk("Hi"),
+            _openai_chunk(" there", "stop"),
+            _openai_chunk(usage=usage),
+        ]
+        request = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "x"}]}
+
+        assert list(connector._wrap_stream(iter(chunks), request, None)) == chunks
+
+        trace = tracer.traces[0]
+        assert trace["output_data"] == "Hi there"
+        assert trace["metadata"]["finish_reason"] == "stop"
+        assert trace["metadata"]["chunk_count"] == 3
+        assert trace["metadata"]["completion_tokens"] == 2
+        assert "estimated_prompt_tokens" not in trace["metadata"]
+        assert trace["metadata"]["time_to_first_token_ms"] is not None
+        assert trace["cost"] == pytest.approx((12 * 0.5 + 2 * 1.5) / 1_000_000)
+
+    def test_openai_async_stream_estimates_without_usage(self, monkeypatch):
+        monkeypatch.setattr(openai_connector, "OPENAI_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = openai_connector.OpenAIConnector(tracer)
+
+        async def stream():
+            for chunk in [_openai_chunk("a" * 40), _openai_chunk("b" * 40, "length")]:
+                yield chunk
+
+        async def scenario():
+            request = {"model": "gpt-4o", "messages": []}
+            return [c async for c in connector._wrap_async_stream(stream(), request, None)]
+
+        assert len(asyncio.run(scenario())) == 2
+        assert connector.flush(timeout=5.0)
+
+        metadata = tracer.traces[0]["metadata"]
+        assert metadata["estimated_completion_tokens"] == 20
+        assert metadata["inter_token_latency_ms_max"] >= 0
+
+    def test_bedrock_stream(self, monkeypatch):
+        monkeypatch.setattr(bedrock_connector, "BOTO3_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = bedrock_connector.BedrockConnector(tracer)
+
+        def event(payload):
+            return {"chunk": {"bytes": json.dumps(payload).encode("utf-8")}}
+
+        events = [
+            event({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}),
+            event({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "!"}}),
+            event(
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn"},
+                    "amazon-bedrock-invocationMetrics": {
+                        "inputTokenCount": 5,
+                        "outputTokenCount": 2,
+                    },
+                }
+            ),
+        ]
+        request = {"modelId": "anthropic.claude-3-haiku", "body": b'{"messages": []}'}
+
+        assert list(connector._wrap_stream(iter(events), request, {}, None)) == events
+
+        trace = tracer.traces[0]
+        assert trace["output_data"] == "Hi!"
+        assert trace["metadata"]["finish_reason"] == "end_turn"
+        assert trace["metadata"]["output_tokens"] == 2
+        assert trace["cost"] == pytest.approx((5 * 0.25 + 2 * 1.25) / 1_000_000)
+
+    def test_bedrock_cost_from_token_counts(self, monkeypatch):
+        monkeypatch.setattr(bedrock_connector, "BOTO3_AVAILABLE", True)
+        connector = bedrock_connector.BedrockConnector(RecordingTracer())
+
+        cost = connector._calculate_bedrock_cost(
+            "us.anthropic.claude-3-5-haiku-20241022-v1:0", 1_000_000, 0
+        )
+
+        assert cost == pytest.approx(0.80)
+        assert connector._calculate_bedrock_cost("unknown.model", 10, 10) is None
+        assert connector._calculate_bedrock_cost("anthropic.claude-3-haiku", None, None) is None
+
+    def test_anthropic_stream(self, monkeypatch):
+        monkeypatch.setattr(anthropic_connector, "ANTHROPIC_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = anthropic_connector.AnthropicConnector(tracer)
+
+        events = [
+            SimpleNamespace(
+                type="message_start",
+                message=SimpleNamespace(usage=SimpleNamespace(input_tokens=1000)),
+            ),
+            SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text="Par")),
+            SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text="is")),
+            SimpleNamespace(
+                type="message_delta",
+                delta=SimpleNamespace(stop_reason="end_turn"),
+                usage=SimpleNamespace(output_tokens=1000),
+            ),
+        ]
+        request = {"model": "claude-3-haiku-20240307", "messages": []}
+
+        assert list(connector._wrap_stream(iter(events), request, None)) == events
+
+        trace = tracer.traces[0]
+        assert trace["output_data"] == "Paris"
+        assert trace["metadata"]["finish_reason"] == "end_turn"
+        assert trace["cost"] == pytest.approx(0.25 / 1000 + 1.25 / 1000)
+
+    def test_anthropic_stream_keeps_sdk_stream_interface(self, monkeypatch):
+        monkeypatch.setattr(anthropic_connector, "ANTHROPIC_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = anthropic_connector.AnthropicConnector(tracer)
+
+        class SDKStream:
+            response = SimpleNamespace(status_code=200)
+            closed = False
+
+            def __iter__(self):
+                yield SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text="Hi"))
+
+            def close(self):
+                self.closed = True
+
+        sdk_stream = SDKStream()
+        request = {"model": "claude-3-haiku-20240307", "messages": []}
+
+        with connector._wrap_stream(sdk_stream, request, None) as stream:
+            assert stream.response.status_code == 200
+            assert [event.delta.text for event in stream] == ["Hi"]
+
+        assert sdk_stream.closed
+        assert tracer.traces[0]["output_data"] == "Hi"
+
+    def test_error_mid_stream_keeps_partial_metadata(self, monkeypatch):
+        monkeypatch.setattr(openai_connector, "OPENAI_AVAILABLE", True)
+        tracer = RecordingTracer()
+        connector = openai_connector.OpenAIConnector(tracer)
+
+        def broken():
+            yield _openai_chunk("partial")
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            list(connector._wrap_stream(broken(), {"model": "gpt-4o"}, None))
+
+        trace = tracer.traces[0]
+        assert trace["error"] == "reset"
+        assert trace["metadata"]["chunk_count"] == 1
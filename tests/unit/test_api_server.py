@@ -0,0 +1,86 @@
+"""
+Unit tests for the API server.
+
+Tests the bounded analytics executor across app lifespans, rejection of
+analytics requests beyond the pending cap, and NDJSON trace streaming.
+"""
+
+import json
+import warnings
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+with warnings.catch_warnings():
+    # Newer Starlette releases deprecate the httpx-based test client
+    warnings.simplefilter("ignore")
+    from fastapi.testclient import TestClient
+
+from cert.api import server
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "cert_traces.jsonl"
+    traces = [
+        {"timestamp": f"2025-01-0{day}T12:00:00Z", "model": "gpt-4o", "cost": day}
+        for day in range(1, 6)
+    ]
+    path.write_text("".join(json.dumps(t) + "\n" for t in traces))
+    monkeypatch.setattr(server, "_trace_file", path)
+    return path
+
+
+class TestAnalyticsExecutor:
+    """Test the analytics executor across lifespans and the pending cap."""
+
+    def test_app_can_start_twice(self, trace_file):
+        for _ in range(2):
+            with TestClient(server.app) as client:
+                response = client.get("/api/traces/recent", params={"limit": 2})
+                assert response.status_code == 200
+                assert response.json()["count"] == 2
+
+        assert server.app.state.analytics_executor is None
+
+    def test_busy_analytics_are_rejected(self, trace_file, monkeypatch):
+        monkeypatch.setattr(server, "ANALYTICS_MAX_PENDING", 0)
+
+        with TestClient(server.app) as client:
+            response = client.get("/api/traces/recent")
+
+        assert response.status_code == 503
+        assert server._analytics_pending == 0
+
+
+class TestNDJSONStreaming:
+    """Test trace responses streamed one trace per line."""
+
+    def test_recent_traces_as_ndjson(self, trace_file):
+        with TestClient(server.app) as client:
+            response = client.get("/api/traces/recent", params={"limit": 3, "format": "ndjson"})
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["x-total-count"] == "5"
+        costs = [json.loads(line)["cost"] for line in response.text.splitlines()]
+        assert costs == [5, 4, 3]
+
+    def test_export_streams_in_chunks(self, trace_file, monkeypatch):
+        monkeypatch.setattr(server, "STREAM_CHUNK_BYTES", 1)
+        chunks = list(server._iter_ndjson_chunks(server._iter_trace_file()))
+        assert len(chunks) == 5
+
+        with TestClient(server.app) as client:
+            response = client.get("/api/traces/export", params={"since": "2025-01-03T00:00:00Z"})
+
+        assert response.status_code == 200
+        costs = [json.loads(line)["cost"] for line in response.text.splitlines()]
+        assert costs == [3, 4, 5]
+
+    def test_export_rejects_invalid_timestamp(self, trace_file):
+        with TestClient(server.app) as client:
+            response = client.get("/api/traces/export", params={"since": "yesterday"})
+
+        assert response.status_code == 400
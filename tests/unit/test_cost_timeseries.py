@@ -0,0 +1,123 @@
+"""
+Unit tests for the vectorized cost time-series engine.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+# Skip all tests if numpy not installed
+pytest.importorskip("numpy")
+
+import numpy as np
+
+from cert.value.analyzer import CostAnalyzer
+from cert.value.timeseries import CostTimeSeries
+
+START = datetime(2025, 1, 1)
+
+
+def _seasonal_series(days=14, spike_at=None):
+    hours = np.arange(days * 24)
+    values = 10 + 5 * np.sin(2 * np.pi * hours / 24)
+    if spike_at is not None:
+        values[spike_at] += 100
+    return CostTimeSeries(START, values, freq="hour")
+
+
+class TestCostTimeSeries:
+    """Test bucketing, anomaly detection, decomposition and forecasting."""
+
+    def test_from_traces_fills_empty_buckets(self):
+        traces = [
+            {"timestamp": "2025-01-01T00:10:00Z", "cost": 1.0},
+            {"timestamp": "2025-01-01T00:50:00Z", "cost": 2.0},
+            {"timestamp": "2025-01-01T03:05:00Z", "cost": 4.0},
+            {"timestamp": "invalid", "cost": 8.0},
+        ]
+
+        series = CostTimeSeries.from_traces(traces, freq="hour")
+
+        assert series.start == START
+        assert series.values.tolist() == [3.0, 0.0, 0.0, 4.0]
+
+    def test_rolling_zscore_flags_spike(self):
+        series = _seasonal_series(spike_at=200)
+
+        anomalies = series.detect_anomalies(window=24, threshold=3.0)
+
+        assert len(anomalies) == 1
+        assert anomalies[0]["timestamp"] == (START + timedelta(hours=200)).isoformat() + "Z"
+        assert anomalies[0]["severity"] == "critical"
+
+    def test_decompose_recovers_seasonality(self):
+        series = _seasonal_series()
+
+        components = series.decompose(period=24)
+
+        assert np.allclose(components["trend"], 10, atol=0.5)
+        expected = 5 * np.sin(2 * np.pi * np.arange(24) / 24)
+        assert np.allclose(components["seasonal"][:24], expected, atol=0.5)
+
+    def test_forecast_continues_trend(self):
+        hours = np.arange(10 * 24)
+        series = CostTimeSeries(START, 1 + 0.1 * hours, freq="hour")
+
+        result = series.forecast(horizon=24, period=24)
+
+        assert len(result["forecast"]) == 24
+        assert result["forecast"][0] == pytest.approx(1 + 0.1 * 240, rel=0.05)
+        assert np.all(result["upper"] >= result["forecast"])
+
+    def test_budget_burn_projects_exhaustion(self):
+        series = CostTimeSeries(START, np.full(10 * 24, 1.0), freq="hour")
+
+        burn = series.budget_burn(budget=500.0, period_end=START + timedelta(days=31))
+
+        assert burn["spent"] == pytest.approx(240.0)
+        assert burn["projected_total"] == pytest.approx(744.0, rel=0.01)
+        assert burn["on_track"] is False
+        assert burn["projected_exhaustion"].startswith("2025-01-21")
+
+    def test_budget_burn_with_stale_data_starts_at_as_of(self):
+        # $1/h for four days, then no traces for two weeks
+        series = CostTimeSeries(START, np.full(4 * 24, 1.0), freq="hour")
+
+        burn = series.budget_burn(budget=300.0, as_of=START + timedelta(days=19))
+
+        assert burn["spent"] == pytest.approx(96.0)
+        assert burn["projected_total"] == pytest.approx(96.0, abs=1.0)
+        assert burn["projected_exhaustion"] is None
+        assert burn["on_track"] is True
+
+    def test_budget_burn_counts_current_partial_bucket(self):
+        # $1/h for ten days, then half an hour into the next hour
+        values = np.append(np.full(10 * 24, 1.0), 0.5)
+        series = CostTimeSeries(START, values, freq="hour")
+        as_of = START + timedelta(days=10, minutes=30)
+
+        burn = series.budget_burn(budget=1000.0, as_of=as_of, period_end=START + timedelta(days=31))
+
+        assert burn["spent"] == pytest.approx(240.5)
+        # Only the unobserved half of the current hour is forecast
+        assert burn["projected_total"] == pytest.approx(744.0, rel=0.01)
+
+        # Projecting from an earlier point only counts the elapsed share
+        earlier = series.budget_burn(
+            budget=1000.0,
+            as_of=START + timedelta(days=5, minutes=15),
+            period_end=START + timedelta(days=31),
+        )
+        assert earlier["spent"] == pytest.approx(120.25)
+
+    def test_analyzer_cost_timeseries(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        with open(path, "w") as f:
+            for day in range(3):
+                trace = {"timestamp": (START + timedelta(days=day)).isoformat(), "cost": 2.0}
+                f.write(json.dumps(trace) + "\n")
+
+        series = CostAnalyzer(str(path)).cost_timeseries("day")
+
+        assert series.values.tolist() == [2.0, 2.0, 2.0]
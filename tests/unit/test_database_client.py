@@ -0,0 +1,203 @@
+"""
+Unit tests for the database client.
+
+Tests batched and buffered writes and keyset pagination against a fake
+Supabase query builder.
+"""
+
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from cert.database import DatabaseClient
+
+
+class FakeQuery:
+    """Records builder calls and returns canned data on execute."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return method
+
+    def execute(self):
+        self.client.executed.append(self)
+        for name, args, _ in self.calls:
+            if name in ("insert", "upsert"):
+                return SimpleNamespace(data=args[0])
+        return SimpleNamespace(data=self.client.pages.pop(0) if self.client.pages else [])
+
+
+class FakeSupabase:
+    def __init__(self, pages=None):
+        self.executed = []
+        self.pages = list(pages or [])
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+USER_ID = UUID(int=7)
+
+
+def _trace(i):
+    return {"function_name": f"fn{i}", "duration_ms": 1.0, "status": "success", "user_id": USER_ID}
+
+
+def _schema_columns(table):
+    """Column names of a table in database/schema.sql."""
+    schema = (Path(__file__).parents[2] / "database" / "schema.sql").read_text()
+    body = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\);", schema, re.S).group(1)
+    return {
+        line.split()[0]
+        for line in body.splitlines()
+        if line.strip()
+        and not line.strip().startswith(("--", "CONSTRAINT", "UNIQUE", "PRIMARY", "CHECK"))
+    }
+
+
+@pytest.fixture
+def fake():
+    return FakeSupabase()
+
+
+class TestBatchWrites:
+    """Test multi-row inserts and buffering."""
+
+    def test_batch_is_split_by_batch_size(self, fake):
+        db = DatabaseClient(client=fake, batch_size=2)
+
+        ids = db.insert_traces_batch([_trace(i) for i in range(5)])
+
+        assert len(ids) == 5
+        assert all(isinstance(i, UUID) for i in ids)
+        sizes = [len(q.calls[0][1][0]) for q in fake.executed]
+        assert sizes == [2, 2, 1]
+        assert all(q.calls[0][0] == "insert" for q in fake.executed)
+
+    def test_upsert_uses_conflict_column(self, fake):
+        db = DatabaseClient(client=fake)
+        trace_id = UUID(int=1)
+
+        db.insert_measurements_batch(
+            [
+                {
+                    "trace_id": trace_id,
+                    "confidence": 0.4,
+                    "semantic_score": 0.5,
+                    "grounding_score": 0.6,
+                }
+            ],
+            upsert=True,
+        )
+
+        name, args, kwargs = fake.executed[0].calls[0]
+        assert name == "upsert"
+        assert kwargs == {"on_conflict": "trace_id"}
+        assert args[0][0]["passed"] is False
+
+    def test_buffer_flushes_at_batch_size_and_on_exit(self, fake):
+        with DatabaseClient(client=fake, batch_size=3) as db:
+            trace_ids = [db.buffer_trace(**_trace(i)) for i in range(4)]
+            assert len(fake.executed) == 1
+
+            db.buffer_measurement(
+                trace_id=trace_ids[-1], confidence=0.9, semantic_score=0.9, grounding_score=0.9
+            )
+
+        tables = [q.table for q in fake.executed]
+        assert tables == ["traces", "traces", "measurements"]
+        assert fake.executed[1].calls[0][1][0][0]["id"] == str(trace_ids[-1])
+
+    def test_failed_flush_keeps_rows(self, fake):
+        db = DatabaseClient(client=fake, batch_size=10)
+        db.buffer_trace(**_trace(0))
+        fake.table = lambda name: (_ for _ in ()).throw(ConnectionError("down"))
+
+        with pytest.raises(ConnectionError):
+            db.flush()
+        assert len(db._trace_buffer) == 1
+
+    def test_invalid_batch_size(self, fake):
+        with pytest.raises(ValueError):
+            DatabaseClient(client=fake, batch_size=-1)
+
+
+class TestTraceRows:
+    """Test trace rows match the traces table of database/schema.sql."""
+
+    def test_rows_use_schema_columns(self, fake):
+        db = DatabaseClient(client=fake)
+
+        db.insert_trace(function_name="rag", duration_ms=1.0, status="success", user_id=USER_ID)
+        db.insert_traces_batch([{**_trace(1), "status": "error", "project_id": UUID(int=2)}])
+
+        rows = [q.calls[0][1][0] for q in fake.executed]
+        rows = [rows[0], *rows[1]]
+        columns = _schema_columns("traces")
+        for row in rows:
+            assert set(row) <= columns
+            assert row["user_id"] == str(USER_ID)
+        assert [row["name"] for row in rows] == ["rag", "fn1"]
+        assert [row["status"] for row in rows] == ["ok", "error"]
+
+    def test_client_user_id_is_the_default_owner(self, fake):
+        db = DatabaseClient(client=fake, user_id=USER_ID)
+
+        db.insert_trace(function_name="rag", duration_ms=1.0, status="ok")
+
+        assert fake.executed[0].calls[0][1][0]["user_id"] == str(USER_ID)
+
+    def test_missing_user_or_unknown_status_is_rejected(self, fake, monkeypatch):
+        monkeypatch.delenv("CERT_DB_USER_ID", raising=False)
+        db = DatabaseClient(client=fake)
+
+        with pytest.raises(ValueError, match="user_id"):
+            db.insert_trace(function_name="rag", duration_ms=1.0, status="ok")
+        with pytest.raises(ValueError, match="status"):
+            db.buffer_trace(**{**_trace(0), "status": "failed"})
+        assert fake.executed == []
+
+
+class TestKeysetPagination:
+    """Test cursor pagination on (created_at, id)."""
+
+    def test_cursor_filter_and_order(self, fake):
+        db = DatabaseClient(client=fake)
+
+        db.get_traces(limit=10, after=("2025-01-01T00:00:00+00:00", "abc"))
+
+        calls = fake.executed[0].calls
+        or_filter = next(args[0] for name, args, _ in calls if name == "or_")
+        assert or_filter == (
+            'created_at.lt."2025-01-01T00:00:00+00:00",'
+            'and(created_at.eq."2025-01-01T00:00:00+00:00",id.lt.abc)'
+        )
+        orders = [(args[0], kwargs) for name, args, kwargs in calls if name == "order"]
+        assert orders == [("created_at", {"desc": True}), ("id", {"desc": True})]
+        assert "offset" not in [name for name, _, _ in calls]
+
+    def test_iter_traces_follows_cursor(self):
+        pages = [
+            [{"id": "b", "created_at": "t2"}, {"id": "a", "created_at": "t2"}],
+            [{"id": "c", "created_at": "t1"}],
+        ]
+        fake = FakeSupabase(pages)
+        db = DatabaseClient(client=fake)
+
+        traces = list(db.iter_traces(page_size=2, status="error"))
+
+        assert [t["id"] for t in traces] == ["b", "a", "c"]
+        second = fake.executed[1].calls
+        assert any(name == "or_" and "id.lt.a" in args[0] for name, args, _ in second)
+        assert DatabaseClient.page_cursor([]) is None
@@ -0,0 +1,201 @@
+"""
+Unit tests for the database trace sink.
+
+Tests batched background writes, retry and spooling against the SQLite
+stand-in for the Postgres writer.
+"""
+
+import json
+
+import pytest
+
+from cert.core.sinks import JSONLSink
+from cert.core.tracer import CertTracer, trace
+from cert.database import DatabaseTraceSink, SQLiteTraceWriter, trace_to_row
+
+
+class FlakyWriter(SQLiteTraceWriter):
+    """SQLite writer that fails while ``down`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+        self.batches = []
+
+    def write_rows(self, rows):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.batches.append(len(rows))
+        super().write_rows(rows)
+
+
+def _count(writer):
+    return writer.conn.execute("SELECT COUNT(*) FROM traces").fetchone()[0]
+
+
+@pytest.fixture
+def writer():
+    return FlakyWriter()
+
+
+class TestTraceToRow:
+    """Test mapping of trace dictionaries to table rows."""
+
+    def test_tracer_trace(self):
+        row = trace_to_row(
+            {
+                "timestamp": "2025-01-01T00:00:00Z",
+                "function": "rag",
+                "duration_ms": 12.5,
+                "status": "error",
+                "error": "boom",
+                "context": ["doc"],
+                "answer": "Paris",
+            }
+        )
+
+        assert row["name"] == "rag"
+        assert row["status"] == "error"
+        assert row["error_message"] == "boom"
+        assert row["created_at"] == "2025-01-01T00:00:00Z"
+        assert json.loads(row["context"]) == ["doc"]
+        assert row["output_text"] == "Paris"
+
+    def test_connector_trace(self):
+        row = trace_to_row(
+            {
+                "platform": "openai",
+                "model": "gpt-4o",
+                "cost": 0.02,
+                "input_data": {"messages": []},
+                "metadata": {"prompt_tokens": 10, "completion_tokens": 5, "sample_weight": 4},
+            }
+        )
+
+        assert row["vendor"] == "openai"
+        assert row["status"] == "ok"
+        assert row["total_tokens"] == 15
+        assert row["cost"] == 0.02
+        assert row["sample_weight"] == 4
+        assert json.loads(row["input_text"]) == {"messages": []}
+
+
+class TestDatabaseTraceSink:
+    """Test background batching, retry and spooling."""
+
+    def test_writes_in_batches(self, writer):
+        sink = DatabaseTraceSink(writer, batch_size=3, flush_interval=10)
+
+        for i in range(7):
+            sink.write({"function": f"fn{i}", "duration_ms": 1.0})
+        assert sink.flush(timeout=5)
+
+        assert _count(writer) == 7
+        assert max(writer.batches) <= 3
+        assert sink.traces_written == 7
+        sink.close()
+
+    def test_failed_batch_is_spooled_and_replayed(self, writer, tmp_path):
+        spool = tmp_path / "spool.jsonl"
+        sink = DatabaseTraceSink(writer, max_retries=1, retry_backoff=0, spool_path=str(spool))
+
+        writer.down = True
+        sink.write({"function": "a"})
+        sink.write({"function": "b"})
+        assert sink.flush(timeout=5)
+        assert _count(writer) == 0
+        assert len(spool.read_text().splitlines()) == 2
+        assert sink.write_failures == 2
+
+        writer.down = False
+        sink.write({"function": "c"})
+        assert sink.flush(timeout=5)
+
+        assert _count(writer) == 3
+        assert not spool.exists()
+        sink.close()
+
+    def test_corrupt_spool_lines_are_quarantined(self, writer, tmp_path):
+        spool = tmp_path / "spool.jsonl"
+        good = json.dumps(trace_to_row({"function": "a"}))
+        # A crash mid-append leaves a torn last line
+        spool.write_text(good + "\n" + good[:20])
+        sink = DatabaseTraceSink(writer, spool_path=str(spool))
+
+        sink.write({"function": "b"})
+        assert sink.flush(timeout=5)
+
+        assert _count(writer) == 2
+        assert sink.spool_corrupt == 1
+        assert (tmp_path / "spool.jsonl.corrupt").read_text() == good[:20] + "\n"
+
+        sink.write({"function": "c"})
+        assert sink.flush(timeout=5)
+        assert _count(writer) == 3
+        sink.close()
+
+    def test_spool_append_terminates_torn_line(self, writer, tmp_path):
+        spool = tmp_path / "spool.jsonl"
+        spool.write_text('{"torn"')
+        sink = DatabaseTraceSink(writer, max_queue_size=0, spool_path=str(spool))
+
+        sink.write({"function": "a"})
+
+        lines = spool.read_text().splitlines()
+        assert lines[0] == '{"torn"'
+        assert json.loads(lines[1])["name"] == "a"
+
+    def test_full_queue_spools_instead_of_blocking(self, writer, tmp_path):
+        spool = tmp_path / "spool.jsonl"
+        sink = DatabaseTraceSink(writer, max_queue_size=0, spool_path=str(spool))
+
+        sink.write({"function": "a"})
+
+        assert sink.traces_spooled == 1
+        assert sink.queue_size == 0
+
+    def test_dropped_without_spool(self, writer):
+        sink = DatabaseTraceSink(writer, max_queue_size=0)
+
+        sink.write({"function": "a"})
+
+        assert sink.traces_dropped == 1
+
+    def test_retried_rows_are_not_duplicated(self, writer):
+        row = trace_to_row({"function": "a"})
+
+        writer.write_rows([row])
+        writer.write_rows([row])
+
+        assert _count(writer) == 1
+
+
+class TestTracerSinks:
+    """Test CertTracer and @trace with pluggable sinks."""
+
+    def test_tracer_writes_to_every_sink(self, writer, tmp_path):
+        log_path = tmp_path / "traces.jsonl"
+        sink = DatabaseTraceSink(writer)
+        tracer = CertTracer(sinks=[JSONLSink(str(log_path)), sink])
+
+        tracer.log_trace({"function": "rag", "duration_ms": 3.0})
+        assert tracer.flush()
+
+        assert len(log_path.read_text().splitlines()) == 1
+        assert _count(writer) == 1
+        tracer.close()
+
+    def test_decorator_uses_sinks(self, writer):
+        sink = DatabaseTraceSink(writer)
+
+        @trace(sinks=[sink])
+        def answer(query):
+            return {"answer": "Paris", "context": "France"}
+
+        answer(query="capital?")
+        assert sink.flush(timeout=5)
+
+        name, input_text = writer.conn.execute("SELECT name, input_text FROM traces").fetchone()
+        assert name == "answer"
+        assert input_text == "capital?"
+        sink.close()
@@ -0,0 +1,166 @@
+"""
+Unit tests for the live metrics feed.
+
+Tests incremental trace tailing, delta computation and subscriber fan-out.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+# cert.api imports the FastAPI app on package import
+pytest.importorskip("fastapi")
+
+from cert.api.live import LiveMetricsBroadcaster, TraceFileTail, compute_delta
+
+
+def _write(path, traces, mode="a"):
+    with open(path, mode) as f:
+        for trace in traces:
+            f.write(json.dumps(trace) + "\n")
+
+
+class TestTraceFileTail:
+    """Test incremental reading of the trace file."""
+
+    def test_reads_only_appended_traces(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        _write(path, [{"cost": 1.0}])
+
+        tail = TraceFileTail(str(path))
+        assert tail.read_new() == []
+
+        _write(path, [{"cost": 2.0}, {"cost": 3.0}])
+        assert [t["cost"] for t in tail.read_new()] == [2.0, 3.0]
+        assert tail.read_new() == []
+
+    def test_partial_line_is_deferred(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        path.write_text("")
+        tail = TraceFileTail(str(path))
+
+        with open(path, "a") as f:
+            f.write('{"cost": 1.0}\n{"cost": ')
+        assert len(tail.read_new()) == 1
+
+        with open(path, "a") as f:
+            f.write("2.0}\n")
+        assert tail.read_new() == [{"cost": 2.0}]
+
+    def test_truncation_restarts_from_beginning(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        _write(path, [{"cost": 1.0}, {"cost": 2.0}])
+        tail = TraceFileTail(str(path))
+
+        _write(path, [{"cost": 5.0}], mode="w")
+        assert tail.read_new() == [{"cost": 5.0}]
+
+
+class TestComputeDelta:
+    """Test delta computation for new traces."""
+
+    def test_delta_sections(self):
+        traces = [
+            {"cost": 0.5, "model": "gpt-4", "duration_ms": 100, "status": "success"},
+            {"cost": 0.25, "model": "gpt-3.5", "duration_ms": 300, "status": "error"},
+            {"metadata": {"cost": 0.25, "confidence": 0.9}, "model": "gpt-4"},
+        ]
+
+        delta = compute_delta(traces, recent_limit=2)
+
+        assert delta["trace_count"] == 3
+        assert delta["cost"]["value"] == 1.0
+        assert delta["cost"]["by_model"] == {"gpt-4": 0.75, "gpt-3.5": 0.25}
+        assert delta["health"]["error_count"] == 1
+        assert delta["health"]["max_latency"] == 300
+        assert delta["quality"]["evaluated_count"] == 1
+        assert delta["quality"]["passed_count"] == 1
+        assert len(delta["recent_traces"]) == 2
+        assert delta["recent_traces"][0]["metadata"]["confidence"] == 0.9
+
+
+class TestLiveMetricsBroadcaster:
+    """Test fan-out to subscribers."""
+
+    def test_single_delta_fanned_out(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        path.write_text("")
+
+        async def scenario():
+            broadcaster = LiveMetricsBroadcaster(str(path), poll_interval=0.01)
+            first = broadcaster.subscribe()
+            second = broadcaster.subscribe()
+
+            _write(path, [{"cost": 1.5}])
+            frames = await asyncio.wait_for(asyncio.gather(first.get(), second.get()), timeout=2.0)
+
+            broadcaster.unsubscribe(first)
+            broadcaster.unsubscribe(second)
+            return broadcaster, frames
+
+        broadcaster, frames = asyncio.run(scenario())
+
+        assert frames[0] is frames[1]
+        assert frames[0].startswith("event: delta\n")
+        assert broadcaster.deltas_published == 1
+        assert broadcaster.subscriber_count == 0
+
+    def test_slow_subscriber_drops_oldest(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        path.write_text("")
+
+        async def scenario():
+            broadcaster = LiveMetricsBroadcaster(str(path), max_queue_size=2)
+            queue = broadcaster.subscribe()
+            for cost in (1.0, 2.0, 3.0):
+                broadcaster.publish([{"cost": cost}])
+            frames = [queue.get_nowait() for _ in range(queue.qsize())]
+            broadcaster.unsubscribe(queue)
+            return broadcaster, frames
+
+        broadcaster, frames = asyncio.run(scenario())
+
+        assert len(frames) == 2
+        assert '"value": 3.0' in frames[-1]
+        assert broadcaster.events_dropped == 1
+
+    def test_snapshot_uses_runner_and_is_shared(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        path.write_text("")
+        calls = []
+
+        async def run_blocking(func):
+            calls.append(func)
+            return func()
+
+        async def scenario():
+            broadcaster = LiveMetricsBroadcaster(
+                str(path), snapshot_fn=lambda: {"n": len(calls)}, run_blocking=run_blocking
+            )
+            return [await broadcaster.get_snapshot(), await broadcaster.get_snapshot()]
+
+        snapshots = asyncio.run(scenario())
+
+        assert snapshots == [{"n": 1}, {"n": 1}]
+        assert len(calls) == 1
+
+    def test_snapshot_max_age_and_failure(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        path.write_text("")
+        results = [{"n": 1}, RuntimeError("analytics workers busy"), {"n": 2}]
+
+        async def run_blocking(func):
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        async def scenario():
+            broadcaster = LiveMetricsBroadcaster(
+                str(path), snapshot_fn=dict, run_blocking=run_blocking, snapshot_max_age=0
+            )
+            return [await broadcaster.get_snapshot() for _ in range(3)]
+
+        # Expired every time; the failed refresh keeps the previous snapshot
+        assert asyncio.run(scenario()) == [{"n": 1}, {"n": 1}, {"n": 2}]
@@ -0,0 +1,141 @@
+"""
+Unit tests for the database metrics engine.
+
+Tests SQL aggregation against the file-based MetricsEngine on the same
+traces, and incremental refresh of the hourly rollups, using SQLite.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from cert.database import SQLiteTraceWriter, trace_to_row
+from cert.metrics import DatabaseMetricsEngine, MetricConfig, MetricsEngine
+
+
+def _traces(now, count=300, weighted=True, seed=7):
+    rng = random.Random(seed)
+    traces = []
+    for _ in range(count):
+        timestamp = now - timedelta(minutes=rng.randint(1, 60 * 24 * 13))
+        trace = {
+            "timestamp": timestamp.isoformat() + "Z",
+            "platform": rng.choice(["openai", "anthropic"]),
+            "model": rng.choice(["gpt-4o", "claude", "gpt-4o-mini"]),
+            "cost": round(rng.random(), 4),
+            "duration_ms": rng.randint(10, 5000),
+            "metadata": {},
+        }
+        if rng.random() < 0.1:
+            trace["error"] = "timeout"
+        if rng.random() < 0.5:
+            trace["metadata"]["confidence"] = round(rng.random(), 3)
+        if weighted and rng.random() < 0.3:
+            trace["metadata"]["sample_weight"] = rng.choice([2, 5])
+        traces.append(trace)
+    return traces
+
+
+def _load(writer, traces):
+    writer.write_rows([trace_to_row(t) for t in traces])
+
+
+@pytest.fixture
+def writer():
+    return SQLiteTraceWriter()
+
+
+class TestParityWithFileEngine:
+    """SQL aggregation returns the same metrics as the JSONL engine."""
+
+    @pytest.mark.parametrize("weighted", [True, False])
+    @pytest.mark.parametrize("use_rollups", [True, False])
+    def test_snapshot_matches(self, writer, tmp_path, weighted, use_rollups):
+        traces = _traces(datetime.utcnow(), weighted=weighted)
+        path = tmp_path / "traces.jsonl"
+        path.write_text("".join(json.dumps(t) + "\n" for t in traces))
+        _load(writer, traces)
+
+        engine = DatabaseMetricsEngine(writer.conn, use_rollups=use_rollups)
+        if use_rollups:
+            engine.refresh_rollups()
+
+        expected = MetricsEngine(str(path)).get_metrics("week").to_dict()
+        actual = engine.get_metrics("week").to_dict()
+
+        for name in ("cost", "health", "quality"):
+            assert actual[name] == expected[name]
+
+    def test_empty_database(self, writer):
+        metrics = DatabaseMetricsEngine(writer.conn).get_metrics("day")
+
+        assert metrics.cost.value == 0
+        assert metrics.health.value == 100.0
+        assert metrics.quality.value == 100.0
+
+
+class TestRollups:
+    """Test incremental rollup maintenance."""
+
+    def test_unrolled_hours_come_from_raw_traces(self, writer):
+        now = datetime.utcnow()
+        _load(writer, [{"timestamp": (now - timedelta(hours=5)).isoformat() + "Z", "cost": 1.0}])
+        engine = DatabaseMetricsEngine(writer.conn)
+        engine.refresh_rollups(now=now)
+
+        # Written after the refresh, newer than the watermark
+        _load(writer, [{"timestamp": (now - timedelta(minutes=1)).isoformat() + "Z", "cost": 2.0}])
+
+        assert engine.cost_metric("day").value == pytest.approx(3.0)
+
+    def test_late_arrivals_within_margin_are_rolled_up(self, writer):
+        now = datetime.utcnow()
+        engine = DatabaseMetricsEngine(writer.conn, late_arrival_hours=3)
+        engine.refresh_rollups(now=now)
+
+        # Late trace in an hour that was already rolled up
+        _load(writer, [{"timestamp": (now - timedelta(hours=2)).isoformat() + "Z", "cost": 4.0}])
+        assert engine.cost_metric("day").value == pytest.approx(0.0)
+
+        engine.refresh_rollups(now=now)
+        assert engine.cost_metric("day").value == pytest.approx(4.0)
+
+    def test_replayed_traces_older_than_margin_are_rolled_up(self, writer):
+        now = datetime.utcnow()
+        _load(writer, [{"timestamp": (now - timedelta(hours=10)).isoformat() + "Z", "cost": 1.0}])
+        engine = DatabaseMetricsEngine(writer.conn, late_arrival_hours=3)
+        engine.refresh_rollups(now=now)
+
+        # Spool replayed after an outage keeps the original timestamps
+        _load(writer, [{"timestamp": (now - timedelta(hours=10)).isoformat() + "Z", "cost": 2.0}])
+        _load(writer, [{"timestamp": (now - timedelta(hours=8)).isoformat() + "Z", "cost": 4.0}])
+
+        engine.refresh_rollups(now=now)
+        assert engine.cost_metric("day").value == pytest.approx(7.0)
+
+        # Already recomputed; the next refresh leaves the totals alone
+        engine.refresh_rollups(now=now)
+        assert engine.cost_metric("day").value == pytest.approx(7.0)
+
+    def test_threshold_change_invalidates_rollup(self, writer):
+        now = datetime.utcnow()
+        _load(
+            writer,
+            [
+                {
+                    "timestamp": (now - timedelta(hours=4)).isoformat() + "Z",
+                    "metadata": {"confidence": 0.6},
+                }
+            ],
+        )
+        engine = DatabaseMetricsEngine(writer.conn)
+        engine.refresh_rollups(now=now)
+        assert engine.quality_metric("day").passed_count == 0
+
+        config = MetricConfig.from_dict({"quality": {"semantic_threshold": 0.5}})
+        engine = DatabaseMetricsEngine(writer.conn, config=config)
+
+        assert engine.rollup_watermark() is None
+        assert engine.quality_metric("day").passed_count == 1
@@ -36,6 +36,103 @@ class TestOpenTelemetryExporter:
         traces = exporter.get_traces()
         assert len(traces) > 0
 
+    def test_batched_file_export(self, tmp_path):
+        """Test spans are exported in batches to file and OTLP stand-in."""
+        import json
+
+        from cert.observability.telemetry import OpenTelemetryExporter
+
+        span_file = tmp_path / "spans.jsonl"
+        collector_file = tmp_path / "collector.jsonl"
+        exporter = OpenTelemetryExporter(
+            service_name="test",
+            export_to_file=str(span_file),
+            endpoint=f"file://{collector_file}",
+            batch_size=4,
+            schedule_delay_ms=60000,
+        )
+
+        for i in range(10):
+            with exporter.start_span(f"op-{i}"):
+                pass
+
+        assert exporter.force_flush(timeout=5.0)
+        exporter.shutdown()
+
+        assert len(span_file.read_text().splitlines()) == 10
+        requests = [json.loads(line) for line in collector_file.read_text().splitlines()]
+        batch_sizes = [len(r["resourceSpans"][0]["scopeSpans"][0]["spans"]) for r in requests]
+        assert sum(batch_sizes) == 10
+        assert max(batch_sizes) <= 4
+        assert exporter.get_export_stats()["spans_exported"] == 10
+
+    def test_full_queue_drops_spans(self):
+        """Test spans are dropped and counted when the queue is full."""
+        import threading
+
+        from cert.observability.telemetry import BatchSpanProcessor
+
+        entered = threading.Event()
+        release = threading.Event()
+
+        class BlockingExporter:
+            def export(self, spans):
+                entered.set()
+                release.wait(5.0)
+                return True
+
+            def shutdown(self):
+                pass
+
+        processor = BatchSpanProcessor(
+            [BlockingExporter()], max_queue_size=2, max_export_batch_size=1
+        )
+        processor.on_end(object())
+        assert entered.wait(5.0)
+
+        for _ in range(4):
+            processor.on_end(object())
+
+        assert processor.queue_size == 2
+        assert processor.spans_dropped == 2
+
+        release.set()
+        processor.shutdown()
+        assert processor.spans_exported == 3
+
+    def test_failed_exports_are_not_counted_as_exported(self):
+        """Test spans rejected by an exporter are counted as failed."""
+        from cert.observability.telemetry import BatchSpanProcessor
+
+        class FailingExporter:
+            def export(self, spans):
+                raise ConnectionError("collector unreachable")
+
+            def shutdown(self):
+                pass
+
+        processor = BatchSpanProcessor([FailingExporter()], max_export_batch_size=2)
+        for _ in range(3):
+            processor.on_end(object())
+        processor.shutdown()
+
+        stats = processor.get_stats()
+        assert stats["spans_exported"] == 0
+        assert stats["spans_failed"] == 3
+        assert stats["export_failures"] == 2
+
+    def test_shutdown_unregisters_exit_hook(self):
+        """Test only processors still running are flushed at exit."""
+        from cert.observability.telemetry import span_processor
+
+        processors = [span_processor.BatchSpanProcessor([]) for _ in range(3)]
+        assert all(p in span_processor._active_processors for p in processors)
+
+        processors[0].shutdown()
+
+        assert processors[0] not in span_processor._active_processors
+        assert processors[1] in span_processor._active_processors
+
 
 class TestPrometheusMetrics:
     """Tests for PrometheusMetrics."""
@@ -84,6 +181,41 @@ class TestPrometheusMetrics:
         summary = metrics.get_summary()
         assert len(summary["counters"]) > 0
 
+    def test_histogram_buckets(self):
+        """Test bucketed histogram export uses the histogram's bucket type."""
+        from cert.observability.telemetry import PrometheusMetrics
+
+        metrics = PrometheusMetrics(namespace="test")
+
+        for tokens in (5, 60, 60, 20000):
+            metrics.observe_histogram(
+                "tokens", tokens, labels={"model": "gpt-4"}, bucket_type="tokens"
+            )
+
+        output = metrics.export_text()
+        assert 'test_tokens_bucket{model="gpt-4",le="10"} 1' in output
+        assert 'test_tokens_bucket{model="gpt-4",le="100"} 3' in output
+        assert 'test_tokens_bucket{model="gpt-4",le="16000"} 3' in output
+        assert 'test_tokens_bucket{model="gpt-4",le="+Inf"} 4' in output
+        assert 'test_tokens_count{model="gpt-4"} 4' in output
+        assert metrics.get_summary()["histogram_counts"]["tokens"] == 4
+
+    def test_summary_is_bounded(self):
+        """Test summaries keep a bounded window but exact count and sum."""
+        from cert.observability.telemetry import PrometheusMetrics
+
+        metrics = PrometheusMetrics(namespace="test", summary_max_samples=10)
+
+        for i in range(1000):
+            metrics.observe_summary("latency", float(i))
+
+        summary = metrics._summaries["latency"][()]
+        assert len(summary.window) == 10
+        output = metrics.export_text()
+        assert 'test_latency{quantile="0.5"} 994.0' in output
+        assert "test_latency_count 1000" in output
+        assert "test_latency_sum 499500.0" in output
+
 
 class TestCustomMetrics:
     """Tests for CustomMetrics."""
@@ -125,6 +257,69 @@ class TestCustomMetrics:
         assert stats["min"] == 100.0
         assert stats["max"] == 109.0
 
+    def test_increment_per_label_set(self):
+        """Test counters keep independent values per label set."""
+        from cert.observability.telemetry import CustomMetrics
+
+        metrics = CustomMetrics()
+
+        for _ in range(1000):
+            metrics.increment("requests", labels={"model": "gpt-4"})
+        metrics.increment("requests", delta=5, labels={"model": "claude"})
+
+        assert metrics.get_current("requests", labels={"model": "gpt-4"}) == 1000
+        assert metrics.get_current("requests", labels={"model": "claude"}) == 5
+        assert metrics.get_current("requests") == 5
+        assert metrics.get_rate("requests", window_minutes=1) == 1005
+        assert metrics.list_metrics()[0]["series"] == 2
+
+    def test_trend_from_rollups(self):
+        """Test trend buckets are built from rollups."""
+        from datetime import datetime, timedelta
+
+        from cert.observability.telemetry import CustomMetrics
+
+        metrics = CustomMetrics()
+        now = datetime.utcnow()
+
+        metrics.record("score", 1.0, timestamp=now - timedelta(minutes=30))
+        metrics.record("score", 3.0, timestamp=now - timedelta(minutes=30))
+        metrics.record("score", 5.0, timestamp=now)
+
+        trend = metrics.get_trend("score", window_minutes=60, bucket_minutes=10)
+        assert [b["count"] for b in trend] == [2, 1]
+        assert trend[0]["mean"] == 2.0
+
+    def test_raw_points_percentiles(self):
+        """Test percentiles from the raw point ring buffer."""
+        pytest.importorskip("numpy")
+        from cert.observability.telemetry import CustomMetrics
+
+        metrics = CustomMetrics(max_history=50, keep_raw_points=True)
+
+        for i in range(100):
+            metrics.record("latency", float(i))
+
+        stats = metrics.get_statistics("latency")
+        assert stats["count"] == 100
+        assert stats["p50"] == 75.0
+
+    def test_percentiles_without_raw_points_warn(self):
+        """Test defining percentile metrics without raw points warns."""
+        import warnings
+
+        from cert.observability.telemetry import CustomMetrics, MetricType
+
+        metrics = CustomMetrics()
+
+        with pytest.warns(UserWarning, match="keep_raw_points"):
+            metrics.define("latency", MetricType.GAUGE, "Latency", aggregation="p99")
+        with pytest.warns(UserWarning, match="keep_raw_points"):
+            metrics.define("tokens", MetricType.HISTOGRAM, "Tokens per call")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            metrics.define("accuracy", MetricType.GAUGE, "Accuracy", aggregation="avg")
+
 
 class TestAlertManager:
     """Tests for AlertManager."""
@@ -280,3 +475,185 @@ class TestRealTimeUI:
         output = ui.render()
         assert "Test Dashboard" in output
         assert "test" in output
+
+
+class TestWebSocketClientSession:
+    """Tests for per-client WebSocket send queues."""
+
+    def test_drop_oldest_when_full(self):
+        """Test a full queue drops the oldest event and reports it."""
+        import json
+
+        from cert.observability.websocket import ClientSession
+
+        session = ClientSession(object(), max_queue_size=3, max_batch_size=10)
+        for i in range(5):
+            session.enqueue(json.dumps({"event_type": "trace", "data": {"i": i}}))
+
+        frame = json.loads(session.next_frame())
+        assert frame["event_type"] == "batch"
+        assert frame["data"]["dropped"] == 2
+        assert [e["data"]["i"] for e in frame["data"]["events"]] == [2, 3, 4]
+
+    def test_coalesce_replaces_pending_event(self):
+        """Test coalescing keeps only the latest event per key."""
+        from cert.observability.websocket import ClientSession
+
+        session = ClientSession(object(), overflow_policy="coalesce")
+        session.enqueue('{"v": 1}', coalesce_key="metric:cost")
+        session.enqueue('{"v": 2}', coalesce_key="metric:cost")
+        session.enqueue('{"v": 3}')
+
+        assert session.queue_size == 2
+        assert session.events_coalesced == 1
+        assert '{"v": 2}' in session.next_frame()
+
+    def test_slow_client_does_not_delay_others(self):
+        """Test each client is served by its own sender task."""
+        import asyncio
+
+        from cert.observability.websocket import ClientSession
+
+        class FakeWebSocket:
+            def __init__(self, delay):
+                self.delay = delay
+                self.frames = []
+
+            async def send(self, frame):
+                await asyncio.sleep(self.delay)
+                self.frames.append(frame)
+
+        async def scenario():
+            slow, fast = FakeWebSocket(10.0), FakeWebSocket(0)
+            sessions = [ClientSession(slow), ClientSession(fast)]
+            for session in sessions:
+                session.start()
+            for i in range(3):
+                for session in sessions:
+                    session.enqueue(f'{{"i": {i}}}')
+
+            await asyncio.sleep(0.05)
+            for session in sessions:
+                session.stop()
+            return slow, fast
+
+        slow, fast = asyncio.run(scenario())
+
+        assert slow.frames == []
+        assert len(fast.frames) >= 1
+        assert '{"i": 2}' in fast.frames[-1]
+
+
+    def test_failed_send_closes_and_unregisters_client(self):
+        """Test a client whose send fails is closed and dropped by the server."""
+        import asyncio
+
+        pytest.importorskip("websockets")
+        from cert.observability.websocket import TraceEvent, WebSocketTraceServer
+
+        class FailingWebSocket:
+            def __init__(self):
+                self.frames = []
+                self.close_code = None
+                self.closed = asyncio.Event()
+
+            async def send(self, frame):
+                if self.frames:
+                    raise RuntimeError("transport broken")
+                self.frames.append(frame)
+
+            async def close(self, code=1000, reason=""):
+                self.close_code = code
+                self.closed.set()
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                await self.closed.wait()
+                raise StopAsyncIteration
+
+        async def scenario():
+            server = WebSocketTraceServer()
+            websocket = FailingWebSocket()
+            handler = asyncio.create_task(server._handler(websocket))
+            await asyncio.sleep(0)
+            assert len(server._sessions) == 1
+
+            server._fan_out(TraceEvent("trace", "now", {"status": "ok"}))
+            await asyncio.wait_for(handler, timeout=1)
+            return server, websocket
+
+        server, websocket = asyncio.run(scenario())
+
+        assert websocket.close_code == 1011
+        assert server._sessions == {}
+        assert server.clients == set()
+
+
+class TestWebSocketSubscription:
+    """Tests for WebSocket client subscriptions."""
+
+    def test_filters_and_projection(self):
+        """Test subscription filters and field projection."""
+        from cert.observability.websocket import Subscription
+
+        subscription = Subscription.from_message(
+            {
+                "type": "subscribe",
+                "filters": {"statuses": ["error"], "min_latency_ms": 1000},
+                "fields": ["model", "status"],
+            }
+        )
+        slow_error = {"model": "gpt-4", "status": "error", "duration_ms": 2000, "answer": "x"}
+
+        assert subscription.accepts("trace", slow_error)
+        assert not subscription.accepts("trace", {**slow_error, "status": "success"})
+        assert not subscription.accepts("trace", {**slow_error, "duration_ms": 10})
+        assert subscription.accepts("heartbeat", {})
+        assert subscription.project(slow_error) == {"model": "gpt-4", "status": "error"}
+
+    def test_single_field_as_string(self):
+        """Test a single field name is not split into characters."""
+        from cert.observability.websocket import Subscription
+
+        subscription = Subscription.from_message({"fields": "model", "filters": {"models": "gpt-4"}})
+
+        assert subscription.fields == ("model",)
+        assert subscription.project({"model": "gpt-4", "m": 1}) == {"model": "gpt-4"}
+
+    def test_sampling(self):
+        """Test sample rate bounds and zero-rate sampling."""
+        import pytest
+
+        from cert.observability.websocket import Subscription
+
+        with pytest.raises(ValueError):
+            Subscription.from_message({"sample_rate": 2})
+
+        subscription = Subscription.from_message({"sample_rate": 0})
+        assert not any(subscription.accepts("trace", {}) for _ in range(100))
+
+    def test_fan_out_serializes_once_per_projection(self):
+        """Test filtered fan-out to client sessions."""
+        pytest.importorskip("websockets")
+        from cert.observability.websocket import (
+            ClientSession,
+            Subscription,
+            TraceEvent,
+            WebSocketTraceServer,
+        )
+
+        server = WebSocketTraceServer()
+        everything, errors_only = ClientSession(object()), ClientSession(object())
+        errors_only.subscription = Subscription.from_message(
+            {"filters": {"statuses": ["error"]}, "fields": ["status"]}
+        )
+        server._sessions = {1: everything, 2: errors_only}
+
+        for status in ("success", "error"):
+            server._fan_out(TraceEvent("trace", "now", {"status": status, "answer": "x"}))
+
+        assert everything.queue_size == 2
+        assert errors_only.queue_size == 1
+        assert '"data": {"status": "error"}' in errors_only.next_frame()
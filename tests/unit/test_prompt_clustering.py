@@ -0,0 +1,130 @@
+"""
+Unit tests for near-duplicate prompt clustering and caching opportunities.
+"""
+
+import json
+
+import pytest
+
+from cert.value.dedup import (
+    PromptClusterIndex,
+    estimate_similarity,
+    minhash_signature,
+    prompt_text,
+    shingles,
+)
+from cert.value.optimizer import Optimizer
+
+TEMPLATE = (
+    "You are a support assistant. Summarize the following support ticket in two "
+    "sentences and classify its urgency as low, medium or high for the on-call "
+    "team, citing the affected component. Ticket {}: the customer reports that "
+    "the analytics dashboard fails to load after login and the browser console "
+    "shows repeated timeout errors from the metrics endpoint."
+)
+
+
+class TestMinHash:
+    """Test signatures and similarity estimates."""
+
+    def test_identical_text_has_identical_signature(self):
+        a = minhash_signature(shingles(TEMPLATE.format(1)))
+        b = minhash_signature(shingles(TEMPLATE.format(1)))
+        assert a == b
+        assert estimate_similarity(a, b) == 1.0
+
+    def test_near_duplicates_score_higher_than_unrelated(self):
+        a = minhash_signature(shingles(TEMPLATE.format(1)))
+        b = minhash_signature(shingles(TEMPLATE.format(2)))
+        c = minhash_signature(shingles("Translate this recipe for lemon cake into French please"))
+        assert estimate_similarity(a, b) > 0.6
+        assert estimate_similarity(a, c) < 0.2
+
+    def test_prompt_text_uses_message_content(self):
+        messages = [
+            {"role": "system", "content": "You are helpful."},
+            {"role": "user", "content": "Hi"},
+        ]
+        assert prompt_text(messages) == "You are helpful.\nHi"
+
+
+class TestPromptClusterIndex:
+    """Test streaming clustering and bounded memory."""
+
+    def test_clusters_near_duplicates(self):
+        index = PromptClusterIndex()
+        for i in range(20):
+            index.add(TEMPLATE.format(i), cost=0.01)
+        index.add("Write a haiku about the ocean at dawn", cost=0.01)
+
+        clusters = index.clusters(min_size=5)
+
+        assert len(clusters) == 1
+        assert clusters[0].count == 20
+        assert clusters[0].distinct_prompts == 20
+        assert clusters[0].estimated_savings() == pytest.approx(0.19)
+
+    def test_evicts_singletons_when_full(self):
+        index = PromptClusterIndex(max_clusters=3)
+        for _ in range(3):
+            index.add(TEMPLATE.format(0))
+        for text in ["first unique prompt here", "second unique prompt here", "third one"]:
+            index.add(text)
+
+        assert len(index) == 3
+        assert index.evicted_clusters == 1
+        assert index.clusters(min_size=3)[0].count == 3
+
+
+class TestFindCachingOpportunities:
+    """Test Optimizer integration."""
+
+    def test_reports_exact_and_near_duplicate_clusters(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        with open(path, "w") as f:
+            for i in range(6):
+                f.write(json.dumps({"input_data": TEMPLATE.format(i), "cost": 0.02}) + "\n")
+            for _ in range(5):
+                f.write(
+                    json.dumps({"input_data": "What is the capital of France?", "cost": 0.01})
+                    + "\n"
+                )
+
+        opportunities = Optimizer(str(path)).find_caching_opportunities(min_repetitions=5)
+
+        by_type = {o["match_type"]: o for o in opportunities}
+        assert by_type["near_duplicate"]["repetitions"] == 6
+        assert by_type["near_duplicate"]["potential_savings"] == 0.1
+        assert by_type["exact"]["repetitions"] == 5
+        assert opportunities[0]["match_type"] == "near_duplicate"
+
+    def test_sampled_traces_are_weighted(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        with open(path, "w") as f:
+            # 4 logged calls at a 10% sample rate stand for 40 calls
+            for minute in range(4):
+                trace = {
+                    "timestamp": f"2025-01-01T12:0{minute}:00Z",
+                    "model": "gpt-4",
+                    "input_data": "What is the capital of France?",
+                    "cost": 0.01,
+                    "metadata": {"confidence": 0.95, "sample_weight": 10},
+                }
+                f.write(json.dumps(trace) + "\n")
+
+        optimizer = Optimizer(str(path))
+
+        (cache,) = optimizer.find_caching_opportunities(min_repetitions=5)
+        assert cache["repetitions"] == 40
+        assert cache["potential_savings"] == 0.39
+        (downgrade,) = optimizer.recommend_model_changes()
+        assert downgrade["task_count"] == 40
+        assert downgrade["current_cost"] == 0.4
+        (batch,) = optimizer.find_batch_opportunities()
+        assert batch["call_count"] == 40
+
+        summary = optimizer.get_optimization_summary()
+        assert summary["current_monthly_cost"] == 0.4
+        assert summary["potential_savings_percentage"] == pytest.approx(
+            (0.39 + 0.24 + 0.08) / 0.4 * 100, abs=0.1
+        )
@@ -0,0 +1,107 @@
+"""
+Unit tests for the policy replay simulator.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+# Skip all tests if numpy not installed
+pytest.importorskip("numpy")
+
+from cert.value.simulator import (
+    BatchPolicy,
+    ModelRoutingPolicy,
+    ReplaySimulator,
+    TruncationPolicy,
+)
+
+START = datetime(2025, 1, 1)
+
+
+def _trace(minute, model="gpt-4", task="classify", cost=1.0, prompt=1000, confidence=0.95):
+    return {
+        "timestamp": (START + timedelta(minutes=minute)).isoformat() + "Z",
+        "model": model,
+        "cost": cost,
+        "duration_ms": 500,
+        "metadata": {
+            "task_type": task,
+            "prompt_tokens": prompt,
+            "completion_tokens": 100,
+            "confidence": confidence,
+        },
+    }
+
+
+class TestReplaySimulator:
+    """Test projected cost, latency and quality under each policy."""
+
+    def test_no_policies_matches_baseline(self):
+        simulator = ReplaySimulator([_trace(i) for i in range(5)])
+
+        result = simulator.simulate([])
+
+        assert result["cost"]["baseline"] == result["cost"]["projected"] == 5.0
+        assert result["cost"]["delta"] == 0.0
+        assert result["quality"]["delta"] == pytest.approx(0.0)
+
+    def test_batch_discounts_full_windows_only(self):
+        # 10 calls in the first hour, 2 calls in the second
+        traces = [_trace(i) for i in range(10)] + [_trace(65), _trace(70)]
+        simulator = ReplaySimulator(traces)
+
+        result = simulator.simulate([BatchPolicy(window_seconds=3600, min_batch_size=10)])
+
+        assert result["affected_calls"]["batch"] == 10
+        assert result["cost"]["projected"] == pytest.approx(7.0)
+        assert result["latency_ms"]["projected_p95"] > result["latency_ms"]["baseline_p95"]
+
+    def test_routing_requires_confident_group(self):
+        traces = [_trace(i, task="classify", confidence=0.95) for i in range(10)]
+        traces += [_trace(i, task="reason", confidence=0.6) for i in range(10)]
+        simulator = ReplaySimulator(traces)
+
+        result = simulator.simulate(
+            [ModelRoutingPolicy(downgrades={"gpt-4": "gpt-3.5-turbo"}, confidence_drop=0.1)]
+        )
+
+        assert result["affected_calls"]["model_routing"] == 10
+        assert result["cost"]["delta"] < 0
+        assert result["quality"]["delta"] == pytest.approx(-0.05)
+
+    def test_truncation_caps_prompt_cost(self):
+        traces = [_trace(0, prompt=4000), _trace(1, prompt=500)]
+        simulator = ReplaySimulator(traces)
+
+        result = simulator.simulate([TruncationPolicy(max_prompt_tokens=1000)])
+
+        assert result["affected_calls"]["truncation"] == 1
+        assert 1.0 < result["cost"]["projected"] < 2.0
+
+    def test_compare_orders_by_savings(self):
+        traces = [_trace(i, prompt=4000) for i in range(20)]
+        simulator = ReplaySimulator(traces)
+
+        results = simulator.compare(
+            {
+                "truncation": [TruncationPolicy(max_prompt_tokens=3000)],
+                "combined": [TruncationPolicy(max_prompt_tokens=3000), BatchPolicy()],
+            }
+        )
+
+        assert [r["scenario"] for r in results] == ["combined", "truncation"]
+
+    def test_month_of_traces_is_fast(self):
+        import time
+
+        traces = [
+            _trace(i, model=("gpt-4", "gpt-4o", "claude-3-opus")[i % 3], task=f"t{i % 7}")
+            for i in range(30 * 24 * 60)
+        ]
+        simulator = ReplaySimulator(traces)
+
+        started = time.perf_counter()
+        simulator.simulate([ModelRoutingPolicy(), TruncationPolicy(), BatchPolicy()])
+
+        assert time.perf_counter() - started < 1.0
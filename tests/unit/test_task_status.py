@@ -0,0 +1,158 @@
+"""
+Unit tests for async task status and audit progress.
+
+Tests the progress payload built from the counters audit tasks publish, and
+status reads and cancellation against an in-memory stand-in for Redis.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+# cert.api imports the FastAPI app on package import
+pytest.importorskip("fastapi")
+
+from cert.api.task_status import (
+    AUDIT_PROGRESS_PREFIX,
+    MAX_FAILURE_SAMPLES,
+    AsyncTaskStatusClient,
+    build_progress,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def hgetall(self, key):
+        self.calls.append(lambda: dict(self.redis.hashes.get(key, {})))
+
+    def lrange(self, key, start, end):
+        self.calls.append(lambda: list(self.redis.lists.get(key, [])))
+
+    async def execute(self):
+        return [call() for call in self.calls]
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for AsyncTaskStatusClient."""
+
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.lists = {}
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def exists(self, key):
+        return int(key in self.hashes)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field.encode()] = str(value).encode()
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def client():
+    client = AsyncTaskStatusClient()
+    client._redis = FakeRedis()
+    return client
+
+
+class TestBuildProgress:
+    """Test derivation of pass rate and ETA from progress counters."""
+
+    def test_running_audit(self):
+        fields = {
+            b"total": b"1000",
+            b"chunks": b"4",
+            b"started_at": b"100.0",
+            b"processed": b"250",
+            b"evaluated": b"200",
+            b"passed": b"150",
+            b"chunks_done": b"1",
+        }
+        failures = [json.dumps({"trace_id": "t1", "matched": False}).encode()]
+
+        progress = build_progress(fields, failures, now=150.0)
+
+        assert progress["percent"] == 25.0
+        assert progress["pass_rate"] == 0.75
+        assert progress["failed_traces"] == 50
+        assert progress["elapsed_seconds"] == 50.0
+        assert progress["eta_seconds"] == pytest.approx(150.0)
+        assert progress["failure_samples"] == [{"trace_id": "t1", "matched": False}]
+        assert progress["cancelled"] is False
+
+    def test_per_task_counts_are_summed(self):
+        failing = json.dumps([{"trace_id": "t1", "matched": False}] * 80)
+        fields = {
+            b"total": b"100",
+            b"chunks": b"2",
+            b"processed:a": b"50",
+            b"evaluated:a": b"40",
+            b"passed:a": b"30",
+            b"done:a": b"1",
+            b"failures:a": failing.encode(),
+            b"processed:b": b"10",
+            b"evaluated:b": b"10",
+            b"passed:b": b"10",
+            b"done:b": b"0",
+            b"failures:b": failing.encode(),
+        }
+
+        progress = build_progress(fields, [], now=10.0)
+
+        assert progress["processed"] == 60
+        assert progress["evaluated_traces"] == 50
+        assert progress["passed_traces"] == 40
+        assert progress["chunks_done"] == 1
+        assert len(progress["failure_samples"]) == MAX_FAILURE_SAMPLES
+
+    def test_nothing_processed_yet(self):
+        progress = build_progress({b"total": b"1000", b"chunks": b"1"}, [], now=10.0)
+
+        assert progress["processed"] == 0
+        assert progress["pass_rate"] is None
+        assert progress["eta_seconds"] is None
+
+
+class TestAsyncTaskStatusClient:
+    """Test status reads with progress and cancellation."""
+
+    def test_running_status_includes_progress(self, client):
+        client._redis.hashes[f"{AUDIT_PROGRESS_PREFIX}job-1"] = {
+            b"total": b"10",
+            b"processed": b"5",
+            b"evaluated": b"5",
+            b"passed": b"4",
+        }
+
+        status = asyncio.run(client.get_status("job-1", include_progress=True))
+
+        assert status["status"] == "PENDING"
+        assert status["progress"]["pass_rate"] == 0.8
+
+    def test_finished_status_omits_progress(self, client):
+        client._redis.strings["celery-task-meta-job-1"] = json.dumps(
+            {"status": "SUCCESS", "result": {"status": "completed"}}
+        )
+        client._redis.hashes[f"{AUDIT_PROGRESS_PREFIX}job-1"] = {b"processed": b"10"}
+
+        status = asyncio.run(client.get_status("job-1", include_progress=True))
+
+        assert status["result"] == {"status": "completed"}
+        assert "progress" not in status
+
+    def test_cancel_sets_flag_for_known_audit(self, client):
+        key = f"{AUDIT_PROGRESS_PREFIX}job-1"
+        client._redis.hashes[key] = {b"total": b"10"}
+
+        assert asyncio.run(client.cancel_audit("job-1"))
+        assert not asyncio.run(client.cancel_audit("unknown"))
+        assert asyncio.run(client.get_progress("job-1"))["cancelled"] is True